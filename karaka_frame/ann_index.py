@@ -0,0 +1,471 @@
+"""
+ANN Index for Kāraka Frame Graph POC.
+Incremental IVF (inverted-file) approximate nearest-neighbour index over a
+VectorMatrix. Vectors stay in the matrix; the index adds k-means centroids
+and one inverted list of matrix rows per centroid:
+
+    search(q):  score centroids → probe the best `nprobe` lists → exact
+                top-k over the rows in those lists
+
+Inserts are assigned to their nearest centroid as they arrive. Deleted
+vectors are tombstoned in the matrix (row freed until a new vector reuses
+it) and dropped from their list. Centroids are retrained once the corpus has grown
+RETRAIN_GROWTH× past the last training, and the index persists next to
+the matrix as <base>.ivf.npz (centroids + row assignments).
+
+Below ANN_TRAIN_MIN vectors the index answers exactly. Training (k-means
+plus reassigning every vector) runs in a background thread: until it
+finishes, queries use exact search or the previous centroids, and rows
+written meanwhile are reassigned when the new centroids are swapped in.
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from vector_matrix import VectorMatrix
+
+# Vectors required before centroids are trained (exact search until then)
+ANN_TRAIN_MIN = int(os.getenv("ANN_TRAIN_MIN", "8192"))
+
+# Inverted lists (0 = auto, ≈ 2·sqrt(n) at training time)
+ANN_NLIST = int(os.getenv("ANN_NLIST", "0"))
+
+# Lists probed per query: the recall/latency knob
+ANN_NPROBE = int(os.getenv("ANN_NPROBE", "16"))
+
+# Retrain centroids once the corpus is this many times the training size
+RETRAIN_GROWTH = 4
+
+_KMEANS_ITERS = 10
+_SAMPLE_PER_LIST = 64
+_ASSIGN_CHUNK = 16384
+
+
+def _auto_nlist(n: int) -> int:
+    return int(min(65536, max(16, 2 * np.sqrt(n))))
+
+
+class IVFIndex:
+    """
+    IVF index keyed by string IDs (frame IDs, document node IDs).
+
+    metric "ip" ranks by inner product (cosine for normalized vectors);
+    "l2" ranks by squared Euclidean distance, returned negated so higher
+    is always better.
+    """
+
+    def __init__(
+        self,
+        matrix: VectorMatrix,
+        metric: str = "ip",
+        nlist: int = ANN_NLIST,
+        nprobe: int = ANN_NPROBE,
+        train_min: int = ANN_TRAIN_MIN,
+        background: bool = True,
+    ):
+        """
+        Initialize the index (loads <matrix base>.ivf.npz if present).
+
+        Args:
+            matrix: Vector storage; the index owns its writes from now on
+            metric: "ip" or "l2"
+            nlist: Inverted lists (0 = auto from corpus size)
+            nprobe: Default lists probed per query
+            train_min: Vectors required before training centroids
+            background: Train in a worker thread instead of inside add()
+        """
+        if metric not in ("ip", "l2"):
+            raise ValueError(f"Unknown metric: {metric}")
+        self.matrix = matrix
+        self.metric = metric
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_min = train_min
+        self.background = background
+
+        self.centroids: Optional[np.ndarray] = None   # nlist × dim float32
+        self.assign = np.full(0, -1, dtype=np.int32)  # row → list (-1 = none)
+        self.sq_norms = np.zeros(0, dtype=np.float32) # row → ||x||² (l2 only)
+        self.lists: list[list[int]] = []              # list → rows
+        self._list_arrays: dict[int, np.ndarray] = {} # cached np views of lists
+        self.trained_size = 0
+
+        self.trainings = 0
+        self.train_seconds = 0.0
+        self._trainer: Optional[threading.Thread] = None
+        self._touched: Optional[set[int]] = None      # rows written while training
+        self._generation = 0                          # bumped by clear()
+
+        self.path = (
+            matrix.base.with_name(matrix.base.name + ".ivf.npz") if matrix.base else None
+        )
+        if not (self.path and self._load()):
+            self._catch_up(0)
+
+    # ------------------------------------------------------------- persistence
+
+    def _load(self) -> bool:
+        """Restore centroids and assignments. Returns False if unusable."""
+        if not self.path.exists():
+            return False
+        try:
+            data = np.load(self.path)
+            if str(data["metric"]) != self.metric or data["centroids"].shape[1:] != (self.matrix.dim,):
+                return False
+            assign = data["assign"]
+            if len(assign) > len(self.matrix.ids):
+                return False  # Saved against a newer matrix (matrix was reset)
+            centroids = data["centroids"]
+            self.trained_size = int(data["trained_size"])
+        except Exception as e:
+            print(f"⚠️ Failed to load ANN index {self.path.name}: {e}")
+            return False
+
+        self.centroids = centroids if len(centroids) else None
+        self._ensure_rows(len(self.matrix.ids))
+        self.assign[:len(assign)] = assign
+        if self.metric == "l2":
+            self.sq_norms[:len(assign)] = self._row_sq_norms(0, len(assign))
+        # Rows freed since the save drop out; rows added since are assigned below
+        for row in self.matrix.free_rows:
+            if row < len(assign):
+                self.assign[row] = -1
+        self._rebuild_lists()
+        # Freed rows reused since the save
+        reused = np.flatnonzero(self.assign[:len(assign)] < 0)
+        if self.matrix.free_rows:
+            reused = reused[~np.isin(reused, list(self.matrix.free_rows))]
+        self._assign_rows(reused)
+        self._catch_up(len(assign))
+        return True
+
+    def save(self) -> None:
+        """Write centroids and row assignments to <matrix base>.ivf.npz."""
+        if self.path is None:
+            return
+        with self.matrix.lock:
+            n = len(self.matrix.ids)
+            centroids = self.centroids
+            assign = self.assign[:n].copy()
+            trained_size = self.trained_size
+        tmp_path = self.path.with_name(self.path.name + ".tmp.npz")
+        np.savez(
+            tmp_path,
+            metric=np.array(self.metric),
+            centroids=centroids if centroids is not None
+            else np.zeros((0, self.matrix.dim), dtype=np.float32),
+            assign=assign,
+            trained_size=np.array(trained_size),
+        )
+        os.replace(tmp_path, self.path)
+
+    # ------------------------------------------------------------------ writes
+
+    def _ensure_rows(self, n: int) -> None:
+        if len(self.assign) >= n:
+            return
+        capacity = max(n, 2 * len(self.assign), 1024)
+        self.assign = np.concatenate([self.assign, np.full(capacity - len(self.assign), -1, dtype=np.int32)])
+        self.sq_norms = np.concatenate([self.sq_norms, np.zeros(capacity - len(self.sq_norms), dtype=np.float32)])
+
+    def _row_sq_norms(self, start: int, end: int) -> np.ndarray:
+        rows = self.matrix.rows()[start:end].astype(np.float32)
+        return np.einsum("ij,ij->i", rows, rows)
+
+    def _scores(self, vectors: np.ndarray, query: np.ndarray, sq_norms: Optional[np.ndarray]) -> np.ndarray:
+        """Higher is better for both metrics (l2: −||x−q||² + ||q||²)."""
+        scores = vectors @ query
+        if self.metric == "l2":
+            scores = 2 * scores - sq_norms
+        return scores
+
+    def _nearest_centroids(self, vectors: np.ndarray, centroids: Optional[np.ndarray] = None) -> np.ndarray:
+        centroids = self.centroids if centroids is None else centroids
+        scores = vectors @ centroids.T
+        if self.metric == "l2":
+            scores = 2 * scores - np.einsum("ij,ij->i", centroids, centroids)
+        return scores.argmax(axis=1).astype(np.int32)
+
+    def _assign_rows(self, rows: np.ndarray) -> None:
+        """Append rows to their nearest centroid's list."""
+        if self.centroids is None or len(rows) == 0:
+            return
+        data = self.matrix.rows()
+        for start in range(0, len(rows), _ASSIGN_CHUNK):
+            chunk = rows[start:start + _ASSIGN_CHUNK]
+            for row, list_id in zip(chunk.tolist(), self._nearest_centroids(data[chunk].astype(np.float32)).tolist()):
+                self.assign[row] = list_id
+                self.lists[list_id].append(row)
+                self._list_arrays.pop(list_id, None)
+
+    def _unassign(self, row: int) -> None:
+        list_id = int(self.assign[row])
+        if list_id < 0:
+            return
+        self.assign[row] = -1
+        self.lists[list_id].remove(row)
+        self._list_arrays.pop(list_id, None)
+
+    def _rebuild_lists(self) -> None:
+        n = len(self.matrix.ids)
+        self.lists = [[] for _ in range(0 if self.centroids is None else len(self.centroids))]
+        self._list_arrays = {}
+        assign = self.assign[:n]
+        rows = np.flatnonzero(assign >= 0)
+        order = np.argsort(assign[rows], kind="stable")
+        rows = rows[order]
+        bounds = np.searchsorted(assign[rows], np.arange(len(self.lists) + 1))
+        for list_id in range(len(self.lists)):
+            self.lists[list_id] = rows[bounds[list_id]:bounds[list_id + 1]].tolist()
+
+    def _live_rows(self) -> np.ndarray:
+        n = len(self.matrix.ids)
+        live = np.ones(n, dtype=bool)
+        if self.matrix.free_rows:
+            live[list(self.matrix.free_rows)] = False
+        return np.flatnonzero(live)
+
+    def train(self) -> None:
+        """
+        (Re)train centroids with k-means on a sample and reassign every
+        vector. Only the sampling and the final swap hold matrix.lock, so
+        writes and queries (on the previous centroids) continue meanwhile.
+        """
+        started = time.perf_counter()
+        with self.matrix.lock:
+            live = self._live_rows()
+            nlist = min(self.nlist or _auto_nlist(len(live)), len(live))
+            rng = np.random.default_rng(0)
+            sample_rows = np.sort(rng.choice(live, min(len(live), nlist * _SAMPLE_PER_LIST), replace=False))
+            sample = self.matrix.rows()[sample_rows].astype(np.float32)
+            data = self.matrix.rows()  # Rows rewritten after this are in _touched
+            generation = self._generation
+            self._touched = set()
+
+        try:
+            centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+            for _ in range(_KMEANS_ITERS):
+                labels = self._nearest_centroids(sample, centroids)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, sample)
+                counts = np.bincount(labels, minlength=nlist)
+                empty = counts == 0
+                centroids = sums / np.maximum(counts, 1)[:, None]
+                # Re-seed empty lists from random sample points
+                centroids[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+                if self.metric == "ip":
+                    norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+                    centroids /= np.where(norms == 0, 1, norms)
+            centroids = centroids.astype(np.float32)
+
+            labels = np.empty(len(live), dtype=np.int32)
+            for chunk in range(0, len(live), _ASSIGN_CHUNK):
+                rows = live[chunk:chunk + _ASSIGN_CHUNK]
+                labels[chunk:chunk + _ASSIGN_CHUNK] = self._nearest_centroids(data[rows].astype(np.float32), centroids)
+        except BaseException:
+            with self.matrix.lock:
+                self._touched = None
+            raise
+
+        with self.matrix.lock:
+            touched, self._touched = self._touched, None
+            if generation != self._generation:
+                return  # Cleared while training
+            n = len(self.matrix.ids)
+            self._ensure_rows(n)
+            assign = np.full(len(self.assign), -1, dtype=np.int32)
+            assign[live] = labels
+            touched = np.fromiter((row for row in touched if row < n), dtype=np.int64)
+            assign[touched] = -1
+            self.centroids = centroids
+            self.assign = assign
+            self._rebuild_lists()
+            if self.matrix.free_rows:
+                touched = touched[~np.isin(touched, list(self.matrix.free_rows))]
+            self._assign_rows(touched)
+            self.trained_size = len(live)
+            self.trainings += 1
+            self.train_seconds += time.perf_counter() - started
+
+    def _train_in_background(self) -> None:
+        try:
+            self.train()
+            # Vectors added during the run may already call for the next one
+            while self.centroids is not None and len(self.matrix) > RETRAIN_GROWTH * self.trained_size:
+                self.train()
+        except Exception as e:
+            print(f"⚠️ ANN training failed: {e}")
+
+    def _schedule_training(self) -> None:
+        """Train now, or in a worker thread if one is not already running."""
+        if not self.background:
+            self.train()
+            return
+        if self._trainer is not None and self._trainer.is_alive():
+            return
+        self._trainer = threading.Thread(target=self._train_in_background, name="ann-training", daemon=True)
+        self._trainer.start()
+
+    def wait(self) -> None:
+        """Block until a background training run has finished."""
+        trainer = self._trainer
+        if trainer is not None:
+            trainer.join()
+
+    def _catch_up(self, start: int) -> None:
+        """Index matrix rows from `start` on, training or retraining when due."""
+        n = len(self.matrix.ids)
+        self._ensure_rows(n)
+        if self.metric == "l2" and n > start:
+            self.sq_norms[start:n] = self._row_sq_norms(start, n)
+        live = len(self.matrix)
+        if self.centroids is None:
+            if live >= self.train_min:
+                self._schedule_training()
+            return
+        if live > RETRAIN_GROWTH * self.trained_size:
+            self._schedule_training()
+        rows = np.arange(start, n)
+        rows = rows[self.assign[start:n] < 0]
+        if self.matrix.free_rows:
+            rows = rows[~np.isin(rows, list(self.matrix.free_rows))]
+        self._assign_rows(rows)
+
+    def add(self, ids: list[str], vectors: np.ndarray) -> None:
+        """Insert (or replace) vectors by ID."""
+        if len(ids) == 0:
+            return
+        with self.matrix.lock:
+            start = len(self.matrix.ids)
+            replaced, new = [], []
+            for fid in dict.fromkeys(ids):
+                row = self.matrix.row_of.get(fid)
+                if row is not None:
+                    self._unassign(row)
+                    replaced.append(row)
+                else:
+                    new.append(fid)
+            self.matrix.set_many(ids, vectors)
+            if self._touched is not None:
+                self._touched.update(self.matrix.row_of[fid] for fid in ids)
+            # New vectors in freed rows are indexed like replacements
+            replaced += [row for row in map(self.matrix.row_of.get, new) if row < start]
+            replaced = np.asarray(replaced, dtype=np.int64)
+            self._ensure_rows(len(self.matrix.ids))
+            if self.metric == "l2" and len(replaced):
+                rows = self.matrix.rows()[replaced].astype(np.float32)
+                self.sq_norms[replaced] = np.einsum("ij,ij->i", rows, rows)
+            self._assign_rows(replaced)
+            self._catch_up(start)
+
+    def remove(self, frame_id: str) -> None:
+        """Tombstone a vector (its row is freed in the matrix and leaves its list)."""
+        with self.matrix.lock:
+            row = self.matrix.row_of.get(frame_id)
+            if row is None:
+                return
+            self._unassign(row)
+            self.matrix.remove(frame_id)
+            if self._touched is not None:
+                self._touched.add(row)
+
+    def clear(self) -> None:
+        with self.matrix.lock:
+            self.matrix.clear()
+            self.centroids = None
+            self.assign = np.full(0, -1, dtype=np.int32)
+            self.sq_norms = np.zeros(0, dtype=np.float32)
+            self.lists = []
+            self._list_arrays = {}
+            self.trained_size = 0
+            self._generation += 1  # A running training is discarded
+        if self.path and self.path.exists():
+            self.path.unlink()
+
+    # ------------------------------------------------------------------- reads
+
+    def __contains__(self, frame_id: str) -> bool:
+        return frame_id in self.matrix
+
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+    def reconstruct(self, frame_id: str) -> Optional[np.ndarray]:
+        """Stored vector for an ID (float32), or None."""
+        return self.matrix.get(frame_id)
+
+    @staticmethod
+    def _list_array(lists: list[list[int]], cache: dict[int, np.ndarray], list_id: int) -> np.ndarray:
+        rows = cache.get(list_id)
+        if rows is None:
+            rows = cache[list_id] = np.asarray(lists[list_id], dtype=np.int64)
+        return rows
+
+    def _exact(self, query: np.ndarray, k: int) -> list[tuple[str, float]]:
+        if self.metric == "ip":
+            return self.matrix.search(query, k)
+        live = self._live_rows()
+        scores = self._scores(
+            self.matrix.rows()[live].astype(np.float32), query, self.sq_norms[live]
+        )
+        return self._top_k(live, scores, k)
+
+    def _top_k(self, rows: np.ndarray, scores: np.ndarray, k: int) -> list[tuple[str, float]]:
+        k = min(k, len(rows))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.matrix.ids[rows[i]], float(scores[i])) for i in top]
+
+    def search(self, query: np.ndarray, k: int = 10, nprobe: Optional[int] = None) -> list[tuple[str, float]]:
+        """
+        Approximate top-k (ID, score) pairs, best first.
+
+        Args:
+            query: Query vector
+            k: Results to return
+            nprobe: Lists to probe (default self.nprobe; ≥ nlist is exact)
+        """
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        if k <= 0 or len(self.matrix) == 0:
+            return []
+        with self.matrix.lock:
+            # One consistent set of centroids/lists (training swaps them)
+            centroids, lists, cache = self.centroids, self.lists, self._list_arrays
+            data, sq_norms = self.matrix.rows(), self.sq_norms
+        if centroids is None:
+            return self._exact(query, k)
+
+        nprobe = min(nprobe or self.nprobe, len(centroids))
+        centroid_scores = self._scores(
+            centroids, query,
+            np.einsum("ij,ij->i", centroids, centroids) if self.metric == "l2" else None,
+        )
+        probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        rows = np.concatenate([self._list_array(lists, cache, int(list_id)) for list_id in probe])
+        if len(rows) == 0:
+            return []
+        vectors = data[rows].astype(np.float32)
+        scores = self._scores(vectors, query, sq_norms[rows] if self.metric == "l2" else None)
+        return self._top_k(rows, scores, k)
+
+    def get_stats(self) -> dict:
+        sizes = [len(rows) for rows in self.lists]
+        return {
+            "vectors": len(self.matrix),
+            "metric": self.metric,
+            "trained": self.centroids is not None,
+            "nlist": len(self.lists),
+            "nprobe": self.nprobe,
+            "trained_size": self.trained_size,
+            "max_list": max(sizes, default=0),
+            "tombstones": len(self.matrix.free_rows),
+            "trainings": self.trainings,
+            "training": self._trainer is not None and self._trainer.is_alive(),
+            "train_seconds": round(self.train_seconds, 3),
+        }
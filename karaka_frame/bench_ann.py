@@ -0,0 +1,121 @@
+"""
+ANN Benchmark for Kāraka Frame Graph POC
+Measures recall@10 and single-query QPS of the IVF index against exact
+search, across nprobe settings, on clustered synthetic embeddings.
+
+Usage:
+    python bench_ann.py                    # 100k and 1M vectors, dim 384
+    python bench_ann.py 200000             # custom vector count(s)
+    python bench_ann.py 100000 --dim 2048  # temp_colab embedding size
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from ann_index import IVFIndex
+from vector_matrix import VectorMatrix
+
+K = 10
+QUERIES = 500
+EXACT_QUERIES = 20
+NPROBES = [1, 4, 8, 16, 32, 64]
+ADD_BATCH = 10000
+
+
+def make_vectors(n: int, dim: int, rng: np.random.Generator) -> np.ndarray:
+    """Normalized Gaussian-mixture vectors (embeddings cluster by topic)."""
+    centers = rng.standard_normal((max(16, n // 200), dim), dtype=np.float32)
+    vectors = np.empty((n, dim), dtype=np.float16)
+    for start in range(0, n, ADD_BATCH):
+        end = min(start + ADD_BATCH, n)
+        batch = centers[rng.integers(0, len(centers), end - start)]
+        batch += 1.0 * rng.standard_normal(batch.shape, dtype=np.float32)
+        batch /= np.linalg.norm(batch, axis=1, keepdims=True)
+        vectors[start:end] = batch
+    return vectors
+
+
+def ground_truth(matrix: VectorMatrix, queries: np.ndarray) -> list[set[str]]:
+    """Exact top-K per query, scanning the matrix once for all queries."""
+    rows = matrix.rows()
+    best_scores = np.full((len(queries), K), -np.inf, dtype=np.float32)
+    best_rows = np.zeros((len(queries), K), dtype=np.int64)
+    for start in range(0, len(rows), 65536):
+        scores = queries @ rows[start:start + 65536].astype(np.float32).T
+        all_scores = np.concatenate([best_scores, scores], axis=1)
+        all_rows = np.concatenate([best_rows, np.arange(start, start + scores.shape[1])[None, :].repeat(len(queries), 0)], axis=1)
+        top = np.argpartition(-all_scores, K - 1, axis=1)[:, :K]
+        best_scores = np.take_along_axis(all_scores, top, axis=1)
+        best_rows = np.take_along_axis(all_rows, top, axis=1)
+    return [{matrix.ids[row] for row in query_rows} for query_rows in best_rows]
+
+
+def run_benchmark(n: int, dim: int):
+    print(f"🚀 ANN benchmark: {n:,} vectors × {dim} dims, {QUERIES} queries, recall@{K}\n")
+    rng = np.random.default_rng(7)
+    vectors = make_vectors(n + QUERIES, dim, rng)
+    # Queries are held-out draws from the same mixture
+    queries = vectors[n:].astype(np.float32)
+    vectors = vectors[:n]
+    ids = [f"F{i}" for i in range(n)]
+
+    matrix = VectorMatrix(dim, initial_capacity=n)
+    index = IVFIndex(matrix, metric="ip")
+    t0 = time.perf_counter()
+    slowest_add = 0.0
+    for start in range(0, n, ADD_BATCH):
+        t_add = time.perf_counter()
+        index.add(ids[start:start + ADD_BATCH], vectors[start:start + ADD_BATCH])
+        slowest_add = max(slowest_add, time.perf_counter() - t_add)
+    # Training runs in the background; queries meanwhile use the old centroids
+    t_wait = time.perf_counter()
+    index.wait()
+    build_time = time.perf_counter() - t0
+    stats = index.get_stats()
+    print(f"🏗️ Incremental build: {build_time:.1f}s "
+          f"({stats['trainings']} trainings, {stats['train_seconds']:.1f}s k-means, "
+          f"{time.perf_counter() - t_wait:.1f}s waited for the last one), "
+          f"nlist={stats['nlist']}, largest list={stats['max_list']:,}")
+    print(f"⏱️ Slowest add of {ADD_BATCH:,} vectors: {slowest_add * 1000:.0f} ms\n")
+
+    truth = ground_truth(matrix, queries)
+
+    t0 = time.perf_counter()
+    for query in queries[:EXACT_QUERIES]:
+        matrix.search(query, K)
+    exact_qps = EXACT_QUERIES / (time.perf_counter() - t0)
+
+    print(f"| Search | nprobe | Recall@{K} | QPS | Speedup |")
+    print(f"|---|---|---|---|---|")
+    print(f"| exact (float16 scan) | - | 1.000 | {exact_qps:,.1f} | 1.0× |")
+    for nprobe in NPROBES:
+        hits = 0
+        t0 = time.perf_counter()
+        results = [index.search(query, K, nprobe=nprobe) for query in queries]
+        qps = QUERIES / (time.perf_counter() - t0)
+        for found, expected in zip(results, truth):
+            hits += len({fid for fid, _ in found} & expected)
+        print(f"| IVF | {nprobe} | {hits / (QUERIES * K):.3f} | {qps:,.1f} | {qps / exact_qps:,.1f}× |")
+
+    # Tombstones: delete 10% and confirm none are returned
+    for fid in ids[::10]:
+        index.remove(fid)
+    leaked = sum(
+        1 for query in queries[:50] for fid, _ in index.search(query, K)
+        if int(fid[1:]) % 10 == 0
+    )
+    print(f"\n🪦 Deleted {len(ids[::10]):,} vectors; tombstoned results returned: {leaked}\n")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    dim = 384
+    if "--dim" in args:
+        i = args.index("--dim")
+        dim = int(args[i + 1])
+        del args[i:i + 2]
+    counts = [int(a) for a in args] or [100_000, 1_000_000]
+    for count in counts:
+        run_benchmark(count, dim)
@@ -0,0 +1,113 @@
+"""
+Memory Benchmark for Kāraka Frames
+Measures bytes per frame for the compact slot-based Frame against the
+previous dataclass layout, at corpus scale (default 1M frames).
+
+Usage:
+    python bench_frame_memory.py            # 1,000,000 frames
+    python bench_frame_memory.py 200000     # custom frame count
+"""
+
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional
+
+from frame_extractor import Frame, SENTENCES, SYMBOLS
+
+
+@dataclass
+class LegacyFrame:
+    """The pre-compaction Frame layout (regular dataclass, one str per role)."""
+    frame_id: str
+    sentence_id: int
+    sentence_text: str
+    kriya: str
+    kriya_surface: str
+    karta: Optional[str] = None
+    karma: Optional[str] = None
+    karana: Optional[str] = None
+    sampradana: Optional[str] = None
+    apadana: Optional[str] = None
+    locus_time: Optional[str] = None
+    locus_space: Optional[str] = None
+    locus_topic: Optional[str] = None
+    causal_links: Optional[list[dict]] = None
+
+
+# Realistic vocabulary: role fillers repeat heavily across a corpus
+KRIYAS = ["fund", "conduct", "lead", "publish", "discover", "analyze", "approve", "present"]
+AGENTS = [f"Dr. Researcher {i}" for i in range(5000)]
+OBJECTS = [f"the study number {i}" for i in range(20000)]
+PLACES = ["Copenhagen", "Mumbai", "Stanford University", "Geneva", "Berlin", "IIT Delhi"]
+YEARS = [str(y) for y in range(1990, 2030)]
+SENTENCE_FRAMES = [1, 1, 1, 2, 2, 3]
+
+
+def make_rows(n: int, seed: int = 7) -> list[dict]:
+    """Generate n synthetic frame payloads (decoded once, shared by both runs)."""
+    rng = random.Random(seed)
+    rows = []
+    sentence_id, frames_left = -1, 0
+    for i in range(n):
+        kriya = rng.choice(KRIYAS)
+        if frames_left == 0:
+            # A sentence yields one to three event frames
+            sentence_id, frames_left = sentence_id + 1, rng.choice(SENTENCE_FRAMES)
+        frames_left -= 1
+        rows.append({
+            "frame_id": f"F{i}",
+            "sentence_id": sentence_id,
+            "sentence_text": f"Sentence {sentence_id} about a research event.",
+            "kriya": kriya,
+            "kriya_surface": kriya + "ed",
+            "karta": rng.choice(AGENTS) if rng.random() < 0.8 else None,
+            "karma": rng.choice(OBJECTS) if rng.random() < 0.9 else None,
+            "locus_time": rng.choice(YEARS) if rng.random() < 0.5 else None,
+            "locus_space": rng.choice(PLACES) if rng.random() < 0.4 else None,
+        })
+    return rows
+
+
+def _copy(value):
+    """Force a fresh string object, as json.loads would produce per record."""
+    return "".join(value) if isinstance(value, str) else value
+
+
+def measure(cls, rows: list[dict]) -> tuple[float, float]:
+    """Return (bytes per frame, build seconds) for constructing all rows as cls."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    frames = [cls(**{k: _copy(v) for k, v in row.items()}) for row in rows]
+    elapsed = time.perf_counter() - t0
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    per_frame = (after - before) / len(frames)
+    del frames
+    return per_frame, elapsed
+
+
+def run_benchmark(n: int):
+    print(f"🚀 Frame memory benchmark: {n:,} frames\n")
+    rows = make_rows(n)
+
+    legacy_bytes, legacy_time = measure(LegacyFrame, rows)
+    compact_bytes, compact_time = measure(Frame, rows)
+
+    print(f"| Layout | Bytes/frame | Total (MB) | Build time |")
+    print(f"|---|---|---|---|")
+    print(f"| dataclass (legacy) | {legacy_bytes:,.0f} | {legacy_bytes * n / 1e6:,.1f} | {legacy_time:.2f}s |")
+    print(f"| slots + symbol IDs | {compact_bytes:,.0f} | {compact_bytes * n / 1e6:,.1f} | {compact_time:.2f}s |")
+    print(f"\n📉 Reduction: {(1 - compact_bytes / legacy_bytes) * 100:.1f}%")
+    print(f"🔤 Interned role symbols: {len(SYMBOLS):,}, sentences: {len(SENTENCES):,}")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    run_benchmark(count)
@@ -0,0 +1,135 @@
+"""
+Retraction Benchmark for Kāraka Frame Graph POC
+Measures retract_identity cascade latency on deep derivation chains: the
+reverse argument index against the json_each scan over all derive frames
+proposed in research-proposal/executable-storage-schema.md, in a store
+padded with unrelated observations and derivations.
+
+Chain of depth D:  id ≡ [a, b]
+                   d1 = derive[c1, o1, id], dk = derive[ck, c(k-1), ok]
+Retracting id invalidates d1..dD and c1..cD (2D + 1 frames).
+
+Usage:
+    python bench_retraction.py             # 100k background frames, depths 10/100/1000
+    python bench_retraction.py 200000      # custom background size
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from frame_extractor import Frame
+from frame_store import FrameStore, DERIVE_SYMBOL, IDENTITY_SYMBOL
+from sqlite_frame_store import SQLiteFrameStore
+
+DEPTHS = [10, 100, 1000]
+VERBS = ["give", "eat", "fund", "build", "visit", "sell", "write", "teach"]
+
+# Cascade with the spec's queries: every step scans the derive frames
+_SCAN_DEPENDENTS = """
+SELECT id, arguments FROM frame
+WHERE symbol = 'derive' AND active
+  AND EXISTS (SELECT 1 FROM json_each(frame.arguments) WHERE value = ?)
+"""
+_SCAN_SUPPORTS = """
+SELECT COUNT(*) FROM frame
+WHERE symbol = 'derive' AND active AND json_extract(arguments, '$[0]') = ?
+"""
+
+
+def frame(frame_id: str, symbol: str, *arguments: str) -> Frame:
+    roles = dict(zip(["karta", "karma", "karana", "sampradana"], arguments))
+    return Frame(frame_id=frame_id, sentence_id=0, sentence_text="", kriya=symbol, kriya_surface=symbol, **roles)
+
+
+def build_corpus(background: int) -> list[Frame]:
+    """Observations and shallow derivations, plus one chain per depth."""
+    rng = random.Random(3)
+    frames = [
+        frame(f"o{i}", rng.choice(VERBS), f"person_{rng.randrange(5000)}", f"thing_{rng.randrange(5000)}")
+        for i in range(background)
+    ]
+    frames += [
+        frame(f"bd{i}", DERIVE_SYMBOL, f"label_{i}", f"o{i}", f"o{(i * 7) % background}")
+        for i in range(background // 10)
+    ]
+    for depth in DEPTHS:
+        frames.append(frame(f"id_{depth}", IDENTITY_SYMBOL, f"a_{depth}", f"b_{depth}"))
+        previous = f"id_{depth}"
+        for k in range(1, depth + 1):
+            conclusion = f"c{depth}_{k}"
+            frames.append(frame(conclusion, "projection", f"label_{depth}_{k}"))
+            evidence = [f"o{k}", previous] if k == 1 else [previous, f"o{k}"]
+            frames.append(frame(f"d{depth}_{k}", DERIVE_SYMBOL, conclusion, *evidence))
+            previous = conclusion
+    return frames
+
+
+def scan_cascade(conn, root: str) -> int:
+    """The spec's json_each cascade (same closure rules), inside the caller's transaction."""
+    retracted, queue = {root}, [root]
+    conn.execute("UPDATE frame SET active = FALSE WHERE id = ?", (root,))
+    while queue:
+        frame_id = queue.pop()
+        for dependent_id, arguments in conn.execute(_SCAN_DEPENDENTS, (frame_id,)).fetchall():
+            if dependent_id in retracted:
+                continue
+            retracted.add(dependent_id)
+            conn.execute("UPDATE frame SET active = FALSE WHERE id = ?", (dependent_id,))
+            conclusion = json.loads(arguments)[0]
+            exists = conn.execute("SELECT 1 FROM frame WHERE id = ? AND active", (conclusion,)).fetchone()
+            if exists and not conn.execute(_SCAN_SUPPORTS, (conclusion,)).fetchone()[0]:
+                retracted.add(conclusion)
+                conn.execute("UPDATE frame SET active = FALSE WHERE id = ?", (conclusion,))
+                queue.append(conclusion)
+            queue.append(dependent_id)
+    return len(retracted)
+
+
+def run_benchmark(background: int):
+    frames = build_corpus(background)
+    print(f"🚀 Retraction benchmark: {len(frames):,} frames "
+          f"({background:,} observations, {background // 10:,} background derivations)\n")
+
+    memory = FrameStore(None)
+    memory.add_frames(frames)
+
+    directory = tempfile.mkdtemp()
+    sqlite = SQLiteFrameStore(os.path.join(directory, "bench.db"))
+    sqlite.add_frames(frames)
+
+    print("| Depth | Frames retracted | Memory (index) | SQLite (index) | SQLite json_each scan | Speedup vs scan |")
+    print("|---|---|---|---|---|---|")
+    for depth in DEPTHS:
+        identity = f"id_{depth}"
+
+        # Baseline first, rolled back so the indexed run sees the same data
+        conn = sqlite._writer
+        conn.execute("BEGIN IMMEDIATE")
+        t0 = time.perf_counter()
+        scanned = scan_cascade(conn, identity)
+        scan_ms = (time.perf_counter() - t0) * 1000
+        conn.execute("ROLLBACK")
+
+        t0 = time.perf_counter()
+        memory.retract_identity(identity, reason="benchmark")
+        memory_ms = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        sqlite.retract_identity(identity, reason="benchmark")
+        sqlite_ms = (time.perf_counter() - t0) * 1000
+
+        retracted = len(memory.retracted) - sum(2 * d + 1 for d in DEPTHS if d < depth)
+        assert retracted == scanned == 2 * depth + 1, (retracted, scanned)
+        print(f"| {depth:,} | {retracted:,} | {memory_ms:,.1f} ms | {sqlite_ms:,.1f} ms | "
+              f"{scan_ms:,.1f} ms | {scan_ms / sqlite_ms:,.0f}× |")
+
+    sqlite.close()
+    print()
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    run_benchmark(count)
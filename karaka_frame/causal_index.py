@@ -0,0 +1,359 @@
+"""
+Causal Index for Kāraka Frame Graph POC.
+Adjacency of the causal links frames carry (cause_frame → effect_frame),
+for multi-hop expansion without rescanning frames:
+
+    frame → edges where it is the cause     (out)
+    frame → edges where it is the effect    (in)
+    owner frame → edges its links assert
+
+Connected components of the causal graph are kept incrementally in an
+EquivalenceClasses union-find (one identity per edge), so searches that
+follow links either way stop at once between different components.
+
+Directed reachability is a transitive closure per component: each frame
+is labelled with the frames its links lead to, so "does A lead to B" is
+a set lookup. A new link A → B extends the labels of the component's
+frames that reach A with B's label (causal links may form cycles, so
+there is no topological order to relabel in). Removing a link recomputes
+the labels of its old component. Components above CAUSAL_LABEL_MAX frames
+keep no labels (their closure would cost quadratic memory), and reaches()
+walks them instead.
+
+Expansion is a breadth-first walk bounded by hop count, fan-out per frame
+and a total, so it costs the frames it returns.
+
+Edges are stamped with the version that added and removed them, so a
+snapshot at an older version expands over the links it sees. Removed
+edges are purged once no open reader can see them.
+"""
+
+import os
+import sys
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+from entity_equivalence import EquivalenceClasses
+
+if TYPE_CHECKING:
+    # Type hints only: frame_extractor pulls in the LLM client, and
+    # temp_colab.py imports this module on its own
+    from frame_extractor import Frame
+
+# Multi-hop bounds of qa_engine.search_frames' causal expansion
+CAUSAL_HOPS = int(os.getenv("CAUSAL_HOPS", "3"))
+CAUSAL_FAN_OUT = int(os.getenv("CAUSAL_FAN_OUT", "8"))
+CAUSAL_EXPAND_LIMIT = int(os.getenv("CAUSAL_EXPAND_LIMIT", "50"))
+# Largest causal component (frames) whose reachability labels are kept
+CAUSAL_LABEL_MAX = int(os.getenv("CAUSAL_LABEL_MAX", "256"))
+
+_NEVER = 2 ** 63 - 1
+# `labels_changed` while the labels are being updated: readers walk instead
+_UPDATING = sys.maxsize
+_NOTHING: frozenset = frozenset()
+
+
+def frame_links(frame: "Frame") -> list[tuple[str, str, Optional[str]]]:
+    """(cause, effect, causal_type) of a frame's complete causal links."""
+    return [
+        (link["cause_frame"], link["effect_frame"], link.get("causal_type"))
+        for link in frame.causal_links or ()
+        if link.get("cause_frame") and link.get("effect_frame")
+    ]
+
+
+class CausalIndex:
+    """Versioned causal adjacency with incremental components and reachability labels."""
+
+    def __init__(
+        self,
+        horizon: Optional[Callable[[], Optional[int]]] = None,
+        purge_after: int = 4096,
+        label_max: int = CAUSAL_LABEL_MAX,
+    ):
+        """
+        Args:
+            horizon: Oldest version an open reader may still read (None: no
+                open readers); removed edges older than it are purged
+            purge_after: Removed edges accumulated before a purge is tried
+            label_max: Largest component whose frames are labelled
+        """
+        self._edges: dict[int, tuple[str, str, Optional[str]]] = {}  # edge -> (cause, effect, type)
+        self._added: dict[int, int] = {}           # edge -> version added
+        self._removed: dict[int, int] = {}         # edge -> version removed
+        self._out: dict[str, list[int]] = {}       # cause -> edges
+        self._in: dict[str, list[int]] = {}        # effect -> edges
+        self._owned: dict[str, list[int]] = {}     # owner -> live edges
+        self._next_edge = 0
+        self.components = EquivalenceClasses()     # live edges only
+        self._reach: dict[str, frozenset] = {}     # frame -> frames its links lead to
+        self.label_max = label_max
+        # Version of the last label change (see reaches)
+        self.labels_changed = 0
+        self.built = 0                             # Version build() indexed
+        self.horizon = horizon
+        self._purge_at = purge_after
+        self.purge_after = purge_after
+        self.purged = 0
+
+    def __contains__(self, owner: str) -> bool:
+        return owner in self._owned
+
+    def __len__(self) -> int:
+        return len(self._edges) - len(self._removed)
+
+    # ------------------------------------------------------------------ writes
+
+    def build(self, frames: Iterable["Frame"], version: int = 0) -> None:
+        """
+        Index the links of the frames visible at a version. Only readers at
+        that version or later can use the index (older ones never saw its
+        changes).
+        """
+        self.built = version
+        for frame in frames:
+            self.add(frame, 0)
+
+    def invalidate(self) -> None:
+        """Hide components and labels from readers until the next change."""
+        self.components.invalidate()
+        self.labels_changed = _UPDATING
+
+    def add(self, frame: "Frame", version: int) -> None:
+        """Index a frame's links at a version (replaces its previous links)."""
+        self.add_links(frame.frame_id, frame_links(frame), version)
+
+    def add_links(self, owner: str, links: Iterable[tuple[str, str, Optional[str]]], version: int = 0) -> None:
+        """
+        Assert causal links on behalf of an owner (a frame, or a graph edge).
+
+        Args:
+            owner: ID the links are withdrawn by
+            links: (cause, effect, causal_type) triples
+            version: Version the links are committed at
+        """
+        self.remove(owner, version)
+        edges = []
+        for cause, effect, relation in links:
+            edge = self._next_edge
+            self._next_edge += 1
+            self.labels_changed = _UPDATING
+            self._edges[edge] = (cause, effect, relation)
+            self._added[edge] = version
+            self._out.setdefault(cause, []).append(edge)
+            self._in.setdefault(effect, []).append(edge)
+            self.components.add(f"{owner}#{edge}", [cause, effect], version)
+            self._label_link(cause, effect)
+            self.labels_changed = version
+            edges.append(edge)
+        if edges:
+            self._owned[owner] = edges
+
+    def remove(self, owner: str, version: int = 0) -> bool:
+        """Retire an owner's links at a version. False if it has none."""
+        edges = self._owned.pop(owner, None)
+        if edges is None:
+            return False
+        self.labels_changed = _UPDATING
+        affected = set()
+        for edge in edges:
+            affected.update(self.components.members(self._edges[edge][0]))
+            self._removed[edge] = version
+            self.components.remove(f"{owner}#{edge}", version)
+        self._relabel(affected)
+        self.labels_changed = version
+        if len(self._removed) >= self._purge_at:
+            self.purge()
+            # Edges still held by open readers wait for the next round
+            self._purge_at = max(self.purge_after, 2 * len(self._removed))
+        return True
+
+    def purge(self) -> int:
+        """Drop removed edges no open reader can see. Returns how many."""
+        horizon = self.horizon() if self.horizon else None
+        dead = {
+            edge for edge, removed in list(self._removed.items())
+            if horizon is None or removed <= horizon
+        }
+        if not dead:
+            return 0
+        for adjacency in (self._out, self._in):
+            for frame_id, edges in list(adjacency.items()):
+                if any(edge in dead for edge in edges):
+                    kept = [edge for edge in edges if edge not in dead]
+                    if kept:
+                        adjacency[frame_id] = kept  # Replaced, readers keep the old list
+                    else:
+                        del adjacency[frame_id]
+        for edge in dead:
+            del self._edges[edge], self._added[edge], self._removed[edge]
+        self.purged += len(dead)
+        return len(dead)
+
+    def _label_link(self, cause: str, effect: str) -> None:
+        """Extend the labels of the frames that reach cause by a new link cause → effect."""
+        members = self.components.members(cause)
+        if len(members) > self.label_max:
+            for frame_id in members:
+                self._reach.pop(frame_id, None)
+            return
+        gained = self._reach.get(effect, _NOTHING) | {effect}
+        for frame_id in members:
+            # Unlabelled members had no links before this one
+            label = self._reach.get(frame_id, _NOTHING)
+            if frame_id == cause or cause in label:
+                self._reach[frame_id] = label | gained
+            elif frame_id not in self._reach:
+                self._reach[frame_id] = label
+
+    def _relabel(self, frame_ids: set[str]) -> None:
+        """Recompute the labels of frames whose component lost links."""
+        for frame_id in frame_ids:
+            self._reach.pop(frame_id, None)
+        done = set()
+        for frame_id in frame_ids:
+            if frame_id in done or not self._linked(frame_id):
+                continue
+            members = self.components.members(frame_id)
+            done.update(members)
+            if len(members) <= self.label_max:
+                for member in members:
+                    self._reach[member] = frozenset(self._walk(member))
+
+    def _linked(self, frame_id: str) -> bool:
+        """Whether a frame still has live links."""
+        removed = self._removed
+        return any(edge not in removed for edge in self._out.get(frame_id, ())) or any(
+            edge not in removed for edge in self._in.get(frame_id, ())
+        )
+
+    # ------------------------------------------------------------------- reads
+
+    def neighbours(
+        self,
+        frame_id: str,
+        version: int = _NEVER - 1,
+        direction: str = "both",
+        relations: Optional[set] = None,
+    ) -> list[tuple[str, Optional[str], str]]:
+        """
+        Frames one causal link away, as seen at a version.
+
+        Args:
+            frame_id: Frame to start from
+            version: Reader version
+            direction: "out" (effects), "in" (causes) or "both"
+            relations: causal_type values to follow (None: all)
+
+        Returns:
+            [(frame_id, causal_type, "out" | "in")], in link order
+        """
+        found = []
+        added, removed, edges = self._added, self._removed, self._edges
+        sides = (("out", self._out, 1), ("in", self._in, 0))
+        for side, adjacency, other in sides:
+            if direction not in ("both", side):
+                continue
+            for edge in adjacency.get(frame_id, ()):
+                if added.get(edge, _NEVER) > version or removed.get(edge, _NEVER) <= version:
+                    continue
+                link = edges.get(edge)
+                if link is None or (relations is not None and link[2] not in relations):
+                    continue
+                found.append((link[other], link[2], side))
+        return found
+
+    def expand(
+        self,
+        seeds: Iterable[str],
+        version: int = _NEVER - 1,
+        hops: int = CAUSAL_HOPS,
+        fan_out: int = CAUSAL_FAN_OUT,
+        limit: Optional[int] = CAUSAL_EXPAND_LIMIT,
+        direction: str = "both",
+        relations: Optional[set] = None,
+    ) -> dict[str, int]:
+        """
+        Frames within a number of causal hops of the seeds.
+
+        Args:
+            seeds: Frame IDs to start from
+            version: Reader version
+            hops: Maximum links followed from a seed
+            fan_out: Maximum new frames taken from one frame's links
+            limit: Maximum frames returned besides the seeds (None: no limit)
+            direction: "out" (effects), "in" (causes) or "both"
+            relations: causal_type values to follow (None: all)
+
+        Returns:
+            frame_id → hops from the nearest seed, seeds (0) first, in
+            breadth-first order
+        """
+        reached = {seed: 0 for seed in seeds}
+        queue = deque(reached)
+        budget = _NEVER if limit is None else limit
+        while queue and budget > 0:
+            frame_id = queue.popleft()
+            depth = reached[frame_id]
+            if depth >= hops:
+                continue
+            taken = 0
+            for other, _, _ in self.neighbours(frame_id, version, direction, relations):
+                if other in reached:
+                    continue
+                reached[other] = depth + 1
+                queue.append(other)
+                taken += 1
+                budget -= 1
+                if taken >= fan_out or budget <= 0:
+                    break
+        return reached
+
+    def _walk(self, frame_id: str, version: int = _NEVER - 1) -> set[str]:
+        """Frames a frame's links lead to (one or more links), as seen at a version."""
+        reached: set[str] = set()
+        stack = [frame_id]
+        while stack:
+            for other, _, _ in self.neighbours(stack.pop(), version, "out"):
+                if other not in reached:
+                    reached.add(other)
+                    stack.append(other)
+        return reached
+
+    def reaches(self, cause: str, effect: str, version: int = _NEVER - 1) -> bool:
+        """
+        Whether a chain of one or more links leads from cause to effect, as
+        seen at a version. A label lookup, unless the labels are newer than
+        the version or the component is too large to label.
+        """
+        changed = self.labels_changed
+        if changed <= version:
+            label = self._reach.get(cause)
+            if label is not None and self.labels_changed == changed:
+                return effect in label
+        return effect in self._walk(cause, version)
+
+    def connected(self, a: str, b: str, version: int = _NEVER - 1) -> Optional[bool]:
+        """
+        Whether two frames are in the same causal component (ignoring link
+        direction). None when the components are newer than the version.
+        """
+        components = self.components
+        changed = components.changed
+        if changed > version:
+            return None
+        same = components.same(a, b)
+        return same if components.changed == changed else None
+
+    def get_stats(self) -> dict:
+        components = self.components.get_stats()
+        return {
+            "links": len(self),
+            "frames": components["entities"],
+            "components": components["classes"],
+            "largest_component": components["largest_class"],
+            "labelled_frames": len(self._reach),
+            "label_entries": sum(len(label) for label in list(self._reach.values())),
+            "removed_links": len(self._removed),
+            "purged_links": self.purged,
+        }
@@ -0,0 +1,322 @@
+"""
+Columnar Snapshot for Kāraka Frame Graph POC.
+Single-file frame snapshot that is memory-mapped at startup: NumPy columns
+over a shared UTF-8 string table, with the FrameStore lookup indexes
+serialized alongside, so opening a store parses and indexes nothing.
+
+    b"KFCOLS01" | u64 header length | JSON header | 64-byte aligned arrays
+
+    str_offsets/str_data   string table (string ID → UTF-8 bytes)
+    frame columns          frame_id, sentence_id, sentence_text, kriya,
+                           kriya_surface, roles (n × 8), causal_links (JSON);
+                           string IDs, -1 = None
+    id_order               rows sorted by frame_id (binary search)
+    entity_* / kriya_*     sorted key IDs → CSR posting lists of rows
+    role<i>_*              per role: value postings, and trigram → value
+                           postings (same semantics as TrigramIndex)
+"""
+
+import json
+import struct
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Optional
+
+import numpy as np
+
+from frame_extractor import Frame, ROLE_FIELDS
+from trigram_index import trigrams
+
+MAGIC = b"KFCOLS01"
+_ALIGN = 64
+
+
+class _StringTable:
+    """Builder-side string → ID table."""
+
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+        self.strings: list[str] = []
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        sid = self.ids.get(value)
+        if sid is None:
+            sid = self.ids[value] = len(self.strings)
+            self.strings.append(value)
+        return sid
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        encoded = [s.encode("utf-8") for s in self.strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(b) for b in encoded], dtype=np.int64)
+        return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def _postings(table: _StringTable, mapping: dict[str, list[int]]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """CSR posting lists: (sorted key string IDs, offsets, values)."""
+    keys = sorted(mapping)
+    offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(mapping[k]) for k in keys], dtype=np.int64)
+    values = np.fromiter(
+        (v for k in keys for v in mapping[k]), dtype=np.int32, count=int(offsets[-1])
+    )
+    return np.array([table.add(k) for k in keys], dtype=np.int32), offsets, values
+
+
+def write_snapshot(
+    f: BinaryIO,
+    frames: Iterable[Frame],
+    version: int = 0,
+    retracted: Iterable[Frame] = (),
+) -> int:
+    """
+    Write frames as a columnar snapshot.
+
+    Args:
+        f: Binary file opened for writing
+        frames: Frames to store (row order is preserved)
+        version: Store version the snapshot captures
+        retracted: Inactive (retracted) frames, kept in the header outside
+            the columns and indexes
+
+    Returns:
+        Number of frames written
+    """
+    table = _StringTable()
+    frame_ids, sentence_ids, sentence_texts, kriyas, surfaces, causal = [], [], [], [], [], []
+    roles: list[list[int]] = []
+    entities: dict[str, list[int]] = {}
+    kriya_rows: dict[str, list[int]] = {}
+    role_values: list[dict[str, list[int]]] = [{} for _ in ROLE_FIELDS]
+
+    for row, frame in enumerate(frames):
+        frame_ids.append(table.add(frame.frame_id))
+        sentence_ids.append(frame.sentence_id)
+        sentence_texts.append(table.add(frame.sentence_text))
+        kriyas.append(table.add(frame.kriya))
+        surfaces.append(table.add(frame.kriya_surface))
+        causal.append(table.add(
+            json.dumps(frame.causal_links, ensure_ascii=False)
+            if frame.causal_links is not None else None
+        ))
+        roles.append([table.add(getattr(frame, field)) for field in ROLE_FIELDS])
+        kriya_rows.setdefault(frame.kriya.lower().strip(), []).append(row)
+        for field, value in frame.role_items():
+            entity_rows = entities.setdefault(value.lower().strip(), [])
+            if not entity_rows or entity_rows[-1] != row:
+                entity_rows.append(row)
+            role_values[ROLE_FIELDS.index(field)].setdefault(value.lower(), []).append(row)
+
+    n = len(frame_ids)
+    arrays: dict[str, np.ndarray] = {
+        "frame_id": np.array(frame_ids, dtype=np.int32),
+        "sentence_id": np.array(sentence_ids, dtype=np.int64),
+        "sentence_text": np.array(sentence_texts, dtype=np.int32),
+        "kriya": np.array(kriyas, dtype=np.int32),
+        "kriya_surface": np.array(surfaces, dtype=np.int32),
+        "roles": np.array(roles, dtype=np.int32).reshape(n, len(ROLE_FIELDS)),
+        "causal_links": np.array(causal, dtype=np.int32),
+    }
+    arrays["id_order"] = np.array(
+        sorted(range(n), key=lambda r: table.strings[frame_ids[r]]), dtype=np.int32
+    )
+    arrays["entity_keys"], arrays["entity_offsets"], arrays["entity_rows"] = _postings(table, entities)
+    arrays["kriya_keys"], arrays["kriya_offsets"], arrays["kriya_rows"] = _postings(table, kriya_rows)
+
+    for i, values in enumerate(role_values):
+        keys, offsets, rows = _postings(table, values)
+        arrays[f"role{i}_values"], arrays[f"role{i}_value_offsets"], arrays[f"role{i}_value_rows"] = keys, offsets, rows
+        grams: dict[str, list[int]] = {}
+        for value_index, value in enumerate(sorted(values)):
+            for gram in trigrams(value):
+                grams.setdefault(gram, []).append(value_index)
+        gram_keys = sorted(grams)
+        gram_offsets = np.zeros(len(gram_keys) + 1, dtype=np.int64)
+        gram_offsets[1:] = np.cumsum([len(grams[g]) for g in gram_keys], dtype=np.int64)
+        arrays[f"role{i}_grams"] = np.array(gram_keys, dtype="<U3")
+        arrays[f"role{i}_gram_offsets"] = gram_offsets
+        arrays[f"role{i}_gram_values"] = np.fromiter(
+            (v for g in gram_keys for v in grams[g]), dtype=np.int32, count=int(gram_offsets[-1])
+        )
+
+    # String table last: postings above add their keys to it
+    arrays["str_offsets"], arrays["str_data"] = table.arrays()
+
+    # Header lists array offsets relative to the aligned data start
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        layout[name] = [array.dtype.str, list(array.shape), offset]
+        offset += -(-array.nbytes // _ALIGN) * _ALIGN
+    header = json.dumps({
+        "frames": n,
+        "version": version,
+        "retracted": [frame.to_dict() for frame in retracted],
+        "arrays": layout,
+    }).encode("utf-8")
+    prefix = len(MAGIC) + 8 + len(header)
+    data_start = -(-prefix // _ALIGN) * _ALIGN
+
+    f.write(MAGIC)
+    f.write(struct.pack("<Q", len(header)))
+    f.write(header)
+    f.write(b"\0" * (data_start - prefix))
+    for name, array in arrays.items():
+        data = np.ascontiguousarray(array).tobytes()
+        f.write(data)
+        f.write(b"\0" * (-(-len(data) // _ALIGN) * _ALIGN - len(data)))
+    return n
+
+
+class ColumnarSnapshot:
+    """Read-only, memory-mapped view of a snapshot written by write_snapshot."""
+
+    def __init__(self, path: Path):
+        """
+        Map a snapshot file. Only the header is read; columns and indexes
+        are paged in on access.
+
+        Args:
+            path: Snapshot file
+        """
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path.name} is not a columnar frame snapshot")
+            (header_len,) = struct.unpack("<Q", f.read(8))
+            header = json.loads(f.read(header_len))
+        data_start = -(-(len(MAGIC) + 8 + header_len) // _ALIGN) * _ALIGN
+
+        self.count: int = header["frames"]
+        self.version: int = header.get("version", 0)
+        self.retracted: list[dict] = header.get("retracted", [])
+        self._mm = np.memmap(self.path, dtype=np.uint8, mode="r")
+        self.arrays: dict[str, np.ndarray] = {}
+        for name, (dtype, shape, offset) in header["arrays"].items():
+            dtype = np.dtype(dtype)
+            size = int(np.prod(shape))
+            if size == 0:
+                self.arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                self.arrays[name] = np.frombuffer(
+                    self._mm, dtype=dtype, count=size, offset=data_start + offset
+                ).reshape(shape)
+
+        a = self.arrays
+        self._str_offsets, self._str_data = a["str_offsets"], a["str_data"]
+        self._frame_id = a["frame_id"]
+
+    def string(self, sid: int) -> Optional[str]:
+        """Decode one string-table entry (-1 → None)."""
+        if sid < 0:
+            return None
+        start, end = self._str_offsets[sid], self._str_offsets[sid + 1]
+        return bytes(self._str_data[start:end]).decode("utf-8")
+
+    def _bisect(self, n: int, key_at: Callable[[int], str], key: str) -> int:
+        """Index of key in a sorted sequence of n keys, or -1."""
+        lo, hi = 0, n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < n and key_at(lo) == key else -1
+
+    # ------------------------------------------------------------------ frames
+
+    def frame(self, row: int) -> Frame:
+        """Materialize one row as a Frame."""
+        a, s = self.arrays, self.string
+        causal_links = s(int(a["causal_links"][row]))
+        return Frame(
+            frame_id=s(int(self._frame_id[row])),
+            sentence_id=int(a["sentence_id"][row]),
+            sentence_text=s(int(a["sentence_text"][row])),
+            kriya=s(int(a["kriya"][row])),
+            kriya_surface=s(int(a["kriya_surface"][row])),
+            causal_links=json.loads(causal_links) if causal_links is not None else None,
+            **{field: s(int(sid)) for field, sid in zip(ROLE_FIELDS, a["roles"][row])},
+        )
+
+    def row_of(self, frame_id: str) -> int:
+        """Row holding frame_id, or -1."""
+        order = self.arrays["id_order"]
+        i = self._bisect(len(order), lambda i: self.string(int(self._frame_id[order[i]])), frame_id)
+        return int(order[i]) if i >= 0 else -1
+
+    def frame_id(self, row: int) -> str:
+        return self.string(int(self._frame_id[row]))
+
+    # ----------------------------------------------------------------- indexes
+
+    def _lookup(self, prefix: str, key: str) -> np.ndarray:
+        keys = self.arrays[f"{prefix}_keys"]
+        i = self._bisect(len(keys), lambda i: self.string(int(keys[i])), key)
+        if i < 0:
+            return np.empty(0, dtype=np.int32)
+        offsets = self.arrays[f"{prefix}_offsets"]
+        return self.arrays[f"{prefix}_rows"][offsets[i]:offsets[i + 1]]
+
+    def entity_rows(self, key: str) -> np.ndarray:
+        """Rows mentioning a normalized (lower/strip) entity."""
+        return self._lookup("entity", key)
+
+    def kriya_rows(self, key: str) -> np.ndarray:
+        """Rows with a normalized kriyā."""
+        return self._lookup("kriya", key)
+
+    def role_rows(self, field: str, query: str) -> np.ndarray:
+        """Rows whose filler for a role field contains query (case-insensitive)."""
+        i = ROLE_FIELDS.index(field)
+        a = self.arrays
+        values, value_offsets, value_rows = (
+            a[f"role{i}_values"], a[f"role{i}_value_offsets"], a[f"role{i}_value_rows"]
+        )
+        query = query.lower()
+        grams = trigrams(query)
+        if grams:
+            gram_keys, gram_offsets, gram_values = (
+                a[f"role{i}_grams"], a[f"role{i}_gram_offsets"], a[f"role{i}_gram_values"]
+            )
+            postings = []
+            for gram in grams:
+                j = int(np.searchsorted(gram_keys, gram))
+                if j == len(gram_keys) or gram_keys[j] != gram:
+                    return np.empty(0, dtype=np.int32)
+                postings.append(gram_values[gram_offsets[j]:gram_offsets[j + 1]])
+            postings.sort(key=len)
+            candidates = postings[0]
+            for posting in postings[1:]:
+                candidates = np.intersect1d(candidates, posting, assume_unique=True)
+        else:
+            candidates = range(len(values))
+
+        matched = [
+            value_rows[value_offsets[j]:value_offsets[j + 1]]
+            for j in candidates if query in self.string(int(values[j]))
+        ]
+        return np.unique(np.concatenate(matched)) if matched else np.empty(0, dtype=np.int32)
+
+    def _live_keys(self, prefix: str, live: Optional[np.ndarray]) -> list[str]:
+        """Index keys with at least one live row (live: bool mask, None = all)."""
+        keys = self.arrays[f"{prefix}_keys"]
+        if live is not None and len(keys):
+            offsets = self.arrays[f"{prefix}_offsets"]
+            alive = np.add.reduceat(live[self.arrays[f"{prefix}_rows"]].astype(np.int32), offsets[:-1])
+            keys = keys[alive > 0]
+        return [self.string(int(sid)) for sid in keys]
+
+    def entity_keys(self, live: Optional[np.ndarray] = None) -> list[str]:
+        return self._live_keys("entity", live)
+
+    def kriya_keys(self, live: Optional[np.ndarray] = None) -> list[str]:
+        return self._live_keys("kriya", live)
+
+    def get_stats(self) -> dict:
+        return {
+            "frames": self.count,
+            "strings": len(self._str_offsets) - 1,
+            "bytes": int(self.path.stat().st_size),
+        }
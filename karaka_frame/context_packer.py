@@ -0,0 +1,148 @@
+"""
+Context Packer for Kāraka Frame Graph POC.
+Builds the frame section of the answer-synthesis prompt within a token
+budget, instead of one indented JSON object per frame:
+
+    ## SENTENCES
+    S1: The NIH funded the study in 2019.
+    ## FRAMES (frame_id | kriyā | kārakas | sentence)
+    F0 | fund | Kartā=NIH; Karma=the study; Time=2019 | S1
+    ## CAUSAL LINKS (cause → effect)
+    F0 → F1 (prayojana)
+
+Frames go in rank order (frames filling the role the question asks for
+first, then retrieval order) until the budget is spent. Null roles are left
+out, a sentence shared by several frames is written once, and the packing
+report lists what did not fit.
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Optional
+
+from frame_extractor import Frame
+from graph_view import ROLE_LABELS
+from llm_client import estimate_tokens
+
+# Token budget of the frame section of the synthesis prompt
+QA_CONTEXT_TOKENS = int(os.getenv("QA_CONTEXT_TOKENS", "3000"))
+
+# Frame IDs listed in the report per category (counts are always exact)
+REPORT_IDS = 20
+
+_HEADERS = (
+    "## SENTENCES",
+    "## FRAMES (frame_id | kriyā | kārakas | sentence)",
+    "## CAUSAL LINKS (cause → effect)",
+)
+
+
+@dataclass
+class PackedContext:
+    """Frame section of a synthesis prompt and what went into it."""
+    text: str
+    frames: list[Frame]                  # packed, in prompt order
+    budget: int
+    tokens: int = 0
+    dropped: list[str] = field(default_factory=list)            # frame IDs over budget
+    sentences_shared: int = 0            # frame references to an already written sentence
+    sentences_omitted: list[str] = field(default_factory=list)  # packed frames without their sentence
+
+    def report(self) -> dict:
+        return {
+            "budget": self.budget,
+            "tokens": self.tokens,
+            "frames_packed": len(self.frames),
+            "frames_dropped": len(self.dropped),
+            "dropped_ids": self.dropped[:REPORT_IDS],
+            "sentences_shared": self.sentences_shared,
+            "sentences_omitted": self.sentences_omitted[:REPORT_IDS],
+        }
+
+
+def frame_line(frame: Frame, sentence_ref: str) -> str:
+    """One frame: ID, kriyā, non-null kārakas, sentence reference."""
+    karakas = "; ".join(f"{ROLE_LABELS.get(role, role)}={value}" for role, value in frame.role_items())
+    return f"{frame.frame_id} | {frame.kriya or '?'} | {karakas or '-'} | {sentence_ref}"
+
+
+def rank_frames(frames: list[Frame], target_role: Optional[str] = None) -> list[Frame]:
+    """Frames filling the asked role first; retrieval order otherwise (stable)."""
+    if not target_role:
+        return list(frames)
+    return sorted(frames, key=lambda f: not getattr(f, target_role, None))
+
+
+def pack_context(
+    frames: list[Frame],
+    budget: int = QA_CONTEXT_TOKENS,
+    target_role: Optional[str] = None,
+) -> PackedContext:
+    """
+    Pack frames into a compact prompt section.
+
+    Args:
+        frames: Retrieved frames, best first
+        budget: Tokens the section may use (estimate_tokens)
+        target_role: Kāraka the question asks for (query plan)
+
+    Returns:
+        PackedContext with the text and the packing report
+    """
+    packed = PackedContext(text="", frames=[], budget=budget)
+    used = sum(estimate_tokens(header) for header in _HEADERS)
+    sentences: dict[str, str] = {}       # sentence text -> ref
+    sentence_lines: list[str] = []
+    frame_lines: list[str] = []
+
+    for frame in rank_frames(frames, target_role):
+        text = (frame.sentence_text or "").strip()
+        ref = sentences.get(text, "-")
+        sentence_line = None
+        if text and text not in sentences:
+            ref = f"S{len(sentences) + 1}"
+            sentence_line = f"{ref}: {text}"
+        line = frame_line(frame, ref)
+        cost = estimate_tokens(line) + (estimate_tokens(sentence_line) if sentence_line else 0)
+        if used + cost > budget and sentence_line:
+            # The frame alone may still fit without its sentence
+            line, sentence_line = frame_line(frame, "-"), None
+            cost = estimate_tokens(line)
+            if used + cost <= budget:
+                packed.sentences_omitted.append(frame.frame_id)
+        if used + cost > budget:
+            packed.dropped.append(frame.frame_id)
+            continue
+        if sentence_line:
+            sentences[text] = ref
+            sentence_lines.append(sentence_line)
+        elif text and ref != "-":
+            packed.sentences_shared += 1
+        frame_lines.append(line)
+        packed.frames.append(frame)
+        used += cost
+
+    # Causal links between packed frames, as long as they fit
+    included = {f.frame_id for f in packed.frames}
+    link_lines = []
+    for frame in packed.frames:
+        for link in frame.causal_links or ():
+            cause, effect = link.get("cause_frame"), link.get("effect_frame")
+            if cause not in included or effect not in included:
+                continue
+            relation = link.get("causal_type")
+            line = f"{cause} → {effect}" + (f" ({relation})" if relation else "")
+            if line in link_lines:
+                continue
+            cost = estimate_tokens(line)
+            if used + cost > budget:
+                break
+            link_lines.append(line)
+            used += cost
+
+    sections = [(_HEADERS[0], sentence_lines), (_HEADERS[1], frame_lines), (_HEADERS[2], link_lines)]
+    packed.text = "\n".join(
+        "\n".join([header, *lines]) for header, lines in sections if lines
+    )
+    packed.tokens = used
+    return packed
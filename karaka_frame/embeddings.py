@@ -0,0 +1,110 @@
+"""
+Embeddings for Kāraka Frame Graph POC.
+Batched canonical-event embeddings through the nv-embedqa NIM (any
+OpenAI-compatible /v1/embeddings endpoint), or a local hashing stand-in
+when no endpoint is configured.
+"""
+
+import hashlib
+import os
+import re
+
+import numpy as np
+
+EMBED_BASE_URL = os.getenv("EMBED_BASE_URL")
+EMBED_MODEL = os.getenv("EMBED_MODEL", "nvidia/llama-3.2-nv-embedqa-1b-v2")
+EMBED_DIM = int(os.getenv("EMBED_DIM", "384"))
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class HashingEmbedder:
+    """
+    Local stand-in: signed feature hashing of word unigrams and bigrams,
+    L2-normalized. Deterministic and dependency-free; lexical, not semantic.
+    """
+
+    name = "local-hashing"
+
+    def __init__(self, dim: int = EMBED_DIM):
+        self.dim = dim
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        tokens = _TOKEN_RE.findall(text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            h = int.from_bytes(digest, "little")
+            vec[h % self.dim] += 1.0 if (h >> 63) else -1.0
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    async def embed(self, texts: list[str], input_type: str = "passage") -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.stack([self._embed_one(t) for t in texts])
+
+
+class NIMEmbedder:
+    """nv-embedqa NIM (OpenAI-compatible embeddings API)."""
+
+    def __init__(
+        self,
+        base_url: str,
+        model: str = EMBED_MODEL,
+        dim: int = EMBED_DIM,
+        batch_size: int = EMBED_BATCH_SIZE,
+    ):
+        from openai import AsyncOpenAI
+        self.client = AsyncOpenAI(
+            base_url=base_url,
+            api_key=os.getenv("EMBED_API_KEY") or os.getenv("LLM_API_KEY") or "not-needed"
+        )
+        self.name = model
+        self.dim = dim
+        self.batch_size = batch_size
+
+    async def embed(self, texts: list[str], input_type: str = "passage") -> np.ndarray:
+        """
+        Embed texts in batches.
+
+        Args:
+            texts: Texts to embed
+            input_type: "passage" for stored frames, "query" for questions
+                (nv-embedqa is asymmetric)
+
+        Returns:
+            float32 array of shape (len(texts), dim), L2-normalized
+        """
+        rows = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            response = await self.client.embeddings.create(
+                model=self.name,
+                input=batch,
+                dimensions=self.dim,
+                extra_body={"input_type": input_type, "truncate": "END"},
+            )
+            rows.extend(item.embedding for item in sorted(response.data, key=lambda d: d.index))
+        if not rows:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        matrix = np.asarray(rows, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+
+# Global embedder instance
+_embedder = None
+
+def get_embedder():
+    """Get or create the global embedder (NIM if EMBED_BASE_URL is set)."""
+    global _embedder
+    if _embedder is None:
+        if EMBED_BASE_URL:
+            _embedder = NIMEmbedder(EMBED_BASE_URL)
+        else:
+            print("ℹ️ EMBED_BASE_URL not set, using local hashing embeddings")
+            _embedder = HashingEmbedder()
+    return _embedder
@@ -0,0 +1,149 @@
+"""
+Entity Equivalence for Kāraka Frame Graph POC.
+Incremental union-find over identity assertions (≡ frames, IS_SAME_AS
+edges): entities they equate share one class, so a lookup of any member
+resolves to all of them without walking the identity chain per read.
+
+    entity → class root       (every member points straight at its root)
+    root   → members
+    identity → entities it equates, entity → identities mentioning it
+
+Unions merge the smaller class into the larger one and repoint its
+members, so find() is a single dict lookup that never mutates (readers on
+other threads stay safe) and each entity is relabelled O(log n) times.
+Removing an identity (retraction, deletion) rebuilds only the affected
+class from the identities still incident to its members.
+"""
+
+import sys
+from typing import Iterable
+
+# `changed` while a mutation is in progress: readers fall back
+_UPDATING = sys.maxsize
+
+
+class EquivalenceClasses:
+    """Union-find of entities equated by identity assertions."""
+
+    def __init__(self, version: int = 0):
+        self._root: dict[str, str] = {}            # entity -> class root
+        self._members: dict[str, set[str]] = {}    # root -> entities of the class
+        self._identities: dict[str, list[str]] = {}  # identity ID -> entities it equates
+        self._incident: dict[str, set[str]] = {}   # entity -> identity IDs
+        # Version of the last change; readers at an older version must not
+        # use the classes (see FrameReader.equivalent_entities)
+        self.changed = version
+
+    def __contains__(self, identity_id: str) -> bool:
+        return identity_id in self._identities
+
+    def __len__(self) -> int:
+        return len(self._identities)
+
+    # ------------------------------------------------------------------ writes
+
+    def invalidate(self) -> None:
+        """Hide the classes from readers until the next add() or remove()."""
+        self.changed = _UPDATING
+
+    def add(self, identity_id: str, entities: Iterable[str], version: int = 0) -> None:
+        """
+        Assert that entities are the same (replaces an identity of the same ID).
+
+        Args:
+            identity_id: ID of the identity (frame ID or edge key)
+            entities: Entity keys it equates
+            version: Version the assertion is committed at
+        """
+        entities = list(dict.fromkeys(entities))
+        self.changed = _UPDATING
+        if identity_id in self._identities:
+            self._remove(identity_id)
+        self._identities[identity_id] = entities
+        for entity in entities:
+            self._make(entity)
+            self._incident.setdefault(entity, set()).add(identity_id)
+        for other in entities[1:]:
+            self._union(entities[0], other)
+        self.changed = version
+
+    def remove(self, identity_id: str, version: int = 0) -> bool:
+        """
+        Withdraw an identity, splitting its class if nothing else holds it
+        together. Returns False if the identity is unknown.
+        """
+        if identity_id not in self._identities:
+            return False
+        self.changed = _UPDATING
+        self._remove(identity_id)
+        self.changed = version
+        return True
+
+    def _remove(self, identity_id: str) -> None:
+        entities = self._identities.pop(identity_id)
+        for entity in entities:
+            incident = self._incident.get(entity)
+            if incident is not None:
+                incident.discard(identity_id)
+                if not incident:
+                    del self._incident[entity]
+        if not entities:
+            return
+
+        # Rebuild the affected class from its remaining identities
+        component = self._members.pop(self._root[entities[0]])
+        remaining = set()
+        for entity in component:
+            incident = self._incident.get(entity)
+            if incident:
+                self._root[entity] = entity
+                self._members[entity] = {entity}
+                remaining |= incident
+            else:
+                del self._root[entity]
+        for other_id in remaining:
+            equated = self._identities[other_id]
+            for other in equated[1:]:
+                self._union(equated[0], other)
+
+    def _make(self, entity: str) -> None:
+        if entity not in self._root:
+            self._root[entity] = entity
+            self._members[entity] = {entity}
+
+    def _union(self, a: str, b: str) -> None:
+        root_a, root_b = self._root[a], self._root[b]
+        if root_a == root_b:
+            return
+        if len(self._members[root_a]) < len(self._members[root_b]):
+            root_a, root_b = root_b, root_a
+        moved = self._members.pop(root_b)
+        for entity in moved:
+            self._root[entity] = root_a
+        self._members[root_a] |= moved
+
+    # ------------------------------------------------------------------- reads
+
+    def find(self, entity: str) -> str:
+        """Class root of an entity (the entity itself if it has no identities)."""
+        return self._root.get(entity, entity)
+
+    def members(self, entity: str) -> list[str]:
+        """All entities in the entity's class, itself included."""
+        root = self._root.get(entity)
+        if root is None:
+            return [entity]
+        return list(self._members.get(root, (entity,)))
+
+    def same(self, a: str, b: str) -> bool:
+        return self.find(a) == self.find(b)
+
+    def get_stats(self) -> dict:
+        sizes = [len(members) for members in list(self._members.values())]
+        return {
+            "identities": len(self._identities),
+            "entities": len(self._root),
+            "classes": len(sizes),
+            "largest_class": max(sizes, default=0),
+            "changed": self.changed,
+        }
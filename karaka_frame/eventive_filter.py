@@ -4,7 +4,9 @@ Filters out stative sentences, keeps only eventive (action) sentences.
 """
 
 import json
+from typing import Optional
 from llm_client import call_llm
+from near_duplicates import cluster_sentences, DEFAULT_THRESHOLD
 
 # Keywords that often indicate stative sentences
 STATIVE_PATTERNS = [
@@ -82,7 +84,7 @@ Respond with JSON: {"type": "EVENTIVE" or "STATIVE", "reason": "brief explanatio
 """
 
     try:
-        response = await call_llm(prompt, f"Sentence: {sentence}", json_mode=True)
+        response = await call_llm(prompt, f"Sentence: {sentence}", json_mode=True, task="eventive_filter")
         data = json.loads(response)
         
         is_event = data.get("type", "").upper() == "EVENTIVE"
@@ -95,32 +97,67 @@ Respond with JSON: {"type": "EVENTIVE" or "STATIVE", "reason": "brief explanatio
         return True, f"Classification error, defaulting to eventive: {e}"
 
 
-async def filter_eventive(sentences: list[str]) -> list[dict]:
+async def filter_eventive(
+    sentences: list[str],
+    near_dup_threshold: Optional[float] = DEFAULT_THRESHOLD,
+) -> list[dict]:
     """
     Filter a list of sentences, keeping only eventive ones.
     
+    Near-duplicate sentences are clustered first (MinHash/LSH); only the
+    cluster representative is classified, the others inherit its decision
+    (unless the keyword check contradicts it) and carry a "duplicate_of"
+    sentence_id for frame adaptation.
+    
+    Args:
+        sentences: Sentences to classify
+        near_dup_threshold: Jaccard threshold for clustering (None disables)
+    
     Returns:
         List of dicts with sentence and metadata
     """
     results = []
+    by_id = {}
+    
+    if near_dup_threshold is not None:
+        representatives = cluster_sentences(sentences, near_dup_threshold)
+    else:
+        representatives = [None] * len(sentences)
     
     for i, sentence in enumerate(sentences):
         if not sentence.strip():
             continue
-            
-        is_event, reason = await is_eventive(sentence)
         
-        results.append({
-            "sentence_id": i,
-            "text": sentence.strip(),
-            "is_eventive": is_event,
-            "reason": reason
-        })
+        rep = representatives[i]
+        rep_result = by_id.get(rep) if rep is not None else None
+        if rep_result is not None and quick_eventive_check(sentence) not in (None, rep_result["is_eventive"]):
+            rep_result = None  # The cheap check contradicts the representative: classify on its own
+        if rep_result is not None:
+            result = {
+                "sentence_id": i,
+                "text": sentence.strip(),
+                "is_eventive": rep_result["is_eventive"],
+                "reason": f"Near-duplicate of sentence {rep}",
+                "duplicate_of": rep,
+            }
+        else:
+            is_event, reason = await is_eventive(sentence)
+            result = {
+                "sentence_id": i,
+                "text": sentence.strip(),
+                "is_eventive": is_event,
+                "reason": reason
+            }
+        
+        results.append(result)
+        by_id[i] = result
         
-        status = "✅ EVENTIVE" if is_event else "⏭️ STATIVE (skipped)"
+        status = "✅ EVENTIVE" if result["is_eventive"] else "⏭️ STATIVE (skipped)"
         print(f"  [{i}] {status}: {sentence[:50]}...")
     
     eventive_count = sum(1 for r in results if r["is_eventive"])
-    print(f"\n📊 {eventive_count}/{len(results)} sentences are eventive")
+    duplicate_count = sum(1 for r in results if "duplicate_of" in r)
+    print(f"\n📊 {eventive_count}/{len(results)} sentences are eventive"
+          f" ({duplicate_count} near-duplicates skipped classification)")
     
     return results
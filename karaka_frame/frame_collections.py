@@ -0,0 +1,290 @@
+"""
+Frame Collections for Kāraka Frame Graph POC.
+Named frame collections (per document, tenant or corpus), each a separate
+FrameStore with its own indexes, WAL and snapshot:
+
+    default          the global store (frames.json, see get_store)
+    <name>           FRAME_COLLECTIONS_DIR/<name>/frames.json (or frames.db)
+
+Frame IDs only need to be unique within a collection. Dropping a collection
+closes its store and renames its directory to a tombstone (.<name>.dropped.*),
+deleted in the background, so the name is free at once; other collections'
+indexes are never touched. Cross-collection reads fan out over per-collection snapshots
+and concatenate the results in collection order.
+"""
+
+import heapq
+import os
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+from frame_extractor import Frame
+from frame_store import FrameReader, FrameStore, get_store, open_store
+from inverted_index import SEARCH_TOP_K
+from causal_index import CAUSAL_EXPAND_LIMIT, CAUSAL_FAN_OUT, CAUSAL_HOPS
+
+# Directory holding one subdirectory per named collection
+FRAME_COLLECTIONS_DIR = os.getenv("FRAME_COLLECTIONS_DIR", "collections")
+
+DEFAULT_COLLECTION = "default"
+
+_NAME_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]{0,63}")
+
+# Dropped collection directories awaiting deletion (never valid names)
+_TOMBSTONE_GLOB = ".*.dropped.*"
+
+
+class CollectionsView(FrameReader):
+    """
+    Read view over snapshots of several collections. get_frame returns the
+    first match in collection order; lists are concatenated.
+    """
+
+    def __init__(self, snapshots: dict[str, FrameReader], generation: int = 0):
+        """
+        Args:
+            snapshots: Collection name → snapshot
+            generation: Collections dropped so far (FrameCollections.dropped)
+        """
+        self.snapshots = snapshots
+        # Per-collection versions; the sum only grows while no collection is dropped
+        self.versions = {name: snapshot.version for name, snapshot in snapshots.items()}
+        self.version = sum(self.versions.values())
+        self.generation = generation
+
+    @property
+    def cache_version(self) -> tuple:
+        """
+        Identifies the state read: unlike the summed version it never
+        repeats, as a recreated collection starts at a new generation.
+        """
+        return self.generation, tuple(sorted(self.versions.items()))
+
+    def release(self) -> None:
+        for snapshot in self.snapshots.values():
+            snapshot.release()
+        self.snapshots = {}
+
+    def __enter__(self) -> "CollectionsView":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+    def __len__(self) -> int:
+        return sum(len(snapshot) for snapshot in self.snapshots.values())
+
+    def get_frame(self, frame_id: str) -> Optional[Frame]:
+        """Get a frame by ID (first collection that has it)."""
+        for snapshot in self.snapshots.values():
+            frame = snapshot.get_frame(frame_id)
+            if frame is not None:
+                return frame
+        return None
+
+    def get_all_frames(self) -> list[Frame]:
+        """Get all frames of every collection."""
+        return [f for snapshot in self.snapshots.values() for f in snapshot.get_all_frames()]
+
+    def find_by_entity(self, entity: str, equivalent: bool = True) -> list[Frame]:
+        """Find all frames mentioning an entity (identity classes are per collection)."""
+        return [
+            f for snapshot in self.snapshots.values()
+            for f in snapshot.find_by_entity(entity, equivalent)
+        ]
+
+    def equivalent_entities(self, entity: str) -> list[str]:
+        """Entities equated with entity in any of the collections."""
+        members = {}
+        for snapshot in self.snapshots.values():
+            members.update(dict.fromkeys(snapshot.equivalent_entities(entity)))
+        return list(members)
+
+    def find_by_kriya(self, kriya: str) -> list[Frame]:
+        """Find all frames with a specific kriya."""
+        return [f for snapshot in self.snapshots.values() for f in snapshot.find_by_kriya(kriya)]
+
+    def find_by_role(self, role: str, value: str) -> list[Frame]:
+        """Find frames where a specific role's value contains the given text."""
+        return [f for snapshot in self.snapshots.values() for f in snapshot.find_by_role(role, value)]
+
+    def _frame_ids(self) -> list[str]:
+        return [fid for snapshot in self.snapshots.values() for fid in snapshot._frame_ids()]
+
+    def search(
+        self, kriya_terms: list[str], entity_terms: list[str], k: int = SEARCH_TOP_K
+    ) -> list[tuple[Frame, float]]:
+        """Top-k frames over all collections (each scored by its own index)."""
+        return heapq.nlargest(k, (
+            hit for snapshot in self.snapshots.values()
+            for hit in snapshot.search(kriya_terms, entity_terms, k)
+        ), key=lambda hit: hit[1])
+
+    def expand_causal(
+        self,
+        frames: list[Frame],
+        hops: int = CAUSAL_HOPS,
+        fan_out: int = CAUSAL_FAN_OUT,
+        limit: Optional[int] = CAUSAL_EXPAND_LIMIT,
+        relations: Optional[set] = None,
+    ) -> list[Frame]:
+        """Frames within `hops` causal links of frames, per collection (links never cross collections)."""
+        return [
+            f for snapshot in self.snapshots.values()
+            for f in snapshot.expand_causal(frames, hops, fan_out, limit, relations)
+        ]
+
+    def _entity_keys(self) -> list[str]:
+        keys = {}
+        for snapshot in self.snapshots.values():
+            keys.update(dict.fromkeys(snapshot._entity_keys()))
+        return list(keys)
+
+
+class FrameCollections:
+    """Registry of named FrameStores."""
+
+    def __init__(self, root: str = FRAME_COLLECTIONS_DIR, default_store: Optional[FrameStore] = None):
+        """
+        Initialize the registry. Collections found under root are opened on
+        first use.
+
+        Args:
+            root: Directory of named collections
+            default_store: Store served as the "default" collection
+                (the global store when omitted)
+        """
+        self.root = Path(root)
+        self._stores: dict[str, FrameStore] = {
+            DEFAULT_COLLECTION: default_store if default_store is not None else get_store()
+        }
+        self._lock = threading.Lock()
+        self.dropped = 0
+        # Finish deleting collections dropped before a restart
+        if self.root.is_dir():
+            for tombstone in self.root.glob(_TOMBSTONE_GLOB):
+                self._delete_later(tombstone)
+
+    @staticmethod
+    def _check_name(name: str) -> str:
+        if not _NAME_RE.fullmatch(name):
+            raise ValueError(f"Invalid collection name: {name!r}")
+        return name
+
+    def _path(self, name: str) -> Path:
+        return self.root / name / "frames.json"
+
+    def names(self) -> list[str]:
+        """Open and on-disk collections, default first."""
+        on_disk = sorted(
+            p.name for p in self.root.iterdir() if p.is_dir() and _NAME_RE.fullmatch(p.name)
+        ) if self.root.is_dir() else []
+        return list(dict.fromkeys([DEFAULT_COLLECTION, *self._stores, *on_disk]))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._stores or (name != DEFAULT_COLLECTION and self._path(name).parent.is_dir())
+
+    def get(self, name: Optional[str] = None, create: bool = True) -> Optional[FrameStore]:
+        """
+        A collection's store, opened (or created) on first use.
+
+        Args:
+            name: Collection name (default collection when None)
+            create: Create the collection if it does not exist
+
+        Returns:
+            The store, or None if it does not exist and create is False
+        """
+        name = name or DEFAULT_COLLECTION
+        store = self._stores.get(name)
+        if store is not None:
+            return store
+        self._check_name(name)
+        with self._lock:
+            store = self._stores.get(name)
+            if store is None:
+                if not create and name not in self:
+                    return None
+                path = self._path(name)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                store = self._stores[name] = open_store(path)
+        return store
+
+    @staticmethod
+    def _delete_later(directory: Path) -> threading.Thread:
+        """Delete a tombstoned directory in a background thread."""
+        thread = threading.Thread(
+            target=shutil.rmtree, args=(directory,), kwargs={"ignore_errors": True},
+            name=f"drop-{directory.name}", daemon=True,
+        )
+        thread.start()
+        return thread
+
+    def drop(self, name: str) -> bool:
+        """
+        Remove a collection (the default collection is cleared instead).
+        Its directory is renamed to a tombstone under the lock and deleted
+        in the background, so a large collection does not hold up other
+        requests and the name can be reused at once. Other collections are
+        untouched.
+
+        Returns:
+            False if the collection did not exist
+        """
+        if name == DEFAULT_COLLECTION:
+            self._stores[DEFAULT_COLLECTION].clear()
+            return True
+        self._check_name(name)
+        with self._lock:
+            store = self._stores.pop(name, None)
+            directory = self._path(name).parent
+            if store is None and not directory.is_dir():
+                return False
+            if store is not None:
+                store.close()
+            if directory.is_dir():
+                tombstone = directory.with_name(f".{name}.dropped.{time.time_ns()}")
+                directory.rename(tombstone)
+                self._delete_later(tombstone)
+            self.dropped += 1
+        print(f"🗑️ Dropped frame collection '{name}'")
+        return True
+
+    def snapshot(self, names: Optional[Iterable[str]] = None) -> CollectionsView:
+        """
+        Read view over several collections (all when names is None).
+        Unknown names are skipped.
+        """
+        selected = self.names() if names is None else list(dict.fromkeys(names))
+        snapshots = {}
+        for name in selected:
+            store = self.get(name, create=False)
+            if store is not None:
+                snapshots[name] = store.snapshot()
+        return CollectionsView(snapshots, self.dropped)
+
+    def close(self) -> None:
+        for store in self._stores.values():
+            store.close()
+
+    def get_stats(self) -> dict:
+        """Frame counts of the open collections."""
+        return {
+            "collections": self.names(),
+            "open": {name: len(store) for name, store in self._stores.items()},
+            "dropped": self.dropped,
+        }
+
+
+_collections: Optional[FrameCollections] = None
+
+def get_collections() -> FrameCollections:
+    """Get or create the global collection registry."""
+    global _collections
+    if _collections is None:
+        _collections = FrameCollections()
+    return _collections
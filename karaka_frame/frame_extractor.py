@@ -3,35 +3,196 @@ Frame Extractor for Kāraka Frame Graph POC.
 Extracts Kriyā (verb root) and Kāraka (semantic roles) from eventive sentences.
 """
 
+import asyncio
+import hashlib
 import json
+import os
+import sys
+import threading
+from array import array
 from dataclasses import dataclass, asdict
 from typing import Optional
-from llm_client import call_llm
+from llm_client import call_llm, estimate_tokens, record_tier_decision, resolve_model
+from sentence_index import SentenceIndex, sentence_key, frame_id_for
+from frame_validator import check_invariants, validate_frame, audit_frame, drop_ungrounded, filler_key, AUDITOR_PROMPT_PATH
+from stage_pipeline import get_stage_pipeline, primary_event
+from srl_prefill import Prefill, prefill_frame
+
+
+# Kāraka role fields in their fixed storage order
+ROLE_FIELDS = (
+    "karta",        # Agent
+    "karma",        # Object
+    "karana",       # Instrument
+    "sampradana",   # Recipient
+    "apadana",      # Source
+    "locus_time",   # Temporal locus
+    "locus_space",  # Spatial locus
+    "locus_topic",  # Topic locus
+)
+
+
+class SymbolTable:
+    """
+    Process-wide table of interned strings (role fillers, sentences).
+    Maps each distinct string to a small integer ID (0 is reserved for None).
+    Symbols are never freed: the table grows with the vocabulary, not the frame count.
+    Hits are lock-free; adding a symbol takes a lock, as frames are built in
+    worker threads too.
+    """
+
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self._strings: list[Optional[str]] = [None]
+        self._lock = threading.Lock()
+
+    def intern(self, value: Optional[str]) -> int:
+        """Return the symbol ID for a string, adding it if unseen."""
+        if value is None:
+            return 0
+        sid = self._ids.get(value)
+        if sid is None:
+            with self._lock:
+                sid = self._ids.get(value)  # Added while waiting for the lock
+                if sid is None:
+                    value = sys.intern(value)
+                    sid = len(self._strings)
+                    self._strings.append(value)
+                    self._ids[value] = sid
+        return sid
+
+    def lookup(self, sid: int) -> Optional[str]:
+        """Return the string for a symbol ID."""
+        return self._strings[sid]
+
+    def __len__(self) -> int:
+        return len(self._strings) - 1
+
+
+SYMBOLS = SymbolTable()
+
+# Sentence texts, one entry per distinct sentence however many frames cite it
+SENTENCES = SymbolTable()
+
+# Index of the sentence ID in Frame._symbols, after the eight role IDs
+SENTENCE_SLOT = len(ROLE_FIELDS)
+
+
+def _intern(value):
+    """Intern a string value, passing None (or non-strings) through."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class _SymbolSlot:
+    """Descriptor exposing one entry of Frame._symbols as an optional string."""
+
+    __slots__ = ("index", "table")
+
+    def __init__(self, index: int, table: SymbolTable = SYMBOLS):
+        self.index = index
+        self.table = table
+
+    def __get__(self, frame, owner=None):
+        if frame is None:
+            return self
+        return self.table.lookup(frame._symbols[self.index])
+
+    def __set__(self, frame, value):
+        frame._symbols[self.index] = self.table.intern(value)
 
 
-@dataclass
 class Frame:
-    """A single event frame with Kriyā and Kāraka roles."""
-    frame_id: str
-    sentence_id: int
-    sentence_text: str
-    kriya: str  # Normalized verb root
-    kriya_surface: str  # Original verb form
-    
-    # Kāraka roles (null if not present)
-    karta: Optional[str] = None       # Agent
-    karma: Optional[str] = None       # Object  
-    karana: Optional[str] = None      # Instrument
-    sampradana: Optional[str] = None  # Recipient
-    apadana: Optional[str] = None     # Source
-    locus_time: Optional[str] = None  # Temporal locus
-    locus_space: Optional[str] = None # Spatial locus
-    locus_topic: Optional[str] = None # Topic locus
-    causal_links: Optional[list[dict]] = None # Causal links to other frames
+    """
+    A single event frame with Kriyā and Kāraka roles.
     
+    Memory-compact layout: fixed __slots__, interned kriyā strings, and the
+    eight Kāraka roles plus the sentence stored as symbol IDs in a
+    fixed-width unsigned array; frames of the same sentence share its text.
+    Role attributes (frame.karta, ...) and sentence_text read and write
+    plain strings as before.
+    """
+
+    __slots__ = (
+        "frame_id",
+        "sentence_id",
+        "kriya",          # Normalized verb root
+        "kriya_surface",  # Original verb form
+        "_symbols",       # array('I'): SYMBOLS ids in ROLE_FIELDS order, then the SENTENCES id
+        "causal_links",   # Causal links to other frames
+    )
+
+    def __init__(
+        self,
+        frame_id: str,
+        sentence_id: int,
+        sentence_text: str,
+        kriya: str,
+        kriya_surface: str,
+        karta: Optional[str] = None,
+        karma: Optional[str] = None,
+        karana: Optional[str] = None,
+        sampradana: Optional[str] = None,
+        apadana: Optional[str] = None,
+        locus_time: Optional[str] = None,
+        locus_space: Optional[str] = None,
+        locus_topic: Optional[str] = None,
+        causal_links: Optional[list[dict]] = None,
+    ):
+        self.frame_id = frame_id
+        self.sentence_id = sentence_id
+        self.kriya = _intern(kriya)
+        self.kriya_surface = _intern(kriya_surface)
+        self._symbols = array("I", [
+            SYMBOLS.intern(karta),
+            SYMBOLS.intern(karma),
+            SYMBOLS.intern(karana),
+            SYMBOLS.intern(sampradana),
+            SYMBOLS.intern(apadana),
+            SYMBOLS.intern(locus_time),
+            SYMBOLS.intern(locus_space),
+            SYMBOLS.intern(locus_topic),
+            SENTENCES.intern(sentence_text),
+        ])
+        self.causal_links = causal_links
+
+    # Kāraka roles (None if not present)
+    karta = _SymbolSlot(0)        # Agent
+    karma = _SymbolSlot(1)        # Object
+    karana = _SymbolSlot(2)       # Instrument
+    sampradana = _SymbolSlot(3)   # Recipient
+    apadana = _SymbolSlot(4)      # Source
+    locus_time = _SymbolSlot(5)   # Temporal locus
+    locus_space = _SymbolSlot(6)  # Spatial locus
+    locus_topic = _SymbolSlot(7)  # Topic locus
+
+    sentence_text = _SymbolSlot(SENTENCE_SLOT, SENTENCES)
+
+    def role_items(self) -> list[tuple[str, str]]:
+        """Return (role_field, value) pairs for all non-null roles."""
+        lookup = SYMBOLS.lookup
+        return [
+            (field, lookup(sid))
+            for field, sid in zip(ROLE_FIELDS, self._symbols)
+            if sid
+        ]
+
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
-        return asdict(self)
+        result = {
+            "frame_id": self.frame_id,
+            "sentence_id": self.sentence_id,
+            "sentence_text": self.sentence_text,
+            "kriya": self.kriya,
+            "kriya_surface": self.kriya_surface,
+        }
+        lookup = SYMBOLS.lookup
+        for field, sid in zip(ROLE_FIELDS, self._symbols):
+            result[field] = lookup(sid)
+        result["causal_links"] = (
+            [dict(link) for link in self.causal_links]
+            if self.causal_links is not None else None
+        )
+        return result
     
     def to_display(self) -> dict:
         """Convert to display format (only non-null roles)."""
@@ -58,6 +219,17 @@ class Frame:
         
         return result
 
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Frame):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={v!r}" for k, v in self.to_dict().items())
+        return f"Frame({fields})"
+
 
 EXTRACTION_PROMPT = """You are a Pāṇinian grammatical parser extracting event frames from sentences.
 
@@ -141,36 +313,281 @@ Then, provide ONLY valid JSON in a <json> block:
 </json>"""
 
 
-async def extract_frame(sentence_id: int, sentence: str) -> Frame:
+COMPACT_EXTRACTION_PROMPT = """You are a Pāṇinian grammatical parser. Extract the main event frame of the sentence.
+
+Roles (copy text VERBATIM from the sentence, null if absent):
+- karta: agent (active: subject; passive: the "by" phrase, else null)
+- karma: object (active: direct object; passive: subject)
+- karana: instrument ("with/using ..."), sampradana: recipient ("to/for ...")
+- apadana: source ("from ..."), locus_time: date/period
+- locus_space: physical place, locus_topic: abstract subject matter
+
+Respond with JSON only, no reasoning:
+{"kriya": "verb root", "kriya_surface": "verb as written", "prayoga": "active|passive",
+ "karta": null, "karma": null, "karana": null, "sampradana": null, "apadana": null,
+ "locus_time": null, "locus_space": null, "locus_topic": null}"""
+
+
+PREFILL_CONFIRM_PROMPT = """You are a Pāṇinian grammatical parser checking a candidate event frame
+built from a dependency parse of the sentence.
+
+Fields: kriya (verb root), kriya_surface (verb as written), prayoga (active|passive),
+karta (agent; passive: the "by" phrase), karma (object; passive: the subject),
+karana (instrument), sampradana (recipient), apadana (source),
+locus_time (date/period), locus_space (physical place), locus_topic (abstract subject matter).
+Fillers must be exact text from the sentence.
+
+If the candidate is correct, respond with {}.
+Otherwise respond with ONLY the fields to change, e.g. {"locus_space": null, "locus_topic": "the study"}.
+Respond with JSON only, no reasoning."""
+
+
+# Extraction tiers: "cascade" (compact first, escalate on validation failure),
+# "reasoning" (always the full reasoning prompt), "compact" (never escalate)
+# or "staged" (D1 ∥ D2a → D2b prompt graph, see stage_pipeline)
+EXTRACTION_MODE = os.getenv("EXTRACTION_MODE", "cascade").lower()
+
+# First-tier (small model) samples per sentence; more than one enables the
+# agreement check, and disagreeing samples escalate to the large model. The
+# first sample keeps the baseline temperature and is the one accepted; the
+# others are drawn at SAMPLE_TEMPERATURE for the check only
+EXTRACTION_SAMPLES = max(1, int(os.getenv("EXTRACTION_SAMPLES", "2")))
+SAMPLE_TEMPERATURE = float(os.getenv("LLM_SAMPLE_TEMPERATURE", "0.7"))
+
+# Run the auditor LLM on frames failing local validation ("on"/"off")
+FRAME_AUDIT = os.getenv("FRAME_AUDIT", "on").lower() == "on"
+
+# Observed completion+prompt tokens of reasoning-tier calls (for savings estimates)
+_reasoning_usage = {"calls": 0, "tokens": 0}
+
+
+@dataclass
+class ExtractionStats:
+    """Per-document extraction counters, reported to the client after process_text."""
+    eventive_sentences: int = 0
+    llm_extractions: int = 0   # extract_frame calls made
+    reused_frames: int = 0     # served from the sentence index (LLM call skipped)
+    adapted_frames: int = 0    # adapted from a near-duplicate representative
+    failed: int = 0
+    prefill_accepted: int = 0  # clean dependency-parse frame, no LLM call
+    prefill_confirmed: int = 0 # parse candidate sent to the LLM for a diff
+    compact_accepted: int = 0  # resolved by the JSON-only tier (or prefill diff)
+    escalations: int = 0       # re-run with the reasoning prompt on the large model
+    disagreements: int = 0     # first-tier samples that disagreed
+    tokens_used: int = 0
+    tokens_saved_est: int = 0  # net, vs. running every sentence through the reasoning tier
+    audits_skipped: int = 0    # passed local validation, no auditor call
+    audits_run: int = 0        # failed local validation, auditor called
+    ungrounded_dropped: int = 0  # role fillers cleared for not occurring in the sentence
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        tiered = self.compact_accepted + self.escalations
+        data["escalation_rate"] = round(self.escalations / tiered, 3) if tiered else 0.0
+        return data
+
+
+def validate_extraction(data: dict, sentence: str) -> list[str]:
+    """
+    Cheap local checks on a raw extraction (see frame_validator). An empty
+    list means the frame is acceptable without the reasoning tier.
+    """
+    issues = check_invariants(
+        sentence,
+        data.get("kriya"),
+        data.get("kriya_surface"),
+        {field: data.get(field) for field in ROLE_FIELDS},
+        data.get("prayoga"),
+    )
+    return [str(issue) for issue in issues]
+
+
+def _reasoning_tokens_estimate() -> int:
+    """Average tokens per reasoning-tier call (prompt-size guess until observed)."""
+    if _reasoning_usage["calls"]:
+        return _reasoning_usage["tokens"] // _reasoning_usage["calls"]
+    return estimate_tokens(EXTRACTION_PROMPT) + 600
+
+
+def extraction_fingerprint() -> str:
+    """
+    Hash of what decides an extracted frame: the extraction mode, its
+    prompts (auditor and stages included) and the models they run on.
+    Sentence index entries stamped with another fingerprint are re-extracted.
+    """
+    material = [EXTRACTION_MODE, EXTRACTION_PROMPT, COMPACT_EXTRACTION_PROMPT, PREFILL_CONFIRM_PROMPT]
+    material += [resolve_model(task)[0] for task in ("extraction", "extraction_reasoning", "audit")]
+    if FRAME_AUDIT and AUDITOR_PROMPT_PATH.exists():
+        material.append(AUDITOR_PROMPT_PATH.read_text())
+    if EXTRACTION_MODE == "staged":
+        material += [stage.prompt_hash for stage in get_stage_pipeline().stages.values()]
+    return hashlib.sha256(json.dumps(material, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+def _frame_signature(data: dict) -> tuple:
+    """What two samples must agree on: the verb root and every role filler."""
+    return (str(data.get("kriya") or "").strip().lower(),) + tuple(
+        filler_key(data[field]) if data.get(field) else "" for field in ROLE_FIELDS
+    )
+
+
+async def _call_extractor(
+    prompt: str,
+    sentence: str,
+    usage: dict,
+    task: str = "extraction",
+    temperature: float = 0.1,
+) -> dict:
+    """One extraction LLM call, parsed to a dict."""
+    response = await call_llm(
+        prompt,
+        f"Sentence: {sentence}",
+        json_mode=True,
+        temperature=temperature,
+        usage=usage,
+        task=task
+    )
+    try:
+        return json.loads(response)
+    except json.JSONDecodeError as je:
+        print(f"  ⚠️ JSON parse error: {je}")
+        print(f"  ⚠️ Response was: {response[:300]}")
+        raise
+
+
+async def _confirm_prefill(
+    prefill: Prefill,
+    sentence: str,
+    usage: dict,
+    temperature: float = 0.1,
+) -> dict:
+    """Ask the LLM to confirm a parse-derived candidate; apply the returned diff."""
+    candidate = {"kriya": None, "kriya_surface": None, "prayoga": None,
+                 **{field: None for field in ROLE_FIELDS}, **prefill.data}
+    notes = "\n".join(f"- {a}" for a in prefill.ambiguities)
+    response = await call_llm(
+        PREFILL_CONFIRM_PROMPT,
+        f"Sentence: {sentence}\nCandidate: {json.dumps(candidate, ensure_ascii=False)}"
+        + (f"\nParser was unsure about:\n{notes}" if notes else ""),
+        json_mode=True,
+        temperature=temperature,
+        usage=usage,
+        task="extraction"
+    )
+    diff = json.loads(response)
+    if not isinstance(diff, dict):
+        raise json.JSONDecodeError("Diff is not an object", response, 0)
+    return {**candidate, **{k: v for k, v in diff.items() if k in candidate}}
+
+
+async def _first_tier(prefill: Optional[Prefill], sentence: str, usage: dict) -> tuple[Optional[dict], bool]:
+    """
+    Run the small-model tier: one sample at the baseline temperature, which
+    is the frame kept, plus EXTRACTION_SAMPLES - 1 samples at
+    SAMPLE_TEMPERATURE in parallel that only serve the agreement check.
+
+    Returns:
+        (baseline sample or None if it did not parse, whether all samples agree)
+    """
+    async def sample(temperature: float) -> dict:
+        if prefill is not None:
+            return await _confirm_prefill(prefill, sentence, usage, temperature)
+        return await _call_extractor(COMPACT_EXTRACTION_PROMPT, sentence, usage, temperature=temperature)
+
+    temperatures = [0.1] + [SAMPLE_TEMPERATURE] * (EXTRACTION_SAMPLES - 1)
+    results = await asyncio.gather(*(sample(t) for t in temperatures), return_exceptions=True)
+    errors = [r for r in results if isinstance(r, Exception)]
+    if len(errors) == len(results) and not isinstance(errors[0], json.JSONDecodeError):
+        raise errors[0]
+    baseline = results[0] if isinstance(results[0], dict) else None
+    if errors:
+        return baseline, False
+    agree = len({_frame_signature(r) for r in results}) == 1
+    return baseline, agree
+
+
+async def extract_frame(
+    sentence_id: int,
+    sentence: str,
+    stats: Optional[ExtractionStats] = None,
+) -> Frame:
     """
     Extract a single event frame from an eventive sentence.
     
+    Two-tier cascade: a compact JSON-only prompt runs first and the result is
+    checked with validate_extraction(); only on failure (or unparseable JSON)
+    is the sentence re-extracted with the full reasoning prompt. When a
+    dependency parse is available (see srl_prefill), the first tier is either
+    skipped (unambiguous parse) or replaced by a short confirm/diff call.
+    In "staged" mode the D1/D2a/D2b prompt graph is used instead, with each
+    stage served from its own cache when unchanged.
+    
     Args:
         sentence_id: Unique identifier for the sentence
         sentence: The eventive sentence text
+        stats: Optional counters for escalations and token usage
     
     Returns:
-        Frame object with extracted Kriyā and Kārakas
+        Frame object with extracted Kriyā and Kārakas, keyed by the
+        sentence's content hash (see sentence_index.frame_id_for)
     """
+    frame_id = frame_id_for(sentence)
+    stats = stats if stats is not None else ExtractionStats()
     try:
         print(f"\n  🔍 Extracting frame for: '{sentence[:60]}...'")
         
-        response = await call_llm(
-            EXTRACTION_PROMPT,
-            f"Sentence: {sentence}",
-            json_mode=True
-        )
+        data = None
+        compact_usage = {}
+        first_tier_called = False
+        if EXTRACTION_MODE == "staged":
+            staged_usage = {}
+            outputs = await get_stage_pipeline().run(sentence, usage=staged_usage)
+            stats.tokens_used += staged_usage.get("prompt_tokens", 0) + staged_usage.get("completion_tokens", 0)
+            data = primary_event(outputs)
+            if data is None:
+                raise ValueError("D2b returned no event instance")
+        elif EXTRACTION_MODE != "reasoning":
+            prefill = prefill_frame(sentence)
+            if prefill is not None and prefill.is_clean:
+                print("  🌳 Parse prefill accepted without LLM")
+                stats.prefill_accepted += 1
+                stats.tokens_saved_est += _reasoning_tokens_estimate()
+                data = prefill.data
+            else:
+                first_tier_called = True
+                if prefill is not None:
+                    stats.prefill_confirmed += 1
+                data, samples_agree = await _first_tier(prefill, sentence, compact_usage)
         
-        # Try to parse JSON
-        try:
-            data = json.loads(response)
-        except json.JSONDecodeError as je:
-            print(f"  ⚠️ JSON parse error: {je}")
-            print(f"  ⚠️ Response was: {response[:300]}")
-            raise
+        if first_tier_called:
+            issues = validate_extraction(data, sentence) if data is not None else ["unparseable JSON"]
+            if data is not None and not samples_agree:
+                issues.append("small-model samples disagree")
+                stats.disagreements += 1
+            compact_tokens = compact_usage.get("prompt_tokens", 0) + compact_usage.get("completion_tokens", 0)
+            stats.tokens_used += compact_tokens
+            
+            if issues and EXTRACTION_MODE == "cascade":
+                print(f"  ⤴️ Escalating to reasoning prompt: {'; '.join(issues)}")
+                stats.escalations += 1
+                record_tier_decision("extraction", escalated=True)
+                stats.tokens_saved_est -= compact_tokens  # Wasted first-tier call
+                data = None
+            elif data is not None:
+                stats.compact_accepted += 1
+                record_tier_decision("extraction", escalated=False)
+                stats.tokens_saved_est += max(0, _reasoning_tokens_estimate() - compact_tokens)
+        
+        if data is None:
+            reasoning_usage = {}
+            data = await _call_extractor(EXTRACTION_PROMPT, sentence, reasoning_usage, task="extraction_reasoning")
+            tokens = reasoning_usage.get("prompt_tokens", 0) + reasoning_usage.get("completion_tokens", 0)
+            stats.tokens_used += tokens
+            _reasoning_usage["calls"] += 1
+            _reasoning_usage["tokens"] += tokens
         
         frame = Frame(
-            frame_id=f"F{sentence_id}",
+            frame_id=frame_id,
             sentence_id=sentence_id,
             sentence_text=sentence,
             kriya=data.get("kriya", "UNKNOWN"),
@@ -207,7 +624,7 @@ async def extract_frame(sentence_id: int, sentence: str) -> Frame:
         print(f"  ❌ Error type: {type(e).__name__}: {e}")
         traceback.print_exc()
         return Frame(
-            frame_id=f"F{sentence_id}",
+            frame_id=frame_id,
             sentence_id=sentence_id,
             sentence_text=sentence,
             kriya="EXTRACTION_FAILED",
@@ -215,27 +632,118 @@ async def extract_frame(sentence_id: int, sentence: str) -> Frame:
         )
 
 
-async def extract_frames(eventive_sentences: list[dict]) -> list[Frame]:
+async def _audit_if_needed(frame: Frame, stats: ExtractionStats) -> None:
+    """Validate locally; call the auditor LLM only when an invariant fails."""
+    issues = validate_frame(frame)
+    if not issues:
+        stats.audits_skipped += 1
+        return
+    
+    print(f"  🩺 {frame.frame_id} failed local checks: {'; '.join(map(str, issues))}")
+    if FRAME_AUDIT:
+        usage = {}
+        await audit_frame(frame, issues, usage=usage)
+        stats.audits_run += 1
+        stats.tokens_used += usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0)
+    
+    stats.ungrounded_dropped += len(drop_ungrounded(frame))
+
+
+async def extract_frames(
+    eventive_sentences: list[dict],
+    sentence_index: Optional[SentenceIndex] = None,
+    source: str = "inline",
+    stats: Optional[ExtractionStats] = None,
+) -> list[Frame]:
     """
     Extract frames from a list of eventive sentences.
     
+    Sentences already present in the sentence index reuse the stored frame
+    payload and only record a new occurrence; each distinct sentence is
+    returned once. Items marked "duplicate_of" (near-duplicates, see
+    eventive_filter) adapt their representative's frame when the diff allows.
+    
     Args:
         eventive_sentences: List of dicts with sentence_id, text, is_eventive
+        sentence_index: Content-addressed index shared across calls
+            (a transient one is used if omitted, deduping within this call)
+        source: Document identifier recorded with each occurrence
+        stats: Optional counters to fill in (skipped calls, failures)
     
     Returns:
         List of Frame objects
     """
+    from near_duplicates import adapt_frame
+    
+    index = sentence_index if sentence_index is not None else SentenceIndex(fingerprint=extraction_fingerprint())
+    stats = stats if stats is not None else ExtractionStats()
     frames = []
+    seen = set()
+    by_sentence_id: dict[int, Frame] = {}
+    
+    if EXTRACTION_MODE == "staged":
+        # Run the stage graph for every sentence that will need extraction up
+        # front, so sentences overlap within the per-stage limits; the loop
+        # below then reads the results from the stage cache.
+        pending = {
+            item["text"] for item in eventive_sentences
+            if item.get("is_eventive", False)
+            and item.get("duplicate_of") is None
+            and sentence_key(item["text"]) not in index
+        }
+        if pending:
+            usage = {}
+            await get_stage_pipeline().run_many(sorted(pending), usage=usage)
+            stats.tokens_used += usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0)
     
     for item in eventive_sentences:
         if not item.get("is_eventive", False):
             continue
+        stats.eventive_sentences += 1
         
-        frame = await extract_frame(
-            sentence_id=item["sentence_id"],
-            sentence=item["text"]
-        )
-        frames.append(frame)
+        key = sentence_key(item["text"])
+        occurrence = {"source": source, "sentence_id": item["sentence_id"]}
+        
+        payload = index.lookup(key)
+        if payload is not None:
+            frame = Frame(**payload)
+            index.add_occurrence(key, occurrence)
+            stats.reused_frames += 1
+            print(f"  ♻️ Reused frame {frame.frame_id} for sentence {item['sentence_id']}")
+        else:
+            frame = None
+            rep_frame = by_sentence_id.get(item.get("duplicate_of"))
+            if rep_frame is not None and rep_frame.kriya != "EXTRACTION_FAILED":
+                frame = adapt_frame(rep_frame, item["sentence_id"], item["text"])
+                issues = validate_extraction(frame.to_dict(), item["text"]) if frame is not None else []
+                if issues:
+                    print(f"  ⤴️ Adapted frame rejected, extracting: {'; '.join(issues)}")
+                    frame = None
+                elif frame is not None:
+                    stats.adapted_frames += 1
+                    print(f"  🧬 Adapted {rep_frame.frame_id} → {frame.frame_id} (near-duplicate)")
+            
+            if frame is None:
+                frame = await extract_frame(
+                    sentence_id=item["sentence_id"],
+                    sentence=item["text"],
+                    stats=stats
+                )
+                stats.llm_extractions += 1
+                if frame.kriya != "EXTRACTION_FAILED":
+                    await _audit_if_needed(frame, stats)
+            
+            if frame.kriya == "EXTRACTION_FAILED":
+                stats.failed += 1
+            else:
+                index.add(key, frame.to_dict(), occurrence)
+        
+        by_sentence_id[item["sentence_id"]] = frame
+        if frame.frame_id not in seen:
+            seen.add(frame.frame_id)
+            frames.append(frame)
     
-    print(f"\n🎯 Extracted {len(frames)} frames")
+    print(f"\n🎯 Extracted {len(frames)} frames "
+          f"({stats.llm_extractions} LLM calls, {stats.reused_frames} reused, "
+          f"{stats.adapted_frames} adapted, {stats.escalations} escalated)")
     return frames
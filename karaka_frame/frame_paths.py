@@ -0,0 +1,283 @@
+"""
+Frame Paths for Kāraka Frame Graph POC.
+How two frames are connected: the shortest chains of frames between them
+over
+
+    causal      cause_frame → effect_frame links (causal_index), followed
+                either way; each step keeps its direction
+    identity    frame ─ ≡ frame ─ frame, through entities an identity
+                assertion equates (entity_equivalence)
+
+Shortest paths come from a bidirectional breadth-first search that grows
+the smaller frontier; the k shortest simple paths from Yen's algorithm,
+each spur search bidirectional as well. Searches are bounded by a hop
+count and a fan-out per frame, and a causal-only search between two
+frames in different causal components ends without expanding anything.
+"""
+
+import heapq
+import os
+from dataclasses import dataclass, field
+from typing import Optional
+
+from frame_extractor import Frame
+from frame_store import FrameReader, IDENTITY_SYMBOL, identity_arguments
+
+# Defaults of /api/path and qa_engine.find_paths
+PATH_MAX_HOPS = int(os.getenv("PATH_MAX_HOPS", "6"))
+PATH_K = int(os.getenv("PATH_K", "3"))
+# Links followed from one frame during a path search
+PATH_FAN_OUT = int(os.getenv("PATH_FAN_OUT", "32"))
+
+# Relation filters: "causal" (any causal_type), a causal_type, or "identity"
+CAUSAL = "causal"
+IDENTITY = "identity"
+
+_FLIP = {"→": "←", "←": "→", "≡": "≡"}
+
+
+@dataclass
+class PathStep:
+    """One link of a path, read from source to target."""
+    source: str
+    target: str
+    relation: str       # causal_type ("causal" when untyped) or "identity"
+    direction: str      # "→" source causes target, "←" target causes source, "≡" identity
+
+    def to_dict(self) -> dict:
+        return {"from": self.source, "to": self.target, "relation": self.relation, "direction": self.direction}
+
+
+@dataclass
+class FramePath:
+    """Ordered chain of frames from a source frame to a target frame."""
+    frame_ids: list[str]
+    steps: list[PathStep] = field(default_factory=list)
+
+    @property
+    def hops(self) -> int:
+        return len(self.steps)
+
+    def chain(self) -> str:
+        """F0 —karana→ F1 ≡ I1 ≡ F7"""
+        parts = [self.frame_ids[0]]
+        for step in self.steps:
+            if step.direction == "≡":
+                parts.append(f"≡ {step.target}")
+            elif step.direction == "→":
+                parts.append(f"—{step.relation}→ {step.target}")
+            else:
+                parts.append(f"←{step.relation}— {step.target}")
+        return " ".join(parts)
+
+    def to_dict(self) -> dict:
+        return {
+            "hops": self.hops,
+            "frame_ids": self.frame_ids,
+            "steps": [step.to_dict() for step in self.steps],
+            "chain": self.chain(),
+        }
+
+
+class PathFinder:
+    """Path searches over one reader (a store snapshot)."""
+
+    def __init__(self, reader: FrameReader, relations: Optional[set] = None, fan_out: int = PATH_FAN_OUT):
+        """
+        Args:
+            reader: Store or snapshot to search
+            relations: Links to follow: "causal", causal_type values and / or
+                "identity" (None: all)
+            fan_out: Links followed from one frame
+        """
+        self.reader = reader
+        self.relations = set(relations) if relations else None
+        self.fan_out = fan_out
+        self.causal = reader._causal_index()
+        self._neighbours: dict[str, list[tuple[str, str, str]]] = {}
+        self.expanded = 0
+
+    # ------------------------------------------------------------- adjacency
+
+    def _follows(self, relation: str) -> bool:
+        relations = self.relations
+        if relations is None:
+            return True
+        if relation == IDENTITY:
+            return IDENTITY in relations
+        return CAUSAL in relations or relation in relations
+
+    def neighbours(self, frame_id: str) -> list[tuple[str, str, str]]:
+        """(frame_id, relation, direction) one link away (memoized per search)."""
+        found = self._neighbours.get(frame_id)
+        if found is not None:
+            return found
+        self.expanded += 1
+        found, seen = [], {frame_id}
+        for other, relation, side in self.causal.neighbours(frame_id, self.reader.version):
+            relation = relation or CAUSAL
+            if other not in seen and self._follows(relation):
+                seen.add(other)
+                found.append((other, relation, "→" if side == "out" else "←"))
+        if self._follows(IDENTITY):
+            for other in self._identity_neighbours(frame_id):
+                if other not in seen:
+                    seen.add(other)
+                    found.append((other, IDENTITY, "≡"))
+        found = found[:self.fan_out]
+        self._neighbours[frame_id] = found
+        return found
+
+    def _identity_neighbours(self, frame_id: str) -> list[str]:
+        """≡ frames equating an entity of the frame; for a ≡ frame, frames mentioning what it equates."""
+        frame = self.reader.get_frame(frame_id)
+        if frame is None:
+            return []
+        reader = self.reader
+        if frame.kriya == IDENTITY_SYMBOL:
+            return [
+                other.frame_id for entity in identity_arguments(frame)
+                for other in reader.find_by_entity(entity, equivalent=False)
+            ]
+        found = []
+        for _, value in frame.role_items():
+            entity = value.lower().strip()
+            if len(reader.equivalent_entities(entity)) < 2:
+                continue  # No identity mentions it
+            found.extend(
+                other.frame_id for other in reader.find_by_entity(entity, equivalent=False)
+                if other.kriya == IDENTITY_SYMBOL
+            )
+        return found
+
+    # --------------------------------------------------------------- searches
+
+    def shortest(
+        self,
+        source: str,
+        target: str,
+        max_hops: int = PATH_MAX_HOPS,
+        blocked_nodes: frozenset = frozenset(),
+        blocked_edges: frozenset = frozenset(),
+    ) -> Optional[FramePath]:
+        """
+        Shortest path by bidirectional breadth-first search.
+
+        Args:
+            source: Frame ID to start from
+            target: Frame ID to reach
+            max_hops: Longest path accepted
+            blocked_nodes: Frames the path may not pass through
+            blocked_edges: (frame, frame) links the path may not use
+
+        Returns:
+            The path, or None if there is none within max_hops
+        """
+        if source == target:
+            return FramePath([source])
+        if self.relations is not None and IDENTITY not in self.relations:
+            if self.causal.connected(source, target, self.reader.version) is False:
+                return None
+
+        # frame -> (previous frame, relation, direction from previous), and depth
+        sides = [({source: None}, {source: 0}, [source]), ({target: None}, {target: 0}, [target])]
+        depths = [0, 0]
+        while sides[0][2] and sides[1][2] and depths[0] + depths[1] < max_hops:
+            forward = 0 if len(sides[0][2]) <= len(sides[1][2]) else 1
+            parents, depth, frontier = sides[forward]
+            other_parents, other_depth, _ = sides[1 - forward]
+            depths[forward] += 1
+            next_frontier, best = [], None
+            for node in frontier:
+                for neighbour, relation, direction in self.neighbours(node):
+                    if neighbour in parents or neighbour in blocked_nodes:
+                        continue
+                    if (node, neighbour) in blocked_edges or (neighbour, node) in blocked_edges:
+                        continue
+                    parents[neighbour] = (node, relation, direction)
+                    depth[neighbour] = depths[forward]
+                    next_frontier.append(neighbour)
+                    if neighbour in other_parents:
+                        length = depths[forward] + other_depth[neighbour]
+                        if best is None or length < best[0]:
+                            best = (length, neighbour)
+            sides[forward] = (parents, depth, next_frontier)
+            if best is not None:
+                return self._join(sides[0][0], sides[1][0], best[1])
+        return None
+
+    @staticmethod
+    def _join(forward: dict, backward: dict, meet: str) -> FramePath:
+        """Path through the frame where the two searches met."""
+        frame_ids, steps = [meet], []
+        node = meet
+        while forward[node] is not None:
+            previous, relation, direction = forward[node]
+            frame_ids.append(previous)
+            steps.append(PathStep(previous, node, relation, direction))
+            node = previous
+        frame_ids.reverse()
+        steps.reverse()
+        node = meet
+        while backward[node] is not None:
+            following, relation, direction = backward[node]
+            frame_ids.append(following)
+            steps.append(PathStep(node, following, relation, _FLIP[direction]))
+            node = following
+        return FramePath(frame_ids, steps)
+
+    def k_shortest(
+        self, source: str, target: str, k: int = PATH_K, max_hops: int = PATH_MAX_HOPS
+    ) -> list[FramePath]:
+        """
+        Up to k shortest simple paths, shortest first (Yen's algorithm).
+
+        Args:
+            source: Frame ID to start from
+            target: Frame ID to reach
+            k: Number of paths
+            max_hops: Longest path accepted
+        """
+        first = self.shortest(source, target, max_hops)
+        if first is None or k <= 0:
+            return []
+        found = [first]
+        seen = {tuple(first.frame_ids)}
+        candidates: list[tuple[int, int, FramePath]] = []
+        counter = 0
+        while len(found) < k:
+            last = found[-1]
+            for i in range(last.hops):
+                root = last.frame_ids[:i + 1]
+                blocked_edges = frozenset(
+                    (path.frame_ids[i], path.frame_ids[i + 1]) for path in found
+                    if path.hops > i and path.frame_ids[:i + 1] == root
+                )
+                spur = self.shortest(root[-1], target, max_hops - i, frozenset(root[:-1]), blocked_edges)
+                if spur is None:
+                    continue
+                path = FramePath(root + spur.frame_ids[1:], last.steps[:i] + spur.steps)
+                key = tuple(path.frame_ids)
+                if key not in seen:
+                    seen.add(key)
+                    counter += 1
+                    heapq.heappush(candidates, (path.hops, counter, path))
+            if not candidates:
+                break
+            found.append(heapq.heappop(candidates)[2])
+        return found
+
+    def get_stats(self) -> dict:
+        return {"frames_expanded": self.expanded}
+
+
+def path_frames(paths: list[FramePath], reader: FrameReader) -> list[Frame]:
+    """Frames of the paths, each once, in path order."""
+    frames = {}
+    for path in paths:
+        for frame_id in path.frame_ids:
+            if frame_id not in frames:
+                frame = reader.get_frame(frame_id)
+                if frame is not None:
+                    frames[frame_id] = frame
+    return list(frames.values())
@@ -1,36 +1,485 @@
 """
 Frame Store for Kāraka Frame Graph POC.
-In-memory storage with JSON persistence.
+A memory-mapped columnar snapshot (see columnar_snapshot) plus an in-memory
+delta of frames added since, persisted by a write-ahead log (see frame_wal),
+and canonical-event embeddings in a float16 matrix (see vector_matrix).
+Reads go through versioned, snapshot-isolated views.
 """
 
 import json
+import os
+import sys
+import threading
+import uuid
+from collections import deque
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional
-from dataclasses import asdict
+
+import numpy as np
 from frame_extractor import Frame
+from frame_wal import FrameLog
+from trigram_index import TrigramIndex
+from columnar_snapshot import ColumnarSnapshot, write_snapshot
+from embeddings import get_embedder
+from vector_matrix import VectorMatrix
+from ann_index import IVFIndex
+from graph_view import GraphView, entity_node, frame_graph
+from entity_equivalence import EquivalenceClasses
+from inverted_index import InvertedIndex, SEARCH_TOP_K
+from causal_index import CausalIndex, CAUSAL_EXPAND_LIMIT, CAUSAL_FAN_OUT, CAUSAL_HOPS
+
+# Role names accepted by find_by_role → Frame attribute
+ROLE_ATTR_MAP = {
+    "karta": "karta", "kartā": "karta", "agent": "karta",
+    "karma": "karma", "object": "karma",
+    "karana": "karana", "karaṇa": "karana", "instrument": "karana",
+    "sampradana": "sampradana", "sampradāna": "sampradana", "recipient": "sampradana",
+    "apadana": "apadana", "apādāna": "apadana", "source": "apadana",
+    "time": "locus_time", "locus_time": "locus_time",
+    "space": "locus_space", "locus_space": "locus_space", "place": "locus_space",
+    "topic": "locus_topic", "locus_topic": "locus_topic",
+}
+
+# Version stamp of frames that are not (or no longer) visible
+_NEVER = sys.maxsize
+
+# L1 system symbols (research-proposal/executable-storage-schema.md). A
+# frame's arguments are its role fillers in ROLE_FIELDS order, so a derive
+# frame is [conclusion, evidence...] in karta, karma, karana, ...
+IDENTITY_SYMBOL = "≡"
+DERIVE_SYMBOL = "derive"
+RETRACT_SYMBOL = "RETRACT_IDENTITY"
+TRACE_SYMBOL = "trace"
+
+
+def frame_arguments(frame: Frame) -> list[str]:
+    """L0 argument list of a frame (its role fillers, in ROLE_FIELDS order)."""
+    return [value for _, value in frame.role_items()]
 
 
-class FrameStore:
+def identity_arguments(frame: Frame) -> list[str]:
+    """Normalized entities an identity (≡) frame equates."""
+    return [value.lower().strip() for value in frame_arguments(frame)]
+
+
+class FrameReader:
     """
-    Simple in-memory frame store with optional JSON persistence.
+    Read API shared by the frame store backends and their snapshots.
+    Exports are built on get_all_frames() and _entity_keys(), so they see
+    one consistent state.
     """
     
-    def __init__(self, persist_path: Optional[str] = None):
+    version: int = 0
+    _equivalence: Optional[EquivalenceClasses] = None  # identity classes (see entity_equivalence)
+    
+    def __len__(self) -> int:
+        raise NotImplementedError
+    
+    def get_frame(self, frame_id: str) -> Optional[Frame]:
+        raise NotImplementedError
+    
+    def get_all_frames(self) -> list[Frame]:
+        raise NotImplementedError
+    
+    def _find_entity(self, normalized: str) -> list[Frame]:
+        """Frames mentioning exactly this normalized entity."""
+        raise NotImplementedError
+    
+    def find_by_entity(self, entity: str, equivalent: bool = True) -> list[Frame]:
         """
-        Initialize the frame store.
+        Find all frames mentioning an entity.
         
         Args:
-            persist_path: Optional path to JSON file for persistence
+            entity: Entity text (normalized: lowercase, stripped)
+            equivalent: Also match entities equated with it by identity
+                (≡) frames
         """
-        self.frames: dict[str, Frame] = {}
-        self.vectors: dict[str, list[float]] = {}  # Mock vector store: frame_id -> embedding
-        self.entities: dict[str, set[str]] = {}  # entity -> frame_ids
-        self.kriyas: dict[str, set[str]] = {}    # kriya -> frame_ids
-        self.persist_path = Path(persist_path) if persist_path else None
+        normalized = entity.lower().strip()
+        members = self.equivalent_entities(normalized) if equivalent else [normalized]
+        if len(members) == 1:
+            return self._find_entity(normalized)
+        found = {}
+        for member in members:
+            for frame in self._find_entity(member):
+                found.setdefault(frame.frame_id, frame)
+        return list(found.values())
+    
+    def equivalent_entities(self, entity: str) -> list[str]:
+        """
+        Normalized entities in the same identity class as entity (itself
+        included). Served by the store's union-find when it is current for
+        this reader's version, else by walking the ≡ frames visible here.
+        """
+        normalized = entity.lower().strip()
+        classes = self._equivalence
+        if classes is not None:
+            changed = classes.changed
+            if changed <= self.version:
+                members = classes.members(normalized)
+                if classes.changed == changed:  # No write raced the lookup
+                    return members
+        return self._identity_closure(normalized)
+    
+    def _identity_closure(self, normalized: str) -> list[str]:
+        """Identity class by breadth-first search over visible ≡ frames."""
+        members = {normalized: None}
+        queue = deque([normalized])
+        while queue:
+            for frame in self._find_entity(queue.popleft()):
+                if frame.kriya != IDENTITY_SYMBOL:
+                    continue
+                for argument in identity_arguments(frame):
+                    if argument not in members:
+                        members[argument] = None
+                        queue.append(argument)
+        return list(members)
+    
+    def find_by_kriya(self, kriya: str) -> list[Frame]:
+        raise NotImplementedError
+    
+    def find_by_role(self, role: str, value: str) -> list[Frame]:
+        raise NotImplementedError
+    
+    def _entity_keys(self) -> list[str]:
+        """All normalized entity keys (graph entity nodes)."""
+        raise NotImplementedError
+    
+    def _frame_ids(self) -> list[str]:
+        """All frame IDs, in get_all_frames() order."""
+        raise NotImplementedError
+    
+    def _search_index(self) -> InvertedIndex:
+        """Keyword index to rank with (readers without a store index build one)."""
+        index = InvertedIndex()
+        index.build(self.get_all_frames())
+        return index
+    
+    def search(
+        self, kriya_terms: list[str], entity_terms: list[str], k: int = SEARCH_TOP_K
+    ) -> list[tuple[Frame, float]]:
+        """
+        Top-k frames by BM25 over kriyā lemmas, role fillers and sentence
+        tokens (see inverted_index).
         
-        # Load existing data if persist file exists
-        if self.persist_path and self.persist_path.exists():
-            self._load()
+        Args:
+            kriya_terms: Verb keywords
+            entity_terms: Entity keywords
+            k: Number of results
+        
+        Returns:
+            [(frame, score)], best first
+        """
+        results = []
+        for frame_id, score in self._search_index().search(kriya_terms, entity_terms, self.version, k):
+            frame = self.get_frame(frame_id)
+            if frame is not None:
+                results.append((frame, score))
+        return results
+    
+    def _causal_index(self) -> CausalIndex:
+        """Causal adjacency to expand over (readers without a store index build one)."""
+        index = CausalIndex()
+        index.build(self.get_all_frames())
+        return index
+    
+    def expand_causal(
+        self,
+        frames: list[Frame],
+        hops: int = CAUSAL_HOPS,
+        fan_out: int = CAUSAL_FAN_OUT,
+        limit: Optional[int] = CAUSAL_EXPAND_LIMIT,
+        relations: Optional[set] = None,
+    ) -> list[Frame]:
+        """
+        Frames within a number of causal links of frames, in either
+        direction (see causal_index).
+        
+        Args:
+            frames: Frames to start from (not returned)
+            hops: Maximum links followed
+            fan_out: Maximum new frames taken from one frame's links
+            limit: Maximum frames returned (None: no limit)
+            relations: causal_type values to follow (None: all)
+        
+        Returns:
+            Reached frames, nearest first
+        """
+        reached = self._causal_index().expand(
+            [f.frame_id for f in frames], self.version, hops, fan_out, limit, relations=relations
+        )
+        found = []
+        for frame_id, depth in reached.items():
+            frame = self.get_frame(frame_id) if depth else None
+            if frame is not None:
+                found.append(frame)
+        return found
+    
+    def causally_reaches(self, cause_id: str, effect_id: str) -> bool:
+        """Whether a chain of causal links leads from one frame to another."""
+        return self._causal_index().reaches(cause_id, effect_id, self.version)
+    
+    def to_json(self) -> str:
+        """Export all frames as JSON."""
+        return json.dumps(
+            [f.to_dict() for f in self.get_all_frames()],
+            indent=2
+        )
+    
+    def to_graph_data(self) -> dict:
+        """
+        Export as graph visualization data.
+        Returns nodes and edges for visualization (same IDs as GraphView).
+        """
+        nodes = {}
+        edges = []
+        for frame in self.get_all_frames():
+            event, frame_edges = frame_graph(frame)
+            nodes[event["id"]] = event
+            for entity_key, edge in frame_edges:
+                if edge["source"] not in nodes:
+                    nodes[edge["source"]] = entity_node(entity_key)
+                edges.append(edge)
+        return {"version": self.version, "nodes": list(nodes.values()), "edges": edges}
+    
+    def _get_entities(self, frame: Frame) -> list[str]:
+        """Extract all entity mentions from a frame."""
+        return [value for _, value in frame.role_items() if value]
+
+
+class FrameStoreView(FrameReader):
+    """
+    Immutable view of a FrameStore at one committed version.
+    
+    Writes made after the view was taken carry higher version stamps and are
+    filtered out; frames they replaced or deleted stay readable from the
+    store's history while a registered view is open. Compaction and clear()
+    swap the store's containers rather than mutating them, so a view keeps
+    reading the generation it was taken from.
+    """
+    
+    def __init__(self, store: "FrameStore", version: int, registered: bool = False):
+        self.version = version
+        self._store = store if registered else None
+        with store._swap_lock:
+            self.base = store.base
+            self._base_dead = store._base_dead
+            self._frames = store.frames
+            self._added = store._added
+            self._history = store._history
+            self._entities = store.entities
+            self._kriyas = store.kriyas
+            self._role_index = store.role_index
+            self._equivalence = store._equivalence
+            self._search = store._search
+            self._causal = store._causal
+    
+    def release(self) -> None:
+        """Let the store drop history kept for this view."""
+        if self._store is not None:
+            self._store._release(self.version)
+            self._store = None
+    
+    def __enter__(self) -> "FrameStoreView":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.release()
+    
+    # ------------------------------------------------------------- visibility
+    
+    def _base_live(self, row: int) -> bool:
+        dead = self._base_dead.get(row)
+        return dead is None or dead > self.version
+    
+    def _base_frames(self, rows) -> list[Frame]:
+        """Materialize snapshot rows live at this version."""
+        return [self.base.frame(int(row)) for row in rows if self._base_live(int(row))]
+    
+    def _delta(self, frame_ids) -> list[Frame]:
+        """Delta frames among frame_ids that were added by this version."""
+        version, added, frames = self.version, self._added, self._frames
+        found = []
+        for fid in list(frame_ids):
+            frame = frames.get(fid)
+            if frame is not None and added.get(fid, _NEVER) <= version:
+                found.append(frame)
+        return found
+    
+    def _old_versions(self, frame_id: Optional[str] = None) -> list[Frame]:
+        """Replaced or deleted delta frames still current at this version."""
+        if not self._history:
+            return []
+        entries = (
+            self._history.get(frame_id, []) if frame_id is not None
+            else [e for entries in list(self._history.values()) for e in entries]
+        )
+        return [frame for frame, added, removed in list(entries) if added <= self.version < removed]
+    
+    def _live_mask(self) -> Optional[np.ndarray]:
+        """Snapshot rows live at this version (None when none are masked)."""
+        dead = [row for row, v in list(self._base_dead.items()) if v <= self.version]
+        if not dead:
+            return None
+        live = np.ones(self.base.count, dtype=bool)
+        live[dead] = False
+        return live
+    
+    # ------------------------------------------------------------------ reads
+    
+    def __len__(self) -> int:
+        count = 0
+        if self.base is not None:
+            count = self.base.count - sum(1 for v in list(self._base_dead.values()) if v <= self.version)
+        count += sum(1 for v in list(self._added.values()) if v <= self.version)
+        return count + len(self._old_versions())
+    
+    def _iter_frames(self):
+        """All frames: live snapshot rows in order, then the delta."""
+        if self.base is not None:
+            for row in range(self.base.count):
+                if self._base_live(row):
+                    yield self.base.frame(row)
+        yield from self._delta(self._frames)
+        yield from self._old_versions()
+    
+    def _frame_ids(self) -> list[str]:
+        """All frame IDs, in get_all_frames() order."""
+        base_ids = [
+            self.base.frame_id(row) for row in range(self.base.count)
+            if self._base_live(row)
+        ] if self.base else []
+        return base_ids + [f.frame_id for f in self._delta(self._frames)] + [
+            f.frame_id for f in self._old_versions()
+        ]
+    
+    def get_frame(self, frame_id: str) -> Optional[Frame]:
+        """Get a frame by ID."""
+        delta = self._delta([frame_id]) or self._old_versions(frame_id)
+        if delta:
+            return delta[0]
+        if self.base is not None:
+            row = self.base.row_of(frame_id)
+            if row >= 0 and self._base_live(row):
+                return self.base.frame(row)
+        return None
+    
+    def get_all_frames(self) -> list[Frame]:
+        """Get all frames."""
+        return list(self._iter_frames())
+    
+    def _find_entity(self, normalized: str) -> list[Frame]:
+        base = self._base_frames(self.base.entity_rows(normalized)) if self.base else []
+        return base + self._delta(self._entities.get(normalized, ())) + [
+            f for f in self._old_versions()
+            if normalized in {e.lower().strip() for e in self._get_entities(f)}
+        ]
+    
+    def find_by_kriya(self, kriya: str) -> list[Frame]:
+        """Find all frames with a specific kriya."""
+        normalized = kriya.lower().strip()
+        base = self._base_frames(self.base.kriya_rows(normalized)) if self.base else []
+        return base + self._delta(self._kriyas.get(normalized, ())) + [
+            f for f in self._old_versions() if f.kriya.lower().strip() == normalized
+        ]
+    
+    def find_by_role(self, role: str, value: str) -> list[Frame]:
+        """
+        Find frames where a specific role's value contains the given text
+        (case-insensitive), via the snapshot's and the delta's trigram indexes.
+        """
+        attr = ROLE_ATTR_MAP.get(role.lower())
+        if not attr:
+            return []
+        
+        base = self._base_frames(self.base.role_rows(attr, value)) if self.base else []
+        return base + self._delta(self._role_index.lookup(attr, value)) + [
+            f for f in self._old_versions()
+            if getattr(f, attr) and value.lower() in getattr(f, attr).lower()
+        ]
+    
+    def _visible_keys(self, index: dict[str, set[str]]) -> list[str]:
+        version, added = self.version, self._added
+        return [
+            key for key, frame_ids in list(index.items())
+            if any(added.get(fid, _NEVER) <= version for fid in list(frame_ids))
+        ]
+    
+    def _entity_keys(self) -> list[str]:
+        """All normalized entity keys (graph entity nodes)."""
+        base = self.base.entity_keys(self._live_mask()) if self.base else []
+        old = [e.lower().strip() for f in self._old_versions() for e in self._get_entities(f)]
+        return list(dict.fromkeys(base + self._visible_keys(self._entities) + old))
+    
+    def _kriya_keys(self) -> list[str]:
+        base = self.base.kriya_keys(self._live_mask()) if self.base else []
+        old = [f.kriya.lower().strip() for f in self._old_versions()]
+        return list(dict.fromkeys(base + self._visible_keys(self._kriyas) + old))
+    
+    def _search_index(self) -> InvertedIndex:
+        if self._search is None and self._store is not None:
+            index = self._store.search_index
+            # Built after this view was taken: fall back to a private index
+            self._search = index if index.built <= self.version else super()._search_index()
+        return self._search if self._search is not None else super()._search_index()
+    
+    def _causal_index(self) -> CausalIndex:
+        if self._causal is None and self._store is not None:
+            index = self._store.causal_index
+            self._causal = index if index.built <= self.version else super()._causal_index()
+        return self._causal if self._causal is not None else super()._causal_index()
+
+
+class FrameEmbeddings:
+    """
+    Canonical-event embeddings shared by the frame store backends. Frames
+    are queued on write and embedded in batches by embed_pending(); vectors
+    live in a float16 VectorMatrix next to the store, searched through an
+    IVF index. Both are opened on first use, so startup does not read them.
+    
+    Backends call _init_embeddings() and provide get_frame() and _frame_ids().
+    """
+    
+    def _init_embeddings(self, persist_path: Optional[Path]) -> None:
+        """Canonical-event embeddings: float16 matrix (memory-mapped when persisted)."""
+        self.embedder = get_embedder()
+        self._vector_path = str(persist_path) + ".vec" if persist_path else None
+        self._ann: Optional[IVFIndex] = None
+        self._stale_vectors: set[str] = set()  # removed before the matrix was opened
+        self._pending_embeddings: dict[str, str] = {}  # frame_id -> canonical text
+        self._embeddings_synced = False  # stored frames checked for missing vectors
+    
+    @property
+    def ann(self) -> IVFIndex:
+        """ANN index over the embeddings (owns all writes to the matrix)."""
+        if self._ann is None:
+            self._ann = IVFIndex(VectorMatrix(
+                self.embedder.dim, path=self._vector_path, model=self.embedder.name
+            ))
+            for frame_id in self._stale_vectors:
+                self._ann.remove(frame_id)
+            self._stale_vectors.clear()
+        return self._ann
+    
+    @property
+    def embeddings(self) -> VectorMatrix:
+        return self.ann.matrix
+    
+    def _queue_embedding(self, frame: Frame) -> None:
+        self._pending_embeddings[frame.frame_id] = self._compute_canonical_text(frame)
+    
+    def _drop_vector(self, frame_id: str) -> None:
+        self._pending_embeddings.pop(frame_id, None)
+        if self._ann is None:
+            self._stale_vectors.add(frame_id)
+        else:
+            self._ann.remove(frame_id)
+    
+    def _queue_missing_embeddings(self) -> None:
+        """Queue stored frames that have no vector yet (new store or model change)."""
+        for frame_id in self._frame_ids():
+            if frame_id not in self.embeddings and frame_id not in self._pending_embeddings:
+                self._queue_embedding(self.get_frame(frame_id))
     
     def _compute_canonical_text(self, frame: Frame) -> str:
         """
@@ -44,206 +493,1005 @@ class FrameStore:
         # Add Agent (Kartā)
         if frame.karta:
             text = f"{frame.karta} {text}"
-            
+        
         # Add Object (Karma)
         if frame.karma:
             text = f"{text} {frame.karma}"
-            
+        
         # Add Instrument/Locus for context
         if frame.karana: text += f" using {frame.karana}"
         if frame.locus_topic: text += f" about {frame.locus_topic}"
         
         return text
+    
+    async def embed_pending(self) -> int:
+        """
+        Embed the canonical texts of frames added since the last call, in
+        batches through the configured embedder. The first call also queues
+        stored frames that have no vector yet.
+        
+        Returns:
+            Number of frames embedded
+        """
+        if not self._embeddings_synced:
+            self._embeddings_synced = True
+            self._queue_missing_embeddings()
+        if not self._pending_embeddings:
+            return 0
+        pending = dict(self._pending_embeddings)
+        frame_ids = list(pending)
+        try:
+            vectors = await self.embedder.embed([pending[fid] for fid in frame_ids])
+        except Exception as e:
+            print(f"⚠️ Embedding failed, {len(frame_ids)} frames stay queued: {e}")
+            return 0
+        # Frames removed or re-added while the batch was in flight keep their new state
+        done = [i for i, fid in enumerate(frame_ids)
+                if self._pending_embeddings.get(fid) == pending[fid]]
+        self.ann.add([frame_ids[i] for i in done], vectors[done])
+        for i in done:
+            del self._pending_embeddings[frame_ids[i]]
+        return len(done)
+    
+    async def semantic_search(self, query: str, k: int = 10) -> list[tuple[Frame, float]]:
+        """Frames whose canonical-event embedding is closest to the query text."""
+        await self.embed_pending()
+        query_vec = (await self.embedder.embed([query], input_type="query"))[0]
+        results = []
+        for frame_id, score in self.ann.search(query_vec, k):
+            frame = self.get_frame(frame_id)
+            if frame is not None:
+                results.append((frame, score))
+        return results
+    
+    def _clear_embeddings(self) -> None:
+        self.ann.clear()
+        self._pending_embeddings.clear()
+        self._stale_vectors.clear()
+    
+    def _flush_embeddings(self) -> None:
+        if self._ann is not None:
+            self._ann.matrix.flush()
+    
+    def _close_embeddings(self) -> None:
+        """Let a running ANN training finish, then persist the index and matrix."""
+        if self._ann is not None:
+            self._ann.wait()
+            self._ann.save()
+            self._ann.matrix.close()
+    
+    def _embedding_stats(self) -> dict:
+        """The "embeddings" and "ann" stats sections, once the matrix is open."""
+        if self._ann is None:
+            return {}
+        return {
+            "embeddings": {**self._ann.matrix.get_stats(), "pending": len(self._pending_embeddings)},
+            "ann": self._ann.get_stats(),
+        }
 
-    def add_frame(self, frame: Frame) -> None:
-        """Add a frame to the store."""
-        self.frames[frame.frame_id] = frame
+
+class FrameGraph:
+    """
+    Incrementally maintained visualization graph shared by the frame store
+    backends. Built from a snapshot on first use, then updated by the
+    backend's write paths with each change's version.
+
+    Backends provide _lock (held by writers), version and snapshot(), and
+    set self._graph = None.
+    """
+    
+    @property
+    def graph(self) -> GraphView:
+        """Visualization graph, built on first use and then kept current by writes."""
+        with self._lock:
+            if self._graph is None:
+                with self.snapshot() as snapshot:
+                    graph = GraphView()
+                    graph.build(snapshot.get_all_frames(), snapshot.version)
+                self._graph = graph
+            return self._graph
+    
+    def to_graph_data(self) -> dict:
+        """Export as graph visualization data (incrementally maintained)."""
+        with self._lock:
+            return self.graph.to_graph_data(self.version)
+    
+    def graph_delta(self, since: int) -> dict:
+        """
+        Graph changes committed after version `since`.
         
-        # Compute "Canonical Event Embedding"
-        # In a real deployment, call: client.embeddings.create(input=self._compute_canonical_text(frame))
-        # Here we mock it or store the text for now
-        self.vectors[frame.frame_id] = [0.0] * 384 # Placeholder 384-dim vector
+        Args:
+            since: Version of the graph the client holds
         
-        # Index by kriya (lowercase for consistent matching)
-        kriya_key = frame.kriya.lower().strip()
+        Returns:
+            Added and removed nodes / edges, or the full graph if `since`
+            is older than the change log
+        """
+        with self._lock:
+            return self.graph.delta(since, self.version)
+    
+    def _graph_stats(self) -> dict:
+        """The "graph" stats section, once the graph is built."""
+        return {"graph": self._graph.get_stats()} if self._graph is not None else {}
+
+
+class FrameRetraction:
+    """
+    Frame and identity retraction (research-proposal/executable-storage-
+    schema.md) shared by the frame store backends. Retracted frames are
+    kept but hidden from every read; the cascade visits only dependents,
+    found through the entity index (argument → frames).
+
+    Backends provide _lock, _current() (a reader that includes the open
+    write batch), _commit_retraction(), get_retracted() and flush().
+    """
+    
+    _writing: Optional[int] = None  # Version of the open write batch, if any
+    
+    def _dependents(self, reader: FrameReader, argument: str) -> list[Frame]:
+        """
+        Active frames with `argument` among their arguments, via the entity
+        index (argument → frames, normalized) and an exact check.
+        """
+        return [
+            frame for frame in reader.find_by_entity(argument, equivalent=False)
+            if argument in frame_arguments(frame)
+        ]
+    
+    def _retraction_closure(self, frame_id: str) -> list[Frame]:
+        """
+        A frame plus everything its retraction invalidates: derive frames
+        that use a retracted frame as an argument, and derived conclusions
+        left without an active derive frame. Only dependents are visited.
+        """
+        reader = self._current()
+        frame = reader.get_frame(frame_id)
+        if frame is None:
+            return []
+        closure = {frame_id: frame}
+        queue = deque([frame])
+        while queue:
+            frame = queue.popleft()
+            for dependent in self._dependents(reader, frame.frame_id):
+                if dependent.kriya == DERIVE_SYMBOL and dependent.frame_id not in closure:
+                    closure[dependent.frame_id] = dependent
+                    queue.append(dependent)
+            
+            arguments = frame_arguments(frame)
+            if frame.kriya != DERIVE_SYMBOL or not arguments or arguments[0] in closure:
+                continue
+            conclusion = reader.get_frame(arguments[0])
+            if conclusion is None:
+                continue  # Conclusion is an entity, not a frame
+            supported = any(
+                d.kriya == DERIVE_SYMBOL and d.frame_id not in closure
+                and frame_arguments(d)[0] == conclusion.frame_id
+                for d in self._dependents(reader, conclusion.frame_id)
+            )
+            if not supported:
+                closure[conclusion.frame_id] = conclusion
+                queue.append(conclusion)
+        return list(closure.values())
+    
+    def retract(self, frame_id: str, cascade: bool = True, flush: bool = True) -> list[str]:
+        """
+        Mark a frame inactive (kept, but hidden from all reads) and cascade
+        to the derivations that depend on it, as one version.
+        
+        Args:
+            frame_id: Frame to retract
+            cascade: Also retract dependent derive frames and their
+                unsupported conclusions
+            flush: Commit before returning (see add_frames); ignored inside
+                an open write batch, which commits as a whole
+        
+        Returns:
+            IDs of the retracted frames (empty if the frame is not active)
+        """
+        with self._lock:
+            if cascade:
+                frames = self._retraction_closure(frame_id)
+            else:
+                frames = [f for f in [self._current().get_frame(frame_id)] if f is not None]
+            self._commit_retraction(frames, [])
+        if flush and self._writing is None:
+            self.flush()
+        return [frame.frame_id for frame in frames]
+    
+    def retract_identity(
+        self, identity_id: str, reason: str = "", source: str = "user", flush: bool = True
+    ) -> str:
+        """
+        Retract an identity hypothesis (≡ frame): deactivate it, assert a
+        RETRACT_IDENTITY frame, cascade to dependent derivations and add a
+        trace frame, all in one version.
+        
+        Args:
+            identity_id: ID of the ≡ frame
+            reason: Why it was retracted (kept in the trace frame)
+            source: Who retracted it
+            flush: Commit before returning (as for retract)
+        
+        Returns:
+            ID of the RETRACT_IDENTITY frame
+        """
+        with self._lock:
+            identity = self._current().get_frame(identity_id)
+            if identity is None or identity.kriya != IDENTITY_SYMBOL:
+                raise ValueError(f"No active identity frame {identity_id!r}")
+            frames = self._retraction_closure(identity_id)
+            retraction = Frame(
+                frame_id=str(uuid.uuid4()), sentence_id=-1, sentence_text=source,
+                kriya=RETRACT_SYMBOL, kriya_surface=RETRACT_SYMBOL, karta=identity_id,
+            )
+            trace = Frame(
+                frame_id=str(uuid.uuid4()), sentence_id=-1, sentence_text="system",
+                kriya=TRACE_SYMBOL, kriya_surface=TRACE_SYMBOL,
+                karta=RETRACT_SYMBOL, karma=identity_id, karana=reason or None,
+            )
+            self._commit_retraction(frames, [retraction, trace])
+        if flush and self._writing is None:
+            self.flush()
+        print(f"↩️ Retracted identity {identity_id} ({len(frames) - 1} dependent frames)")
+        return retraction.frame_id
+
+
+class FrameEquivalence:
+    """
+    Union-find identity classes (see entity_equivalence) shared by the
+    frame store backends: built from the active ≡ frames when the store
+    opens, then kept current by the backend's write paths with each
+    change's version.
+
+    Backends provide _lock and snapshot(), and set self._equivalence = None.
+    """
+    
+    def _build_equivalence(self) -> None:
+        """Union the entities of every active ≡ frame (via the kriya index)."""
+        with self._lock:
+            with self.snapshot() as snapshot:
+                classes = EquivalenceClasses(snapshot.version)
+                for frame in snapshot.find_by_kriya(IDENTITY_SYMBOL):
+                    classes.add(frame.frame_id, identity_arguments(frame), snapshot.version)
+            self._equivalence = classes
+    
+    def _equivalence_stats(self) -> dict:
+        """The "entity_classes" stats section."""
+        return {"entity_classes": self._equivalence.get_stats()} if self._equivalence is not None else {}
+
+
+class FrameSearch:
+    """
+    BM25 keyword index (see inverted_index) shared by the frame store
+    backends: built on first search, like the graph view, then kept
+    current by the backend's write paths with each change's version.
+    Removed docs are purged once no open snapshot predates them.
+
+    Backends provide _lock, _swap_lock, _readers (version → open
+    snapshots) and snapshot(), and set self._search = None.
+    """
+    
+    @property
+    def search_index(self) -> InvertedIndex:
+        """Keyword index, built on first use and then kept current by writes."""
+        with self._lock:
+            if self._search is None:
+                index = InvertedIndex(horizon=self._oldest_reader)
+                with self.snapshot() as snapshot:
+                    index.build(snapshot.get_all_frames(), snapshot.version)
+                self._search = index
+            return self._search
+    
+    def _search_index(self) -> InvertedIndex:
+        return self.search_index
+    
+    def _oldest_reader(self) -> Optional[int]:
+        """Version of the oldest open snapshot (None when there are none)."""
+        with self._swap_lock:
+            return min(self._readers, default=None)
+    
+    def _search_stats(self) -> dict:
+        """The "search" stats section, once the index is built."""
+        return {"search": self._search.get_stats()} if self._search is not None else {}
+
+
+class FrameCausal:
+    """
+    Causal link index (see causal_index) shared by the frame store
+    backends, built on first use and kept current like FrameSearch's
+    index, which also supplies _oldest_reader.
+    
+    Backends provide _lock and snapshot(), and set self._causal = None.
+    """
+    
+    @property
+    def causal_index(self) -> CausalIndex:
+        """Causal adjacency, built on first use and then kept current by writes."""
+        with self._lock:
+            if self._causal is None:
+                index = CausalIndex(horizon=self._oldest_reader)
+                with self.snapshot() as snapshot:
+                    index.build(snapshot.get_all_frames(), snapshot.version)
+                self._causal = index
+            return self._causal
+    
+    def _causal_index(self) -> CausalIndex:
+        return self.causal_index
+    
+    def _causal_stats(self) -> dict:
+        """The "causal" stats section, once the index is built."""
+        return {"causal": self._causal.get_stats()} if self._causal is not None else {}
+
+
+class FrameStore(FrameGraph, FrameRetraction, FrameEquivalence, FrameSearch, FrameCausal, FrameReader, FrameEmbeddings):
+    """
+    Frame store with optional persistence. Frames live in two layers:
+    
+        base   read-only columnar snapshot, memory-mapped with its indexes
+               (rows deleted or replaced since are masked out)
+        delta  frames added since the snapshot, in dicts + trigram index
+    
+    Every write batch commits atomically as one new version (multi-version
+    concurrency control): readers take snapshot() views that stay fixed at
+    their version while ingestion continues. Mutations are logged;
+    compaction folds the delta into a new snapshot.
+    """
+    
+    def __init__(self, persist_path: Optional[str] = None):
+        """
+        Initialize the frame store.
+        
+        Args:
+            persist_path: Optional path for persistence. The snapshot lives at
+                <persist_path>.cols and mutations are logged to
+                <persist_path>.wal; a JSON snapshot at persist_path itself
+                (the pre-columnar format) is imported once.
+        """
+        self.version = 0                     # last committed version
+        self._writing: Optional[int] = None  # version of the open write batch
+        self.scope_id = uuid.uuid4().hex     # identifies this store object (QA cache scope)
+        self._undo: Optional[dict] = None    # frame_id -> state before the open batch
+        self._lock = threading.RLock()       # write batches, and compaction's capture/swap
+        self._swap_lock = threading.Lock()   # container swaps vs. view capture
+        self._readers: dict[int, int] = {}   # version -> open registered views
+        self.base: Optional[ColumnarSnapshot] = None
+        self._reset_delta()
+        self.retracted: dict[str, Frame] = {}  # inactive frames (see retract)
+        self.persist_path = Path(persist_path) if persist_path else None
+        self.log = FrameLog(
+            self.persist_path.with_name(self.persist_path.name + ".cols"),
+            wal_path=self.persist_path.with_name(self.persist_path.name + ".wal"),
+        ) if self.persist_path else None
+        self._compact_lock = threading.Lock()  # one compaction at a time (taken before _lock)
+        self._compactor: Optional[threading.Thread] = None
+        # (op, frame_id, frame, version) written while a snapshot is written
+        self._since_rotation: Optional[list] = None
+        self._init_embeddings(self.persist_path)
+        self._graph: Optional[GraphView] = None
+        self._equivalence: Optional[EquivalenceClasses] = None
+        self._search: Optional[InvertedIndex] = None
+        self._causal: Optional[CausalIndex] = None
+        
+        # Map snapshot + replay log
+        if self.log:
+            self._load()
+        self._build_equivalence()
+    
+    def _reset_delta(self) -> None:
+        """
+        Start an empty delta over self.base. Containers are replaced, never
+        cleared, so views of the previous generation stay intact (callers
+        hold _swap_lock once the store is shared).
+        """
+        self.frames: dict[str, Frame] = {}       # delta: frame_id -> frame
+        self._added: dict[str, int] = {}         # delta: frame_id -> version added
+        self.entities: dict[str, set[str]] = {}  # entity -> frame_ids (delta)
+        self.kriyas: dict[str, set[str]] = {}    # kriya -> frame_ids (delta)
+        self.role_index = TrigramIndex()         # (role, substring) -> frame_ids (delta)
+        self._base_dead: dict[int, int] = {}     # snapshot row -> version deleted/replaced
+        # frame_id -> [(frame, added, removed)]: delta frames replaced or
+        # deleted while registered views were open
+        self._history: dict[str, list[tuple[Frame, int, int]]] = {}
+    
+    # ------------------------------------------------------------- versioning
+    
+    @contextmanager
+    def _write_batch(self):
+        """
+        Group mutations into one atomically visible version (re-entrant).
+        Mutations are stamped with the batch version, so readers at the
+        previous version do not see them until it is published. A batch
+        that raises is rolled back and never published or logged.
+        """
+        with self._lock:
+            if self._writing is not None:
+                yield
+                return
+            self._writing = self.version + 1
+            self._undo = {}
+            if self.log:
+                self.log.begin()
+            try:
+                yield
+            except BaseException:
+                try:
+                    self._rollback()
+                except Exception as e:
+                    print(f"⚠️ Rollback of write batch {self._writing} failed: {e}")
+                if self.log:
+                    self.log.end(commit=False)
+                raise
+            else:
+                if self.log:
+                    self.log.end()
+                self.version = self._writing
+            finally:
+                self._writing = None
+                self._undo = None
+        if self.log:
+            self._maybe_compact()
+    
+    def _touch(self, frame_id: str) -> None:
+        """Remember a frame's state before the open batch first changes it."""
+        undo = self._undo
+        if undo is None or frame_id in undo:
+            return
+        row = self.base.row_of(frame_id) if self.base is not None else -1
+        undo[frame_id] = (
+            self.frames.get(frame_id),
+            self._added.get(frame_id),
+            row if row >= 0 and row not in self._base_dead else -1,
+            self.retracted.get(frame_id),
+        )
+    
+    def _rollback(self) -> None:
+        """
+        Put every frame the failed batch touched back in its previous state.
+        Index entries are restored with the unpublished batch stamp, so
+        readers never saw the batch and the next one reuses its version.
+        """
+        writing = self._writing
+        for frame_id, (frame, added, row, retracted) in list(self._undo.items()):
+            current = self.frames.get(frame_id)
+            if current is not frame or self._added.get(frame_id) != added:
+                if current is not None:
+                    self._unindex_frame(current)
+                self._drop_vector(frame_id)
+                if frame is not None:
+                    self._index_frame(frame)
+                    self._added[frame_id] = added
+                    self._queue_embedding(frame)
+            history = self._history.get(frame_id)
+            if history:
+                # Superseded within the batch: the restored frame is current again
+                kept = [entry for entry in history if entry[2] != writing]
+                if kept:
+                    self._history[frame_id] = kept
+                else:
+                    del self._history[frame_id]
+            if row >= 0 and self._base_dead.get(row) == writing:
+                del self._base_dead[row]
+                frame = self.base.frame(row)
+                self._queue_embedding(frame)
+                if self._graph is not None:
+                    self._graph.add_frame(frame, writing)
+                if self._equivalence is not None and frame.kriya == IDENTITY_SYMBOL:
+                    self._equivalence.add(frame_id, identity_arguments(frame), writing)
+                if self._search is not None:
+                    self._search.add(frame, writing)
+                if self._causal is not None:
+                    self._causal.add(frame, writing)
+            if retracted is not None:
+                self.retracted[frame_id] = retracted
+            else:
+                self.retracted.pop(frame_id, None)
+        if self._since_rotation:
+            self._since_rotation = [c for c in self._since_rotation if c[3] != writing]
+    
+    def snapshot(self) -> FrameStoreView:
+        """
+        Immutable read view at the current version. Release it (or use it
+        as a context manager) so history kept for it can be dropped.
+        """
+        with self._swap_lock:
+            version = self.version
+            self._readers[version] = self._readers.get(version, 0) + 1
+        return FrameStoreView(self, version, registered=True)
+    
+    def _release(self, version: int) -> None:
+        with self._swap_lock:
+            remaining = self._readers.get(version, 0) - 1
+            if remaining > 0:
+                self._readers[version] = remaining
+            else:
+                self._readers.pop(version, None)
+            if not self._readers:
+                self._history = {}
+    
+    def _view(self) -> FrameStoreView:
+        """Unregistered view at the current version, for a single synchronous read."""
+        return FrameStoreView(self, self.version)
+    
+    # ----------------------------------------------------------------- writes
+    
+    def add_frame(self, frame: Frame, flush: bool = False) -> None:
+        """
+        Add a frame to the store (logged). The record is committed with its
+        group, at most FRAME_WAL_GROUP_INTERVAL seconds later; the embedding
+        is computed by the next embed_pending() batch.
+        
+        Args:
+            frame: Frame to add
+            flush: Commit before returning (one fsync for this frame alone)
+        """
+        with self._write_batch():
+            if self._index_frame(frame):
+                self._drop_vector(frame.frame_id)
+            self._queue_embedding(frame)
+            self._journal("add", frame.frame_id, frame)
+            if self.log:
+                self.log.append({"op": "add", "v": self._writing, "frame": frame.to_dict()})
+        if flush:
+            self.flush()
+    
+    def delete_frame(self, frame_id: str) -> bool:
+        """Remove a frame (logged). Returns False if it was not stored."""
+        with self._write_batch():
+            if not self._remove_frame(frame_id):
+                if frame_id not in self.retracted:
+                    return False
+                self._touch(frame_id)
+                del self.retracted[frame_id]
+            self._drop_vector(frame_id)
+            self._journal("delete", frame_id, None)
+            if self.log:
+                self.log.append({"op": "delete", "v": self._writing, "frame_id": frame_id})
+            return True
+    
+    def _journal(self, op: str, frame_id: str, frame: Optional[Frame]) -> None:
+        """Remember a write made while compaction writes the snapshot."""
+        if self._since_rotation is not None:
+            self._since_rotation.append((op, frame_id, frame, self._writing))
+    
+    def _index_frame(self, frame: Frame) -> bool:
+        """
+        Insert a frame into the delta maps and indexes.
+        
+        Returns:
+            True if it replaced a stored frame
+        """
+        self._touch(frame.frame_id)
+        replaced = self._remove_frame(frame.frame_id)
+        self.frames[frame.frame_id] = frame
+        self._added[frame.frame_id] = self._writing
+        self.retracted.pop(frame.frame_id, None)  # Re-asserted
+        
+        # Index by kriya (lowercase for consistent matching, interned so
+        # repeated keys share one string object)
+        kriya_key = sys.intern(frame.kriya.lower().strip())
         if kriya_key not in self.kriyas:
             self.kriyas[kriya_key] = set()
         self.kriyas[kriya_key].add(frame.frame_id)
         
         # Index by entities (all kāraka role fillers)
         for entity in self._get_entities(frame):
-            normalized = entity.lower().strip()
+            normalized = sys.intern(entity.lower().strip())
             if normalized not in self.entities:
                 self.entities[normalized] = set()
             self.entities[normalized].add(frame.frame_id)
         
-        # Auto-persist
-        if self.persist_path:
-            self._save()
+        for field, value in frame.role_items():
+            self.role_index.add(field, value, frame.frame_id)
+        
+        if self._graph is not None:
+            self._graph.add_frame(frame, self._writing)
+        if self._equivalence is not None and frame.kriya == IDENTITY_SYMBOL:
+            self._equivalence.add(frame.frame_id, identity_arguments(frame), self._writing)
+        if self._search is not None:
+            self._search.add(frame, self._writing)
+        if self._causal is not None:
+            self._causal.add(frame, self._writing)
+        return replaced
     
-    def add_frames(self, frames: list[Frame]) -> None:
-        """Add multiple frames."""
-        for frame in frames:
-            self.add_frame(frame)
+    def _remove_frame(self, frame_id: str) -> bool:
+        """Remove a frame from whichever layer holds it. False if neither does."""
+        frame = self.frames.get(frame_id)
+        if frame is not None:
+            self._unindex_frame(frame)
+            return True
+        return self._retire_base_row(frame_id)
+    
+    def _unindex_frame(self, frame: Frame) -> None:
+        """Remove a frame from the delta maps and indexes."""
+        self._touch(frame.frame_id)
+        self.frames.pop(frame.frame_id, None)
+        added = self._added.pop(frame.frame_id, None)
+        if self._readers and added is not None:
+            self._history.setdefault(frame.frame_id, []).append((frame, added, self._writing))
+        self._withdraw_identity(frame.frame_id)
+        if self._search is not None:
+            self._search.remove(frame.frame_id, self._writing)
+        if self._causal is not None:
+            self._causal.remove(frame.frame_id, self._writing)
+        if self._graph is not None:
+            self._graph.remove_frame(frame, self._writing)
+        
+        kriya_key = frame.kriya.lower().strip()
+        frame_ids = self.kriyas.get(kriya_key)
+        if frame_ids is not None:
+            frame_ids.discard(frame.frame_id)
+            if not frame_ids:
+                del self.kriyas[kriya_key]
+        
+        for entity in self._get_entities(frame):
+            normalized = entity.lower().strip()
+            frame_ids = self.entities.get(normalized)
+            if frame_ids is not None:
+                frame_ids.discard(frame.frame_id)
+                if not frame_ids:
+                    del self.entities[normalized]
+        
+        for field, value in frame.role_items():
+            self.role_index.remove(field, value, frame.frame_id)
+    
+    def _retire_base_row(self, frame_id: str) -> bool:
+        """Mask a frame's snapshot row (deleted or replaced). False if it has none."""
+        if self.base is None:
+            return False
+        row = self.base.row_of(frame_id)
+        if row < 0 or row in self._base_dead:
+            return False
+        self._touch(frame_id)
+        self._base_dead[row] = self._writing
+        self._withdraw_identity(frame_id)
+        if self._search is not None:
+            self._search.remove(frame_id, self._writing)
+        if self._causal is not None:
+            self._causal.remove(frame_id, self._writing)
+        if self._graph is not None:
+            self._graph.remove_frame(self.base.frame(row), self._writing)
+        return True
+    
+    def _withdraw_identity(self, frame_id: str) -> None:
+        """Drop a deleted, replaced or retracted ≡ frame from the classes."""
+        if self._equivalence is not None and frame_id in self._equivalence:
+            self._equivalence.remove(frame_id, self._writing)
+    
+    # ------------------------------------------------------------- retraction
+    
+    def _current(self) -> FrameReader:
+        """Reader that includes the open write batch (callers hold _lock)."""
+        return FrameStoreView(self, self._writing or self.version)
+    
+    def _commit_retraction(self, frames: list[Frame], asserted: list[Frame]) -> None:
+        """Deactivate frames and add the asserted ones as one version."""
+        if not frames and not asserted:
+            return
+        with self._write_batch():
+            for frame in frames:
+                if self._apply_retract(frame.frame_id):
+                    self._drop_vector(frame.frame_id)
+                    self._journal("retract", frame.frame_id, None)
+                    if self.log:
+                        self.log.append({"op": "retract", "v": self._writing, "frame_id": frame.frame_id})
+            for frame in asserted:
+                self.add_frame(frame)
+    
+    def _apply_retract(self, frame_id: str) -> bool:
+        """Move an active frame out of the indexes into self.retracted. False if not active."""
+        frame = self.frames.get(frame_id)
+        if frame is None and self.base is not None:
+            row = self.base.row_of(frame_id)
+            if row >= 0 and row not in self._base_dead:
+                frame = self.base.frame(row)
+        if frame is None:
+            return False
+        self._touch(frame_id)
+        self._remove_frame(frame_id)
+        self.retracted[frame_id] = frame
+        return True
+    
+    def get_retracted(self, frame_id: str) -> Optional[Frame]:
+        """A retracted (inactive) frame, or None."""
+        return self.retracted.get(frame_id)
+    
+    def add_frames(self, frames: list[Frame], flush: bool = True) -> None:
+        """
+        Add multiple frames and commit them as one group (one version).
+        
+        Args:
+            frames: Frames to add
+            flush: Commit before returning; async callers pass False and
+                run flush() in a worker thread instead
+        """
+        with self._write_batch():
+            for frame in frames:
+                self.add_frame(frame)
+        if flush:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Commit buffered log records (blocking; use asyncio.to_thread from async code)."""
+        if self.log:
+            self.log.flush()
+            self._maybe_compact()
+        self._flush_embeddings()
+    
+    def close(self) -> None:
+        """Commit buffered log records and close the log file."""
+        if self._compactor is not None:
+            self._compactor.join()
+        if self.log:
+            self.log.close()
+        self._close_embeddings()
+    
+    def compact(self) -> None:
+        """
+        Fold the delta into a new columnar snapshot and truncate the log.
+        Writers only wait while the log is rotated, not while the snapshot
+        is written; their writes are carried over into the new delta.
+        """
+        if not self.log:
+            return
+        with self._compact_lock:
+            self._compact()
+    
+    def _compact(self) -> None:
+        """compact() with _compact_lock held."""
+        with self._lock:
+            # A registered view keeps frames replaced meanwhile readable
+            view = self.snapshot()
+            retracted = list(self.retracted.values())
+            self.log.rotate()
+            self._since_rotation = []
+        try:
+            self.log.compact(lambda f: write_snapshot(
+                f, view._iter_frames(), version=view.version, retracted=retracted
+            ))
+            with self._lock:
+                changes, self._since_rotation = self._since_rotation, None
+                self._open_snapshot(changes)
+        except BaseException:
+            with self._lock:
+                self._since_rotation = None
+            raise
+        finally:
+            view.release()
+    
+    def _open_snapshot(self, changes: list = ()) -> None:
+        """
+        Map the snapshot file as the base layer. The delta starts empty,
+        then changes (writes made while the snapshot was written) are
+        re-applied to it with their versions before readers see the swap.
+        Their vectors, graph, identity class, search and causal index changes
+        and retractions were already applied when they were made.
+        """
+        base = ColumnarSnapshot(self.log.snapshot_path)
+        with self._swap_lock:
+            self.base = base
+            self._reset_delta()
+            writing, graph, self._graph = self._writing, self._graph, None
+            equivalence, self._equivalence = self._equivalence, None
+            search, self._search = self._search, None
+            causal, self._causal = self._causal, None
+            retracted = dict(self.retracted)  # Already current; replay must not change it
+            for op, frame_id, frame, version in changes:
+                self._writing = version
+                if op == "add":
+                    self._index_frame(frame)
+                else:
+                    self._remove_frame(frame_id)
+            self._writing, self._graph, self.retracted = writing, graph, retracted
+            self._equivalence, self._search, self._causal = equivalence, search, causal
+        self.log.snapshot_frames = base.count
+    
+    def _maybe_compact(self) -> None:
+        """Compact in a background thread once the log outgrows the snapshot."""
+        if not self.log.needs_compaction():
+            return
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        self._compactor = threading.Thread(target=self._compact_in_background, name="frame-compaction", daemon=True)
+        self._compactor.start()
+    
+    def _compact_in_background(self) -> None:
+        try:
+            self.compact()
+        except Exception as e:
+            print(f"⚠️ Frame log compaction failed: {e}")
+    
+    def clear(self) -> None:
+        """Clear all frames (one new version)."""
+        with self._compact_lock, self._lock:
+            with self._swap_lock:
+                self.base = None
+                self._reset_delta()
+                self.retracted = {}
+                self.version += 1
+                self._equivalence = EquivalenceClasses(self.version)
+                self._search = None
+                self._causal = None
+            if self._graph is not None:
+                self._graph.reset(self.version)
+            self._clear_embeddings()
+            
+            if self.log:
+                # An empty snapshot is cheaper than logging the clear
+                self._compact()
+    
+    # ------------------------------------------------------------------ reads
+    
+    def __len__(self) -> int:
+        return len(self._view())
+    
+    def _frame_ids(self) -> list[str]:
+        """All frame IDs, in get_all_frames() order."""
+        return self._view()._frame_ids()
     
     def get_frame(self, frame_id: str) -> Optional[Frame]:
         """Get a frame by ID."""
-        return self.frames.get(frame_id)
+        return self._view().get_frame(frame_id)
     
     def get_all_frames(self) -> list[Frame]:
         """Get all frames."""
-        return list(self.frames.values())
+        return self._view().get_all_frames()
     
-    def find_by_entity(self, entity: str) -> list[Frame]:
-        """Find all frames mentioning an entity."""
-        normalized = entity.lower().strip()
-        frame_ids = self.entities.get(normalized, set())
-        return [self.frames[fid] for fid in frame_ids if fid in self.frames]
+    def find_by_entity(self, entity: str, equivalent: bool = True) -> list[Frame]:
+        """Find all frames mentioning an entity (or one equated with it)."""
+        return self._view().find_by_entity(entity, equivalent)
+    
+    def equivalent_entities(self, entity: str) -> list[str]:
+        """Normalized entities in the same identity class as entity."""
+        return self._view().equivalent_entities(entity)
+    
+    def search(
+        self, kriya_terms: list[str], entity_terms: list[str], k: int = SEARCH_TOP_K
+    ) -> list[tuple[Frame, float]]:
+        """Top-k frames by BM25 (see FrameReader.search)."""
+        self.search_index  # Build on first use
+        return self._view().search(kriya_terms, entity_terms, k)
+    
+    def expand_causal(
+        self,
+        frames: list[Frame],
+        hops: int = CAUSAL_HOPS,
+        fan_out: int = CAUSAL_FAN_OUT,
+        limit: Optional[int] = CAUSAL_EXPAND_LIMIT,
+        relations: Optional[set] = None,
+    ) -> list[Frame]:
+        """Frames within `hops` causal links of frames (see FrameReader.expand_causal)."""
+        self.causal_index  # Build on first use
+        return self._view().expand_causal(frames, hops, fan_out, limit, relations)
+    
+    def causally_reaches(self, cause_id: str, effect_id: str) -> bool:
+        """Whether a chain of causal links leads from one frame to another."""
+        self.causal_index
+        return self._view().causally_reaches(cause_id, effect_id)
     
     def find_by_kriya(self, kriya: str) -> list[Frame]:
         """Find all frames with a specific kriya."""
-        normalized = kriya.lower().strip()
-        frame_ids = self.kriyas.get(normalized, set())
-        return [self.frames[fid] for fid in frame_ids if fid in self.frames]
+        return self._view().find_by_kriya(kriya)
     
     def find_by_role(self, role: str, value: str) -> list[Frame]:
-        """Find frames where a specific role has a specific value."""
-        results = []
-        role_lower = role.lower()
-        value_lower = value.lower()
-        
-        role_attr_map = {
-            "karta": "karta", "kartā": "karta", "agent": "karta",
-            "karma": "karma", "object": "karma",
-            "karana": "karana", "karaṇa": "karana", "instrument": "karana",
-            "sampradana": "sampradana", "sampradāna": "sampradana", "recipient": "sampradana",
-            "apadana": "apadana", "apādāna": "apadana", "source": "apadana",
-            "time": "locus_time", "locus_time": "locus_time",
-            "space": "locus_space", "locus_space": "locus_space", "place": "locus_space",
-            "topic": "locus_topic", "locus_topic": "locus_topic",
-        }
-        
-        attr = role_attr_map.get(role_lower)
-        if not attr:
-            return results
-        
-        for frame in self.frames.values():
-            frame_value = getattr(frame, attr, None)
-            if frame_value and value_lower in frame_value.lower():
-                results.append(frame)
-        
-        return results
+        """
+        Find frames where a specific role's value contains the given text
+        (case-insensitive), via the snapshot's and the delta's trigram indexes.
+        """
+        return self._view().find_by_role(role, value)
     
-    def clear(self) -> None:
-        """Clear all frames."""
-        self.frames.clear()
-        self.entities.clear()
-        self.kriyas.clear()
-        
-        if self.persist_path:
-            self._save()
+    def _entity_keys(self) -> list[str]:
+        """All normalized entity keys (graph entity nodes)."""
+        return self._view()._entity_keys()
+    
+    def to_json(self) -> str:
+        """Export all frames as JSON (one version)."""
+        return self._view().to_json()
     
     def get_stats(self) -> dict:
         """Get statistics about the store."""
+        view = self._view()
+        kriyas = view._kriya_keys()
         return {
-            "total_frames": len(self.frames),
-            "unique_entities": len(self.entities),
-            "unique_kriyas": len(self.kriyas),
-            "kriyas": list(self.kriyas.keys()),
+            "total_frames": len(view),
+            "unique_entities": len(view._entity_keys()),
+            "unique_kriyas": len(kriyas),
+            "kriyas": kriyas,
+            "version": view.version,
+            "open_snapshots": sum(self._readers.values()),
+            "history_frames": sum(len(entries) for entries in self._history.values()),
+            "retracted_frames": len(self.retracted),
+            "role_index": self.role_index.get_stats(),
+            **self._graph_stats(),
+            **self._equivalence_stats(),
+            **self._search_stats(),
+            **self._causal_stats(),
+            **({"snapshot": {**self.base.get_stats(), "dead_rows": len(self._base_dead)}}
+               if self.base else {}),
+            **self._embedding_stats(),
+            **({"log": self.log.get_stats()} if self.log else {}),
         }
     
-    def to_json(self) -> str:
-        """Export all frames as JSON."""
-        return json.dumps(
-            [f.to_dict() for f in self.frames.values()],
-            indent=2
-        )
-    
-    def to_graph_data(self) -> dict:
-        """
-        Export as graph visualization data.
-        Returns nodes and edges for visualization.
-        """
-        nodes = []
-        edges = []
-        entity_ids = {}
-        
-        # Create entity nodes
-        for entity in self.entities.keys():
-            entity_id = f"E_{len(entity_ids)}"
-            entity_ids[entity] = entity_id
-            nodes.append({
-                "id": entity_id,
-                "label": entity.title(),
-                "type": "entity"
-            })
-        
-        # Create event nodes and edges
-        for frame in self.frames.values():
-            event_id = frame.frame_id
-            nodes.append({
-                "id": event_id,
-                "label": frame.kriya.upper(),
-                "type": "event"
-            })
-            
-            # Create edges from entities to events
-            role_map = {
-                "Kartā": frame.karta,
-                "Karma": frame.karma,
-                "Karaṇa": frame.karana,
-                "Sampradāna": frame.sampradana,
-                "Apādāna": frame.apadana,
-                "Time": frame.locus_time,
-                "Space": frame.locus_space,
-                "Topic": frame.locus_topic,
-            }
-            
-            for role, value in role_map.items():
-                if value:
-                    entity_key = value.lower().strip()
-                    if entity_key in entity_ids:
-                        edges.append({
-                            "source": entity_ids[entity_key],
-                            "target": event_id,
-                            "label": role
-                        })
-        
-        return {"nodes": nodes, "edges": edges}
-    
-    def _get_entities(self, frame: Frame) -> list[str]:
-        """Extract all entity mentions from a frame."""
-        entities = []
-        for value in [frame.karta, frame.karma, frame.karana, 
-                     frame.sampradana, frame.apadana,
-                     frame.locus_time, frame.locus_space, frame.locus_topic]:
-            if value:
-                entities.append(value)
-        return entities
-    
-    def _save(self) -> None:
-        """Persist frames to JSON file."""
-        if self.persist_path:
-            self.persist_path.write_text(self.to_json())
-    
     def _load(self) -> None:
-        """Load frames from JSON file."""
-        if self.persist_path and self.persist_path.exists():
+        """Map the snapshot (importing a legacy JSON one), then replay the log."""
+        imported = 0
+        if self.log.snapshot_path.exists():
             try:
-                data = json.loads(self.persist_path.read_text())
-                for item in data:
-                    frame = Frame(**item)
-                    self.add_frame(frame)
+                self._open_snapshot()
+                self.version = self.base.version
+                self.retracted = {item["frame_id"]: Frame(**item) for item in self.base.retracted}
             except Exception as e:
-                print(f"⚠️ Failed to load frames: {e}")
+                print(f"⚠️ Failed to open frame snapshot: {e}")
+        elif self.persist_path.exists():
+            self._writing = 1
+            imported = self._import_json(self.persist_path)
+            self.version = 1 if imported else 0
+        
+        try:
+            for record in self.log.recover():
+                # Replayed records keep their logged version
+                self._writing = max(record.get("v", 0), self.version)
+                if record.get("op") == "add":
+                    frame = Frame(**record["frame"])
+                    if self._index_frame(frame):
+                        self._drop_vector(frame.frame_id)
+                elif record.get("op") == "delete":
+                    if self._remove_frame(record["frame_id"]):
+                        self._drop_vector(record["frame_id"])
+                    else:
+                        self.retracted.pop(record["frame_id"], None)
+                elif record.get("op") == "retract":
+                    if self._apply_retract(record["frame_id"]):
+                        self._drop_vector(record["frame_id"])
+                self.version = self._writing
+        except Exception as e:
+            print(f"⚠️ Failed to load frames: {e}")
+            return
+        finally:
+            self._writing = None
+        
+        if imported or self.log.rotated_path.exists():
+            # Convert the JSON snapshot, or finish an interrupted compaction
+            self.compact()
+        if imported:
+            print(f"📦 Converted {imported} frames from {self.persist_path.name} to {self.log.snapshot_path.name}")
+    
+    def _import_json(self, path: Path) -> int:
+        """Index the frames of a JSON snapshot (list of frame dicts)."""
+        try:
+            items = json.loads(path.read_text() or "[]")
+            for item in items:
+                self._index_frame(Frame(**item))
+            return len(items)
+        except Exception as e:
+            print(f"⚠️ Failed to load frame snapshot: {e}")
+            return 0
 
 
 # Global store instance
-_store: Optional[FrameStore] = None
+_store: Optional[FrameReader] = None
+
+# "memory" (dict + WAL, default) or "sqlite" (see sqlite_frame_store)
+FRAME_STORE_BACKEND = os.getenv("FRAME_STORE_BACKEND", "memory").lower()
+
+def open_store(persist_path, db_path: Optional[str] = None) -> FrameReader:
+    """
+    Open a frame store with the configured backend.
+    
+    Args:
+        persist_path: Frame snapshot path (the sqlite backend imports it
+            once into an empty database)
+        db_path: SQLite database (default: persist_path with a .db suffix)
+    """
+    if FRAME_STORE_BACKEND == "sqlite":
+        from sqlite_frame_store import SQLiteFrameStore
+        return SQLiteFrameStore(
+            db_path or str(Path(persist_path).with_suffix(".db")), import_path=str(persist_path)
+        )
+    return FrameStore(str(persist_path))
 
-def get_store(persist_path: str = "frames.json") -> FrameStore:
+def get_store(persist_path: str = "frames.json") -> FrameReader:
     """Get or create the global frame store."""
     global _store
     if _store is None:
-        _store = FrameStore(persist_path)
+        _store = open_store(persist_path, os.getenv("FRAME_STORE_DB", "frames.db"))
     return _store
@@ -0,0 +1,233 @@
+"""
+Frame Validator for Kāraka Frame Graph POC.
+Deterministic grounding checks over extracted frames, replacing the LLM audit
+pass for everything a program can verify. The auditor prompt
+(prompts/auditor_prompt.txt) is only called for frames that fail these checks.
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from llm_client import call_llm
+
+ARTICLES = {"the", "a", "an"}
+
+_WORD_RE = re.compile(r"\w+")
+
+# Passive verb group: form of "be" followed by a past participle
+PASSIVE_RE = re.compile(
+    r"\b(?:is|are|was|were|be|been|being)\s+(?:\w+\s+)?\w+(?:ed|en|wn)\b",
+    re.IGNORECASE,
+)
+
+AUDITOR_PROMPT_PATH = Path(__file__).parent.parent / "prompts" / "auditor_prompt.txt"
+
+# Frame role field ↔ auditor/D2b role label
+ROLE_LABELS = {
+    "karta": "Agent",
+    "karma": "Object",
+    "karana": "Instrument",
+    "sampradana": "Recipient",
+    "apadana": "Source",
+    "locus_time": "Locus_Time",
+    "locus_space": "Locus_Space",
+    "locus_topic": "Locus_Topic",
+}
+LABEL_ROLES = {label.lower(): field for field, label in ROLE_LABELS.items()}
+
+
+@dataclass
+class ValidationIssue:
+    """One failed invariant. Codes follow the auditor prompt's error types."""
+    code: str               # invented_entity, duplicate_role, kriya_surface_missing, ...
+    field: Optional[str]    # Role field concerned (None for frame-level issues)
+    message: str
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def _span_tokens(text: str) -> list[str]:
+    """Lowercased word tokens with articles removed."""
+    return [t for t in _WORD_RE.findall(text.lower()) if t not in ARTICLES]
+
+
+def filler_key(value: str) -> str:
+    """Comparison key for a role filler (case, punctuation and articles ignored)."""
+    return " ".join(_span_tokens(value))
+
+
+def is_grounded(value: str, sentence: str) -> bool:
+    """
+    True if value occurs in sentence as a contiguous token span, ignoring
+    case, punctuation and articles ("The study" matches "a study").
+    """
+    if value.lower() in sentence.lower():
+        return True
+    needle = _span_tokens(value)
+    if not needle:
+        return False
+    haystack = _span_tokens(sentence)
+    n = len(needle)
+    return any(haystack[i:i + n] == needle for i in range(len(haystack) - n + 1))
+
+
+def check_invariants(
+    sentence: str,
+    kriya: Optional[str],
+    kriya_surface: Optional[str],
+    roles: dict[str, Optional[str]],
+    prayoga: Optional[str] = None,
+) -> list[ValidationIssue]:
+    """
+    Run every local invariant on one frame's fields.
+
+    Args:
+        sentence: Source sentence
+        kriya: Normalized verb root
+        kriya_surface: Verb form as written
+        roles: Role field → filler (None for absent roles)
+        prayoga: "active"/"passive" if the extractor reported it
+
+    Returns:
+        List of issues (empty if the frame passes)
+    """
+    issues = []
+
+    if not kriya or kriya.strip().upper() in ("", "UNKNOWN"):
+        issues.append(ValidationIssue("empty_kriya", None, "empty kriyā"))
+
+    if kriya_surface and not is_grounded(kriya_surface, sentence):
+        issues.append(ValidationIssue(
+            "kriya_surface_missing", None,
+            f"kriyā surface '{kriya_surface}' not found in sentence"
+        ))
+
+    # A frame with no roles at all is valid (impersonal or agentless verbs);
+    # links are only missing when every proposed filler is ungrounded
+    filled = {field: value for field, value in roles.items() if value}
+    grounded = 0
+
+    seen: dict[str, str] = {}
+    for field, value in filled.items():
+        if is_grounded(value, sentence):
+            grounded += 1
+        else:
+            issues.append(ValidationIssue(
+                "invented_entity", field,
+                f"{field} '{value}' not found in sentence"
+            ))
+        key = filler_key(value)
+        if key in seen:
+            issues.append(ValidationIssue(
+                "duplicate_role", field,
+                f"'{value}' fills both {seen[key]} and {field}"
+            ))
+        else:
+            seen[key] = field
+    if filled and not grounded:
+        issues.append(ValidationIssue("missing_links", None, "no grounded kāraka links"))
+
+    prayoga = (prayoga or "").lower()
+    passive_form = bool(kriya_surface and PASSIVE_RE.search(kriya_surface))
+    if passive_form and prayoga == "active":
+        issues.append(ValidationIssue(
+            "passive_voice_error", None,
+            f"passive verb form '{kriya_surface}' marked active"
+        ))
+    karta = filled.get("karta")
+    if karta and (passive_form or prayoga == "passive"):
+        by_phrase = re.compile(r"\bby\s+(?:(?:the|a|an)\s+)?" + re.escape(karta), re.IGNORECASE)
+        if not by_phrase.search(sentence):
+            issues.append(ValidationIssue(
+                "passive_voice_error", "karta",
+                f"passive kartā '{karta}' is not a 'by' phrase"
+            ))
+
+    return issues
+
+
+def validate_frame(frame, prayoga: Optional[str] = None) -> list[ValidationIssue]:
+    """Run the local invariants on a Frame."""
+    return check_invariants(
+        frame.sentence_text,
+        frame.kriya,
+        frame.kriya_surface,
+        dict(frame.role_items()),
+        prayoga,
+    )
+
+
+def _event_instances(frame) -> list[dict]:
+    """Render a Frame in the D2b event-instance shape the auditor prompt expects."""
+    return [{
+        "instance_id": "event_1",
+        "kriyā_concept": frame.kriya,
+        "surface_text": frame.kriya_surface,
+        "kāraka_links": [
+            {"role": ROLE_LABELS[field], "entity": value}
+            for field, value in frame.role_items()
+        ],
+    }]
+
+
+async def audit_frame(frame, issues: list[ValidationIssue], usage: dict = None) -> dict:
+    """
+    LLM audit for a frame that failed local checks.
+    Applies the auditor's suggested role move (if any) to the frame in place.
+
+    Returns:
+        The auditor verdict dict ({"score", "needs_retry", ...}), or {} if
+        the prompt is unavailable or the call failed
+    """
+    if not AUDITOR_PROMPT_PATH.exists():
+        return {}
+
+    prompt = AUDITOR_PROMPT_PATH.read_text()
+    prompt = prompt.replace("{SENTENCE_HERE}", frame.sentence_text)
+    prompt = prompt.replace(
+        "{EVENT_INSTANCES_JSON}",
+        json.dumps(_event_instances(frame), ensure_ascii=False, indent=2)
+    )
+    hints = "\n".join(f"- {issue}" for issue in issues)
+
+    try:
+        response = await call_llm(
+            prompt,
+            f"Local checks flagged:\n{hints}",
+            json_mode=True,
+            usage=usage,
+            task="audit"
+        )
+        verdict = json.loads(response)
+    except Exception as e:
+        print(f"  ⚠️ Audit failed for {frame.frame_id}: {e}")
+        return {}
+
+    fix = verdict.get("suggested_fix") or {}
+    wrong = LABEL_ROLES.get(str(fix.get("wrong_role", "")).lower())
+    correct = LABEL_ROLES.get(str(fix.get("correct_role", "")).lower())
+    entity = str(fix.get("entity") or "").lower()
+    if verdict.get("needs_retry") and wrong and correct and getattr(frame, wrong):
+        if not getattr(frame, correct) and entity in ("", getattr(frame, wrong).lower()):
+            setattr(frame, correct, getattr(frame, wrong))
+            setattr(frame, wrong, None)
+            print(f"  🩺 Audit moved {frame.frame_id} {wrong} → {correct}")
+
+    return verdict
+
+
+def drop_ungrounded(frame) -> list[str]:
+    """
+    Clear role fillers that do not occur in the sentence (the one invariant
+    that is never negotiable). Returns the cleared role fields.
+    """
+    cleared = []
+    for field, value in frame.role_items():
+        if not is_grounded(value, frame.sentence_text):
+            setattr(frame, field, None)
+            cleared.append(field)
+    return cleared
@@ -0,0 +1,281 @@
+"""
+Frame Write-Ahead Log for Kāraka Frame Graph POC.
+Append-only JSONL log of FrameStore mutations next to its snapshot:
+
+    frames.json.cols   snapshot (format owned by the store, see columnar_snapshot)
+    frames.json.wal    {"op": "add", "frame": {...}} / {"op": "delete", "frame_id": ...}
+
+Records are buffered and written with one fsync per group (group commit):
+when the group is full, when its oldest record is GROUP_INTERVAL seconds old
+(a timer thread commits it), or on flush().
+
+Once the log outgrows the snapshot it is compacted, which keeps the amortized
+write cost per frame constant as the store grows. rotate() moves the log
+aside as frames.json.wal.compacting and new records go to a fresh log while
+the snapshot is rewritten (atomically); compact() then deletes the rotated
+segment. Recovery replays the rotated segment, if a crash left one, before
+the log.
+"""
+
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, Optional
+
+# Records buffered before a group commit
+GROUP_SIZE = int(os.getenv("FRAME_WAL_GROUP_SIZE", "256"))
+
+# Max seconds a record may sit in the buffer before a timer commits it
+GROUP_INTERVAL = float(os.getenv("FRAME_WAL_GROUP_INTERVAL", "0.5"))
+
+# Compact once the log holds more records than max(this, snapshot frames)
+COMPACT_MIN_RECORDS = int(os.getenv("FRAME_WAL_COMPACT_MIN", "1000"))
+
+
+def _fsync_dir(path: Path) -> None:
+    """fsync a directory so a rename inside it is durable (no-op where unsupported)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class FrameLog:
+    """
+    Snapshot + write-ahead log pair for one frame store.
+    Thread-safe, so flushes can be pushed off the event loop with asyncio.to_thread.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: Path,
+        wal_path: Optional[Path] = None,
+        group_size: int = GROUP_SIZE,
+        group_interval: float = GROUP_INTERVAL,
+        compact_min_records: int = COMPACT_MIN_RECORDS,
+    ):
+        """
+        Initialize the log.
+
+        Args:
+            snapshot_path: Path of the snapshot file
+            wal_path: Path of the log (default <snapshot_path>.wal)
+            group_size: Buffered records that trigger a group commit
+            group_interval: Max age in seconds of a buffered record before commit
+            compact_min_records: Lower bound on log records before compaction
+        """
+        self.snapshot_path = Path(snapshot_path)
+        self.wal_path = Path(wal_path) if wal_path else self.snapshot_path.with_name(self.snapshot_path.name + ".wal")
+        self.rotated_path = self.wal_path.with_name(self.wal_path.name + ".compacting")
+        self.group_size = group_size
+        self.group_interval = group_interval
+        self.compact_min_records = compact_min_records
+
+        self._lock = threading.RLock()
+        self._buffer: list[str] = []
+        self._batch: Optional[list[str]] = None  # records of the open write batch
+        self._timer: Optional[threading.Timer] = None
+        self._file = None
+        self.wal_records = 0
+        self.snapshot_frames = 0  # set by the store once its snapshot is open
+
+        # Counters for get_stats()
+        self.commits = 0
+        self.compactions = 0
+        self.recovered_records = 0
+        self.torn_bytes = 0
+
+    # ------------------------------------------------------------------ recovery
+
+    def recover(self) -> Iterator[dict]:
+        """
+        Yield the logged records since the last snapshot: a rotated segment
+        left by an interrupted compaction first, then the log. A torn or
+        corrupt tail (crash mid-write) is truncated away; everything before
+        it is kept.
+        """
+        for path in (self.rotated_path, self.wal_path):
+            yield from self._recover_segment(path)
+
+    def _recover_segment(self, path: Path) -> Iterator[dict]:
+        try:
+            f = path.open("rb")
+        except FileNotFoundError:
+            return
+
+        good_offset = 0
+        with f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # Torn final write
+                try:
+                    record = json.loads(raw)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    break  # Corrupt: ignore it and everything after it
+                good_offset += len(raw)
+                self.wal_records += 1
+                self.recovered_records += 1
+                yield record
+
+        size = path.stat().st_size
+        if size > good_offset:
+            self.torn_bytes += size - good_offset
+            print(f"⚠️ Frame log: discarding {size - good_offset} torn bytes of {path.name} after offset {good_offset}")
+            with path.open("r+b") as f:
+                f.truncate(good_offset)
+                f.flush()
+                os.fsync(f.fileno())
+
+    # ------------------------------------------------------------------- writes
+
+    def append(self, record: dict) -> None:
+        """
+        Buffer one record. The group is committed once it is full, or by a
+        timer group_interval seconds after its first record.
+        """
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._batch is not None:
+                self._batch.append(line)
+                return
+            self._buffer.append(line)
+            self._schedule_commit()
+
+    def begin(self) -> None:
+        """Hold appended records back until end(): a write batch is logged whole or not at all."""
+        with self._lock:
+            self._batch = []
+
+    def end(self, commit: bool = True) -> None:
+        """
+        Close the write batch opened by begin().
+
+        Args:
+            commit: Hand its records to the group commit (False: drop them,
+                the batch failed)
+        """
+        with self._lock:
+            batch, self._batch = self._batch, None
+            if commit and batch:
+                self._buffer.extend(batch)
+                self._schedule_commit()
+
+    def _schedule_commit(self) -> None:
+        if len(self._buffer) >= self.group_size or self.group_interval <= 0:
+            self._commit()
+        elif self._timer is None:
+            self._timer = threading.Timer(self.group_interval, self._commit_window)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _commit_window(self) -> None:
+        """Timer callback: commit the group whose window has elapsed."""
+        with self._lock:
+            self._timer = None
+            try:
+                self._commit()
+            except OSError as e:
+                # Left buffered: the next commit retries it
+                print(f"⚠️ Frame log group commit failed: {e}")
+
+    def flush(self) -> None:
+        """Commit any buffered records (one write + one fsync)."""
+        with self._lock:
+            self._commit()
+
+    def _commit(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+        if self._file is None:
+            self._file = self.wal_path.open("a", encoding="utf-8")
+        self._file.write("".join(self._buffer))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.wal_records += len(self._buffer)
+        self.commits += 1
+        self._buffer.clear()
+
+    def needs_compaction(self) -> bool:
+        """
+        True once the log holds more records than the last snapshot. The
+        snapshot at least doubles between compactions, so rewrite cost stays
+        amortized O(1) per frame.
+        """
+        return self.wal_records > max(self.compact_min_records, self.snapshot_frames)
+
+    def rotate(self) -> None:
+        """
+        Commit the buffer and move the log aside for compaction; records
+        appended from now on go to a fresh log. A segment left by a failed
+        compaction is extended rather than replaced.
+        """
+        with self._lock:
+            self._commit()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self.wal_path.exists():
+                if self.rotated_path.exists():
+                    with self.rotated_path.open("ab") as out, self.wal_path.open("rb") as f:
+                        shutil.copyfileobj(f, out)
+                        out.flush()
+                        os.fsync(out.fileno())
+                    self.wal_path.unlink()
+                else:
+                    os.replace(self.wal_path, self.rotated_path)
+                _fsync_dir(self.wal_path.parent)
+            self.wal_records = 0
+
+    def compact(self, write_snapshot: Callable[[BinaryIO], int]) -> None:
+        """
+        Write a fresh snapshot atomically (temp file, fsync, rename) and
+        delete the segment rotate() moved aside. write_snapshot writes the
+        frames as of the rotation to the binary file it is given and returns
+        how many it wrote. Appends are not blocked meanwhile.
+        """
+        tmp_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        with tmp_path.open("wb") as f:
+            frame_count = write_snapshot(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        _fsync_dir(self.snapshot_path.parent)
+
+        # The snapshot now covers every rotated record
+        with self._lock:
+            self.rotated_path.unlink(missing_ok=True)
+            _fsync_dir(self.rotated_path.parent)
+            self.snapshot_frames = frame_count
+            self.compactions += 1
+
+    def close(self) -> None:
+        """Commit buffered records and close the log file."""
+        with self._lock:
+            self._commit()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def get_stats(self) -> dict:
+        """Log size and group-commit counters."""
+        return {
+            "wal_records": self.wal_records,
+            "snapshot_frames": self.snapshot_frames,
+            "buffered": len(self._buffer),
+            "compacting": self.rotated_path.exists(),
+            "commits": self.commits,
+            "compactions": self.compactions,
+            "recovered_records": self.recovered_records,
+            "torn_bytes": self.torn_bytes,
+        }
@@ -0,0 +1,181 @@
+"""
+Graph View for Kāraka Frame Graph POC.
+Incrementally maintained visualization graph of the frame store: one event
+node per frame, one entity node per distinct role filler, and an edge per
+filled role. IDs are stable (entity IDs hash the normalized filler), so a
+client holding the graph at some version can be sent only what changed:
+
+    version → changed node / edge IDs      (bounded change log)
+
+delta(since) reports each ID changed after `since` as added (with its
+current data) or removed. Clients older than the log get the full graph.
+"""
+
+import bisect
+import hashlib
+import os
+from typing import Iterable
+
+from frame_extractor import Frame
+
+# Change-log entries kept for deltas (older clients get the full graph)
+GRAPH_DELTA_LOG = int(os.getenv("GRAPH_DELTA_LOG", "100000"))
+
+ROLE_LABELS = {
+    "karta": "Kartā",
+    "karma": "Karma",
+    "karana": "Karaṇa",
+    "sampradana": "Sampradāna",
+    "apadana": "Apādāna",
+    "locus_time": "Time",
+    "locus_space": "Space",
+    "locus_topic": "Topic",
+}
+
+
+def entity_node_id(entity_key: str) -> str:
+    """Stable node ID of a normalized entity."""
+    return "E_" + hashlib.blake2b(entity_key.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def frame_graph(frame: Frame) -> tuple[dict, list[tuple[str, dict]]]:
+    """
+    A frame's event node and its (entity key, edge) pairs.
+
+    Returns:
+        (event node, [(normalized entity, entity → event edge)])
+    """
+    event = {"id": frame.frame_id, "label": frame.kriya.upper(), "type": "event"}
+    edges = []
+    for field, value in frame.role_items():
+        entity_key = value.lower().strip()
+        source = entity_node_id(entity_key)
+        label = ROLE_LABELS[field]
+        edges.append((entity_key, {
+            "id": f"{source}>{frame.frame_id}:{label}",
+            "source": source,
+            "target": frame.frame_id,
+            "label": label,
+        }))
+    return event, edges
+
+
+def entity_node(entity_key: str) -> dict:
+    return {"id": entity_node_id(entity_key), "label": entity_key.title(), "type": "entity"}
+
+
+class GraphView:
+    """Graph of a frame store, updated per frame with versioned changes."""
+
+    def __init__(self, max_log: int = GRAPH_DELTA_LOG):
+        self.nodes: dict[str, dict] = {}
+        self.edges: dict[str, dict] = {}
+        self._entity_refs: dict[str, int] = {}  # entity node ID → edges
+        self.max_log = max_log
+        self._log_versions: list[int] = []
+        self._log: list[tuple[str, str]] = []   # ("node" | "edge", ID)
+        self.floor = 0  # deltas since an older version need the full graph
+
+    def build(self, frames: Iterable[Frame], version: int) -> None:
+        """Replace the graph with the given frames at a version."""
+        self.reset(version)
+        for frame in frames:
+            self._add(frame, None)
+
+    def reset(self, version: int) -> None:
+        """Empty graph; clients behind `version` get the full graph."""
+        self.nodes, self.edges, self._entity_refs = {}, {}, {}
+        self._log_versions, self._log = [], []
+        self.floor = version
+
+    # ------------------------------------------------------------------ writes
+
+    def add_frame(self, frame: Frame, version: int) -> None:
+        self._add(frame, version)
+
+    def remove_frame(self, frame: Frame, version: int) -> None:
+        event, edges = frame_graph(frame)
+        if self.nodes.pop(event["id"], None) is not None:
+            self._record(version, "node", event["id"])
+        for _, edge in edges:
+            if self.edges.pop(edge["id"], None) is None:
+                continue
+            self._record(version, "edge", edge["id"])
+            source = edge["source"]
+            refs = self._entity_refs[source] - 1
+            if refs:
+                self._entity_refs[source] = refs
+            else:
+                del self._entity_refs[source]
+                del self.nodes[source]
+                self._record(version, "node", source)
+
+    def _add(self, frame: Frame, version) -> None:
+        event, edges = frame_graph(frame)
+        self.nodes[event["id"]] = event
+        self._record(version, "node", event["id"])
+        for entity_key, edge in edges:
+            if edge["id"] in self.edges:
+                continue  # Frame re-added without a removal
+            self.edges[edge["id"]] = edge
+            self._record(version, "edge", edge["id"])
+            source = edge["source"]
+            if source not in self._entity_refs:
+                self._entity_refs[source] = 0
+                self.nodes[source] = entity_node(entity_key)
+                self._record(version, "node", source)
+            self._entity_refs[source] += 1
+
+    def _record(self, version, kind: str, item_id: str) -> None:
+        if version is None:
+            return  # Building: clients start from the full graph
+        self._log_versions.append(version)
+        self._log.append((kind, item_id))
+        if len(self._log) > self.max_log:
+            cut = len(self._log) // 2
+            self.floor = self._log_versions[cut - 1]
+            del self._log_versions[:cut], self._log[:cut]
+
+    # ------------------------------------------------------------------- reads
+
+    def to_graph_data(self, version: int) -> dict:
+        """Full graph: nodes and edges for visualization."""
+        return {
+            "version": version,
+            "full": True,
+            "nodes": list(self.nodes.values()),
+            "edges": list(self.edges.values()),
+        }
+
+    def delta(self, since: int, version: int) -> dict:
+        """
+        Changes after version `since`, up to `version`.
+
+        Returns:
+            Added (current data) and removed node / edge IDs, or the full
+            graph when `since` predates the change log
+        """
+        if since < self.floor or since > version:
+            return self.to_graph_data(version)
+        start = bisect.bisect_right(self._log_versions, since)
+        changed = {"node": {}, "edge": {}}
+        for kind, item_id in self._log[start:]:
+            changed[kind][item_id] = None
+        return {
+            "version": version,
+            "since": since,
+            "full": False,
+            "nodes_added": [self.nodes[i] for i in changed["node"] if i in self.nodes],
+            "nodes_removed": [i for i in changed["node"] if i not in self.nodes],
+            "edges_added": [self.edges[i] for i in changed["edge"] if i in self.edges],
+            "edges_removed": [i for i in changed["edge"] if i not in self.edges],
+        }
+
+    def get_stats(self) -> dict:
+        return {
+            "nodes": len(self.nodes),
+            "edges": len(self.edges),
+            "entities": len(self._entity_refs),
+            "log_entries": len(self._log),
+            "floor": self.floor,
+        }
@@ -0,0 +1,247 @@
+"""
+Inverted Index for Kāraka Frame Graph POC.
+Ranked keyword retrieval behind FrameReader.search (qa_engine.search_frames):
+
+    "k:" + lemma   → {doc: weight}   kriyā and kriyā surface form
+    "e:" + lemma   → {doc: weight}   role fillers (role-boosted) + sentence
+
+Weights are field-boosted term frequencies, scored with BM25; a query only
+touches the postings of its own terms and the top k come off a heap.
+
+Docs are frame versions stamped with the version that added and removed
+them, so a snapshot at an older version still ranks the frames it sees.
+Removed docs are purged once no open reader can see them.
+"""
+
+import heapq
+import math
+import os
+import re
+from typing import Callable, Iterable, Optional
+
+from frame_extractor import Frame
+
+# Frames returned per question by qa_engine.search_frames
+SEARCH_TOP_K = int(os.getenv("SEARCH_TOP_K", "10"))
+
+# Kriyā keyword matches outweigh entity matches (as the old substring scorer did)
+KRIYA_BOOST = 3.0
+ENTITY_BOOST = 2.0
+
+# Field weights of an entity term: fillers of core roles count most,
+# mentions elsewhere in the sentence least
+ROLE_BOOSTS = {
+    "karta": 2.0,
+    "karma": 2.0,
+    "sampradana": 1.5,
+    "locus_space": 1.5,
+    "locus_time": 1.5,
+    "karana": 1.2,
+    "apadana": 1.2,
+    "locus_topic": 1.2,
+}
+SENTENCE_BOOST = 1.0
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_NEVER = 2 ** 63 - 1
+_TOKEN_RE = re.compile(r"\w+")
+STOP_WORDS = frozenset(
+    "a an and are as at be by did do does for from has have how in is it of on or "
+    "the to was were what when where which who whom whose why with".split()
+)
+
+
+def lemma(token: str) -> str:
+    """Crude suffix-stripping lemma: fund / funds / funded / funding → fund."""
+    for suffix in ("ing", "ed", "es", "s"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3 and not token.endswith("ss"):
+            token = token[:-len(suffix)]
+            break
+    if token.endswith("e") and len(token) > 3:
+        token = token[:-1]
+    if token.endswith("y") and len(token) > 3:
+        token = token[:-1] + "i"
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    """Lemmas of the words in text, stop words dropped."""
+    return [lemma(t) for t in _TOKEN_RE.findall(text.lower()) if t not in STOP_WORDS]
+
+
+def frame_terms(frame: Frame) -> tuple[dict[str, float], int]:
+    """
+    Weighted terms of a frame.
+
+    Returns:
+        (term → boosted frequency, doc length in tokens)
+    """
+    terms: dict[str, float] = {}
+    for token in set(tokenize(frame.kriya or "") + tokenize(frame.kriya_surface or "")):
+        terms["k:" + token] = 1.0
+    length = 0
+    for field, value in frame.role_items():
+        tokens = tokenize(value)
+        length += len(tokens)
+        boost = ROLE_BOOSTS.get(field, 1.0)
+        for token in tokens:
+            terms["e:" + token] = terms.get("e:" + token, 0.0) + boost
+    tokens = tokenize(frame.sentence_text or "")
+    length += len(tokens)
+    for token in tokens:
+        terms["e:" + token] = terms.get("e:" + token, 0.0) + SENTENCE_BOOST
+    return terms, max(length, 1)
+
+
+class InvertedIndex:
+    """Incremental BM25 index of frames (term → doc → weight)."""
+
+    def __init__(self, horizon: Optional[Callable[[], Optional[int]]] = None, purge_after: int = 4096):
+        """
+        Args:
+            horizon: Oldest version an open reader may still read (None: no
+                open readers); removed docs older than it are purged
+            purge_after: Removed docs accumulated before a purge is tried
+        """
+        self._postings: dict[str, dict[int, float]] = {}
+        self._frame_ids: dict[int, str] = {}       # doc -> frame_id
+        self._lengths: dict[int, int] = {}         # doc -> tokens
+        self._added: dict[int, int] = {}           # doc -> version added
+        self._removed: dict[int, int] = {}         # doc -> version removed
+        self._live: dict[str, int] = {}            # frame_id -> current doc
+        self._next_doc = 0
+        self._live_length = 0
+        self.built = 0                             # Version build() indexed
+        self.horizon = horizon
+        self._purge_at = purge_after
+        self.purge_after = purge_after
+        self.purged = 0
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    # ------------------------------------------------------------------ writes
+
+    def build(self, frames: Iterable[Frame], version: int = 0) -> None:
+        """
+        Index the frames visible at a version. Only readers at that version
+        or later can search the index (older ones never saw its changes).
+        """
+        self.built = version
+        for frame in frames:
+            self.add(frame, 0)
+
+    def add(self, frame: Frame, version: int) -> None:
+        """Index a frame at a version (replaces its previous doc)."""
+        self.remove(frame.frame_id, version)
+        terms, length = frame_terms(frame)
+        doc = self._next_doc
+        self._next_doc += 1
+        self._frame_ids[doc] = frame.frame_id
+        self._lengths[doc] = length
+        self._added[doc] = version
+        for term, weight in terms.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = {}
+            posting[doc] = weight
+        self._live[frame.frame_id] = doc
+        self._live_length += length
+
+    def remove(self, frame_id: str, version: int) -> bool:
+        """Retire a frame's doc at a version. False if it is not indexed."""
+        doc = self._live.pop(frame_id, None)
+        if doc is None:
+            return False
+        self._removed[doc] = version
+        self._live_length -= self._lengths[doc]
+        if len(self._removed) >= self._purge_at:
+            self.purge()
+            # Docs still held by open readers wait for the next round
+            self._purge_at = max(self.purge_after, 2 * len(self._removed))
+        return True
+
+    def purge(self) -> int:
+        """Drop removed docs no open reader can see. Returns how many."""
+        horizon = self.horizon() if self.horizon else None
+        dead = {
+            doc for doc, removed in list(self._removed.items())
+            if horizon is None or removed <= horizon
+        }
+        if not dead:
+            return 0
+        for term, posting in list(self._postings.items()):
+            if any(doc in dead for doc in posting):
+                kept = {doc: w for doc, w in posting.items() if doc not in dead}
+                if kept:
+                    self._postings[term] = kept
+                else:
+                    del self._postings[term]
+        for doc in dead:
+            del self._frame_ids[doc], self._lengths[doc], self._added[doc], self._removed[doc]
+        self.purged += len(dead)
+        return len(dead)
+
+    # ------------------------------------------------------------------- reads
+
+    def search(
+        self,
+        kriya_terms: Iterable[str],
+        entity_terms: Iterable[str],
+        version: int = _NEVER - 1,
+        k: int = SEARCH_TOP_K,
+    ) -> list[tuple[str, float]]:
+        """
+        Top-k frames for a query, as seen at a version.
+
+        Args:
+            kriya_terms: Verb keywords (matched against kriyā lemmas)
+            entity_terms: Entity keywords (role fillers and sentence)
+            version: Reader version (docs added later or removed by then
+                are skipped)
+            k: Number of results
+
+        Returns:
+            [(frame_id, score)], best first
+        """
+        query = {}
+        for keyword in kriya_terms:
+            for token in tokenize(keyword):
+                query["k:" + token] = KRIYA_BOOST
+        for keyword in entity_terms:
+            for token in tokenize(keyword):
+                query["e:" + token] = ENTITY_BOOST
+
+        docs = max(len(self._live), 1)
+        average = max(self._live_length, 1) / docs
+        added, removed, lengths = self._added, self._removed, self._lengths
+        scores: dict[int, float] = {}
+        for term, boost in query.items():
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            entries = list(posting.items())
+            idf = math.log(1 + (docs - len(entries) + 0.5) / (len(entries) + 0.5))
+            for doc, weight in entries:
+                if added.get(doc, _NEVER) > version or removed.get(doc, _NEVER) <= version:
+                    continue
+                norm = K1 * (1 - B + B * lengths.get(doc, average) / average)
+                scores[doc] = scores.get(doc, 0.0) + boost * idf * weight * (K1 + 1) / (weight + norm)
+
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        frame_ids = self._frame_ids
+        return [
+            (frame_id, score) for frame_id, score in
+            ((frame_ids.get(doc), score) for doc, score in best) if frame_id is not None
+        ]
+
+    def get_stats(self) -> dict:
+        return {
+            "frames": len(self._live),
+            "terms": len(self._postings),
+            "removed_docs": len(self._removed),
+            "purged_docs": self.purged,
+        }
@@ -18,6 +18,93 @@ client = AsyncOpenAI(
 
 DEFAULT_MODEL = os.getenv("LLM_MODEL", "meta-llama/llama-3.1-70b-instruct")
 
+# Small tier: Nemotron-Nano 8B NIM (on EKS). Opt-in: without LLM_SMALL_BASE_URL
+# every task runs on the main model (unless LLM_TASK_TIERS routes it)
+SMALL_MODEL = os.getenv("LLM_SMALL_MODEL", "nvidia/llama-3.1-nemotron-nano-8b-v1")
+_small_base_url = os.getenv("LLM_SMALL_BASE_URL")
+small_client = AsyncOpenAI(
+    base_url=_small_base_url,
+    api_key=os.getenv("LLM_SMALL_API_KEY") or os.getenv("LLM_API_KEY") or "not-needed"
+) if _small_base_url else client
+
+MODEL_TIERS = {"small": SMALL_MODEL, "large": DEFAULT_MODEL}
+
+# Tasks routed to the small tier once its endpoint is configured
+SMALL_TIER_TASKS = (
+    "eventive_filter",
+    "planner",
+    "extraction",                     # first tier, escalates to extraction_reasoning
+)
+
+# Tier per task; override with LLM_TASK_TIERS="extraction=large,planner=small"
+TASK_TIERS = {
+    task: "small" if _small_base_url and task in SMALL_TIER_TASKS else "large"
+    for task in (*SMALL_TIER_TASKS, "extraction_reasoning", "audit", "answer", "split")
+}
+for _part in os.getenv("LLM_TASK_TIERS", "").split(","):
+    _task, _, _tier = _part.partition("=")
+    if _task.strip() and _tier.strip() in MODEL_TIERS:
+        TASK_TIERS[_task.strip()] = _tier.strip()
+
+# USD per 1M tokens (prompt + completion), for cost reporting only
+TIER_COST_PER_MTOK = {
+    "small": float(os.getenv("LLM_SMALL_COST_PER_MTOK", "0.06")),
+    "large": float(os.getenv("LLM_LARGE_COST_PER_MTOK", "0.88")),
+}
+
+# Process-wide per-task routing counters (see get_routing_stats)
+_routing: dict[str, dict] = {}
+
+
+def resolve_model(task: str = None, model: str = None) -> tuple[str, str]:
+    """
+    Pick (model, tier) for a call: an explicit model wins, then the task's
+    routed tier, then the large default.
+    """
+    if model:
+        tier = "small" if model == SMALL_MODEL else "large"
+        return model, tier
+    tier = TASK_TIERS.get(task, "large")
+    return MODEL_TIERS[tier], tier
+
+
+def _route_entry(task: str) -> dict:
+    return _routing.setdefault(task or "default", {
+        "calls": {}, "tokens": {}, "decisions": 0, "escalations": 0,
+    })
+
+
+def record_tier_decision(task: str, escalated: bool) -> None:
+    """Count one small-tier result that was accepted or escalated to the large tier."""
+    entry = _route_entry(task)
+    entry["decisions"] += 1
+    entry["escalations"] += int(escalated)
+
+
+def get_routing_stats() -> dict:
+    """Per-task model mix, escalation rate and estimated cost."""
+    report = {}
+    total_cost = 0.0
+    for task, entry in _routing.items():
+        cost = sum(
+            TIER_COST_PER_MTOK[tier] * tokens / 1e6 for tier, tokens in entry["tokens"].items()
+        )
+        total_cost += cost
+        report[task] = {
+            "calls": dict(entry["calls"]),
+            "tokens": dict(entry["tokens"]),
+            "escalations": entry["escalations"],
+            "escalation_rate": round(entry["escalations"] / entry["decisions"], 3) if entry["decisions"] else 0.0,
+            "cost_usd": round(cost, 6),
+        }
+    return {
+        "models": dict(MODEL_TIERS),
+        "task_tiers": dict(TASK_TIERS),
+        "small_endpoint": bool(_small_base_url),
+        "tasks": report,
+        "total_cost_usd": round(total_cost, 6),
+    }
+
 
 import re
 
@@ -36,12 +123,39 @@ def extract_json_from_text(text: str) -> str:
     return text
 
 
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for APIs that omit usage."""
+    return max(1, len(text or "") // 4)
+
+
+def _record_usage(usage: dict, response, messages: list[dict], content: str) -> int:
+    """
+    Accumulate prompt/completion token counts into a caller-supplied dict
+    (if given). Returns the call's total token count.
+    """
+    reported = getattr(response, "usage", None)
+    if reported is not None and getattr(reported, "completion_tokens", None) is not None:
+        prompt_tokens = reported.prompt_tokens or 0
+        completion_tokens = reported.completion_tokens or 0
+    else:
+        prompt_tokens = sum(estimate_tokens(m["content"]) for m in messages)
+        completion_tokens = estimate_tokens(content)
+    if usage is None:
+        return prompt_tokens + completion_tokens
+    usage["calls"] = usage.get("calls", 0) + 1
+    usage["prompt_tokens"] = usage.get("prompt_tokens", 0) + prompt_tokens
+    usage["completion_tokens"] = usage.get("completion_tokens", 0) + completion_tokens
+    return prompt_tokens + completion_tokens
+
+
 async def call_llm(
     system_prompt: str,
     user_text: str,
     model: str = None,
     json_mode: bool = False,
-    temperature: float = 0.1
+    temperature: float = 0.1,
+    usage: dict = None,
+    task: str = None
 ) -> str:
     """
     Generic ASYNC wrapper for LLM calls.
@@ -49,14 +163,16 @@ async def call_llm(
     Args:
         system_prompt: Instructions for the LLM
         user_text: User input to process
-        model: LLM model to use (defaults to env var)
+        model: LLM model to use (overrides task routing)
         json_mode: If True, request JSON output (note: some models don't support this)
         temperature: Sampling temperature (lower = more deterministic)
+        usage: Optional dict to accumulate calls/prompt_tokens/completion_tokens into
+        task: Task name for model routing and reporting (see TASK_TIERS)
     
     Returns:
         LLM response as string
     """
-    used_model = model or DEFAULT_MODEL
+    used_model, tier = resolve_model(task, model)
     print(f"  🤖 LLM call to: {used_model[:40]}...")
     
     # Add JSON instruction to prompt if json_mode requested
@@ -79,9 +195,14 @@ async def call_llm(
     # Instead we'll extract JSON from the response
     
     try:
-        response = await client.chat.completions.create(**kwargs)
+        tier_client = small_client if tier == "small" else client
+        response = await tier_client.chat.completions.create(**kwargs)
         content = response.choices[0].message.content
         print(f"  📨 Raw response (first 200 chars): {content[:200] if content else 'EMPTY'}...")
+        tokens = _record_usage(usage, response, messages, content)
+        entry = _route_entry(task)
+        entry["calls"][tier] = entry["calls"].get(tier, 0) + 1
+        entry["tokens"][tier] = entry["tokens"].get(tier, 0) + tokens
     except Exception as e:
         print(f"  ❌ LLM API error: {type(e).__name__}: {e}")
         raise
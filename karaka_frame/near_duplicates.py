@@ -0,0 +1,275 @@
+"""
+Near-Duplicate Detection for Kāraka Frame Graph POC.
+MinHash/LSH over word shingles clusters near-identical sentences during ingestion
+(differing only in numbers, whitespace or trivial wording). One representative per
+cluster goes through the LLM; the others get the representative's frame adapted
+via a cheap token diff, falling back to extraction when the diff touches the event.
+"""
+
+import difflib
+import hashlib
+import os
+import random
+import re
+from typing import TYPE_CHECKING, Optional
+
+from sentence_index import normalize_sentence, frame_id_for
+
+if TYPE_CHECKING:
+    from frame_extractor import Frame  # Imported lazily: it loads the LLM client
+
+# Default Jaccard similarity threshold for clustering (tunable via env)
+DEFAULT_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.8"))
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*")
+_WORD_RE = re.compile(r"\w+")
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def shingles(text: str, k: int = 3) -> set[str]:
+    """Word k-shingles of a sentence, with every number collapsed to '0'."""
+    tokens = _WORD_RE.findall(_NUMBER_RE.sub("0", normalize_sentence(text)))
+    if len(tokens) < k:
+        return {" ".join(tokens)}
+    return {" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+
+
+def choose_bands(num_perm: int, threshold: float) -> tuple[int, int]:
+    """
+    Pick (bands, rows) with bands * rows == num_perm whose LSH S-curve
+    midpoint (1/bands)^(1/rows) is closest to the requested threshold.
+    """
+    best = (num_perm, 1)
+    best_err = float("inf")
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        err = abs((1 / bands) ** (1 / rows) - threshold)
+        if err < best_err:
+            best, best_err = (bands, rows), err
+    return best
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of cluster representatives.
+
+    Only representatives are inserted into the band buckets, so each new
+    sentence costs one signature plus a bounded number of candidate
+    comparisons: clustering stays linear in corpus size.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = 64,
+        max_candidates: int = 32,
+        seed: int = 1,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            threshold: Estimated Jaccard similarity needed to join a cluster
+            num_perm: Number of MinHash permutations (signature length)
+            max_candidates: Cap on representatives compared per sentence
+            seed: Seed for the permutation coefficients
+        """
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.max_candidates = max_candidates
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+
+        rng = random.Random(seed)
+        self._a = [rng.randrange(1, _MERSENNE_PRIME) for _ in range(num_perm)]
+        self._b = [rng.randrange(0, _MERSENNE_PRIME) for _ in range(num_perm)]
+
+        self.buckets: list[dict[tuple, list]] = [{} for _ in range(self.bands)]
+        self.signatures: dict = {}  # representative id -> signature
+
+    def signature(self, text: str) -> tuple[int, ...]:
+        """MinHash signature of a sentence's shingle set."""
+        hashes = [
+            int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+            for s in shingles(text)
+        ]
+        return tuple(
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+            for a, b in zip(self._a, self._b)
+        )
+
+    @staticmethod
+    def similarity(sig_a: tuple, sig_b: tuple) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+    def add(self, item_id, text: str) -> Optional[object]:
+        """
+        Cluster one sentence.
+
+        Returns:
+            The representative id this sentence duplicates, or None if it
+            became a new representative.
+        """
+        sig = self.signature(text)
+        band_keys = [
+            (i, sig[i * self.rows:(i + 1) * self.rows]) for i in range(self.bands)
+        ]
+
+        candidates = []
+        seen = set()
+        for i, key in band_keys:
+            for rep_id in self.buckets[i].get(key, ()):
+                if rep_id not in seen:
+                    seen.add(rep_id)
+                    candidates.append(rep_id)
+            if len(candidates) >= self.max_candidates:
+                break
+
+        best_id, best_sim = None, 0.0
+        for rep_id in candidates[:self.max_candidates]:
+            sim = self.similarity(sig, self.signatures[rep_id])
+            if sim > best_sim:
+                best_id, best_sim = rep_id, sim
+
+        if best_id is not None and best_sim >= self.threshold:
+            return best_id
+
+        self.signatures[item_id] = sig
+        for i, key in band_keys:
+            self.buckets[i].setdefault(key, []).append(item_id)
+        return None
+
+
+def cluster_sentences(
+    sentences: list[str],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Optional[int]]:
+    """
+    Cluster near-duplicate sentences.
+
+    Returns:
+        For each sentence index, the index of its cluster representative
+        (always an earlier sentence), or None if it is a representative.
+    """
+    index = NearDuplicateIndex(threshold=threshold)
+    result = []
+    for i, sentence in enumerate(sentences):
+        if not sentence.strip():
+            result.append(None)
+            continue
+        result.append(index.add(i, sentence))
+
+    duplicates = sum(1 for r in result if r is not None)
+    if duplicates:
+        print(f"🧬 Near-duplicates: {duplicates}/{len(sentences)} sentences clustered "
+              f"(threshold={threshold})")
+    return result
+
+
+def _tokens(text: str) -> list[tuple[str, int, int]]:
+    """Word/punctuation tokens with their character spans."""
+    return [(m.group().lower(), m.start(), m.end()) for m in _TOKEN_RE.finditer(text)]
+
+
+def _token_span(tokens: list[tuple[str, int, int]], text: str, value: str) -> Optional[tuple[int, int]]:
+    """Inclusive token index range covering the first case-insensitive match of value."""
+    start = text.lower().find(value.lower())
+    if start < 0:
+        return None
+    end = start + len(value)
+    covered = [i for i, (_, s, e) in enumerate(tokens) if s < end and e > start]
+    if not covered:
+        return None
+    return covered[0], covered[-1]
+
+
+def _map_span(opcodes: list, i_s: int, i_e: int, allow_changes: bool) -> Optional[tuple[int, int]]:
+    """
+    Map an inclusive old-token range through diff opcodes to the new sentence.
+
+    Returns None when an edit straddles the span boundary (the filler's extent
+    is ambiguous) or, with allow_changes=False, when any edit falls inside it.
+    """
+    j_s = j_e = None
+    for tag, i1, i2, j1, j2 in opcodes:
+        if i2 <= i_s or i1 > i_e:
+            continue  # Block entirely outside the span
+        if tag == "insert":
+            if i_s < i1 <= i_e and not allow_changes:
+                return None
+            continue
+        if tag != "equal":
+            if not allow_changes:
+                return None
+            if i1 < i_s or i2 - 1 > i_e:
+                return None  # Edit straddles the filler boundary
+            if tag == "delete" and (i1 == i_s or i2 - 1 == i_e):
+                return None  # Filler lost its first/last token
+        if i1 <= i_s < i2:
+            j_s = j1 + (i_s - i1) if tag == "equal" else j1
+        if i1 <= i_e < i2:
+            j_e = j1 + (i_e - i1) if tag == "equal" else j2 - 1
+    if j_s is None or j_e is None or j_e < j_s:
+        return None
+    return j_s, j_e
+
+
+def adapt_frame(rep_frame: "Frame", sentence_id: int, sentence: str) -> Optional["Frame"]:
+    """
+    Adapt a representative's frame to a near-duplicate sentence.
+
+    Each role filler is located in the representative sentence and its token
+    span is mapped through a token diff, so replaced numbers, names or words
+    inside a filler are carried over. The adaptation is rejected when the
+    diff touches the verb or blurs a filler's boundary; the caller should
+    then run full extraction.
+
+    Returns:
+        The adapted Frame, or None if the sentence needs its own extraction
+    """
+    from frame_extractor import Frame, ROLE_FIELDS
+
+    old_text = rep_frame.sentence_text
+    old_tokens = _tokens(old_text)
+    new_tokens = _tokens(sentence)
+
+    opcodes = difflib.SequenceMatcher(
+        a=[t[0] for t in old_tokens],
+        b=[t[0] for t in new_tokens],
+        autojunk=False,
+    ).get_opcodes()
+
+    def carry(value: str, allow_changes: bool) -> Optional[str]:
+        span = _token_span(old_tokens, old_text, value)
+        if span is None:
+            return None
+        mapped = _map_span(opcodes, span[0], span[1], allow_changes)
+        if mapped is None:
+            return None
+        return sentence[new_tokens[mapped[0]][1]:new_tokens[mapped[1]][2]]
+
+    kriya_surface = rep_frame.kriya_surface
+    if kriya_surface:
+        # The event itself must be untouched
+        kriya_surface = carry(kriya_surface, allow_changes=False)
+        if kriya_surface is None:
+            return None
+
+    roles = {}
+    for field, value in rep_frame.role_items():
+        adapted = carry(value, allow_changes=True)
+        if adapted is None:
+            return None
+        roles[field] = adapted
+
+    return Frame(
+        frame_id=frame_id_for(sentence),
+        sentence_id=sentence_id,
+        sentence_text=sentence,
+        kriya=rep_frame.kriya,
+        kriya_surface=kriya_surface,
+        **{field: roles.get(field) for field in ROLE_FIELDS},
+    )
@@ -0,0 +1,282 @@
+"""
+QA Cache for Kāraka Frame Graph POC.
+Two levels in front of qa_engine.ask's two LLM calls:
+
+    plans    normalized question → query plan          (exact, LRU)
+    answers  question embedding → answer               (semantic, LRU)
+
+A plan depends only on the question. An answer depends on the frames its
+synthesis prompt was built from, so each entry keeps the store version it
+was computed at and a fingerprint of those frames. A hit at the same
+version is served as is. After writes, the entry's plan is re-run against
+the current snapshot (a cheap indexed search, no LLM), and the entry is
+kept only if the retrieved frames are unchanged. Writes that touch other
+frames leave cached answers alone.
+
+Similar is not the same question: "funded in 2019?" and "funded in 2021?"
+embed close together. A semantic hit is served only if both questions have
+the same plan signature (asked kāraka, kriyā and entity constraints of the
+rule planner's parse); otherwise only the same normalized question hits.
+The local hashing embedder is lexical, so with it the answer level matches
+normalized questions only.
+"""
+
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Hashable, Optional
+
+import numpy as np
+
+from embeddings import HashingEmbedder, get_embedder
+from sentence_index import normalize_sentence
+
+# Entries kept per level (least recently used evicted first)
+QA_PLAN_CACHE_SIZE = int(os.getenv("QA_PLAN_CACHE_SIZE", "4096"))
+QA_ANSWER_CACHE_SIZE = int(os.getenv("QA_ANSWER_CACHE_SIZE", "1024"))
+# Cosine similarity at which a question reuses another question's answer
+QA_CACHE_SIMILARITY = float(os.getenv("QA_CACHE_SIMILARITY", "0.92"))
+
+
+def normalize_question(question: str) -> str:
+    """Exact-cache key: normalized text without trailing punctuation."""
+    return re.sub(r"[\s?!.]+$", "", normalize_sentence(question))
+
+
+def plan_signature(plan: Optional[dict]) -> Optional[tuple]:
+    """
+    What a question asks, from its plan: asked kāraka, kriyā and entity
+    constraints. None when there is no plan to compare.
+    """
+    if not plan:
+        return None
+    kriyas = plan.get("kriya_keywords") or []
+    return (
+        plan.get("target_role"),
+        kriyas[0].lower() if kriyas else None,
+        tuple(sorted({e.lower().strip() for e in plan.get("entity_keywords") or []})),
+        tuple(sorted((role, value.lower().strip()) for role, value in (plan.get("constraints") or {}).items())),
+    )
+
+
+def _hit_rate(hits: int, misses: int) -> float:
+    return round(hits / (hits + misses), 4) if hits + misses else 0.0
+
+
+class PlanCache:
+    """Exact cache of query plans (LRU)."""
+
+    def __init__(self, max_entries: int = QA_PLAN_CACHE_SIZE):
+        self.entries: OrderedDict[str, dict] = OrderedDict()  # key -> plan
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, question: str) -> Optional[dict]:
+        key = normalize_question(question)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, question: str, plan: dict) -> None:
+        key = normalize_question(question)
+        self.entries[key] = plan
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get_stats(self) -> dict:
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": _hit_rate(self.hits, self.misses),
+        }
+
+
+@dataclass
+class CachedAnswer:
+    """An answer with what it was computed from."""
+    question: str
+    scope: str          # store / collections the answer was read from
+    plan: dict
+    fingerprint: str    # hash of the frames in the synthesis prompt
+    result: dict
+    version: Hashable   # store / collections version the fingerprint was last checked at
+    signature: Optional[tuple] = None  # plan_signature of the question
+    row: int = field(default=-1, repr=False)
+
+
+class AnswerCache:
+    """Semantic answer cache: nearest cached question above a similarity threshold."""
+
+    def __init__(
+        self,
+        max_entries: int = QA_ANSWER_CACHE_SIZE,
+        threshold: float = QA_CACHE_SIMILARITY,
+        semantic: bool = True,
+    ):
+        """
+        Args:
+            max_entries: Entries kept (LRU)
+            threshold: Cosine similarity of a candidate question
+            semantic: Serve other questions with the same plan signature
+                (False: the same normalized question only)
+        """
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.semantic = semantic
+        self._vectors: Optional[np.ndarray] = None   # row -> question embedding
+        self._rows: list[Optional[CachedAnswer]] = []
+        self._free: list[int] = []
+        self._lru: OrderedDict[int, None] = OrderedDict()  # rows, oldest first
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0   # hits checked against a newer version and kept
+        self.invalidated = 0   # hits whose frames had changed
+        self.rejected = 0      # similar questions asking something else
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def get(
+        self,
+        vector: np.ndarray,
+        scope: str,
+        version: Hashable,
+        fingerprint: Callable[[dict], str],
+        question: str = "",
+        signature: Optional[tuple] = None,
+    ) -> Optional[tuple[CachedAnswer, float]]:
+        """
+        Cached answer for a question, if still valid at a store version.
+
+        Args:
+            vector: Question embedding
+            scope: Store / collections being read
+            version: Version of the snapshot being read (for collections,
+                CollectionsView.cache_version)
+            fingerprint: plan → fingerprint of the frames it retrieves now
+            question: The question asked
+            signature: plan_signature of the question (None: exact
+                question matches only)
+
+        Returns:
+            (entry, similarity), or None on a miss
+        """
+        hit = self.lookup(vector, scope, question, signature)
+        if hit is None:
+            self.misses += 1
+            return None
+        entry = hit[0]
+        if entry.version != version:
+            if fingerprint(entry.plan) != entry.fingerprint:
+                self.remove(entry)
+                self.invalidated += 1
+                self.misses += 1
+                return None
+            entry.version = version
+            self.revalidated += 1
+        self.hits += 1
+        return hit
+
+    def lookup(
+        self, vector: np.ndarray, scope: str, question: str = "", signature: Optional[tuple] = None
+    ) -> Optional[tuple[CachedAnswer, float]]:
+        """
+        Most similar cached question of the same scope above the threshold
+        that asks the same thing: the same normalized question, or (semantic
+        level) the same plan signature.
+        """
+        if self._lru:
+            key = normalize_question(question)
+            similarities = self._vectors[:len(self._rows)] @ vector
+            for row in np.argsort(-similarities):
+                similarity = float(similarities[row])
+                if similarity < self.threshold:
+                    break
+                entry = self._rows[row]
+                if entry is None or entry.scope != scope:
+                    continue
+                if normalize_question(entry.question) != key and not (
+                    self.semantic and signature is not None and entry.signature == signature
+                ):
+                    self.rejected += 1
+                    continue
+                self._lru.move_to_end(int(row))
+                return entry, similarity
+        return None
+
+    def put(self, vector: np.ndarray, entry: CachedAnswer) -> None:
+        if self._vectors is None:
+            self._vectors = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+        if len(self._lru) >= self.max_entries:
+            self.remove(self._rows[next(iter(self._lru))])
+        if self._free:
+            row = self._free.pop()
+            self._rows[row] = entry
+        else:
+            row = len(self._rows)
+            self._rows.append(entry)
+        entry.row = row
+        self._vectors[row] = vector
+        self._lru[row] = None
+
+    def remove(self, entry: CachedAnswer) -> None:
+        if self._lru.pop(entry.row, False) is not False:
+            self._rows[entry.row] = None
+            self._vectors[entry.row] = 0
+            self._free.append(entry.row)
+
+    def get_stats(self) -> dict:
+        return {
+            "entries": len(self._lru),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": _hit_rate(self.hits, self.misses),
+            "revalidated": self.revalidated,
+            "invalidated": self.invalidated,
+            "rejected": self.rejected,
+            "threshold": self.threshold,
+            "semantic": self.semantic,
+        }
+
+
+class QACache:
+    """Plan and answer caches plus the question embedder."""
+
+    def __init__(self, embedder=None):
+        self.embedder = embedder or get_embedder()
+        self.plans = PlanCache()
+        # Hashing vectors measure word overlap, not meaning
+        self.answers = AnswerCache(semantic=not isinstance(self.embedder, HashingEmbedder))
+
+    async def embed(self, question: str) -> Optional[np.ndarray]:
+        """Question embedding (None when the embedder fails: answer cache skipped)."""
+        try:
+            return (await self.embedder.embed([normalize_question(question)], input_type="query"))[0]
+        except Exception as e:
+            print(f"⚠️ Question embedding failed, answer cache skipped: {e}")
+            return None
+
+    def clear(self) -> None:
+        self.plans = PlanCache(self.plans.max_entries)
+        self.answers = AnswerCache(self.answers.max_entries, self.answers.threshold, self.answers.semantic)
+
+    def get_stats(self) -> dict:
+        return {"plans": self.plans.get_stats(), "answers": self.answers.get_stats()}
+
+
+_cache: Optional[QACache] = None
+
+def get_qa_cache() -> QACache:
+    """Get or create the global QA cache."""
+    global _cache
+    if _cache is None:
+        _cache = QACache()
+    return _cache
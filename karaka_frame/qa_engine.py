@@ -5,11 +5,19 @@ Implements a 2-Phase RAG Pipeline:
 2. Answer Synthesis: Filtered Frames -> Answer
 """
 
+import hashlib
 import json
-from typing import Optional, List, Dict, Any
+from typing import Any, Dict, Hashable, List, Optional
 from llm_client import call_llm
-from frame_store import FrameStore, get_store
+from frame_store import FrameReader, FrameStore, get_store
+from frame_collections import get_collections
 from frame_extractor import Frame
+from inverted_index import SEARCH_TOP_K
+from qa_cache import CachedAnswer, get_qa_cache, plan_signature
+from graph_view import ROLE_LABELS
+from context_packer import pack_context
+from frame_paths import PATH_K, PATH_MAX_HOPS, FramePath, PathFinder, path_frames
+from query_planner import PLANNER_MIN_CONFIDENCE, plan_with_rules, record_plan
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # PHASE 1: QUERY PLANNING PROMPT
@@ -88,102 +96,137 @@ Each frame is an EVENT.
 ```
 """
 
-async def plan_query(question: str) -> Dict[str, Any]:
-    """Phase 1: Generate search filters from question."""
+async def plan_query(question: str, rules: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Phase 1: Generate search filters from question (rule planner, LLM when unsure).
+
+    Args:
+        question: Natural-language question
+        rules: The question's rule-based plan, if already computed
+    """
+    if rules is None:
+        rules = plan_with_rules(question)
+    if rules is not None and rules["confidence"] >= PLANNER_MIN_CONFIDENCE:
+        record_plan("rules")
+        return rules
+    if rules is not None:
+        print(f"     Rule planner unsure ({rules['confidence']}): {rules['reasoning']}")
+
+    record_plan("llm")
     prompt = f"{QUERY_PLANNER_PROMPT}\n\nQuestion: \"{question}\"\n"
     
     try:
-        response = await call_llm(prompt, "Generte JSON query plan", temperature=0.1, json_mode=True)
+        response = await call_llm(prompt, "Generte JSON query plan", temperature=0.1, json_mode=True, task="planner")
         # Parse JSON
         start = response.find("{")
         end = response.rfind("}") + 1
         data = json.loads(response[start:end])
+        data["planner"] = "llm"
+        if rules is not None and rules.get("target_role"):
+            data.setdefault("target_role", rules["target_role"])
         return data
     except Exception as e:
         print(f"⚠️ Query planning failed: {e}")
+        if rules is not None and (rules["kriya_keywords"] or rules["entity_keywords"]):
+            return {**rules, "fallback": True}
         # Fallback: simple keyword search on the question itself
         return {
             "kriya_keywords": [],
             "entity_keywords": [w for w in question.split() if len(w) > 3],
-            "reasoning": "Fallback keyword search"
+            "reasoning": "Fallback keyword search",
+            "fallback": True  # Not cached
         }
 
-def search_frames(store: FrameStore, plan: Dict[str, Any]) -> List[Frame]:
-    """Phase 2: Filter frames based on plan + Graph Expansion."""
-    all_frames = store.get_all_frames()
-    
-    kriyas = [k.lower() for k in plan.get("kriya_keywords", [])]
-    entities = [e.lower() for e in plan.get("entity_keywords", [])]
+def search_frames(store: FrameReader, plan: Dict[str, Any], k: int = SEARCH_TOP_K) -> List[Frame]:
+    """Phase 2: Top-k frames for the plan (BM25 over the inverted index) + causal expansion."""
+    kriyas = plan.get("kriya_keywords", [])
+    entities = plan.get("entity_keywords", [])
     
     if not kriyas and not entities:
-        return all_frames # Return all if no specific filter
-        
-    # 1. Direct Search (Keyword/Vector phase)
-    hits = []
-    
-    for f in all_frames:
-        score = 0
+        return []  # Nothing to match: the whole store is no answer context
         
-        # Check Kriyā (Verb)
-        if f.kriya and any(k in f.kriya.lower() for k in kriyas):
-            score += 3
-        if f.kriya_surface and any(k in f.kriya_surface.lower() for k in kriyas):
-            score += 3
-            
-        # Check Content (Entities)
-        frame_text = f.sentence_text.lower()
-        # Also check specific roles values
-        role_values = " ".join([
-            str(v) for k, v in f.__dict__.items() 
-            if k in ['karta', 'karma', 'locus_space', 'locus_time', 'sampradana'] and v
-        ]).lower()
-        
-        for entity in entities:
-            if entity in frame_text or entity in role_values:
-                score += 2
-                
-        if score > 0:
-            hits.append((score, f))
-            
-    # Sort by score and take top matches
-    hits.sort(key=lambda x: x[0], reverse=True)
-    direct_matches = [h[1] for h in hits] # Take top 10 or threshold
+    # 1. Direct Search: only the posting lists of the plan's terms are read
+    direct_matches = [frame for frame, _ in store.search(kriyas, entities, k)]
     
-    # 2. Graph Expansion (The "Hop")
-    # Retrieve neighbors connected via causal_links to bridge reasoning gaps
+    # 2. Graph Expansion (multi-hop, bounded by CAUSAL_HOPS / CAUSAL_FAN_OUT)
+    # Frames reachable over causal links bridge reasoning gaps; the causal
+    # index walks only the links it returns, in BOTH directions
     expanded_pool = {f.frame_id: f for f in direct_matches}
-    
-    for frame in direct_matches:
-        if not frame.causal_links:
-            continue
-            
-        for link in frame.causal_links:
-            # Check for cause_frame (parent) and effect_frame (child)
-            # We expand in BOTH directions to find context
-            neighbor_ids = []
-            if link.get("cause_frame"): neighbor_ids.append(link.get("cause_frame"))
-            if link.get("effect_frame"): neighbor_ids.append(link.get("effect_frame"))
-            
-            for nid in neighbor_ids:
-                if nid and nid not in expanded_pool:
-                    neighbor = store.get_frame(nid)
-                    if neighbor:
-                        expanded_pool[nid] = neighbor
-                        print(f"     🔗 Graph Hop: Expanded from {frame.frame_id} to {nid}")
+    for neighbor in store.expand_causal(direct_matches):
+        if neighbor.frame_id not in expanded_pool:
+            expanded_pool[neighbor.frame_id] = neighbor
+            print(f"     🔗 Graph Hop: Expanded to {neighbor.frame_id}")
 
     return list(expanded_pool.values())
 
-async def ask(question: str, store: Optional[FrameStore] = None) -> dict:
+async def ask(
+    question: str,
+    store: Optional[FrameStore] = None,
+    collections: Optional[List[str]] = None,
+) -> dict:
     """
     Main Q&A Entry Point: 2-Phase Pipeline.
-    """
-    store = store or get_store()
-    all_frames = store.get_all_frames()
+    Every phase reads one snapshot of the store, so frames ingested while
+    the question is in flight do not mix into the answer; the result
+    reports which store version it was computed from. Repeated and
+    paraphrased questions are served from the QA cache (see qa_cache)
+    while the frames behind their answers are unchanged.
     
+    Args:
+        question: Natural-language question
+        store: Store to read (global store by default)
+        collections: Answer over these named collections instead, fanning
+            out over a snapshot of each ("*" selects all)
+    """
+    if isinstance(collections, str):
+        collections = [collections]
+    if collections:
+        snapshot = get_collections().snapshot(None if "*" in collections else collections)
+        scope = "collections:" + ",".join(sorted(collections))
+        cache_version = snapshot.cache_version
+    else:
+        store = store or get_store()
+        snapshot = store.snapshot()
+        scope = f"store:{store.scope_id}"
+        cache_version = snapshot.version
+    with snapshot:
+        result = await _ask(question, snapshot, scope, cache_version)
+    result["store_version"] = snapshot.version
+    if collections:
+        result["collection_versions"] = snapshot.versions
+    return result
+
+def retrieve(store: FrameReader, plan: Dict[str, Any]) -> List[Frame]:
+    """Frames the synthesis prompt is built from (no frames when the search finds none)."""
+    return search_frames(store, plan)
+
+def _fingerprint(frames: List[Frame]) -> str:
+    """Hash of the frames (content and order) behind an answer."""
+    payload = json.dumps([f.to_dict() for f in frames], sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+async def _ask(question: str, store: FrameReader, scope: str, cache_version: Hashable) -> dict:
     print(f"\n❓ Question: {question}")
-    print(f"  📊 Total DB: {len(all_frames)} frames")
     
-    if not all_frames:
+    cache = get_qa_cache()
+    # Rule plan (a local parse): what the question asks, for the answer cache
+    rules = plan_with_rules(question)
+    signature = plan_signature(rules)
+    vector = await cache.embed(question)
+    if vector is not None:
+        hit = cache.answers.get(
+            vector, scope, cache_version, lambda plan: _fingerprint(retrieve(store, plan)),
+            question=question, signature=signature,
+        )
+        if hit is not None:
+            entry, similarity = hit
+            print(f"  ♻️ Answer cache hit ({similarity:.3f}): {entry.question}")
+            return {**entry.result, "question": question, "frame_count": len(store), "cache": "answer"}
+    
+    frame_count = len(store)
+    print(f"  📊 Total DB: {frame_count} frames")
+    
+    if not frame_count:
         return _empty_response(question)
 
     import time
@@ -194,25 +237,31 @@ async def ask(question: str, store: Optional[FrameStore] = None) -> dict:
     # ─────────────────────────────────────────────────────
     t0 = time.perf_counter()
     print("  🧠 Phase 1: Planning Query...")
-    plan = await plan_query(question)
+    plan = cache.plans.get(question)
+    plan_cached = plan is not None
+    if not plan_cached:
+        plan = await plan_query(question, rules)
+        if not plan.get("fallback"):
+            cache.plans.put(question, plan)
     t1 = time.perf_counter()
     print(f"     ⏱️ Planning took {t1-t0:.2f}s")
     print(f"     Target Kriya: {plan.get('kriya_keywords')}")
     print(f"     Target Entities: {plan.get('entity_keywords')}")
+    if plan.get("target_role"):
+        print(f"     Target Role: {plan['target_role']} ({plan.get('planner', 'llm')})")
     
     # ─────────────────────────────────────────────────────
     # PHASE 2: SEARCH / RETRIEVE
     # ─────────────────────────────────────────────────────
     t2 = time.perf_counter()
     print("  🔍 Phase 2: Searching Graph...")
-    relevant_frames = search_frames(store, plan)
+    relevant_frames = retrieve(store, plan)
     t3 = time.perf_counter()
     print(f"     ⏱️ Search took {t3-t2:.4f}s")
     print(f"     Found {len(relevant_frames)} relevant frames.")
-    
     if not relevant_frames:
-        print("     ⚠️ No direct matches found. Using all frames as fallback.")
-        relevant_frames = all_frames
+        print("     ⚠️ No direct matches found.")
+        return {**_no_match_response(question, frame_count), "cache": "plan" if plan_cached else None}
     
     # ─────────────────────────────────────────────────────
     # PHASE 3: SYNTHESIZE ANSWER
@@ -220,20 +269,23 @@ async def ask(question: str, store: Optional[FrameStore] = None) -> dict:
     t4 = time.perf_counter()
     print("  🤖 Phase 3: Synthesizing Answer...")
     
-    # Prepare Context (Only Relevant Frames)
-    frame_descriptions = []
-    for f in relevant_frames:
-        frame_dict = f.to_display()
-        # Add original sentence for context
-        frame_dict["original_sentence"] = f.sentence_text 
-        frame_descriptions.append(frame_dict)
-        
+    # Prepare Context (Only Relevant Frames, within the token budget)
+    packed = pack_context(relevant_frames, target_role=plan.get("target_role"))
+    report = packed.report()
+    print(f"     📦 Context: {report['frames_packed']} frames, {report['tokens']}/{report['budget']} tokens"
+          + (f", {report['frames_dropped']} dropped" if report["frames_dropped"] else ""))
+
+    # Kāraka the question asks for (from the interrogative)
+    target = ""
+    if plan.get("target_role"):
+        target = f"\n## ASKED ROLE\n{ROLE_LABELS.get(plan['target_role'], plan['target_role'])}\n"
+
     context = f"""## USER QUESTION
 {question}
 
 ## RETRIEVED FRAMES (Search Results)
-{json.dumps(frame_descriptions, indent=2)}
-
+{packed.text}
+{target}
 ## INSTRUCTIONS
 Answer the question using ONLY the Retrieved Frames. 
 If the answer is found, map it to the Pāṇinian role.
@@ -243,7 +295,8 @@ If the answer is found, map it to the Pāṇinian role.
         response = await call_llm(
             ANSWER_SYNTHESIS_PROMPT,
             context,
-            temperature=0.1
+            temperature=0.1,
+            task="answer"
         )
         t5 = time.perf_counter()
         print(f"     ⏱️ Synthesis took {t5-t4:.2f}s")
@@ -252,7 +305,7 @@ If the answer is found, map it to the Pāṇinian role.
         # Parse Response (Reuse existing clean logic)
         data = _parse_llm_json(response)
         
-        return {
+        result = {
             "question": question,
             "answer": data.get("answer", response),
             "reasoning": data.get("reasoning", ""),
@@ -260,14 +313,130 @@ If the answer is found, map it to the Pāṇinian role.
             "mapped_karaka": data.get("mapped_karaka", ""),
             "interrogative_type": data.get("interrogative_type", ""),
             "confidence": data.get("confidence", "medium"),
-            "sources": [f.to_display() for f in relevant_frames if f.frame_id in data.get("matched_frame_ids", [])],
-            "frame_count": len(all_frames)
+            "sources": [f.to_display() for f in packed.frames if f.frame_id in data.get("matched_frame_ids", [])],
+            "frame_count": frame_count,
+            "context": report,
         }
+        if vector is not None:
+            cache.answers.put(vector, CachedAnswer(
+                question=question, scope=scope, plan=plan,
+                fingerprint=_fingerprint(relevant_frames), result=result, version=cache_version,
+                signature=signature,
+            ))
+        return {**result, "cache": "plan" if plan_cached else None}
         
     except Exception as e:
         print(f"  ❌ QA Error: {e}")
         return _error_response(question, str(e))
 
+def find_paths(
+    source: str,
+    target: str,
+    store: Optional[FrameStore] = None,
+    relations: Optional[List[str]] = None,
+    max_hops: int = PATH_MAX_HOPS,
+    k: int = PATH_K,
+) -> dict:
+    """
+    How two frames are connected: up to k shortest chains of frames over
+    causal and identity links (see frame_paths), read from one snapshot.
+    
+    Args:
+        source: Frame ID to start from
+        target: Frame ID to reach
+        store: Store to read (global store by default)
+        relations: Links to follow: "causal", causal_type values and / or
+            "identity" (all by default)
+        max_hops: Longest chain accepted
+        k: Number of chains
+    
+    Returns:
+        Chains (shortest first), their frames, and "context": the chains
+        formatted for the synthesis prompt
+    
+    Raises:
+        KeyError: source or target is not a frame of the store
+    """
+    store = store or get_store()
+    with store.snapshot() as snapshot:
+        for frame_id in (source, target):
+            if snapshot.get_frame(frame_id) is None:
+                raise KeyError(frame_id)
+        finder = PathFinder(snapshot, set(relations) if relations else None)
+        paths = finder.k_shortest(source, target, k, max_hops)
+        frames = path_frames(paths, snapshot)
+        return {
+            "source": source,
+            "target": target,
+            "paths": [path.to_dict() for path in paths],
+            "frames": [f.to_display() for f in frames],
+            "context": path_context(paths, frames),
+            "frames_expanded": finder.expanded,
+            "store_version": snapshot.version,
+        }
+
+def path_context(paths: List[FramePath], frames: List[Frame]) -> str:
+    """Chains as ordered frame IDs, then their frames (compact encoding, see context_packer)."""
+    if not paths:
+        return ""
+    chains = "\n".join(f"{i}. {path.chain()}" for i, path in enumerate(paths, 1))
+    return f"## CHAINS (shortest first)\n{chains}\n{pack_context(frames).text}"
+
+async def ask_path(
+    question: str,
+    source: str,
+    target: str,
+    store: Optional[FrameStore] = None,
+    relations: Optional[List[str]] = None,
+    max_hops: int = PATH_MAX_HOPS,
+    k: int = PATH_K,
+) -> dict:
+    """
+    Answer a question about how two frames are connected from the chains
+    between them only, instead of their whole neighbourhood.
+    
+    Args:
+        question: Question about the connection
+        source, target, store, relations, max_hops, k: As in find_paths
+    """
+    found = find_paths(source, target, store, relations, max_hops, k)
+    if not found["paths"]:
+        return {
+            "question": question,
+            "answer": f"No connection between {source} and {target} within {max_hops} hops.",
+            "sources": [],
+            "paths": [],
+            "store_version": found["store_version"],
+        }
+    
+    context = f"""## USER QUESTION
+{question}
+
+## RETRIEVED FRAMES (Chains from {source} to {target})
+{found["context"]}
+
+## INSTRUCTIONS
+Answer the question using ONLY these chains. Explain the connection step by
+step, following a chain in order.
+"""
+    try:
+        response = await call_llm(ANSWER_SYNTHESIS_PROMPT, context, temperature=0.1, task="answer")
+    except Exception as e:
+        print(f"  ❌ Path QA Error: {e}")
+        return {**_error_response(question, str(e)), "paths": found["paths"]}
+    data = _parse_llm_json(response)
+    matched = data.get("matched_frame_ids", [])
+    return {
+        "question": question,
+        "answer": data.get("answer", response),
+        "reasoning": data.get("reasoning", ""),
+        "matched_frames": matched,
+        "confidence": data.get("confidence", "medium"),
+        "sources": [f for f in found["frames"] if f["frame_id"] in matched],
+        "paths": found["paths"],
+        "store_version": found["store_version"],
+    }
+
 def _parse_llm_json(text):
     try:
         if "{" in text:
@@ -286,6 +455,14 @@ def _empty_response(q):
         "frame_count": 0
     }
 
+def _no_match_response(q, frame_count):
+    return {
+        "question": q,
+        "answer": "No frames match the question.",
+        "sources": [],
+        "frame_count": frame_count
+    }
+
 def _error_response(q, err):
     return {
         "question": q, 
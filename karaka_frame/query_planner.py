@@ -0,0 +1,330 @@
+"""
+Query Planner for Kāraka Frame Graph POC.
+Deterministic fast path for qa_engine.plan_query: a spaCy dependency parse
+of the question plus the interrogative → kāraka mapping
+(architecture/interrogative-karaka-mapping.md):
+
+    who / what (subject)   → kartā       where → locus_space
+    whom / what (object)   → karma       when  → locus_time
+    by / with what, how    → karaṇa      to / for whom → sampradāna
+    from where / whom      → apādāna     about what    → locus_topic
+
+The root verb's lemma is the kriyā, searched together with its synonyms
+(KRIYA_SYNONYM_GROUPS, plus WordNet when nltk has it), and its other
+dependents are entity constraints (roles resolved as in srl_prefill). Questions the rules cannot
+map (why, whose, how many, yes/no, copular or multi-clause questions) get a
+low confidence, and plan_query then falls back to the LLM planner. Sanskrit
+interrogative forms are looked up in the "Part A_ Interrogative Pronouns.csv"
+table.
+"""
+
+import csv
+import os
+from pathlib import Path
+from typing import Optional
+
+from graph_view import ROLE_LABELS
+from srl_prefill import PREP_ROLES, CLAUSE_DEPS, resolve_role
+
+# Rule-based planning first ("on"/"off"); needs spaCy and en_core_web_sm
+RULE_PLANNER = os.getenv("RULE_PLANNER", "on").lower() == "on"
+# Plans below this confidence go to the LLM planner
+PLANNER_MIN_CONFIDENCE = float(os.getenv("PLANNER_MIN_CONFIDENCE", "0.7"))
+# Sanskrit interrogative forms by vibhakti
+INTERROGATIVE_TABLE = os.getenv(
+    "INTERROGATIVE_TABLE",
+    str(Path(__file__).resolve().parent.parent / "Part A_ Interrogative Pronouns.csv"),
+)
+
+# English interrogative → kāraka; "who", "what" and "which" are refined by
+# their dependency (subject → kartā, object → karma, prepositional object →
+# the preposition's role). None: not a kāraka question.
+INTERROGATIVE_ROLES = {
+    "who": "karta",
+    "whom": "karma",
+    "what": "karma",
+    "which": "karma",
+    "where": "locus_space",
+    "when": "locus_time",
+    "how": "karana",
+    "why": None,       # Prayojana / hetu: causal, not a kāraka
+    "whose": None,     # Ṣaṣṭhī: possession, not a kāraka
+}
+
+# Vibhakti → kāraka (the table's rows); ṣaṣṭhī is possession
+VIBHAKTI_ROLES = {
+    "प्रथमा": "karta",
+    "द्वितीया": "karma",
+    "तृतीया": "karana",
+    "चतुर्थी": "sampradana",
+    "पञ्चमी": "apadana",
+    "षष्ठी": None,
+    "सप्तमी": "locus_space",  # Adhikaraṇa: "in/on what", a place unless the question says otherwise
+}
+
+# Kriyā synonym groups: kriyā search matches exact terms, so a question's verb
+# also searches for frames stored under its synonyms
+KRIYA_SYNONYM_GROUPS = (
+    ("discover", "find", "locate", "detect", "identify"),
+    ("fund", "finance", "grant", "sponsor", "support"),
+    ("create", "make", "build", "develop", "produce"),
+    ("invent", "devise", "design"),
+    ("give", "provide", "supply", "donate", "award"),
+    ("receive", "get", "obtain", "acquire"),
+    ("buy", "purchase", "acquire"),
+    ("write", "author", "compose", "publish"),
+    ("say", "state", "announce", "report", "claim"),
+    ("study", "examine", "investigate", "analyze", "research"),
+    ("show", "demonstrate", "reveal", "prove"),
+    ("use", "employ", "utilize", "apply"),
+    ("start", "begin", "launch", "found", "establish"),
+    ("end", "finish", "complete", "conclude"),
+    ("lead", "head", "direct", "manage"),
+    ("cause", "trigger", "induce"),
+    ("increase", "raise", "boost"),
+    ("decrease", "reduce", "lower", "cut"),
+    ("treat", "cure", "heal"),
+    ("teach", "instruct", "train"),
+    ("help", "assist", "aid"),
+    ("move", "travel", "relocate"),
+    ("leave", "depart", "exit"),
+)
+# WordNet verb senses whose lemmas are added (when nltk and its corpus are installed)
+WORDNET_SENSES = 2
+
+# Confidence lost per issue found in the parse
+ISSUE_PENALTY = 0.3
+
+_parser_unavailable = False
+_wordnet_unavailable = False
+_forms: Optional[dict[str, set]] = None
+
+_synonyms: dict[str, list[str]] = {}
+for _group in KRIYA_SYNONYM_GROUPS:
+    for _word in _group:
+        _synonyms.setdefault(_word, []).extend(w for w in _group if w != _word)
+
+# Plans served by each planner (see get_planner_stats)
+_stats = {"rules": 0, "llm": 0}
+
+
+def interrogative_forms() -> dict[str, set]:
+    """Sanskrit interrogative form → kāraka roles it can mark (empty if no table)."""
+    global _forms
+    if _forms is None:
+        _forms = {}
+        try:
+            with open(INTERROGATIVE_TABLE, encoding="utf-8") as f:
+                for row in csv.reader(f):
+                    if len(row) < 3 or not row[1].strip():
+                        continue
+                    vibhakti = row[1].split()[0]
+                    if vibhakti not in VIBHAKTI_ROLES:
+                        continue  # Header rows
+                    for cell in row[2:]:
+                        form = cell.split("(")[0].strip()
+                        if form:
+                            _forms.setdefault(form, set()).add(VIBHAKTI_ROLES[vibhakti])
+        except OSError as e:
+            print(f"  ⚠️ Interrogative table unavailable: {e}")
+    return _forms
+
+
+def kriya_synonyms(lemma: str) -> list[str]:
+    """Synonyms of a verb lemma: its KRIYA_SYNONYM_GROUPS, then WordNet verb senses."""
+    global _wordnet_unavailable
+    synonyms = list(_synonyms.get(lemma, ()))
+    if not _wordnet_unavailable:
+        try:
+            from nltk.corpus import wordnet
+            synsets = wordnet.synsets(lemma, pos=wordnet.VERB)[:WORDNET_SENSES]
+        except (ImportError, LookupError):
+            _wordnet_unavailable = True
+            synsets = []
+        for synset in synsets:
+            synonyms += [name for name in synset.lemma_names() if "_" not in name]
+    return [w for w in dict.fromkeys(synonyms) if w != lemma]
+
+
+def _phrase(token) -> str:
+    """A constraint's noun phrase without leading determiners."""
+    words = [t for t in token.subtree if not (t.dep_ == "det" and t.i < token.i)]
+    return " ".join(t.text for t in words)
+
+
+def _wh_role(wh, root, passive: bool, issues: list[str]) -> Optional[str]:
+    """Kāraka asked for by an interrogative token."""
+    word = wh.lower_
+    if word == "how" and wh.head.i != root.i and wh.head.pos_ in ("ADJ", "ADV"):
+        # "how many", "how long": a quantity, not the instrument
+        issues.append(f"'how {wh.head.lower_}' asks for a quantity")
+        return None
+    role = INTERROGATIVE_ROLES.get(word)
+    if role is None:
+        issues.append(f"'{word}' is not a kāraka question")
+        return None
+
+    if word in ("who", "whom", "what", "which") and wh.i < root.i:
+        # Stranded preposition: "Who was it given to?", "What was it made with?"
+        stranded = next((
+            c for c in root.children
+            if c.dep_ in ("prep", "agent") and not any(g.dep_ in ("pobj", "pcomp") for g in c.children)
+        ), None)
+        if stranded is not None:
+            prep = stranded.lower_
+            if prep == "by":
+                return "karta" if passive else "karana"
+            prep_role = PREP_ROLES.get(prep)
+            if prep_role == "locus":
+                issues.append(f"'{word} ... {prep}': place or topic")
+                return None
+            return prep_role or role
+
+    # "what drug", "which lab": the noun carries the dependency
+    token = wh.head if wh.dep_ == "det" else wh
+    dep = token.dep_
+    if dep in ("nsubj", "csubj"):
+        return "karta" if word != "whom" else "karma"
+    if dep == "nsubjpass":
+        return "karma"
+    if dep in ("dobj", "attr", "oprd"):
+        return "karma"
+    if dep == "dative":
+        return "sampradana"
+    if dep == "pobj":
+        prep = token.head.lower_
+        if prep == "by":
+            return "karta" if passive else "karana"
+        if word == "where":
+            return "apadana" if prep == "from" else "locus_space"
+        prep_role = PREP_ROLES.get(prep)
+        if prep_role == "locus":
+            issues.append(f"'{prep} {word}': place or topic")
+            return None
+        return prep_role or role
+    return role
+
+
+def plan_from_doc(doc) -> dict:
+    """
+    Query plan from a parsed question.
+
+    Returns:
+        Plan dict (kriya_keywords, entity_keywords, target_role,
+        constraints, reasoning, planner, confidence)
+    """
+    issues: list[str] = []
+    root = next((t for t in doc if t.dep_ == "ROOT"), None)
+    wh = next((t for t in doc if t.lower_ in INTERROGATIVE_ROLES and t.tag_ in ("WP", "WP$", "WRB", "WDT")), None)
+    if wh is None:
+        wh = next((t for t in doc if t.lower_ in INTERROGATIVE_ROLES), None)
+
+    passive = root is not None and any(c.dep_ in ("nsubjpass", "auxpass") for c in root.children)
+    target_role = None
+    if wh is not None and root is not None:
+        target_role = _wh_role(wh, root, passive, issues)
+    else:
+        forms = interrogative_forms()
+        roles = set().union(*(forms.get(t.text.strip("?।")) or set() for t in doc))
+        if len(roles) == 1 and None not in roles:
+            target_role = roles.pop()
+        else:
+            issues.append("no interrogative word" if not roles else "ambiguous interrogative case")
+
+    kriya = None
+    if root is None or root.pos_ not in ("VERB", "AUX"):
+        issues.append("no verbal root")
+    elif root.lemma_ == "be" or any(c.dep_ in ("attr", "acomp") for c in root.children):
+        issues.append("copular question")
+    else:
+        kriya = root.lemma_.lower()
+
+    constraints: dict[str, str] = {}
+    wh_tokens = set()
+    if wh is not None:
+        owner = wh.head if wh.dep_ in ("det", "pobj") else wh
+        wh_tokens = {t.i for t in owner.subtree} | {wh.i}
+    for child in (root.children if root is not None else []):
+        if child.i in wh_tokens or any(t.i in wh_tokens for t in child.subtree):
+            continue
+        dep = child.dep_
+        role, token = None, child
+        if dep == "nsubj":
+            role = "karta"
+        elif dep in ("nsubjpass", "dobj"):
+            role = "karma"
+        elif dep == "dative":
+            role = "sampradana"
+        elif dep in ("agent", "prep"):
+            token = next((c for c in child.children if c.dep_ in ("pobj", "pcomp")), None)
+            if token is None:
+                continue  # Stranded preposition (handled by _wh_role)
+            role = "karta" if dep == "agent" else resolve_role(child.lower_, token, issues)
+        elif dep in CLAUSE_DEPS and child.pos_ in ("VERB", "AUX"):
+            issues.append(f"second clause '{child.text}' ({dep})")
+        elif dep == "neg":
+            issues.append("negated question")
+        if role and token.pos_ != "PRON":
+            constraints[role] = _phrase(token)
+
+    entity_keywords = list(dict.fromkeys(constraints.values()))
+    entity_keywords += [e.text for e in doc.ents if e.text not in entity_keywords]
+    if kriya is None and not entity_keywords:
+        issues.append("nothing to search for")
+
+    confidence = max(0.0, 1.0 - ISSUE_PENALTY * len(issues))
+    if target_role is None:
+        confidence = min(confidence, 0.4)
+
+    surface = root.lower_ if root is not None else ""
+    reasoning = (
+        f"Rule-based: '{wh.text if wh is not None else '?'}' → "
+        f"{ROLE_LABELS.get(target_role, target_role or 'no kāraka')}"
+        + (f"; kriyā '{kriya}'" if kriya else "")
+        + "".join(f"; {ROLE_LABELS.get(r, r)} = '{v}'" for r, v in constraints.items())
+        + (f" (issues: {', '.join(issues)})" if issues else "")
+    )
+    return {
+        "kriya_keywords": [k for k in dict.fromkeys([kriya, surface, *kriya_synonyms(kriya)]) if k] if kriya else [],
+        "entity_keywords": entity_keywords,
+        "target_role": target_role,
+        "constraints": constraints,
+        "reasoning": reasoning,
+        "planner": "rules",
+        "confidence": round(confidence, 2),
+    }
+
+
+def plan_with_rules(question: str) -> Optional[dict]:
+    """
+    Parse a question and build its rule-based plan.
+
+    Returns:
+        Plan dict, or None if the rule planner is disabled or spaCy is
+        unavailable
+    """
+    global _parser_unavailable
+    if not RULE_PLANNER or _parser_unavailable:
+        return None
+    from sentence_splitter import get_installed_nlp
+    nlp = get_installed_nlp()
+    if nlp is None:
+        print("  ⚠️ Rule planner disabled: spaCy model en_core_web_sm is not installed")
+        _parser_unavailable = True
+        return None
+    return plan_from_doc(nlp(question.strip()))
+
+
+def record_plan(planner: str) -> None:
+    _stats[planner] += 1
+
+
+def get_planner_stats() -> dict:
+    """Plans served by the rule planner vs the LLM planner."""
+    total = _stats["rules"] + _stats["llm"]
+    return {
+        **_stats,
+        "rule_rate": round(_stats["rules"] / total, 4) if total else 0.0,
+        "min_confidence": PLANNER_MIN_CONFIDENCE,
+        "parser_available": not _parser_unavailable,
+    }
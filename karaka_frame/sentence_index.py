@@ -0,0 +1,198 @@
+"""
+Sentence Index for Kāraka Frame Graph POC.
+Content-addressed map from normalized sentence → extracted frame payload.
+Repeated sentences reuse the stored frame and only record a new occurrence.
+Persisted as an append-only JSONL log shared across process_text calls and restarts.
+Frames are stamped with a fingerprint of the extraction prompts and models, so
+a prompt or model change re-extracts instead of serving stale frames. Once
+the log holds more dead records (stale, superseded or duplicate) than live
+ones it is rewritten on load, as frame_wal compacts the frame log.
+"""
+
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from pathlib import Path
+from typing import Optional
+
+# Rewrite the log once it holds more dead records than max(this, live records)
+COMPACT_MIN_RECORDS = int(os.getenv("SENTENCE_INDEX_COMPACT_MIN", "1000"))
+
+
+def normalize_sentence(text: str) -> str:
+    """Canonical form used for hashing: NFKC, lowercase, collapsed whitespace."""
+    text = unicodedata.normalize("NFKC", text)
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def sentence_key(text: str) -> str:
+    """Content address of a sentence (16 hex chars of SHA-256)."""
+    return hashlib.sha256(normalize_sentence(text).encode("utf-8")).hexdigest()[:16]
+
+
+def frame_id_for(text: str) -> str:
+    """Stable frame ID for a sentence, independent of its position in a document."""
+    return f"F_{sentence_key(text)}"
+
+
+def _occurrence_key(occurrence: dict) -> str:
+    """Hashable identity of an occurrence dict, for O(1) duplicate checks."""
+    return json.dumps(occurrence, ensure_ascii=False, sort_keys=True)
+
+
+class SentenceIndex:
+    """
+    Sentence hash → {"frame": payload, "occurrences": [...]} with JSONL persistence.
+
+    Log records:
+        {"op": "frame", "key": ..., "frame": {...}, "fp": ...}  # first extraction
+        {"op": "occurrence", "key": ..., "occurrence": {...}}  # later repeats
+    """
+
+    def __init__(
+        self,
+        persist_path: Optional[str] = None,
+        fingerprint: Optional[str] = None,
+        compact_min_records: int = COMPACT_MIN_RECORDS,
+    ):
+        """
+        Initialize the sentence index.
+
+        Args:
+            persist_path: Optional path to the JSONL log for persistence
+            fingerprint: Extraction prompts/models the frames must come from;
+                logged frames with another fingerprint are ignored
+            compact_min_records: Lower bound on dead log records before a rewrite
+        """
+        self.entries: dict[str, dict] = {}
+        self.persist_path = Path(persist_path) if persist_path else None
+        self.fingerprint = fingerprint
+        self.compact_min_records = compact_min_records
+        self.stale = 0  # logged frames ignored for a fingerprint mismatch
+        self.compactions = 0
+        self.hits = 0
+        self.misses = 0
+
+        if self.persist_path and self.persist_path.exists():
+            self._load()
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """Return the stored frame payload for a sentence key, if extracted before."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["frame"]
+
+    def __contains__(self, key: str) -> bool:
+        """True if the sentence was extracted before (does not count as a lookup)."""
+        return key in self.entries
+
+    def add(self, key: str, frame_payload: dict, occurrence: dict) -> None:
+        """Store a freshly extracted frame payload with its first occurrence."""
+        self.entries[key] = {"frame": frame_payload, "occurrences": [occurrence],
+                             "seen": {_occurrence_key(occurrence)}}
+        self._append({"op": "frame", "key": key, "frame": frame_payload, "fp": self.fingerprint})
+        self._append({"op": "occurrence", "key": key, "occurrence": occurrence})
+
+    def add_occurrence(self, key: str, occurrence: dict) -> None:
+        """Record another citation of an already-extracted sentence."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return
+        occurrence_key = _occurrence_key(occurrence)
+        if occurrence_key in entry["seen"]:
+            return
+        entry["seen"].add(occurrence_key)
+        entry["occurrences"].append(occurrence)
+        self._append({"op": "occurrence", "key": key, "occurrence": occurrence})
+
+    def occurrences(self, key: str) -> list[dict]:
+        """All recorded occurrences (citations) of a sentence."""
+        entry = self.entries.get(key)
+        return list(entry["occurrences"]) if entry else []
+
+    def get_stats(self) -> dict:
+        """Get statistics about the index."""
+        return {
+            "unique_sentences": len(self.entries),
+            "total_occurrences": sum(len(e["occurrences"]) for e in self.entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "compactions": self.compactions,
+        }
+
+    def _append(self, record: dict) -> None:
+        """Append one record to the JSONL log."""
+        if self.persist_path:
+            with self.persist_path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _load(self) -> None:
+        """Replay the JSONL log, rewriting it if it is mostly dead records."""
+        records = 0
+        try:
+            with self.persist_path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn final line after a crash: ignore it
+                        continue
+                    records += 1
+                    key = record.get("key")
+                    if record.get("op") == "frame":
+                        if record.get("fp") != self.fingerprint:
+                            # Extracted with other prompts/models: re-extract
+                            self.stale += 1
+                            continue
+                        self.entries[key] = {"frame": record["frame"], "occurrences": [], "seen": set()}
+                    elif record.get("op") == "occurrence" and key in self.entries:
+                        entry = self.entries[key]
+                        occurrence_key = _occurrence_key(record["occurrence"])
+                        if occurrence_key not in entry["seen"]:
+                            entry["seen"].add(occurrence_key)
+                            entry["occurrences"].append(record["occurrence"])
+        except Exception as e:
+            print(f"⚠️ Failed to load sentence index: {e}")
+            return
+
+        live = sum(1 + len(entry["occurrences"]) for entry in self.entries.values())
+        if records - live > max(self.compact_min_records, live):
+            self._rewrite()
+
+    def _rewrite(self) -> None:
+        """Replace the log with the live entries (temp file, fsync, atomic rename)."""
+        tmp_path = self.persist_path.with_name(self.persist_path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            for key, entry in self.entries.items():
+                f.write(json.dumps({"op": "frame", "key": key, "frame": entry["frame"], "fp": self.fingerprint},
+                                   ensure_ascii=False) + "\n")
+                for occurrence in entry["occurrences"]:
+                    f.write(json.dumps({"op": "occurrence", "key": key, "occurrence": occurrence},
+                                       ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.persist_path)
+        self.compactions += 1
+
+
+# Global index instance
+_index: Optional[SentenceIndex] = None
+
+def get_sentence_index(
+    persist_path: str = "sentence_index.jsonl",
+    fingerprint: Optional[str] = None,
+) -> SentenceIndex:
+    """Get or create the global sentence index."""
+    global _index
+    if _index is None:
+        _index = SentenceIndex(persist_path, fingerprint)
+    return _index
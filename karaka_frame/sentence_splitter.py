@@ -24,6 +24,21 @@ def _get_nlp():
     return _nlp
 
 
+def get_installed_nlp():
+    """
+    The shared spaCy pipeline, without _get_nlp()'s download fallback.
+    Returns None if spaCy or en_core_web_sm is not installed.
+    """
+    global _nlp
+    if _nlp is None:
+        try:
+            import spacy
+            _nlp = spacy.load("en_core_web_sm")
+        except (ImportError, OSError):
+            return None
+    return _nlp
+
+
 def verify_fidelity(original: str, segments: list[str]) -> bool:
     """The Iron Law: Input MUST equal Output exactly."""
     return "".join(segments) == original
@@ -91,7 +106,7 @@ Output: ["Hello world. ", "How are you? "]
 
 Return only the JSON array, nothing else."""
 
-    response = await call_llm(prompt, text, json_mode=True)
+    response = await call_llm(prompt, text, json_mode=True, task="split")
     
     try:
         data = json.loads(response)
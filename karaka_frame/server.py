@@ -7,17 +7,25 @@ import asyncio
 import json
 from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Optional
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 
 from sentence_splitter import smart_split
 from eventive_filter import filter_eventive
-from frame_extractor import extract_frames
+from frame_extractor import extract_frames, extraction_fingerprint, ExtractionStats, EXTRACTION_MODE
 from frame_store import get_store
+from frame_collections import DEFAULT_COLLECTION, get_collections
 from frame_extractor import Frame
-from qa_engine import ask
+from sentence_index import get_sentence_index, sentence_key
+from stage_pipeline import get_stage_pipeline
+from qa_engine import ask, ask_path, find_paths
+from qa_cache import get_qa_cache
+from query_planner import get_planner_stats
+from frame_paths import PATH_K, PATH_MAX_HOPS
+from llm_client import get_routing_stats
 
 
 def load_demo_frames():
@@ -93,14 +101,17 @@ async def lifespan(app: FastAPI):
     print("🚀 Kāraka Frame Graph POC Server starting...")
     print("📂 Frame store initialized")
     
-    # Load demo frames if available
-    demo_frames = load_demo_frames()
+    # Load demo frames into an empty store (a persisted store already has them)
+    store = get_store()
+    demo_frames = load_demo_frames() if len(store) == 0 else []
     if demo_frames:
-        store = get_store()
-        store.add_frames(demo_frames)
+        store.add_frames(demo_frames, flush=False)
+        await store.embed_pending()
+        await asyncio.to_thread(store.flush)
         print(f"✨ Loaded {len(demo_frames)} demo frames (demo mode ready)")
     
     yield
+    get_collections().close()
     print("👋 Server shutting down")
 
 
@@ -126,25 +137,92 @@ async def root():
     return {"message": "Kāraka Frame Graph POC", "status": "running"}
 
 
+def collection_store(name: Optional[str], create: bool = False):
+    """Store of a named collection (default collection when None), or HTTP 400/404."""
+    try:
+        store = get_collections().get(name, create=create)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if store is None:
+        raise HTTPException(status_code=404, detail=f"Unknown collection: {name}")
+    return store
+
+
 @app.get("/api/stats")
-async def get_stats():
+async def get_stats(collection: Optional[str] = None):
     """Get frame store statistics."""
-    store = get_store()
-    return store.get_stats()
+    store = collection_store(collection)
+    stats = store.get_stats()
+    stats["collections"] = get_collections().get_stats()
+    stats["sentence_index"] = get_sentence_index(fingerprint=extraction_fingerprint()).get_stats()
+    stats["llm_routing"] = get_routing_stats()
+    stats["qa_cache"] = get_qa_cache().get_stats()
+    stats["query_planner"] = get_planner_stats()
+    if EXTRACTION_MODE == "staged":
+        stats["stages"] = get_stage_pipeline().get_stats()
+    return stats
 
 
 @app.get("/api/frames")
-async def get_frames():
+async def get_frames(collection: Optional[str] = None):
     """Get all frames."""
-    store = get_store()
+    store = collection_store(collection)
     return [f.to_display() for f in store.get_all_frames()]
 
 
 @app.get("/api/graph")
-async def get_graph():
-    """Get graph visualization data."""
-    store = get_store()
-    return store.to_graph_data()
+async def get_graph(since: Optional[int] = None, collection: Optional[str] = None):
+    """
+    Get graph visualization data, or with ?since=<version> only the nodes
+    and edges added or removed after that version.
+    """
+    store = collection_store(collection)
+    if since is None:
+        return store.to_graph_data()
+    return store.graph_delta(since)
+
+
+@app.get("/api/path")
+async def get_path(
+    source: str,
+    target: str,
+    relations: Optional[str] = None,
+    max_hops: int = PATH_MAX_HOPS,
+    k: int = PATH_K,
+    question: Optional[str] = None,
+    collection: Optional[str] = None,
+):
+    """
+    Up to k shortest chains of frames from source to target over causal and
+    identity links (?relations=causal,identity or causal_type values). With
+    ?question=... the question is answered from the chains only.
+    """
+    store = collection_store(collection)
+    names = [name.strip() for name in relations.split(",") if name.strip()] if relations else None
+    try:
+        if question:
+            return await ask_path(question, source, target, store, names, max_hops, k)
+        return find_paths(source, target, store, names, max_hops, k)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Unknown frame: {e.args[0]}")
+
+
+@app.get("/api/collections")
+async def list_collections():
+    """List frame collections."""
+    return get_collections().get_stats()
+
+
+@app.delete("/api/collections/{name}")
+async def drop_collection(name: str):
+    """Drop a collection and its indexes (the default collection is cleared)."""
+    try:
+        dropped = get_collections().drop(name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not dropped:
+        raise HTTPException(status_code=404, detail=f"Unknown collection: {name}")
+    return {"dropped": name}
 
 
 @app.websocket("/ws")
@@ -156,10 +234,20 @@ async def websocket_endpoint(websocket: WebSocket):
     - process_text: Process a text document
     - ask_question: Ask a question about the frames
     - get_frames: Get all current frames
+    - get_graph: Get the graph (a graph_delta if "since" is given)
     - clear: Clear all frames
+    - list_collections / drop_collection: Manage frame collections
+    
+    Any message may carry "collection" to switch the connection to that
+    collection (process_text creates it on first use; other messages
+    report an unknown collection as an error); ask_question may carry
+    "collections" (names or ["*"]) to answer across several.
     """
     await websocket.accept()
-    store = get_store()
+    collections = get_collections()
+    collection = DEFAULT_COLLECTION
+    sentence_index = get_sentence_index(fingerprint=extraction_fingerprint())
+    graph_version = None  # graph version this client holds
     
     async def send_status(message: str, progress: float = None):
         """Send a status update to the client."""
@@ -172,6 +260,19 @@ async def websocket_endpoint(websocket: WebSocket):
         """Send an error to the client."""
         await websocket.send_json({"type": "error", "message": message})
     
+    async def send_graph():
+        """Send the graph changes since the client's version (full graph if none)."""
+        nonlocal graph_version
+        if graph_version is None:
+            data = store.to_graph_data()
+        else:
+            data = store.graph_delta(int(graph_version))
+        graph_version = data["version"]
+        await websocket.send_json({
+            "type": "graph" if data["full"] else "graph_delta",
+            "data": data
+        })
+    
     try:
         while True:
             # Receive message
@@ -185,6 +286,23 @@ async def websocket_endpoint(websocket: WebSocket):
             
             msg_type = message.get("type")
             
+            # Resolve the collection per message, since another client may
+            # have dropped it (switching restarts the client's graph from a
+            # full copy)
+            requested = message.get("collection", collection)
+            try:
+                store = collections.get(requested, create=msg_type == "process_text")
+            except ValueError as e:
+                await send_error(str(e))
+                continue
+            if store is None:
+                if requested == collection:
+                    collection, graph_version = DEFAULT_COLLECTION, None
+                await send_error(f"Unknown collection: {requested}")
+                continue
+            if requested != collection:
+                collection, graph_version = requested, None
+            
             # ─────────────────────────────────────────────
             # PROCESS TEXT
             # ─────────────────────────────────────────────
@@ -213,12 +331,54 @@ async def websocket_endpoint(websocket: WebSocket):
                     "data": filtered
                 })
                 
-                # Step 3: Extract frames
+                # Step 3: Extract frames (repeated sentences reuse stored frames)
                 await send_status("Extracting frames...", 0.6)
-                frames = await extract_frames(filtered)
+                doc_id = message.get("doc_id") or f"doc_{sentence_key(text)}"
+                stats = ExtractionStats()
+                frames = await extract_frames(
+                    filtered,
+                    sentence_index=sentence_index,
+                    source=doc_id,
+                    stats=stats,
+                )
+                skipped = stats.reused_frames + stats.adapted_frames
+                if skipped:
+                    await send_status(
+                        f"Reused {stats.reused_frames} stored and adapted "
+                        f"{stats.adapted_frames} near-duplicate frames "
+                        f"(skipped {skipped} LLM calls)", 0.6
+                    )
+                stats_data = stats.to_dict()
+                stats_data["llm_routing"] = get_routing_stats()
+                if EXTRACTION_MODE == "staged":
+                    stats_data["stages"] = get_stage_pipeline().get_stats()
+                if stats.compact_accepted or stats.escalations:
+                    await send_status(
+                        f"Extraction cascade: {stats_data['escalation_rate']:.0%} escalated, "
+                        f"{stats.disagreements} sample disagreements, "
+                        f"~{stats.tokens_saved_est} tokens saved, "
+                        f"${stats_data['llm_routing']['total_cost_usd']:.4f} LLM cost so far", 0.6
+                    )
+                if stats.prefill_accepted or stats.prefill_confirmed:
+                    await send_status(
+                        f"Parse prefill: {stats.prefill_accepted} frames without LLM, "
+                        f"{stats.prefill_confirmed} confirmed by diff", 0.6
+                    )
+                if stats.audits_run or stats.audits_skipped:
+                    await send_status(
+                        f"Grounding checks: {stats.audits_skipped} frames passed locally, "
+                        f"{stats.audits_run} sent to audit", 0.6
+                    )
+                await websocket.send_json({
+                    "type": "extraction_stats",
+                    "doc_id": doc_id,
+                    "data": stats_data
+                })
                 
                 # Add to store
-                store.add_frames(frames)
+                store.add_frames(frames, flush=False)
+                await store.embed_pending()
+                await asyncio.to_thread(store.flush)
                 
                 # Send frames
                 for i, frame in enumerate(frames):
@@ -229,11 +389,8 @@ async def websocket_endpoint(websocket: WebSocket):
                     progress = 0.6 + (0.3 * (i + 1) / len(frames)) if frames else 0.9
                     await send_status(f"Extracted frame {i + 1}/{len(frames)}", progress)
                 
-                # Send graph data
-                await websocket.send_json({
-                    "type": "graph",
-                    "data": store.to_graph_data()
-                })
+                # Send graph changes
+                await send_graph()
                 
                 await send_status(f"Complete! Extracted {len(frames)} frames", 1.0)
                 await websocket.send_json({"type": "complete", "frame_count": len(frames)})
@@ -249,14 +406,16 @@ async def websocket_endpoint(websocket: WebSocket):
                 
                 await send_status("Processing question...")
                 
-                result = await ask(question, store)
+                result = await ask(question, store, collections=message.get("collections"))
                 
                 await websocket.send_json({
                     "type": "answer",
                     "question": result["question"],
                     "answer": result["answer"],
                     "sources": result["sources"],
-                    "frame_count": result["frame_count"]
+                    "frame_count": result["frame_count"],
+                    "store_version": result["store_version"],
+                    "cache": result.get("cache")
                 })
             
             # ─────────────────────────────────────────────
@@ -274,16 +433,15 @@ async def websocket_endpoint(websocket: WebSocket):
             # GET GRAPH
             # ─────────────────────────────────────────────
             elif msg_type == "get_graph":
-                await websocket.send_json({
-                    "type": "graph",
-                    "data": store.to_graph_data()
-                })
+                # Without "since" the client gets the full graph
+                graph_version = message.get("since")
+                await send_graph()
             
             # ─────────────────────────────────────────────
             # CLEAR
             # ─────────────────────────────────────────────
             elif msg_type == "clear":
-                store.clear()
+                await asyncio.to_thread(store.clear)
                 await send_status("Frames cleared")
                 await websocket.send_json({"type": "cleared"})
             
@@ -293,8 +451,10 @@ async def websocket_endpoint(websocket: WebSocket):
             elif msg_type == "load_demo":
                 demo_frames = load_demo_frames()
                 if demo_frames:
-                    store.clear()
-                    store.add_frames(demo_frames)
+                    await asyncio.to_thread(store.clear)
+                    store.add_frames(demo_frames, flush=False)
+                    await store.embed_pending()
+                    await asyncio.to_thread(store.flush)
                     
                     # Send frames to UI
                     for frame in demo_frames:
@@ -303,11 +463,8 @@ async def websocket_endpoint(websocket: WebSocket):
                             "data": frame.to_display()
                         })
                     
-                    # Send graph data
-                    await websocket.send_json({
-                        "type": "graph",
-                        "data": store.to_graph_data()
-                    })
+                    # Send graph changes
+                    await send_graph()
                     
                     await send_status(f"Demo mode: Loaded {len(demo_frames)} pre-extracted frames", 1.0)
                     await websocket.send_json({"type": "complete", "frame_count": len(demo_frames), "demo_mode": True})
@@ -320,8 +477,10 @@ async def websocket_endpoint(websocket: WebSocket):
             elif msg_type == "load_stress_test":
                 stress_frames = load_stress_test_frames()
                 if stress_frames:
-                    store.clear()
-                    store.add_frames(stress_frames)
+                    await asyncio.to_thread(store.clear)
+                    store.add_frames(stress_frames, flush=False)
+                    await store.embed_pending()
+                    await asyncio.to_thread(store.flush)
                     
                     # Send frames to UI
                     for frame in stress_frames:
@@ -330,17 +489,38 @@ async def websocket_endpoint(websocket: WebSocket):
                             "data": frame.to_display()
                         })
                     
-                    # Send graph data
-                    await websocket.send_json({
-                        "type": "graph",
-                        "data": store.to_graph_data()
-                    })
+                    # Send graph changes
+                    await send_graph()
                     
                     await send_status(f"Stress Test: Loaded {len(stress_frames)} frames with causal chains", 1.0)
                     await websocket.send_json({"type": "complete", "frame_count": len(stress_frames), "stress_test": True})
                 else:
                     await send_error("No stress test frames available")
             
+            # ─────────────────────────────────────────────
+            # COLLECTIONS
+            # ─────────────────────────────────────────────
+            elif msg_type == "list_collections":
+                await websocket.send_json({
+                    "type": "collections",
+                    "current": collection,
+                    "data": collections.get_stats()
+                })
+            
+            elif msg_type == "drop_collection":
+                name = message.get("name", "")
+                try:
+                    dropped = collections.drop(name)
+                except ValueError as e:
+                    await send_error(str(e))
+                    continue
+                if not dropped:
+                    await send_error(f"Unknown collection: {name}")
+                    continue
+                if name == collection:
+                    collection, graph_version = DEFAULT_COLLECTION, None
+                await websocket.send_json({"type": "collection_dropped", "name": name, "current": collection})
+            
             else:
                 await send_error(f"Unknown message type: {msg_type}")
     
@@ -0,0 +1,526 @@
+"""
+SQLite Frame Store for Kāraka Frame Graph POC.
+Drop-in FrameStore backend implementing the single-table frame schema from
+research-proposal/executable-storage-schema.md, plus a role-value index table:
+
+    frame       (id, symbol, arguments, time_ref, confidence, source, active,
+                 created_at, + the Frame fields needed to round-trip)
+    frame_role  (frame_id, role, value_norm)   -- one row per filled kāraka
+
+    store_meta  (key, value)                   -- "version": last committed write
+
+Runs in WAL mode: one writer connection, one reader connection per thread,
+so readers never block on ingestion. snapshot() holds a read transaction on
+its own connection, which SQLite keeps at one committed version. Data larger
+than RAM stays on disk; cold start is opening the file.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+from frame_extractor import Frame, ROLE_FIELDS
+from frame_store import (
+    FrameReader, FrameEmbeddings, FrameCausal, FrameEquivalence, FrameGraph, FrameRetraction, FrameSearch,
+    ROLE_ATTR_MAP, IDENTITY_SYMBOL, identity_arguments,
+)
+from entity_equivalence import EquivalenceClasses
+from inverted_index import InvertedIndex
+from causal_index import CausalIndex
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS frame (
+    id            TEXT PRIMARY KEY,
+    symbol        TEXT NOT NULL,               -- kriyā
+    arguments     TEXT NOT NULL,               -- JSON array, ROLE_FIELDS order (null = absent)
+    time_ref      TEXT,                        -- locus_time
+    confidence    REAL DEFAULT 1.0,
+    source        TEXT NOT NULL,
+    active        BOOLEAN DEFAULT TRUE,        -- FALSE = retracted
+    created_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sentence_id   INTEGER,
+    sentence_text TEXT,
+    kriya_surface TEXT,
+    causal_links  TEXT                         -- JSON or NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_frame_symbol ON frame(symbol);
+CREATE INDEX IF NOT EXISTS idx_frame_symbol_norm ON frame(lower(trim(symbol)));
+CREATE INDEX IF NOT EXISTS idx_frame_active ON frame(active) WHERE active = TRUE;
+
+CREATE TABLE IF NOT EXISTS frame_role (
+    frame_id    TEXT NOT NULL REFERENCES frame(id) ON DELETE CASCADE,
+    role        TEXT NOT NULL,
+    value_norm  TEXT NOT NULL                  -- lower(trim(filler))
+);
+
+CREATE INDEX IF NOT EXISTS idx_role_value ON frame_role(role, value_norm);
+CREATE INDEX IF NOT EXISTS idx_value ON frame_role(value_norm);
+CREATE INDEX IF NOT EXISTS idx_role_frame ON frame_role(frame_id);
+
+CREATE TABLE IF NOT EXISTS store_meta (
+    key    TEXT PRIMARY KEY,
+    value  INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO store_meta (key, value) VALUES ('version', 0);
+"""
+
+# Statements are module constants so each connection's statement cache
+# (sqlite3 prepares once per distinct SQL string) reuses them
+_INSERT_FRAME = """
+INSERT OR REPLACE INTO frame
+    (id, symbol, arguments, time_ref, confidence, source, active,
+     sentence_id, sentence_text, kriya_surface, causal_links)
+VALUES (?, ?, ?, ?, 1.0, ?, TRUE, ?, ?, ?, ?)
+"""
+_DELETE_ROLES = "DELETE FROM frame_role WHERE frame_id = ?"
+_INSERT_ROLE = "INSERT INTO frame_role (frame_id, role, value_norm) VALUES (?, ?, ?)"
+_BUMP_VERSION = "UPDATE store_meta SET value = value + 1 WHERE key = 'version'"
+_SELECT_VERSION = "SELECT value FROM store_meta WHERE key = 'version'"
+_RETRACT_FRAME = "UPDATE frame SET active = FALSE WHERE id = ? AND active"
+
+_FRAME_COLUMNS = "f.id, f.symbol, f.arguments, f.sentence_id, f.sentence_text, f.kriya_surface, f.causal_links"
+_SELECT_FRAME = f"SELECT {_FRAME_COLUMNS} FROM frame f WHERE f.id = ? AND f.active"
+_SELECT_RETRACTED = f"SELECT {_FRAME_COLUMNS} FROM frame f WHERE f.id = ? AND NOT f.active"
+_SELECT_ALL = f"SELECT {_FRAME_COLUMNS} FROM frame f WHERE f.active ORDER BY f.rowid"
+_SELECT_BY_KRIYA = f"SELECT {_FRAME_COLUMNS} FROM frame f WHERE lower(trim(f.symbol)) = ? AND f.active"
+_SELECT_BY_ENTITY = f"""
+SELECT DISTINCT {_FRAME_COLUMNS} FROM frame_role r JOIN frame f ON f.id = r.frame_id
+WHERE r.value_norm = ? AND f.active
+"""
+_SELECT_BY_ROLE = f"""
+SELECT DISTINCT {_FRAME_COLUMNS} FROM frame_role r JOIN frame f ON f.id = r.frame_id
+WHERE r.role = ? AND r.value_norm LIKE ? ESCAPE '\\' AND f.active
+"""
+
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class _SQLiteReads(FrameReader):
+    """Frame reads over the connection returned by _reader()."""
+
+    def _reader(self) -> sqlite3.Connection:
+        raise NotImplementedError
+
+    @staticmethod
+    def _row_to_frame(row) -> Frame:
+        frame_id, symbol, arguments, sentence_id, sentence_text, kriya_surface, causal_links = row
+        return Frame(
+            frame_id=frame_id,
+            sentence_id=sentence_id,
+            sentence_text=sentence_text,
+            kriya=symbol,
+            kriya_surface=kriya_surface,
+            causal_links=json.loads(causal_links) if causal_links else None,
+            **dict(zip(ROLE_FIELDS, json.loads(arguments))),
+        )
+
+    def _query(self, sql: str, params: tuple = ()) -> list[Frame]:
+        return [self._row_to_frame(row) for row in self._reader().execute(sql, params)]
+
+    def get_frame(self, frame_id: str) -> Optional[Frame]:
+        """Get a frame by ID."""
+        frames = self._query(_SELECT_FRAME, (frame_id,))
+        return frames[0] if frames else None
+
+    def get_all_frames(self) -> list[Frame]:
+        """Get all frames."""
+        return self._query(_SELECT_ALL)
+
+    def _find_entity(self, normalized: str) -> list[Frame]:
+        return self._query(_SELECT_BY_ENTITY, (normalized,))
+
+    def find_by_kriya(self, kriya: str) -> list[Frame]:
+        """Find all frames with a specific kriya."""
+        return self._query(_SELECT_BY_KRIYA, (kriya.lower().strip(),))
+
+    def find_by_role(self, role: str, value: str) -> list[Frame]:
+        """Find frames where a specific role's value contains the given text."""
+        attr = ROLE_ATTR_MAP.get(role.lower())
+        if not attr:
+            return []
+        # value_norm is stripped; match the same substrings as FrameStore
+        return [
+            frame for frame in self._query(
+                _SELECT_BY_ROLE, (attr, f"%{_like_escape(value.lower().strip())}%")
+            )
+            if value.lower() in getattr(frame, attr).lower()
+        ]
+
+    def _count(self) -> int:
+        return self._reader().execute("SELECT COUNT(*) FROM frame WHERE active").fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._count()
+
+    def _frame_ids(self) -> list[str]:
+        """All frame IDs, in get_all_frames() order."""
+        return [row[0] for row in self._reader().execute("SELECT id FROM frame WHERE active ORDER BY rowid")]
+
+    def _entity_keys(self) -> list[str]:
+        """All normalized entity keys (graph entity nodes)."""
+        rows = self._reader().execute(
+            "SELECT DISTINCT r.value_norm FROM frame_role r JOIN frame f ON f.id = r.frame_id "
+            "WHERE f.active ORDER BY r.rowid"
+        )
+        return [row[0] for row in rows]
+
+
+class SQLiteSnapshot(_SQLiteReads):
+    """Read view pinned to one committed version by an open read transaction."""
+
+    def __init__(self, store: "SQLiteFrameStore"):
+        self._store = store
+        self._conn = conn = store._connect()
+        with store._lock:
+            # No commit between the version read and the captured indexes
+            self._equivalence = store._equivalence
+            self._search = store._search
+            self._causal = store._causal
+            conn.execute("BEGIN")
+            # The first read fixes the transaction's snapshot
+            self.version = conn.execute(_SELECT_VERSION).fetchone()[0]
+            store._register(self.version)
+
+    def _reader(self) -> sqlite3.Connection:
+        return self._conn
+
+    def _search_index(self) -> InvertedIndex:
+        if self._search is None and self._conn is not None:
+            index = self._store.search_index
+            # Built after this snapshot was taken: fall back to a private index
+            self._search = index if index.built <= self.version else super()._search_index()
+        return self._search if self._search is not None else super()._search_index()
+
+    def _causal_index(self) -> CausalIndex:
+        if self._causal is None and self._conn is not None:
+            index = self._store.causal_index
+            self._causal = index if index.built <= self.version else super()._causal_index()
+        return self._causal if self._causal is not None else super()._causal_index()
+
+    def release(self) -> None:
+        """End the read transaction and close its connection."""
+        if self._conn is not None:
+            self._conn.execute("COMMIT")
+            self._conn.close()
+            self._conn = None
+            self._store._release(self.version)
+
+    def __enter__(self) -> "SQLiteSnapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+class SQLiteFrameStore(
+    FrameGraph, FrameRetraction, FrameEquivalence, FrameSearch, FrameCausal, _SQLiteReads, FrameEmbeddings
+):
+    """
+    Frame store backed by a SQLite database (same public API as FrameStore).
+    """
+
+    def __init__(self, db_path: str = "frames.db", import_path: Optional[str] = None):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: SQLite database file
+            import_path: Optional frames.json snapshot imported once when the
+                database is empty (migration from the in-memory store)
+        """
+        self.db_path = Path(db_path)
+        self.persist_path = self.db_path
+        self.scope_id = uuid.uuid4().hex
+        self._init_embeddings(self.db_path)
+        self._local = threading.local()
+        self._lock = threading.RLock()  # Writes, and graph updates after their commit
+        self._swap_lock = threading.Lock()
+        self._readers: dict[int, int] = {}   # version -> open snapshots
+        self._graph = None
+        self._equivalence = None
+        self._search = None
+        self._causal = None
+
+        self._writer = self._connect()
+        self._writer.executescript(SCHEMA)
+
+        if import_path and Path(import_path).exists() and self._count() == 0:
+            try:
+                frames = [Frame(**item) for item in json.loads(Path(import_path).read_text())]
+                self.add_frames(frames)
+                print(f"📥 Imported {len(frames)} frames from {import_path} into {self.db_path}")
+            except Exception as e:
+                print(f"⚠️ Failed to import frames: {e}")
+        self._build_equivalence()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,      # explicit BEGIN/COMMIT
+            cached_statements=64,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """Per-thread read connection (WAL readers see the last commit, never block)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    @property
+    def version(self) -> int:
+        """Last committed version (one per write transaction)."""
+        return self._reader().execute(_SELECT_VERSION).fetchone()[0]
+
+    def snapshot(self) -> SQLiteSnapshot:
+        """Read view at the current version, on its own connection (release it)."""
+        return SQLiteSnapshot(self)
+
+    def _register(self, version: int) -> None:
+        with self._swap_lock:
+            self._readers[version] = self._readers.get(version, 0) + 1
+
+    def _release(self, version: int) -> None:
+        with self._swap_lock:
+            remaining = self._readers.get(version, 0) - 1
+            if remaining > 0:
+                self._readers[version] = remaining
+            else:
+                self._readers.pop(version, None)
+
+    @contextmanager
+    def _transaction(self):
+        """One write transaction: BEGIN IMMEDIATE, then COMMIT, or ROLLBACK on any error."""
+        with self._lock:
+            self._writer.execute("BEGIN IMMEDIATE")
+            with self._writer:
+                yield self._writer
+
+    # ------------------------------------------------------------------- writes
+
+    def _stored_frame(self, frame_id: str) -> Optional[Frame]:
+        """A frame as seen by the write transaction (before it is replaced)."""
+        row = self._writer.execute(_SELECT_FRAME, (frame_id,)).fetchone()
+        return self._row_to_frame(row) if row else None
+
+    def _write_frame(self, frame: Frame) -> None:
+        arguments = [getattr(frame, field) for field in ROLE_FIELDS]
+        self._writer.execute(_INSERT_FRAME, (
+            frame.frame_id,
+            frame.kriya,
+            json.dumps(arguments, ensure_ascii=False),
+            frame.locus_time,
+            f"sentence:{frame.sentence_id}",
+            frame.sentence_id,
+            frame.sentence_text,
+            frame.kriya_surface,
+            json.dumps(frame.causal_links, ensure_ascii=False) if frame.causal_links is not None else None,
+        ))
+        self._writer.execute(_DELETE_ROLES, (frame.frame_id,))
+        self._writer.executemany(_INSERT_ROLE, [
+            (frame.frame_id, field, value.lower().strip())
+            for field, value in frame.role_items()
+        ])
+
+    def _touches_identities(self, frames: list[Frame]) -> bool:
+        """Whether writing (or retiring) frames changes the identity classes."""
+        classes = self._equivalence
+        return classes is not None and any(
+            frame.kriya == IDENTITY_SYMBOL or frame.frame_id in classes for frame in frames
+        )
+
+    def _update_identities(self, retired: list[str], written: list[Frame], version: int) -> None:
+        """
+        Apply committed frame changes to the identity classes. Writers
+        invalidate them before the commit, so until this runs readers at
+        the new version walk the ≡ frames instead.
+        """
+        for frame_id in retired:
+            self._equivalence.remove(frame_id, version)
+        for frame in written:
+            if frame.kriya == IDENTITY_SYMBOL:
+                self._equivalence.add(frame.frame_id, identity_arguments(frame), version)
+            else:
+                self._equivalence.remove(frame.frame_id, version)
+        self._equivalence.changed = version
+
+    def add_frame(self, frame: Frame, flush: bool = False) -> None:
+        """Add a frame to the store (one transaction, committed on return)."""
+        self.add_frames([frame])
+
+    def add_frames(self, frames: list[Frame], flush: bool = True) -> None:
+        """Add multiple frames in a single transaction (flush is implied by the commit)."""
+        if not frames:
+            return
+        with self._lock:
+            replaced = []
+            with self._transaction() as conn:
+                for frame in frames:
+                    if self._graph is not None:
+                        replaced.append(self._stored_frame(frame.frame_id))
+                    self._write_frame(frame)
+                conn.execute(_BUMP_VERSION)
+                version = conn.execute(_SELECT_VERSION).fetchone()[0]
+                identities = self._touches_identities(frames)
+                if identities:
+                    self._equivalence.invalidate()  # Until the update below
+            if identities:
+                self._update_identities([], frames, version)
+            if self._graph is not None:
+                for old, frame in zip(replaced, frames):
+                    if old is not None:
+                        self._graph.remove_frame(old, version)
+                    self._graph.add_frame(frame, version)
+            if self._search is not None:
+                for frame in frames:
+                    self._search.add(frame, version)
+            if self._causal is not None:
+                for frame in frames:
+                    self._causal.add(frame, version)
+        for frame in frames:
+            self._drop_vector(frame.frame_id)
+            self._queue_embedding(frame)
+
+    def delete_frame(self, frame_id: str) -> bool:
+        """Remove a frame. Returns False if it was not stored."""
+        with self._lock:
+            with self._transaction() as conn:
+                old = self._stored_frame(frame_id) if self._graph is not None else None
+                conn.execute(_DELETE_ROLES, (frame_id,))
+                deleted = conn.execute("DELETE FROM frame WHERE id = ?", (frame_id,)).rowcount
+                if deleted:
+                    conn.execute(_BUMP_VERSION)
+                version = conn.execute(_SELECT_VERSION).fetchone()[0]
+                identity = self._equivalence is not None and frame_id in self._equivalence
+                if identity:
+                    self._equivalence.invalidate()
+            if identity:
+                self._update_identities([frame_id], [], version)
+            if old is not None:
+                self._graph.remove_frame(old, version)
+            if deleted and self._search is not None:
+                self._search.remove(frame_id, version)
+            if deleted and self._causal is not None:
+                self._causal.remove(frame_id, version)
+        self._drop_vector(frame_id)
+        return deleted > 0
+
+    def _current(self) -> FrameReader:
+        """Committed state (callers hold _lock, so no write is in flight)."""
+        return self
+
+    def _commit_retraction(self, frames: list[Frame], asserted: list[Frame]) -> None:
+        """Set active = FALSE on frames and insert the asserted ones, in one transaction."""
+        if not frames and not asserted:
+            return
+        with self._lock:
+            with self._transaction() as conn:
+                conn.executemany(_RETRACT_FRAME, [(frame.frame_id,) for frame in frames])
+                for frame in asserted:
+                    self._write_frame(frame)
+                conn.execute(_BUMP_VERSION)
+                version = conn.execute(_SELECT_VERSION).fetchone()[0]
+                identities = self._touches_identities(frames + asserted)
+                if identities:
+                    self._equivalence.invalidate()
+            if identities:
+                self._update_identities([frame.frame_id for frame in frames], asserted, version)
+            if self._graph is not None:
+                for frame in frames:
+                    self._graph.remove_frame(frame, version)
+                for frame in asserted:
+                    self._graph.add_frame(frame, version)
+            if self._search is not None:
+                for frame in frames:
+                    self._search.remove(frame.frame_id, version)
+                for frame in asserted:
+                    self._search.add(frame, version)
+            if self._causal is not None:
+                for frame in frames:
+                    self._causal.remove(frame.frame_id, version)
+                for frame in asserted:
+                    self._causal.add(frame, version)
+        for frame in frames:
+            self._drop_vector(frame.frame_id)
+        for frame in asserted:
+            self._queue_embedding(frame)
+
+    def get_retracted(self, frame_id: str) -> Optional[Frame]:
+        """A retracted (inactive) frame, or None."""
+        frames = self._query(_SELECT_RETRACTED, (frame_id,))
+        return frames[0] if frames else None
+
+    def flush(self) -> None:
+        """Frame writes are committed per call; only embeddings need flushing."""
+        self._flush_embeddings()
+
+    def compact(self) -> None:
+        """Checkpoint the WAL into the main database file."""
+        with self._lock:
+            self._writer.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self) -> None:
+        """Checkpoint and close the writer connection."""
+        self.compact()
+        self._writer.close()
+        self._close_embeddings()
+
+    def clear(self) -> None:
+        """Clear all frames."""
+        with self._lock:
+            with self._transaction() as conn:
+                conn.execute("DELETE FROM frame_role")
+                conn.execute("DELETE FROM frame")
+                conn.execute(_BUMP_VERSION)
+                version = conn.execute(_SELECT_VERSION).fetchone()[0]
+                if self._equivalence is not None:
+                    self._equivalence.invalidate()
+            self._equivalence = EquivalenceClasses(version)
+            self._search = None
+            self._causal = None
+            if self._graph is not None:
+                self._graph.reset(version)
+        self._clear_embeddings()
+
+    def to_json(self) -> str:
+        """Export all frames as JSON (one version)."""
+        with self.snapshot() as snapshot:
+            return snapshot.to_json()
+
+    def get_stats(self) -> dict:
+        """Get statistics about the store."""
+        conn = self._reader()
+        kriyas = [row[0] for row in conn.execute(
+            "SELECT DISTINCT lower(trim(symbol)) FROM frame WHERE active"
+        )]
+        return {
+            "total_frames": self._count(),
+            "unique_entities": conn.execute(
+                "SELECT COUNT(DISTINCT value_norm) FROM frame_role"
+            ).fetchone()[0],
+            "unique_kriyas": len(kriyas),
+            "kriyas": kriyas,
+            "version": conn.execute(_SELECT_VERSION).fetchone()[0],
+            "retracted_frames": conn.execute("SELECT COUNT(*) FROM frame WHERE NOT active").fetchone()[0],
+            "backend": "sqlite",
+            "db_size_bytes": os.path.getsize(self.db_path) if self.db_path.exists() else 0,
+            **self._graph_stats(),
+            **self._equivalence_stats(),
+            **self._search_stats(),
+            **self._causal_stats(),
+            **self._embedding_stats(),
+        }
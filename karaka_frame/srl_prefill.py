@@ -0,0 +1,201 @@
+"""
+SRL Prefill for Kāraka Frame Graph POC.
+Builds a candidate frame from a spaCy dependency parse before any LLM call:
+
+    nsubj → kartā (nsubjpass → karma), "by" agent → kartā, dobj → karma,
+    prepositional objects → kāraka via PREP_ROLES
+
+When the parse is unambiguous and passes the grounding checks the candidate
+is used as-is; otherwise the LLM only confirms it or returns a short diff.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+from frame_validator import check_invariants
+
+# Preposition → kāraka role. "locus" is resolved by the object's type
+# (time / place / topic); prepositions absent here make the parse ambiguous.
+PREP_ROLES = {
+    "with": "karana",
+    "using": "karana",
+    "via": "karana",
+    "through": "karana",
+    "from": "apadana",
+    "out": "apadana",       # "out of"
+    "to": "sampradana",
+    "for": "sampradana",
+    "in": "locus",
+    "at": "locus",
+    "on": "locus",
+    "during": "locus_time",
+    "since": "locus_time",
+    "until": "locus_time",
+    "before": "locus_time",
+    "after": "locus_time",
+    "about": "locus_topic",
+    "regarding": "locus_topic",
+    "concerning": "locus_topic",
+    "examining": "locus_topic",
+}
+
+TIME_ENTS = {"DATE", "TIME"}
+PLACE_ENTS = {"GPE", "LOC", "FAC", "ORG"}
+RECIPIENT_ENTS = {"PERSON", "ORG", "NORP"}
+
+_YEAR_RE = re.compile(r"\b(1[5-9]|20)\d\d\b")
+
+# Clausal dependents that introduce a second event
+CLAUSE_DEPS = {"conj", "ccomp", "advcl", "xcomp", "relcl", "parataxis"}
+
+# Prefill first ("on"/"off"); needs spaCy and en_core_web_sm
+SRL_PREFILL = os.getenv("SRL_PREFILL", "on").lower() == "on"
+
+# Set once the parser failed to load, so later sentences skip straight to the LLM
+_parser_unavailable = False
+
+
+@dataclass
+class Prefill:
+    """Parse-derived candidate frame."""
+    data: dict                                  # kriya, kriya_surface, prayoga, role fields
+    ambiguities: list[str] = field(default_factory=list)
+
+    @property
+    def is_clean(self) -> bool:
+        """True if the candidate can skip the LLM entirely."""
+        return not self.ambiguities
+
+
+def _span_text(token) -> str:
+    """Text of a token's full subtree (the whole noun phrase)."""
+    doc = token.doc
+    return doc[token.left_edge.i:token.right_edge.i + 1].text
+
+
+def _ent_types(token) -> set[str]:
+    """Named-entity labels inside a token's subtree."""
+    return {t.ent_type_ for t in token.subtree if t.ent_type_}
+
+
+def resolve_role(prep: str, pobj, ambiguities: list[str]) -> Optional[str]:
+    """Map one prepositional object to a role field (None if unmappable)."""
+    ents = _ent_types(pobj)
+    is_time = bool(ents & TIME_ENTS) or bool(_YEAR_RE.search(_span_text(pobj)))
+    role = PREP_ROLES.get(prep)
+
+    if is_time and role in ("locus", "locus_time", "apadana", "sampradana"):
+        # "in 2024", "from 2018 to 2023": temporal regardless of preposition
+        return "locus_time"
+    if role is None:
+        ambiguities.append(f"unmapped preposition '{prep}'")
+        return None
+    if role == "locus":
+        if ents & PLACE_ENTS:
+            return "locus_space"
+        if prep == "on":
+            return "locus_topic"
+        ambiguities.append(f"'{prep} {_span_text(pobj)}': place or topic")
+        return None
+    if role == "sampradana" and not ents & RECIPIENT_ENTS:
+        # "went to Berlin", "for six months": not a beneficiary
+        ambiguities.append(f"'{prep} {_span_text(pobj)}': recipient unclear")
+        return None
+    return role
+
+
+def prefill_from_doc(doc) -> Optional[Prefill]:
+    """
+    Build a candidate frame from a parsed sentence.
+
+    Returns:
+        Prefill, or None if the root is not a verb (nothing to prefill)
+    """
+    root = next((t for t in doc if t.dep_ == "ROOT"), None)
+    if root is None or root.pos_ not in ("VERB", "AUX"):
+        return None
+
+    ambiguities = []
+    roles: dict[str, str] = {}
+
+    def assign(role: str, token) -> None:
+        value = _span_text(token)
+        if role in roles and roles[role] != value:
+            ambiguities.append(f"two candidates for {role}")
+            return
+        roles[role] = value
+
+    passive = any(c.dep_ in ("nsubjpass", "auxpass") for c in root.children)
+    if root.lemma_ == "be" or any(c.dep_ in ("attr", "acomp") for c in root.children):
+        ambiguities.append("copular root")
+
+    for child in root.children:
+        dep = child.dep_
+        if dep == "nsubj":
+            assign("karta", child)
+        elif dep == "nsubjpass":
+            assign("karma", child)
+        elif dep == "dobj":
+            assign("karma", child)
+        elif dep == "dative":
+            assign("sampradana", child)
+        elif dep == "agent":
+            pobj = next((c for c in child.children if c.dep_ == "pobj"), None)
+            if pobj is not None:
+                assign("karta", pobj)
+        elif dep == "prep":
+            prep = child.lower_
+            pobj = next((c for c in child.children if c.dep_ in ("pobj", "pcomp")), None)
+            if prep == "out":
+                nested = next((c for c in child.children if c.dep_ == "prep"), None)
+                pobj = next((c for c in nested.children if c.dep_ == "pobj"), None) if nested else None
+            if pobj is None:
+                ambiguities.append(f"preposition '{prep}' without object")
+                continue
+            role = resolve_role(prep, pobj, ambiguities)
+            if role:
+                assign(role, pobj)
+        elif dep in CLAUSE_DEPS and child.pos_ in ("VERB", "AUX"):
+            ambiguities.append(f"second clause '{child.text}' ({dep})")
+        elif dep == "neg":
+            ambiguities.append("negated event")
+
+    # Verb group as written: auxiliaries directly before the verb plus the verb
+    aux = [c.i for c in root.children if c.dep_ in ("aux", "auxpass") and c.i < root.i]
+    surface = doc[min(aux + [root.i]):root.i + 1].text
+
+    data = {
+        "kriya": root.lemma_.lower(),
+        "kriya_surface": surface,
+        "prayoga": "passive" if passive else "active",
+        **roles,
+    }
+    ambiguities.extend(
+        str(issue) for issue in check_invariants(
+            doc.text, data["kriya"], surface, roles, data["prayoga"]
+        )
+    )
+    return Prefill(data=data, ambiguities=ambiguities)
+
+
+def prefill_frame(sentence: str) -> Optional[Prefill]:
+    """
+    Parse a sentence and build its candidate frame.
+
+    Returns:
+        Prefill, or None if prefill is disabled, spaCy is unavailable or
+        the sentence has no verbal root
+    """
+    global _parser_unavailable
+    if not SRL_PREFILL or _parser_unavailable:
+        return None
+    from sentence_splitter import get_installed_nlp
+    nlp = get_installed_nlp()
+    if nlp is None:
+        print("  ⚠️ SRL prefill disabled: spaCy model en_core_web_sm is not installed")
+        _parser_unavailable = True
+        return None
+    doc = nlp(sentence.strip())
+    return prefill_from_doc(doc)
@@ -0,0 +1,339 @@
+"""
+Stage Pipeline for Kāraka Frame Graph POC.
+Runs the multi-phase extraction prompts as a small stage graph:
+
+    D1 (entities) ──┐
+                    ├──► D2b (event instances + kāraka links)
+    D2a (kriyās) ───┘
+
+D1 and D2a run concurrently per sentence; D2b consumes both. Each stage's
+output is cached under a key built from its own prompt text, the model, the
+sentence and its inputs, so editing one prompt file only re-runs that stage (and the stages
+downstream of it whose inputs actually change).
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Callable, Optional
+
+from llm_client import call_llm, resolve_model
+from sentence_index import normalize_sentence
+from frame_validator import LABEL_ROLES
+
+PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
+
+# Per-stage concurrency limits, e.g. "D1=8,D2a=8,D2b=4"
+DEFAULT_CONCURRENCY = {"D1": 8, "D2a": 8, "D2b": 4}
+
+_JSON_BLOCK_RE = re.compile(r"<json>(.*?)</json>", re.DOTALL)
+
+
+def parse_concurrency(spec: Optional[str]) -> dict[str, int]:
+    """Parse a "STAGE=N,STAGE=N" spec on top of the defaults."""
+    limits = dict(DEFAULT_CONCURRENCY)
+    for part in (spec or "").split(","):
+        name, _, value = part.partition("=")
+        if name.strip() and value.strip().isdigit():
+            limits[name.strip()] = max(1, int(value))
+    return limits
+
+
+def parse_tagged_json(text: str) -> dict:
+    """Parse the <json> block of a reasoning response (or the outermost object)."""
+    match = _JSON_BLOCK_RE.search(text or "")
+    if match:
+        body = match.group(1)
+    else:
+        start, end = (text or "").find("{"), (text or "").rfind("}")
+        if start < 0 or end < start:
+            raise json.JSONDecodeError("No JSON object in response", text or "", 0)
+        body = text[start:end + 1]
+    return json.loads(body)
+
+
+@dataclass
+class Stage:
+    """One node of the stage graph."""
+    name: str
+    prompt_file: str
+    deps: tuple[str, ...]
+    # Fills the prompt template from the sentence and dependency outputs
+    render: Callable[[str, str, dict], str]
+    max_concurrency: int = 4
+    task: str = "extraction_reasoning"  # Routing task (see llm_client.TASK_TIERS)
+
+    @cached_property
+    def prompt(self) -> str:
+        """Prompt template, read once per process."""
+        return (PROMPTS_DIR / self.prompt_file).read_text()
+
+    @cached_property
+    def prompt_hash(self) -> str:
+        return hashlib.sha256(self.prompt.encode("utf-8")).hexdigest()[:16]
+
+    def cache_key(self, sentence: str, inputs: dict) -> str:
+        """Key over this stage's prompt and model, the sentence and its upstream outputs."""
+        material = json.dumps(
+            [self.name, self.prompt_hash, resolve_model(self.task)[0], normalize_sentence(sentence),
+             [inputs[d] for d in self.deps]],
+            ensure_ascii=False, sort_keys=True
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()[:24]
+
+
+def _render_sentence_only(template: str, sentence: str, inputs: dict) -> str:
+    return template.replace("{SENTENCE_HERE}", sentence)
+
+
+def _render_d2b(template: str, sentence: str, inputs: dict) -> str:
+    return (
+        template
+        .replace("{SENTENCE_HERE}", sentence)
+        .replace("{ENTITY_LIST_JSON}", json.dumps(inputs["D1"].get("entities", []), ensure_ascii=False, indent=2))
+        .replace("{KRIYA_LIST_JSON}", json.dumps(inputs["D2a"].get("kriyās", []), ensure_ascii=False, indent=2))
+    )
+
+
+@dataclass
+class StageTiming:
+    """Counters and wall-clock time for one stage."""
+    runs: int = 0
+    cache_hits: int = 0
+    failures: int = 0
+    seconds: float = 0.0        # time spent in LLM calls
+    wait_seconds: float = 0.0   # time queued on the concurrency limit
+    tokens: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "runs": self.runs,
+            "cache_hits": self.cache_hits,
+            "failures": self.failures,
+            "seconds": round(self.seconds, 3),
+            "avg_seconds": round(self.seconds / self.runs, 3) if self.runs else 0.0,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "tokens": self.tokens,
+        }
+
+
+class StageCache:
+    """
+    Stage output cache: (stage, key) → output dict.
+    Persisted as an append-only JSONL log of {"stage", "key", "output"} records.
+    """
+
+    def __init__(self, persist_path: Optional[str] = None):
+        self.entries: dict[tuple[str, str], dict] = {}
+        self.persist_path = Path(persist_path) if persist_path else None
+        if self.persist_path and self.persist_path.exists():
+            self._load()
+
+    def get(self, stage: str, key: str) -> Optional[dict]:
+        return self.entries.get((stage, key))
+
+    def put(self, stage: str, key: str, output: dict) -> None:
+        self.entries[(stage, key)] = output
+        if self.persist_path:
+            with self.persist_path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps({"stage": stage, "key": key, "output": output},
+                                   ensure_ascii=False) + "\n")
+
+    def _load(self) -> None:
+        """Replay the JSONL log, skipping a torn final line."""
+        try:
+            with self.persist_path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.entries[(record["stage"], record["key"])] = record["output"]
+        except Exception as e:
+            print(f"⚠️ Failed to load stage cache: {e}")
+
+
+class StagePipeline:
+    """Executes the stage graph for sentences, with per-stage caching and limits."""
+
+    def __init__(self, stages: list[Stage], cache: Optional[StageCache] = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stages: Stages in dependency order (deps must appear earlier)
+            cache: Stage output cache (in-memory only if omitted)
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache = cache if cache is not None else StageCache()
+        self.timings = {stage.name: StageTiming() for stage in stages}
+        self._limits = {
+            stage.name: asyncio.Semaphore(stage.max_concurrency) for stage in stages
+        }
+        # Concurrent callers of the same (stage, key) share one LLM call
+        self._inflight: dict[tuple[str, str], asyncio.Future] = {}
+
+    async def _run_stage(self, stage: Stage, sentence: str, inputs: dict, usage: dict) -> dict:
+        """Run one stage for one sentence, serving from cache when possible."""
+        timing = self.timings[stage.name]
+        key = stage.cache_key(sentence, inputs)
+
+        cached = self.cache.get(stage.name, key)
+        if cached is not None:
+            timing.cache_hits += 1
+            return cached
+
+        inflight = self._inflight.get((stage.name, key))
+        if inflight is not None:
+            timing.cache_hits += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise  # This caller was cancelled
+                # The call we waited on was cancelled: make our own
+                timing.cache_hits -= 1
+                return await self._run_stage(stage, sentence, inputs, usage)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[(stage.name, key)] = future
+        try:
+            queued = time.perf_counter()
+            async with self._limits[stage.name]:
+                started = time.perf_counter()
+                timing.wait_seconds += started - queued
+                call_usage = {}
+                try:
+                    response = await call_llm(
+                        stage.render(stage.prompt, sentence, inputs),
+                        "Analyze the SENTENCE above following the instructions.",
+                        usage=call_usage,
+                        task=stage.task
+                    )
+                    output = parse_tagged_json(response)
+                finally:
+                    timing.runs += 1
+                    timing.seconds += time.perf_counter() - started
+                    for name, count in call_usage.items():
+                        usage[name] = usage.get(name, 0) + count
+                    timing.tokens += call_usage.get("prompt_tokens", 0) + call_usage.get("completion_tokens", 0)
+            self.cache.put(stage.name, key, output)
+        except Exception as e:
+            timing.failures += 1
+            future.set_exception(e)
+            future.exception()  # Mark retrieved; waiters re-raise it themselves
+            raise
+        except BaseException:
+            # Cancelled (or exiting): waiters must not hang on the future
+            future.cancel()
+            raise
+        finally:
+            self._inflight.pop((stage.name, key), None)
+
+        future.set_result(output)
+        return output
+
+    async def run(self, sentence: str, usage: dict = None) -> dict[str, dict]:
+        """
+        Run every stage for one sentence. Stages whose dependencies are
+        satisfied run concurrently.
+
+        Args:
+            sentence: Sentence text
+            usage: Optional dict to accumulate LLM calls/tokens into
+
+        Returns:
+            Stage name → parsed output
+        """
+        usage = usage if usage is not None else {}
+        outputs: dict[str, dict] = {}
+        pending = dict(self.stages)
+        while pending:
+            ready = [s for s in pending.values() if all(d in outputs for d in s.deps)]
+            if not ready:
+                raise ValueError(f"Unsatisfiable stage dependencies: {sorted(pending)}")
+            results = await asyncio.gather(*(
+                self._run_stage(stage, sentence, {d: outputs[d] for d in stage.deps}, usage)
+                for stage in ready
+            ))
+            for stage, result in zip(ready, results):
+                outputs[stage.name] = result
+                del pending[stage.name]
+        return outputs
+
+    async def run_many(self, sentences: list[str], usage: dict = None) -> list:
+        """
+        Run the graph for many sentences at once (bounded by the per-stage
+        limits). Failed sentences yield their exception instead of outputs.
+        """
+        return await asyncio.gather(
+            *(self.run(s, usage) for s in sentences), return_exceptions=True
+        )
+
+    def get_stats(self) -> dict:
+        """Per-stage timings, cache hits and concurrency limits."""
+        return {
+            name: {
+                **self.timings[name].to_dict(),
+                "max_concurrency": stage.max_concurrency,
+                "prompt_hash": stage.prompt_hash,
+            }
+            for name, stage in self.stages.items()
+        }
+
+
+def primary_event(outputs: dict[str, dict]) -> Optional[dict]:
+    """
+    Flatten the D2b result to the single-event frame shape used by Frame:
+    {"kriya", "kriya_surface", "prayoga", <role fields>}. The first
+    non-copula event instance is the sentence's main event.
+
+    Returns:
+        The frame dict, or None if D2b found no event
+    """
+    copulas = {
+        k.get("surface_text") for k in outputs.get("D2a", {}).get("kriyās", [])
+        if k.get("is_copula")
+    }
+    instances = outputs.get("D2b", {}).get("event_instances", [])
+    event = next((e for e in instances if e.get("surface_text") not in copulas), None)
+    if event is None:
+        return None
+
+    data = {
+        "kriya": event.get("kriyā_concept") or event.get("kriya_concept"),
+        "kriya_surface": event.get("surface_text", ""),
+        "prayoga": event.get("prayoga"),
+    }
+    for link in event.get("kāraka_links", event.get("karaka_links", [])):
+        role = LABEL_ROLES.get(str(link.get("role", "")).lower())
+        if role and not data.get(role):
+            data[role] = link.get("entity")
+    return data
+
+
+def build_extraction_pipeline(cache: Optional[StageCache] = None) -> StagePipeline:
+    """The D1 ∥ D2a → D2b extraction graph, with limits from STAGE_CONCURRENCY."""
+    limits = parse_concurrency(os.getenv("STAGE_CONCURRENCY"))
+    return StagePipeline([
+        Stage("D1", "D1_entity_extraction.txt", (), _render_sentence_only, limits["D1"]),
+        Stage("D2a", "D2a_kriya_extraction.txt", (), _render_sentence_only, limits["D2a"]),
+        Stage("D2b", "D2b_event_karaka_extraction.txt", ("D1", "D2a"), _render_d2b, limits["D2b"]),
+    ], cache=cache)
+
+
+# Global pipeline instance
+_pipeline: Optional[StagePipeline] = None
+
+def get_stage_pipeline(persist_path: str = "stage_cache.jsonl") -> StagePipeline:
+    """Get or create the global extraction stage pipeline."""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = build_extraction_pipeline(StageCache(persist_path))
+    return _pipeline
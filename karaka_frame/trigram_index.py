@@ -0,0 +1,110 @@
+"""
+Trigram Index for Kāraka Frame Graph POC.
+Per-role substring index behind FrameStore.find_by_role.
+
+Role fillers repeat heavily across a corpus, so the index is built over
+distinct lowercased values rather than frames:
+
+    trigram → {value}          (posting lists)
+    value   → {frame_id}
+
+A query intersects the postings of its trigrams (smallest first), verifies
+`query in value` on the surviving candidates and unions their frame IDs.
+Queries shorter than three characters scan the role's distinct values.
+"""
+
+from typing import Optional
+
+
+def trigrams(text: str) -> set[str]:
+    """Distinct character trigrams of a (lowercased) string."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Incremental trigram index: (role, value) → frame IDs."""
+
+    def __init__(self):
+        # role → value → frame_ids
+        self.values: dict[str, dict[str, set[str]]] = {}
+        # role → trigram → values
+        self.grams: dict[str, dict[str, set[str]]] = {}
+
+    def add(self, role: str, value: str, frame_id: str) -> None:
+        """Index one role filler of a frame."""
+        value = value.lower()
+        role_values = self.values.setdefault(role, {})
+        frame_ids = role_values.get(value)
+        if frame_ids is None:
+            frame_ids = role_values[value] = set()
+            role_grams = self.grams.setdefault(role, {})
+            for gram in trigrams(value):
+                role_grams.setdefault(gram, set()).add(value)
+        frame_ids.add(frame_id)
+
+    def remove(self, role: str, value: str, frame_id: str) -> None:
+        """Drop one role filler of a frame; unused values leave the postings."""
+        value = value.lower()
+        role_values = self.values.get(role, {})
+        frame_ids = role_values.get(value)
+        if frame_ids is None:
+            return
+        frame_ids.discard(frame_id)
+        if frame_ids:
+            return
+        del role_values[value]
+        role_grams = self.grams.get(role, {})
+        for gram in trigrams(value):
+            posting = role_grams.get(gram)
+            if posting is not None:
+                posting.discard(value)
+                if not posting:
+                    del role_grams[gram]
+
+    def _candidates(self, role: str, query: str) -> Optional[set[str]]:
+        """Values sharing every trigram of the query (None: query too short)."""
+        grams = trigrams(query)
+        if not grams:
+            return None
+        role_grams = self.grams.get(role, {})
+        postings = []
+        for gram in grams:
+            posting = role_grams.get(gram)
+            if not posting:
+                return set()
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        return candidates
+
+    def lookup(self, role: str, query: str) -> set[str]:
+        """Frame IDs whose filler for role contains query (case-insensitive)."""
+        query = query.lower()
+        role_values = self.values.get(role, {})
+        candidates = self._candidates(role, query)
+        if candidates is None:
+            candidates = role_values.keys()
+
+        frame_ids: set[str] = set()
+        for value in candidates:
+            if query in value:
+                frame_ids |= role_values[value]
+        return frame_ids
+
+    def clear(self) -> None:
+        self.values.clear()
+        self.grams.clear()
+
+    def get_stats(self) -> dict:
+        """Distinct values and trigram postings per role."""
+        return {
+            role: {
+                "values": len(self.values.get(role, {})),
+                "trigrams": len(self.grams.get(role, {})),
+            }
+            for role in self.values
+        }
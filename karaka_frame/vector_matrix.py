@@ -0,0 +1,281 @@
+"""
+Vector Matrix for Kāraka Frame Graph POC.
+Growable contiguous float16 matrix of frame embeddings with a row ↔ frame_id
+map. When persisted, the matrix is a memory-mapped file that grows by
+doubling, and the row map is an append-only log beside it:
+
+    <base>.f16    raw float16 rows (capacity × dim)
+    <base>.ids    "# dim=<d> model=<m>" header, then "<row>\\t<frame_id>" lines
+                  ("<row>\\t" clears a row)
+
+Freed rows are reused by the next new frames, so the matrix grows with the
+peak number of vectors, not the number of writes. The row map is rewritten
+(one line per vector) on flush once it holds IDS_LOG_SLACK times as many
+lines as vectors. Writes and flushes take `lock`; flushes run in worker
+threads (asyncio.to_thread) while embeddings are added.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+_CHUNK_ROWS = 65536
+
+# Row map lines per stored vector before the map is rewritten
+IDS_LOG_SLACK = 2
+
+
+class VectorMatrix:
+    """Frame embeddings as one float16 matrix (≈2·dim bytes per frame)."""
+
+    def __init__(
+        self,
+        dim: int,
+        path: Optional[str] = None,
+        model: str = "",
+        initial_capacity: int = 1024,
+    ):
+        """
+        Initialize the matrix.
+
+        Args:
+            dim: Embedding dimension
+            path: Optional base path for the memory-mapped files
+            model: Embedding model tag; stored vectors from a different
+                model or dimension are discarded on load
+            initial_capacity: Rows allocated up front
+        """
+        self.dim = dim
+        self.model = model
+        self.base = Path(path) if path else None
+        self.ids: list[Optional[str]] = []    # row → frame_id (None = free)
+        self.row_of: dict[str, int] = {}      # frame_id → row
+        self.free_rows: set[int] = set()      # removed rows, masked in search, reused
+        self.lock = threading.RLock()         # writes, growth and flushes
+        self._matrix = None
+        self._ids_file = None
+        self._log_lines = 0                   # lines in the row map after its header
+
+        if self.base:
+            self.data_path = self.base.with_name(self.base.name + ".f16")
+            self.ids_path = self.base.with_name(self.base.name + ".ids")
+            if not self._load():
+                self._reset_files(initial_capacity)
+        else:
+            self._matrix = np.zeros((initial_capacity, dim), dtype=np.float16)
+
+    # ------------------------------------------------------------- persistence
+
+    def _header(self) -> str:
+        return f"# dim={self.dim} model={self.model}\n"
+
+    def _open_memmap(self, capacity: int) -> None:
+        self._matrix = np.memmap(self.data_path, dtype=np.float16, mode="r+", shape=(capacity, self.dim))
+
+    def _reset_files(self, capacity: int) -> None:
+        with self.data_path.open("wb") as f:
+            f.truncate(capacity * self.dim * 2)
+        self.ids_path.write_text(self._header(), encoding="utf-8")
+        self._open_memmap(capacity)
+
+    def _load(self) -> bool:
+        """Map existing files. Returns False if they are missing or incompatible."""
+        if not (self.data_path.exists() and self.ids_path.exists()):
+            return False
+        with self.ids_path.open("r", encoding="utf-8") as f:
+            if f.readline() != self._header():
+                print(f"⚠️ Embedding dim/model changed, discarding {self.data_path.name}")
+                return False
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # Torn final line
+                self._log_lines += 1
+                row_text, _, frame_id = line.rstrip("\n").partition("\t")
+                row = int(row_text)
+                while len(self.ids) <= row:
+                    self.ids.append(None)
+                old = self.ids[row]
+                if old is not None and self.row_of.get(old) == row:
+                    del self.row_of[old]
+                self.ids[row] = frame_id or None
+                if frame_id:
+                    self.row_of[frame_id] = row
+
+        self.free_rows = {row for row, fid in enumerate(self.ids) if fid is None}
+        capacity = self.data_path.stat().st_size // (self.dim * 2)
+        if capacity < len(self.ids):
+            print(f"⚠️ {self.data_path.name} is shorter than its row map, discarding")
+            self.ids, self.row_of, self.free_rows = [], {}, set()
+            return False
+        self._open_memmap(max(capacity, 1))
+        return True
+
+    def _log_row(self, row: int, frame_id: Optional[str]) -> None:
+        if self.base is None:
+            return
+        if self._ids_file is None:
+            self._ids_file = self.ids_path.open("a", encoding="utf-8")
+        self._ids_file.write(f"{row}\t{frame_id or ''}\n")
+        self._log_lines += 1
+
+    def _rewrite_ids(self) -> None:
+        """Replace the row map with one line per stored vector (atomic rename)."""
+        if self._ids_file is not None:
+            self._ids_file.close()
+            self._ids_file = None
+        tmp_path = self.ids_path.with_name(self.ids_path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            f.write(self._header())
+            for row, frame_id in enumerate(self.ids):
+                if frame_id is not None:
+                    f.write(f"{row}\t{frame_id}\n")
+            if self.ids and self.ids[-1] is None:
+                f.write(f"{len(self.ids) - 1}\t\n")  # Keeps the row count
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.ids_path)
+        self._log_lines = len(self.row_of) + (1 if self.ids and self.ids[-1] is None else 0)
+
+    def flush(self) -> None:
+        """Write dirty pages and the row map to disk."""
+        if self.base is None:
+            return
+        with self.lock:
+            self._matrix.flush()
+            if self._log_lines > IDS_LOG_SLACK * max(len(self.row_of), 1024):
+                self._rewrite_ids()
+            elif self._ids_file is not None:
+                self._ids_file.flush()
+
+    def close(self) -> None:
+        with self.lock:
+            self.flush()
+            if self._ids_file is not None:
+                self._ids_file.close()
+                self._ids_file = None
+
+    # ------------------------------------------------------------------ writes
+
+    @property
+    def capacity(self) -> int:
+        return self._matrix.shape[0]
+
+    def _grow(self, needed: int) -> None:
+        """Double capacity until `needed` rows fit (callers hold lock)."""
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        if capacity == self.capacity:
+            return
+        if self.base is None:
+            grown = np.zeros((capacity, self.dim), dtype=np.float16)
+            grown[:len(self.ids)] = self._matrix[:len(self.ids)]
+            self._matrix = grown
+            return
+        self._matrix.flush()
+        with self.data_path.open("r+b") as f:
+            f.truncate(capacity * self.dim * 2)
+        # Readers keep the old mapping (a prefix of the file) until the swap
+        self._matrix = np.memmap(self.data_path, dtype=np.float16, mode="r+", shape=(capacity, self.dim))
+
+    def set_many(self, frame_ids: list[str], vectors: np.ndarray) -> None:
+        """Store (or overwrite) one vector per frame ID; new IDs reuse freed rows first."""
+        if len(frame_ids) != len(vectors):
+            raise ValueError("frame_ids and vectors differ in length")
+        with self.lock:
+            new = [fid for fid in dict.fromkeys(frame_ids) if fid not in self.row_of]
+            reused = sorted(self.free_rows)[:len(new)]
+            self._grow(len(self.ids) + len(new) - len(reused))
+            for fid, row in zip(new, reused):
+                self.free_rows.discard(row)
+                self.ids[row] = fid
+                self.row_of[fid] = row
+                self._log_row(row, fid)
+            for fid in new[len(reused):]:
+                self.row_of[fid] = len(self.ids)
+                self.ids.append(fid)
+                self._log_row(self.row_of[fid], fid)
+            rows = [self.row_of[fid] for fid in frame_ids]
+            self._matrix[rows] = np.asarray(vectors, dtype=np.float16)
+
+    def set(self, frame_id: str, vector: np.ndarray) -> None:
+        self.set_many([frame_id], np.asarray(vector).reshape(1, -1))
+
+    def remove(self, frame_id: str) -> None:
+        """Free a frame's row (reused by the next new frame)."""
+        with self.lock:
+            row = self.row_of.pop(frame_id, None)
+            if row is None:
+                return
+            self.ids[row] = None
+            self.free_rows.add(row)
+            self._matrix[row] = 0
+            self._log_row(row, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.ids, self.row_of, self.free_rows = [], {}, set()
+            if self.base is None:
+                self._matrix[:] = 0
+                return
+            if self._ids_file is not None:
+                self._ids_file.close()
+                self._ids_file = None
+            self._log_lines = 0
+            capacity = self.capacity
+            self._matrix = None
+            self._reset_files(capacity)
+
+    # ------------------------------------------------------------------- reads
+
+    def __contains__(self, frame_id: str) -> bool:
+        return frame_id in self.row_of
+
+    def __len__(self) -> int:
+        return len(self.row_of)
+
+    def get(self, frame_id: str) -> Optional[np.ndarray]:
+        """A frame's vector as float32 (None if not embedded)."""
+        row = self.row_of.get(frame_id)
+        return None if row is None else self._matrix[row].astype(np.float32)
+
+    def rows(self) -> np.ndarray:
+        """View of the used rows (float16, includes freed rows as zeros)."""
+        return self._matrix[:len(self.ids)]
+
+    def search(self, query: np.ndarray, k: int = 10) -> list[tuple[str, float]]:
+        """
+        Exact top-k by inner product (cosine for normalized vectors),
+        scanned in float32 chunks.
+        """
+        n = len(self.ids)
+        if n == 0 or k <= 0:
+            return []
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        scores = np.empty(n, dtype=np.float32)
+        for start in range(0, n, _CHUNK_ROWS):
+            end = min(start + _CHUNK_ROWS, n)
+            scores[start:end] = self._matrix[start:end].astype(np.float32) @ query
+        if self.free_rows:
+            scores[list(self.free_rows)] = -np.inf
+
+        k = min(k, len(self.row_of))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[row], float(scores[row])) for row in top]
+
+    def get_stats(self) -> dict:
+        return {
+            "vectors": len(self.row_of),
+            "rows": len(self.ids),
+            "capacity": self.capacity,
+            "dim": self.dim,
+            "model": self.model,
+            "bytes": int(self.capacity * self.dim * 2),
+            "memory_mapped": self.base is not None,
+        }
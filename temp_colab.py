@@ -2,7 +2,7 @@
 # CELL 1: Setup & Dependencies
 # ============================================================================
 print("Installing required libraries...")
-!pip install transformers torch accelerate networkx faiss-cpu pyyaml -q
+!pip install transformers torch accelerate networkx numpy pyyaml -q
 print("✅ Dependencies installed.")
 
 import torch
@@ -14,7 +14,6 @@ import re
 import os
 import sys
 import networkx as nx
-import faiss
 import yaml
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
@@ -24,6 +23,15 @@ import numpy as np
 from collections import defaultdict
 from typing import Dict, List, Optional
 
+# Shared ANN index (karaka_frame/ann_index.py), found next to this script
+# (notebook cells have no __file__: fall back to the working directory)
+REPO_ROOT = Path(__file__).resolve().parent if "__file__" in globals() else Path.cwd()
+sys.path.insert(0, str(REPO_ROOT / "karaka_frame"))
+from vector_matrix import VectorMatrix
+from ann_index import IVFIndex
+from entity_equivalence import EquivalenceClasses
+from causal_index import CausalIndex
+
 # Load configuration from config.yaml
 def load_config(config_path: str = "config.yaml") -> dict:
     """Load configuration from YAML file"""
@@ -108,7 +116,7 @@ def average_pool(last_hidden_states, attention_mask):
 
 
 # ============================================================================
-# CELL 3: Initialize NetworkX, GraphSchema, and FAISS
+# CELL 3: Initialize NetworkX, GraphSchema, and Vector Index
 # ============================================================================
 print("\n" + "="*80)
 print("INITIALIZING GRAPH INFRASTRUCTURE")
@@ -230,51 +238,43 @@ class GraphSchema:
         
         return True
 
-# Initialize FAISS Vector Store
-class FAISSVectorStore:
-    """Wrapper for FAISS index with document ID mapping"""
+# Initialize Vector Store
+class ANNVectorStore:
+    """Wrapper for the IVF index (karaka_frame/ann_index.py) with document ID mapping"""
     
     def __init__(self, dimension: int = None):
         self.dimension = dimension or CONFIG['faiss']['dimension']
-        self.index = faiss.IndexFlatL2(self.dimension)
-        self.doc_id_map = []
-        self.doc_id_to_idx = {}
+        self.index = IVFIndex(VectorMatrix(self.dimension), metric="l2")
     
     def add(self, doc_id: str, embedding: np.ndarray) -> None:
-        if embedding.ndim == 1:
-            embedding = embedding.reshape(1, -1)
-        embedding = embedding.astype('float32')
-        
-        idx = len(self.doc_id_map)
-        self.index.add(embedding)
-        self.doc_id_map.append(doc_id)
-        self.doc_id_to_idx[doc_id] = idx
+        embedding = np.asarray(embedding, dtype='float32').reshape(1, -1)
+        self.index.add([doc_id], embedding)
+    
+    def remove(self, doc_id: str) -> None:
+        self.index.remove(doc_id)
     
     def query_nearby(self, doc_id: str, k: int = None) -> List[str]:
         if k is None:
             k = CONFIG['faiss']['nearby_k']
-        if doc_id not in self.doc_id_to_idx:
+        query_vector = self.index.reconstruct(doc_id)
+        if query_vector is None:
             return []
         
-        idx = self.doc_id_to_idx[doc_id]
-        query_vector = self.index.reconstruct(idx).reshape(1, -1)
-        distances, indices = self.index.search(query_vector, k + 1)
-        
         nearby_doc_ids = []
-        for i in indices[0]:
-            if i < len(self.doc_id_map) and self.doc_id_map[i] != doc_id:
-                nearby_doc_ids.append(self.doc_id_map[i])
+        for other_id, _ in self.index.search(query_vector, k + 1):
+            if other_id != doc_id:
+                nearby_doc_ids.append(other_id)
                 if len(nearby_doc_ids) >= k:
                     break
         
         return nearby_doc_ids
     
     def size(self) -> int:
-        return self.index.ntotal
+        return len(self.index)
 
 print("✅ NetworkX MultiDiGraph initialized")
 print("✅ GraphSchema loaded")
-print("✅ FAISSVectorStore initialized")
+print("✅ ANNVectorStore initialized")
 
 
 # ============================================================================
@@ -842,7 +842,7 @@ print("✅ GSVRetryEngine class defined")
 # CELL 7: Kāraka Knowledge Graph (with Schema Enforcement)
 # ============================================================================
 class KarakaGraphV2:
-    """Enhanced Karaka Graph with strict schema validation and FAISS integration"""
+    """Enhanced Karaka Graph with strict schema validation and vector index integration"""
     
     def __init__(self, embedding_model, embedding_tokenizer):
         """Initialize graph with schema enforcement and vector store
@@ -853,7 +853,7 @@ class KarakaGraphV2:
         """
         self.graph = nx.MultiDiGraph()
         self.schema = GraphSchema()
-        self.vector_store = FAISSVectorStore(dimension=2048)
+        self.vector_store = ANNVectorStore(dimension=2048)
         self.entity_resolver = EntityResolver(embedding_model, embedding_tokenizer)
         
         # Indexes for fast lookup
@@ -861,6 +861,12 @@ class KarakaGraphV2:
         self.kriyas = {}
         self.kriya_index = defaultdict(list)
         self.entity_index = defaultdict(list)
+        
+        # Entities collapsed by IS_SAME_AS edges (union-find)
+        self.entity_classes = EquivalenceClasses()
+        
+        # CAUSES adjacency for bounded multi-hop expansion
+        self.causal = CausalIndex()
     
     def add_document_node(self, doc_id: str, line_number: int, text: str) -> str:
         """Add Document node with schema validation
@@ -971,6 +977,22 @@ class KarakaGraphV2:
         if relation in ["HAS_KARTĀ", "HAS_KARMA", "USES_KARANA", "TARGETS_SAMPRADĀNA", 
                        "FROM_APĀDĀNA", "LOCATED_IN", "OCCURS_AT"] and source in self.kriyas:
             self.entity_index[target].append(source)
+        
+        if relation == "IS_SAME_AS":
+            self.entity_classes.add(f"{source}≡{target}", [source, target])
+        elif relation == "CAUSES":
+            self.causal.add_links(f"{source}→{target}", [(source, target, relation)])
+    
+    def equivalent_entities(self, canonical: str) -> List[str]:
+        """All entities in canonical's IS_SAME_AS class (itself included)
+        
+        Args:
+            canonical: Canonical entity name
+        
+        Returns:
+            Entity node IDs of the class
+        """
+        return self.entity_classes.members(canonical)
     
     def traverse(self, start_node: str, edge_filter: Optional[List[str]] = None, 
                 max_hops: int = None, direction: str = None) -> List[str]:
@@ -1103,16 +1125,17 @@ class KarakaGraphV2:
                 if not required_entity:
                     continue
                 
-                # Resolve entity
+                # Resolve entity to its IS_SAME_AS class
                 canonical = self.entity_resolver.resolve_entity(required_entity)
+                entity_class = set(self.equivalent_entities(canonical))
                 
                 # Map kāraka type to relation
                 relation_map = CONFIG['karaka_relation_mapping']
                 relation = relation_map.get(karaka_type, karaka_type)
                 
-                # Check if edge exists (FROM Kriyā TO Entity)
+                # Check if edge exists (FROM Kriyā TO any Entity of the class)
                 edges = [e for e in self.graph.out_edges(kriya_id, data=True)
-                        if e[1] == canonical and e[2].get('relation') == relation]
+                        if e[1] in entity_class and e[2].get('relation') == relation]
                 
                 if not edges:
                     match = False
@@ -1859,7 +1882,7 @@ class IngestionPipeline:
     # ========================================================================
     
     def _embed_and_store(self, refined_docs: Dict[str, List[str]]):
-        """Create Document nodes and FAISS embeddings
+        """Create Document nodes and vector index embeddings
         
         Args:
             refined_docs: Dict mapping doc_id to list of lines
@@ -1883,7 +1906,7 @@ class IngestionPipeline:
                     # Generate embedding
                     embedding = self._encode_text(text)
                     
-                    # Store in FAISS
+                    # Store in vector index
                     self.graph.vector_store.add(doc_node_id, embedding)
                     
                     doc_success += 1
@@ -2079,7 +2102,7 @@ class IngestionPipeline:
         print(f"   Total Entities: {entity_count}")
         print(f"   Total Documents: {len(self.graph.documents)}")
         print(f"   Total Edges: {self.graph.graph.number_of_edges()}")
-        print(f"   FAISS Index Size: {self.graph.vector_store.size()}")
+        print(f"   Vector Index Size: {self.graph.vector_store.size()}")
         
         # Edge breakdown
         edge_types = defaultdict(int)
@@ -2183,7 +2206,7 @@ class IngestionPipeline:
                     skipped_count += 1
                     continue
                 
-                # Query FAISS for nearby context (5 nearest neighbors)
+                # Query vector index for nearby context (5 nearest neighbors)
                 context_docs = []
                 for doc_node in doc_nodes[:1]:  # Use first doc as anchor
                     nearby = self.graph.vector_store.query_nearby(doc_node, k=5)
@@ -2909,14 +2932,14 @@ class QueryPipeline:
             karta_mention = karaka_constraints["KARTA"]
             canonical = self.graph.entity_resolver.resolve_entity(karta_mention)
             
-            # Get all Kriyā nodes where this entity is KARTĀ (traverse FROM entity via incoming edges)
-            if canonical in self.graph.graph:
-                candidates = [
-                    e[0] for e in self.graph.graph.in_edges(canonical, data=True) 
-                    if e[2].get("relation") == "HAS_KARTĀ"
-                ]
-            else:
-                candidates = []
+            # Get all Kriyā nodes where any entity of its IS_SAME_AS class is
+            # KARTĀ (traverse FROM entity via incoming edges)
+            candidates = list(dict.fromkeys(
+                e[0]
+                for member in self.graph.equivalent_entities(canonical) if member in self.graph.graph
+                for e in self.graph.graph.in_edges(member, data=True)
+                if e[2].get("relation") == "HAS_KARTĀ"
+            ))
         elif verb:
             # Fallback: Filter by verb
             candidates = [
@@ -2945,14 +2968,15 @@ class QueryPipeline:
                 if not required_entity or karaka_type == "KARTA":  # Already filtered
                     continue
                 
-                # Resolve entity and check edge (FROM Kriyā TO Entity)
+                # Resolve entity to its IS_SAME_AS class and check edge (FROM Kriyā TO Entity)
                 canonical = self.graph.entity_resolver.resolve_entity(required_entity)
+                entity_class = set(self.graph.equivalent_entities(canonical))
                 relation = self._map_karaka_to_relation(karaka_type)
                 
                 # Check if edge exists (outgoing from Kriyā)
                 edges = [
                     e for e in self.graph.graph.out_edges(kriya_id, data=True) 
-                    if e[1] == canonical and e[2].get("relation") == relation
+                    if e[1] in entity_class and e[2].get("relation") == relation
                 ]
                 if not edges:
                     match = False
@@ -2976,33 +3000,18 @@ class QueryPipeline:
         mapping["ADHIKARANA"] = "LOCATED_IN"  # Default to spatial
         return mapping.get(karaka_type, "UNKNOWN")
     
-    def _expand_causal_chain(self, kriya_nodes: List[str]) -> List[str]:
-        """Follow CAUSES edges to get full causal chain
+    def _expand_causal_chain(self, kriya_nodes: List[str], max_hops: int = 3, fan_out: int = 8) -> List[str]:
+        """Follow CAUSES edges (both directions) to get the causal chain
         
         Args:
             kriya_nodes: Initial Kriyā nodes
+            max_hops: Maximum CAUSES edges followed from a node
+            fan_out: Maximum new Kriyās taken from one node's edges
         
         Returns:
-            Expanded list including causal chain
+            Expanded list including causal chain (nearest first)
         """
-        expanded = set(kriya_nodes)
-        
-        for kriya_id in kriya_nodes:
-            # Follow CAUSES edges (both directions)
-            # Caused by (incoming CAUSES edges)
-            caused_by = [
-                e[0] for e in self.graph.graph.in_edges(kriya_id, data=True) 
-                if e[2].get("relation") == "CAUSES"
-            ]
-            # Causes (outgoing CAUSES edges)
-            causes = [
-                e[1] for e in self.graph.graph.out_edges(kriya_id, data=True) 
-                if e[2].get("relation") == "CAUSES"
-            ]
-            expanded.update(caused_by)
-            expanded.update(causes)
-        
-        return list(expanded)
+        return list(self.graph.causal.expand(kriya_nodes, hops=max_hops, fan_out=fan_out, limit=None))
     
     def _generate_answer(self, question: str, ground_truth_docs: List[Dict]) -> Dict:
         """Final LLM call with grounded context
@@ -3224,7 +3233,7 @@ refined_docs = ingestion_pipeline._load_documents(docs_folder)
 if refined_docs:
     print(f"   ✅ Loaded {len(refined_docs)} document(s)")
     ingestion_pipeline._embed_and_store(refined_docs)
-    print(f"\n✅ Step 1 complete: {karaka_graph.vector_store.size()} documents embedded in FAISS")
+    print(f"\n✅ Step 1 complete: {karaka_graph.vector_store.size()} documents embedded in vector index")
 else:
     print("❌ No documents loaded - check folder path and file formats (.txt, .md)")
 
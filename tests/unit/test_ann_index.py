@@ -0,0 +1,96 @@
+import threading
+
+import numpy as np
+
+from ann_index import IVFIndex
+from vector_matrix import VectorMatrix
+
+
+def clustered(n, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(8, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, 8, n)] + 0.1 * rng.normal(size=(n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def ids(start, stop):
+    return [f"F{i}" for i in range(start, stop)]
+
+
+def test_exact_until_trained_then_approximate():
+    vectors = clustered(600)
+    index = IVFIndex(VectorMatrix(16), nlist=8, nprobe=8, train_min=500, background=False)
+    index.add(ids(0, 400), vectors[:400])
+    assert index.centroids is None
+    assert index.search(vectors[3], 1)[0][0] == "F3"
+
+    index.add(ids(400, 600), vectors[400:])
+    assert index.get_stats()["trained"] and index.trainings == 1
+    assert index.search(vectors[450], 1)[0][0] == "F450"  # nprobe == nlist: exact
+
+
+def test_removed_vectors_are_not_returned():
+    vectors = clustered(300)
+    index = IVFIndex(VectorMatrix(16), nlist=4, nprobe=4, train_min=100, background=False)
+    index.add(ids(0, 300), vectors)
+    index.remove("F5")
+    assert "F5" not in {fid for fid, _ in index.search(vectors[5], 20)}
+    index.add(["F5"], vectors[5:6])
+    assert index.search(vectors[5], 1)[0][0] == "F5"
+
+
+def test_l2_metric_ranks_by_distance():
+    vectors = clustered(200) * np.linspace(1, 3, 200, dtype=np.float32)[:, None]
+    index = IVFIndex(VectorMatrix(16), metric="l2", nlist=4, nprobe=4, train_min=50, background=False)
+    index.add(ids(0, 200), vectors)
+    query = vectors[17] + 0.01
+    distances = ((vectors.astype(np.float16).astype(np.float32) - query) ** 2).sum(axis=1)
+    assert [fid for fid, _ in index.search(query, 3)] == [f"F{i}" for i in np.argsort(distances)[:3]]
+
+
+def test_background_training_keeps_serving_and_catches_up(monkeypatch):
+    vectors = clustered(900)
+    index = IVFIndex(VectorMatrix(16), nlist=8, nprobe=8, train_min=300)
+
+    # Hold training at its first k-means step until the test releases it
+    started, release = threading.Event(), threading.Event()
+    real_nearest = index._nearest_centroids
+
+    def gated(vectors, centroids=None):
+        if centroids is not None and not release.is_set():
+            started.set()
+            release.wait()
+        return real_nearest(vectors, centroids)
+
+    monkeypatch.setattr(index, "_nearest_centroids", gated)
+    index.add(ids(0, 300), vectors[:300])
+    assert started.wait(5)
+
+    # Writes and queries proceed (exactly) while training runs
+    index.add(ids(300, 600), vectors[300:600])
+    index.remove("F10")
+    index.add(["F11"], vectors[12:13])  # Replaced vector
+    assert index.get_stats()["training"]
+    assert index.search(vectors[500], 1)[0][0] == "F500"
+
+    release.set()
+    index.wait()
+    assert index.trainings == 1 and index.trained_size == 300
+    assigned = {row for rows in index.lists for row in rows}
+    assert assigned == {index.matrix.row_of[fid] for fid in index.matrix.row_of}
+    assert index.matrix.row_of["F11"] in index.lists[index.assign[index.matrix.row_of["F11"]]]
+    assert index.search(vectors[550], 1)[0][0] == "F550"
+
+
+def test_index_persists_with_matrix(tmp_path):
+    vectors = clustered(400)
+    matrix = VectorMatrix(16, path=str(tmp_path / "frames.json.vec"))
+    index = IVFIndex(matrix, nlist=4, train_min=100, background=False)
+    index.add(ids(0, 400), vectors)
+    index.save()
+    matrix.close()
+
+    matrix = VectorMatrix(16, path=str(tmp_path / "frames.json.vec"))
+    reloaded = IVFIndex(matrix, nlist=4, train_min=100, background=False)
+    assert reloaded.trainings == 0 and reloaded.centroids is not None
+    assert sorted(map(len, reloaded.lists)) == sorted(map(len, index.lists))
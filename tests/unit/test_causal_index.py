@@ -0,0 +1,117 @@
+import pytest
+
+from causal_index import CausalIndex
+from frame_extractor import Frame
+from frame_store import FrameStore
+from sqlite_frame_store import SQLiteFrameStore
+
+
+def link(cause, effect, causal_type="hetu"):
+    return {"cause_frame": cause, "effect_frame": effect, "causal_type": causal_type}
+
+
+def make_frame(frame_id, *links):
+    return Frame(frame_id, 0, f"{frame_id} text", "happen", "happen", karta=frame_id,
+                 causal_links=list(links) or None)
+
+
+def ids(frames):
+    return [frame.frame_id for frame in frames]
+
+
+# f1 → f2 → f3 → f4, f5 → f2, and f6 → f7 on their own
+FRAMES = [
+    make_frame("f1"),
+    make_frame("f2", link("f1", "f2"), link("f5", "f2", "nimitta")),
+    make_frame("f3", link("f2", "f3")),
+    make_frame("f4", link("f3", "f4")),
+    make_frame("f5"),
+    make_frame("f6", link("f6", "f7")),
+    make_frame("f7"),
+]
+
+
+def test_labels_follow_link_direction():
+    index = CausalIndex()
+    index.build(FRAMES)
+    assert index.reaches("f1", "f4") and index.reaches("f5", "f3")
+    assert not index.reaches("f4", "f1") and not index.reaches("f1", "f5")
+    assert not index.reaches("f1", "f7") and index.connected("f1", "f5")
+    assert index.get_stats()["labelled_frames"] == 7
+
+    index.add_links("loop", [("f4", "f1", None)], 1)          # Cycles label every member
+    assert index.reaches("f4", "f2") and index.reaches("f3", "f3")
+    index.remove("loop", 2)
+    assert not index.reaches("f4", "f2") and not index.reaches("f3", "f3")
+
+
+def test_removal_splits_labels():
+    index = CausalIndex()
+    index.build(FRAMES)
+    index.remove("f3", 1)                                     # f2 → f3 goes
+    assert not index.reaches("f1", "f4") and index.reaches("f3", "f4")
+    assert index.reaches("f1", "f2") and not index.connected("f1", "f4")
+
+
+def test_large_components_are_walked():
+    index = CausalIndex(label_max=3)
+    index.build(FRAMES)
+    stats = index.get_stats()
+    assert stats["labelled_frames"] == 2                      # Only f6 → f7
+    assert index.reaches("f1", "f4") and not index.reaches("f4", "f1")
+
+    index.remove("f3", 1)
+    assert index.get_stats()["labelled_frames"] == 7          # Both halves fit now
+    assert not index.reaches("f1", "f4")
+
+
+def test_older_versions_see_older_links():
+    index = CausalIndex()
+    index.build(FRAMES[:3])
+    index.add(FRAMES[3], 1)
+    index.remove("f2", 2)
+    assert index.reaches("f1", "f4", version=1) and not index.reaches("f1", "f4", version=0)
+    assert not index.reaches("f1", "f4") and not index.reaches("f1", "f2")
+
+
+def test_expansion_is_bounded():
+    index = CausalIndex()
+    index.build(FRAMES)
+    assert index.expand(["f1"], hops=2) == {"f1": 0, "f2": 1, "f3": 2, "f5": 2}
+    assert list(index.expand(["f2"], fan_out=1, hops=1)) == ["f2", "f3"]
+    assert len(index.expand(["f2"], limit=2)) == 3
+    assert index.expand(["f2"], hops=1, relations={"nimitta"}) == {"f2": 0, "f5": 1}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        store = FrameStore(str(tmp_path / "frames.json"))
+    else:
+        store = SQLiteFrameStore(str(tmp_path / "frames.db"))
+    yield store
+    store.close()
+
+
+def test_store_follows_writes(store):
+    store.add_frames(FRAMES)
+    assert ids(store.expand_causal([store.get_frame("f1")], hops=2)) == ["f2", "f3", "f5"]
+    assert store.causally_reaches("f1", "f4")
+    assert store.get_stats()["causal"]["links"] == 5
+
+    store.delete_frame("f3")
+    assert not store.causally_reaches("f1", "f4")
+    store.retract("f6")
+    assert store.expand_causal([store.get_frame("f7")]) == []
+    store.add_frame(make_frame("f3", link("f2", "f3")))
+    assert store.causally_reaches("f5", "f4")
+
+
+def test_snapshots_keep_their_links(store):
+    store.add_frames(FRAMES)
+    store.causally_reaches("f1", "f4")                        # Build the index
+    with store.snapshot() as snapshot:
+        store.delete_frame("f3")
+        store.add_frame(make_frame("f8", link("f7", "f8")))
+        assert snapshot.causally_reaches("f1", "f4") and not snapshot.causally_reaches("f6", "f8")
+        assert not store.causally_reaches("f1", "f4") and store.causally_reaches("f6", "f8")
@@ -0,0 +1,125 @@
+import json
+import threading
+
+from columnar_snapshot import ColumnarSnapshot
+from frame_extractor import Frame
+from frame_store import FrameStore
+
+
+FRAMES = [
+    Frame("F1", 0, "The agency funded the project in 2024.", "fund", "funded",
+          karta="The agency", karma="the project", locus_time="2024"),
+    Frame("F2", 1, "The project hired 50% of the staff.", "hire", "hired",
+          karta="the project", karma="50% of the staff"),
+    Frame("F3", 2, "Ram gave Sita a book.", "give", "gave",
+          karta="Ram", karma="a book", sampradana="Sita",
+          causal_links=[{"type": "because", "target": "F1"}]),
+]
+
+
+def ids(frames):
+    return sorted(f.frame_id for f in frames)
+
+
+def graph_edges(store):
+    """Graph edges by entity label (entity node IDs follow key order)."""
+    data = store.to_graph_data()
+    labels = {node["id"]: node["label"] for node in data["nodes"]}
+    return sorted((labels[e["source"]], e["target"], e["label"]) for e in data["edges"])
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "frames.json")
+    store = FrameStore(path)
+    store.add_frames(FRAMES)
+    store.compact()
+    store.close()
+
+    snapshot = ColumnarSnapshot(tmp_path / "frames.json.cols")
+    assert [snapshot.frame(row).to_dict() for row in range(snapshot.count)] == [f.to_dict() for f in FRAMES]
+
+    reopened = FrameStore(path)
+    assert reopened.frames == {} and len(reopened) == 3
+    assert reopened.get_frame("F3").to_dict() == FRAMES[2].to_dict()
+    assert ids(reopened.find_by_entity("THE PROJECT ")) == ["F1", "F2"]
+    assert ids(reopened.find_by_kriya("Hire")) == ["F2"]
+    assert ids(reopened.find_by_role("object", "50%")) == ["F2"]
+
+    memory = FrameStore()
+    memory.add_frames(FRAMES)
+    assert graph_edges(reopened) == graph_edges(memory)
+
+
+def test_delta_masks_replaced_and_deleted_rows(tmp_path):
+    path = str(tmp_path / "frames.json")
+    store = FrameStore(path)
+    store.add_frames(FRAMES)
+    store.compact()
+
+    store.add_frame(Frame("F1", 0, "The agency funded the school.", "fund", "funded",
+                          karta="The agency", karma="the school"))
+    assert store.delete_frame("F3") is True
+    assert store.delete_frame("F3") is False
+    assert ids(store.find_by_entity("the project")) == ["F2"]
+    assert ids(store.find_by_role("object", "school")) == ["F1"]
+    assert store.find_by_entity("ram") == [] and "give" not in store.get_stats()["kriyas"]
+    assert len(store) == 2
+    store.close()
+
+    reopened = FrameStore(path)
+    assert [f.frame_id for f in reopened.get_all_frames()] == ["F2", "F1"]
+    assert reopened.get_frame("F1").karma == "the school"
+
+
+def test_json_snapshot_is_imported_once(tmp_path):
+    path = tmp_path / "frames.json"
+    path.write_text(json.dumps([f.to_dict() for f in FRAMES]))
+
+    store = FrameStore(str(path))
+    assert len(store) == 3 and store.frames == {}
+    assert (tmp_path / "frames.json.cols").exists()
+    store.delete_frame("F2")
+    store.close()
+
+    assert ids(FrameStore(str(path)).get_all_frames()) == ["F1", "F3"]
+
+
+def test_writes_during_compaction_are_carried_over(tmp_path, monkeypatch):
+    path = str(tmp_path / "frames.json")
+    store = FrameStore(path)
+    store.add_frames(FRAMES[:2])
+
+    # Hold the snapshot write until the test has written more frames
+    import frame_store
+    started, release = threading.Event(), threading.Event()
+    real_write = frame_store.write_snapshot
+
+    def gated(f, frames, **kwargs):
+        started.set()
+        release.wait()
+        return real_write(f, frames, **kwargs)
+
+    monkeypatch.setattr(frame_store, "write_snapshot", gated)
+    compactor = threading.Thread(target=store.compact)
+    compactor.start()
+    assert started.wait(5)
+
+    store.add_frame(FRAMES[2])     # New during compaction
+    store.delete_frame("F1")       # Deleted while being written to the snapshot
+    release.set()
+    compactor.join()
+
+    assert store.base.count == 2
+    assert ids(store.get_all_frames()) == ["F2", "F3"]
+    assert list(store.frames) == ["F3"]
+    store.close()
+    assert ids(FrameStore(path).get_all_frames()) == ["F2", "F3"]
+
+
+def test_stats_do_not_open_the_embedding_matrix(tmp_path):
+    store = FrameStore(str(tmp_path / "frames.json"))
+    store.add_frames(FRAMES)
+    stats = store.get_stats()
+    assert stats["total_frames"] == 3 and "embeddings" not in stats
+    assert store._ann is None
+    store.close()
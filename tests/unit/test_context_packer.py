@@ -0,0 +1,70 @@
+import asyncio
+
+import qa_cache
+import qa_engine
+import query_planner
+from context_packer import pack_context, rank_frames
+from frame_extractor import Frame
+from frame_store import FrameStore
+from llm_client import estimate_tokens
+
+SENTENCE = "The NIH funded the study in 2019 because it was urgent."
+
+
+def make_frame(frame_id, kriya, text=SENTENCE, causal_links=None, **roles):
+    return Frame(frame_id, 0, text, kriya, kriya, causal_links=causal_links, **roles)
+
+
+FRAMES = [
+    make_frame("F0", "fund", karta="NIH", karma="the study", locus_time="2019",
+               causal_links=[{"cause_frame": "F1", "effect_frame": "F0", "causal_type": "hetu"},
+                             {"cause_frame": "F9", "effect_frame": "F0"}]),
+    make_frame("F1", "be", karta="it"),
+    make_frame("F2", "eat", "Ram ate a mango.", karta="Ram", karma="a mango"),
+]
+
+
+def test_shared_sentences_are_written_once():
+    packed = pack_context(FRAMES, budget=1000)
+    lines = packed.text.splitlines()
+    assert lines.count(f"S1: {SENTENCE}") == 1 and "S2: Ram ate a mango." in lines
+    assert "F1 | be | Kartā=it | S1" in lines
+    assert "F1 → F0 (hetu)" in lines and not any("F9" in line for line in lines)
+    assert "Sampradāna" not in packed.text           # Null roles are left out
+    report = packed.report()
+    assert report["sentences_shared"] == 1 and report["frames_dropped"] == 0
+    assert packed.tokens <= packed.budget
+
+
+def test_asked_role_ranks_first():
+    assert [f.frame_id for f in rank_frames(FRAMES, "locus_time")] == ["F0", "F1", "F2"]
+    assert [f.frame_id for f in rank_frames(FRAMES[::-1], "karma")] == ["F2", "F0", "F1"]
+    assert rank_frames(FRAMES) == FRAMES
+
+
+def test_budget_drops_frames_and_then_sentences():
+    full = pack_context(FRAMES, budget=1000).tokens
+    tight = pack_context(FRAMES, budget=full - estimate_tokens("S2: Ram ate a mango."))
+    assert [f.frame_id for f in tight.frames] == ["F0", "F1", "F2"]
+    assert tight.sentences_omitted == ["F2"] and "F2 | eat | Kartā=Ram; Karma=a mango | -" in tight.text
+
+    tiny = pack_context(FRAMES, budget=60)
+    assert tiny.dropped and tiny.tokens <= 60
+    assert len(tiny.frames) + len(tiny.dropped) == len(FRAMES)
+
+
+def test_question_without_matches_skips_synthesis(monkeypatch):
+    calls = []
+
+    async def fake_llm(system, user, temperature=0.1, json_mode=False, task=None):
+        calls.append(task)
+        return '{"kriya_keywords": ["fly"], "entity_keywords": ["Mars"]}'
+
+    monkeypatch.setattr(qa_engine, "call_llm", fake_llm)
+    monkeypatch.setattr(query_planner, "RULE_PLANNER", False)
+    monkeypatch.setattr(qa_cache, "_cache", None)
+    store = FrameStore()
+    store.add_frames(FRAMES)
+    result = asyncio.run(qa_engine.ask("Who flew to Mars?", store))
+    assert result["answer"] == "No frames match the question."
+    assert result["frame_count"] == 3 and calls == ["planner"]
@@ -0,0 +1,88 @@
+import pytest
+
+from entity_equivalence import EquivalenceClasses
+from frame_extractor import Frame
+from frame_store import FrameStore
+from sqlite_frame_store import SQLiteFrameStore
+
+
+def make_frame(frame_id, kriya="eat", **roles):
+    return Frame(frame_id, 0, f"{frame_id} text", kriya, kriya, **roles)
+
+
+def ids(frames):
+    return sorted(frame.frame_id for frame in frames)
+
+
+FRAMES = [
+    make_frame("f1", karta="Ram"),
+    make_frame("f2", "rule", karta="Dasharatha's son"),
+    make_frame("f3", "exile", karma="Raghava"),
+    make_frame("id1", "≡", karta="Ram", karma="Dasharatha's son"),
+    make_frame("id2", "≡", karta="dasharatha's son", karma="Raghava"),
+]
+
+
+def test_union_and_split():
+    classes = EquivalenceClasses()
+    classes.add("i1", ["a", "b"], 1)
+    classes.add("i2", ["b", "c"], 2)
+    classes.add("i3", ["d", "e"], 3)
+    assert sorted(classes.members("a")) == ["a", "b", "c"]
+    assert classes.same("a", "c") and not classes.same("a", "d")
+    assert classes.members("z") == ["z"]
+
+    assert classes.remove("i1", 4) is True
+    assert classes.members("a") == ["a"]
+    assert sorted(classes.members("b")) == ["b", "c"]
+    assert classes.remove("i1", 5) is False
+    assert classes.changed == 4
+    assert classes.get_stats()["classes"] == 2
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        store = FrameStore(str(tmp_path / "frames.json"))
+    else:
+        store = SQLiteFrameStore(str(tmp_path / "frames.db"))
+    yield store
+    store.close()
+
+
+def test_find_by_entity_resolves_identity_classes(store):
+    store.add_frames(FRAMES)
+    assert ids(store.find_by_entity("RAM")) == ["f1", "f2", "f3", "id1", "id2"]
+    assert ids(store.find_by_entity("ram", equivalent=False)) == ["f1", "id1"]
+    assert store.get_stats()["entity_classes"]["largest_class"] == 3
+
+    store.retract("id2")
+    assert sorted(store.equivalent_entities("Raghava")) == ["raghava"]
+    assert ids(store.find_by_entity("ram")) == ["f1", "f2", "id1"]
+    store.delete_frame("id1")
+    assert ids(store.find_by_entity("ram")) == ["f1"]
+
+
+def test_snapshots_keep_their_classes(store):
+    store.add_frames(FRAMES)
+    with store.snapshot() as snapshot:
+        store.delete_frame("id1")
+        store.add_frame(make_frame("id3", "≡", karta="Raghava", karma="Rama"))
+        assert sorted(snapshot.equivalent_entities("ram")) == ["dasharatha's son", "raghava", "ram"]
+        assert sorted(store.equivalent_entities("ram")) == ["ram"]
+        assert sorted(store.equivalent_entities("rama")) == ["dasharatha's son", "raghava", "rama"]
+
+
+def test_classes_survive_reopen_compaction_and_rollback(tmp_path):
+    path = str(tmp_path / "frames.json")
+    store = FrameStore(path)
+    store.add_frames(FRAMES)
+    store.compact()
+    with pytest.raises(AttributeError):
+        store.add_frames([make_frame("id1", "eat", karta="Ram"), None])   # Replaces id1, then fails
+    assert sorted(store.equivalent_entities("ram")) == ["dasharatha's son", "raghava", "ram"]
+    store.close()
+
+    reopened = FrameStore(path)
+    assert ids(reopened.find_by_entity("raghava")) == ["f1", "f2", "f3", "id1", "id2"]
+    reopened.close()
@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+import frame_extractor
+from frame_extractor import ExtractionStats, extract_frames, validate_extraction
+from sentence_index import SentenceIndex
+
+SENTENCE = "The ERC funded the study in 2021."
+GOOD = {"kriya": "fund", "kriya_surface": "funded", "prayoga": "active",
+        "karta": "The ERC", "karma": "the study", "locus_time": "2021"}
+
+
+def fake_llm(compact_reply, reasoning_reply=GOOD):
+    calls = []
+
+    async def call_llm(prompt, user, json_mode=False, usage=None, **kwargs):
+        tier = "compact" if prompt == frame_extractor.COMPACT_EXTRACTION_PROMPT else "reasoning"
+        calls.append(tier)
+        usage["prompt_tokens"] = usage.get("prompt_tokens", 0) + 100
+        reply = compact_reply if tier == "compact" else reasoning_reply
+        return reply if isinstance(reply, str) else json.dumps(reply)
+
+    return call_llm, calls
+
+
+def run(monkeypatch, compact_reply, items=None):
+    call_llm, calls = fake_llm(compact_reply)
+    monkeypatch.setattr(frame_extractor, "call_llm", call_llm)
+    monkeypatch.setattr(frame_extractor, "EXTRACTION_MODE", "cascade")
+    monkeypatch.setattr(frame_extractor, "EXTRACTION_SAMPLES", 1)
+    monkeypatch.setattr(frame_extractor, "prefill_frame", lambda sentence: None)
+    stats = ExtractionStats()
+    items = items or [{"sentence_id": 0, "text": SENTENCE, "is_eventive": True}]
+    frames = asyncio.run(extract_frames(items, SentenceIndex(fingerprint="fp"), stats=stats))
+    return frames, calls, stats
+
+
+def test_validate_extraction_flags_hallucinated_and_passive_roles():
+    assert validate_extraction(GOOD, SENTENCE) == []
+    assert validate_extraction({**GOOD, "karma": "the grant"}, SENTENCE) == [
+        "karma 'the grant' not found in sentence"]
+    passive = "The study was funded by the ERC."
+    issues = validate_extraction(
+        {"kriya": "fund", "kriya_surface": "was funded", "prayoga": "active", "karta": "The study"}, passive)
+    assert "passive verb form 'was funded' marked active" in issues
+    assert "passive kartā 'The study' is not a 'by' phrase" in issues
+
+
+def test_valid_compact_frame_is_accepted(monkeypatch):
+    frames, calls, stats = run(monkeypatch, GOOD)
+    assert calls == ["compact"]
+    assert frames[0].karta == "The ERC"
+    assert stats.compact_accepted == 1 and stats.escalations == 0
+
+
+def test_invalid_or_unparseable_compact_frame_escalates(monkeypatch):
+    for reply in ({**GOOD, "karta": "Horizon Europe"}, "not json"):
+        frames, calls, stats = run(monkeypatch, reply)
+        assert calls == ["compact", "reasoning"]
+        assert frames[0].karta == "The ERC"
+        assert stats.escalations == 1 and stats.to_dict()["escalation_rate"] == 1.0
+
+
+def test_adapted_frame_failing_validation_is_extracted(monkeypatch):
+    rep = {"kriya": "fund", "kriya_surface": "was funded", "prayoga": "passive",
+           "karta": "the ERC", "karma": "The study", "locus_time": "2021"}
+    call_llm, calls = fake_llm(rep, rep)
+    monkeypatch.setattr(frame_extractor, "call_llm", call_llm)
+    monkeypatch.setattr(frame_extractor, "EXTRACTION_MODE", "cascade")
+    monkeypatch.setattr(frame_extractor, "EXTRACTION_SAMPLES", 1)
+    monkeypatch.setattr(frame_extractor, "prefill_frame", lambda sentence: None)
+    items = [
+        {"sentence_id": 0, "text": "The study was funded by the ERC in 2021.", "is_eventive": True},
+        {"sentence_id": 1, "text": "The study was funded by the ERC in 2023.", "is_eventive": True, "duplicate_of": 0},
+        {"sentence_id": 2, "text": "The study was funded via the ERC in 2021.", "is_eventive": True, "duplicate_of": 0},
+    ]
+    stats = ExtractionStats()
+    frames = asyncio.run(extract_frames(items, SentenceIndex(fingerprint="fp"), stats=stats))
+    assert frames[1].locus_time == "2023" and stats.adapted_frames == 1
+    # The third adaptation keeps a kartā that is no longer a 'by' phrase
+    assert stats.llm_extractions == 2 and calls[:2] == ["compact", "compact"]
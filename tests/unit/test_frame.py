@@ -0,0 +1,73 @@
+import threading
+
+from frame_extractor import Frame, ROLE_FIELDS, SENTENCES, SYMBOLS, SymbolTable
+
+
+def make_frame(**overrides):
+    fields = dict(
+        frame_id="F1", sentence_id=3, sentence_text="The ERC funded the study in 2021.",
+        kriya="fund", kriya_surface="funded", karta="ERC", karma="the study", locus_time="2021",
+    )
+    fields.update(overrides)
+    return Frame(**fields)
+
+
+def test_symbol_table_interns_each_string_once():
+    table = SymbolTable()
+    first = table.intern("Copenhagen")
+    assert table.intern("".join(["Copen", "hagen"])) == first
+    assert table.intern(None) == 0
+    assert table.lookup(first) == "Copenhagen"
+    assert table.lookup(0) is None
+    assert len(table) == 1
+
+
+def test_symbol_table_concurrent_misses_get_one_id():
+    table = SymbolTable()
+    ids = []
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        ids.append(table.intern("shared filler"))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(ids)) == 1
+    assert len(table) == 1
+
+
+def test_frame_round_trips_through_to_dict():
+    frame = make_frame(causal_links=[{"cause_frame": "F0", "effect_frame": "F1"}])
+    data = frame.to_dict()
+    assert list(data) == ["frame_id", "sentence_id", "sentence_text", "kriya", "kriya_surface",
+                          *ROLE_FIELDS, "causal_links"]
+    assert data["karta"] == "ERC" and data["karana"] is None
+    assert Frame(**data) == frame
+    assert frame.to_display()["karakas"] == {
+        "Kartā (Agent)": "ERC", "Karma (Object)": "the study", "Locus_Time": "2021",
+    }
+
+
+def test_roles_are_stored_as_symbol_ids():
+    frame = make_frame()
+    assert not hasattr(frame, "__dict__")
+    frame.karta = "NIH"
+    assert frame.karta == "NIH"
+    assert frame.role_items() == [("karta", "NIH"), ("karma", "the study"), ("locus_time", "2021")]
+    frame.karma = None
+    assert frame.karma is None
+    assert SYMBOLS.lookup(SYMBOLS.intern("NIH")) == "NIH"
+
+
+def test_frames_of_one_sentence_share_its_text():
+    text = "Ram ate and Sita slept."
+    first = make_frame(frame_id="F1", sentence_text="".join(["Ram ate ", "and Sita slept."]))
+    second = make_frame(frame_id="F2", sentence_text=text)
+    assert first.sentence_text is second.sentence_text
+    assert SENTENCES.intern(text) == first._symbols[len(ROLE_FIELDS)]
+    second.sentence_text = "Sita slept."
+    assert second.sentence_text == "Sita slept." and first.sentence_text == text
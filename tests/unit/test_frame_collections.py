@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+from frame_collections import DEFAULT_COLLECTION, FrameCollections
+from frame_extractor import Frame
+from frame_store import FrameStore
+
+
+def make_frame(frame_id, kriya="give", **roles):
+    return Frame(frame_id, 0, f"{frame_id} text", kriya, kriya, **roles)
+
+
+@pytest.fixture
+def collections(tmp_path):
+    registry = FrameCollections(str(tmp_path / "collections"), default_store=FrameStore())
+    yield registry
+    registry.close()
+
+
+def test_collections_are_isolated(collections):
+    collections.get("a").add_frames([make_frame("F0", karta="Ram")])
+    collections.get("b").add_frames([make_frame("F0", kriya="take", karta="Sita")])
+
+    assert collections.get("a").get_frame("F0").kriya == "give"
+    assert collections.get("b").find_by_entity("ram") == []
+    assert len(collections.get(DEFAULT_COLLECTION)) == 0
+    assert collections.names() == [DEFAULT_COLLECTION, "a", "b"]
+
+    assert collections.get("missing", create=False) is None
+    with pytest.raises(ValueError):
+        collections.get("../escape")
+
+
+def test_snapshot_fans_out(collections):
+    collections.get("a").add_frames([make_frame("F0", karta="Ram")])
+    collections.get("b").add_frames([make_frame("F1", karta="Ram"), make_frame("F2")])
+
+    with collections.snapshot(["a", "b", "missing"]) as view:
+        collections.get("a").add_frame(make_frame("F3", karta="Ram"))
+        assert len(view) == 3
+        assert [f.frame_id for f in view.find_by_entity("ram")] == ["F0", "F1"]
+        assert view.versions == {"a": 1, "b": 1} and view.version == 2
+    assert len(collections.snapshot()) == 4
+
+
+def test_drop_frees_the_name_and_deletes_in_background(collections, tmp_path, monkeypatch):
+    root = tmp_path / "collections"
+    collections.get("a").add_frames([make_frame("F0")])
+    collections.get("b").add_frames([make_frame("F0")])
+
+    deleted = []
+    real_delete = FrameCollections._delete_later
+    monkeypatch.setattr(FrameCollections, "_delete_later",
+                        staticmethod(lambda d: deleted.append(real_delete(d))))
+    assert collections.drop("a") is True
+    assert collections.drop("a") is False
+    assert "a" not in collections.names()
+    assert collections.get("a", create=False) is None
+    assert len(collections.get("b")) == 1
+
+    # The name is reusable before the old files are gone
+    assert len(collections.get("a")) == 0
+    for thread in deleted:
+        thread.join(5)
+    assert not list(root.glob(".a.dropped.*"))
+    assert collections.dropped == 1
+
+
+def test_leftover_tombstones_are_swept_on_startup(tmp_path):
+    root = tmp_path / "collections"
+    (root / ".a.dropped.1").mkdir(parents=True)
+    (root / ".a.dropped.1" / "frames.json.cols").write_text("x")
+
+    registry = FrameCollections(str(root), default_store=FrameStore())
+    assert registry.names() == [DEFAULT_COLLECTION]
+    for _ in range(100):
+        if not (root / ".a.dropped.1").exists():
+            break
+        time.sleep(0.01)
+    assert not (root / ".a.dropped.1").exists()
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+import qa_engine
+from frame_extractor import Frame
+from frame_paths import PathFinder
+from frame_store import FrameStore
+
+
+def link(cause, effect, causal_type="hetu"):
+    return {"cause_frame": cause, "effect_frame": effect, "causal_type": causal_type}
+
+
+def make_frame(frame_id, kriya="happen", links=None, **roles):
+    return Frame(frame_id, 0, f"{frame_id} text", kriya, kriya, causal_links=links, **roles)
+
+
+# F0 → F1 → F2, F0 → F3 → F2, and F2 ≡ F4 through "Ram" ≡ "Raghava"
+FRAMES = [
+    make_frame("F0", karta="drought"),
+    make_frame("F1", links=[link("F0", "F1", "karana")], karta="famine"),
+    make_frame("F2", links=[link("F1", "F2"), link("F3", "F2")], karta="Ram"),
+    make_frame("F3", links=[link("F0", "F3")], karta="migration"),
+    make_frame("F4", "rule", karta="Raghava"),
+    make_frame("I1", "≡", karta="Ram", karma="Raghava"),
+    make_frame("F5", karta="festival"),
+]
+
+
+@pytest.fixture
+def store():
+    store = FrameStore()
+    store.add_frames(FRAMES)
+    return store
+
+
+def test_shortest_path_keeps_link_directions(store):
+    with store.snapshot() as snapshot:
+        path = PathFinder(snapshot).shortest("F4", "F0")
+    assert len(path.frame_ids) == 5 and path.frame_ids[:3] == ["F4", "I1", "F2"]
+    assert path.chain() in ("F4 ≡ I1 ≡ F2 ←hetu— F1 ←karana— F0", "F4 ≡ I1 ≡ F2 ←hetu— F3 ←hetu— F0")
+    assert [step.direction for step in path.steps] == ["≡", "≡", "←", "←"]
+
+
+def test_k_shortest_paths_are_distinct_and_ordered(store):
+    with store.snapshot() as snapshot:
+        paths = PathFinder(snapshot).k_shortest("F0", "F4", k=3)
+    assert {tuple(path.frame_ids[:3]) for path in paths} == {("F0", "F1", "F2"), ("F0", "F3", "F2")}
+    assert [path.hops for path in paths] == [4, 4]
+
+
+def test_relations_and_bounds_limit_the_search(store):
+    with store.snapshot() as snapshot:
+        causal = PathFinder(snapshot, {"causal"})
+        assert causal.shortest("F0", "F4") is None
+        assert causal.shortest("F0", "F5") is None and causal.expanded == 0   # Other component
+        assert PathFinder(snapshot, {"karana"}).shortest("F0", "F2") is None
+        assert PathFinder(snapshot).shortest("F4", "F0", max_hops=3) is None
+
+
+def test_snapshot_paths_ignore_later_links(store):
+    with store.snapshot() as snapshot:
+        store.delete_frame("I1")
+        assert PathFinder(snapshot).shortest("F0", "F4") is not None
+    with store.snapshot() as snapshot:
+        assert PathFinder(snapshot).shortest("F0", "F4") is None
+
+
+def test_find_paths_and_ask_path(store, monkeypatch):
+    found = qa_engine.find_paths("F1", "F2", store)
+    assert found["paths"][0]["chain"] == "F1 —hetu→ F2"
+    assert found["context"].startswith("## CHAINS (shortest first)\n1. F1 —hetu→ F2\n")
+    with pytest.raises(KeyError):
+        qa_engine.find_paths("F1", "F9", store)
+
+    async def fake_llm(system, user, temperature=0.1, json_mode=False, task=None):
+        assert "F1 —hetu→ F2" in user
+        return '{"answer": "The famine led to it.", "matched_frame_ids": ["F1"]}'
+
+    monkeypatch.setattr(qa_engine, "call_llm", fake_llm)
+    answer = asyncio.run(qa_engine.ask_path("How did it happen?", "F1", "F2", store))
+    assert answer["answer"] == "The famine led to it." and answer["sources"][0]["frame_id"] == "F1"
+    empty = asyncio.run(qa_engine.ask_path("Why?", "F0", "F5", store))
+    assert empty["paths"] == [] and "No connection" in empty["answer"]
@@ -0,0 +1,91 @@
+import pytest
+
+from frame_extractor import Frame
+from frame_store import FrameStore
+from sqlite_frame_store import SQLiteFrameStore
+
+
+def make_frame(frame_id, kriya="give", **roles):
+    return Frame(frame_id, 0, f"{frame_id} text", kriya, kriya, **roles)
+
+
+def frame_ids(reader):
+    return sorted(frame.frame_id for frame in reader.get_all_frames())
+
+
+def test_snapshot_is_isolated_from_later_batches(tmp_path):
+    store = FrameStore(str(tmp_path / "frames.json"))
+    store.add_frames([make_frame(f"f{i}", karta=f"Person {i}") for i in range(6)])
+    store.compact()                                  # f0-f5 in the snapshot
+    store.add_frames([make_frame("f6", karta="Person 6")])  # f6 in the delta
+
+    snapshot = store.snapshot()
+    before = frame_ids(snapshot)
+    store.add_frames([make_frame(f"f{i}", kriya="take") for i in range(4, 10)])
+    store.delete_frame("f1")
+    store.delete_frame("f6")
+
+    assert frame_ids(snapshot) == before and len(snapshot) == 7
+    assert snapshot.get_frame("f5").kriya == "give"
+    assert snapshot.get_frame("f6").kriya == "give"
+    assert snapshot.find_by_kriya("take") == []
+    assert [f.frame_id for f in snapshot.find_by_role("agent", "person 6")] == ["f6"]
+    assert store.get_frame("f5").kriya == "take" and store.get_frame("f6") is None
+    assert store.version == snapshot.version + 3
+    assert store.get_stats()["history_frames"] > 0
+
+    snapshot.release()
+    assert store.get_stats()["history_frames"] == 0
+    store.close()
+
+
+def test_snapshot_survives_compaction_and_clear(tmp_path):
+    store = FrameStore(str(tmp_path / "frames.json"))
+    store.add_frames([make_frame("f1"), make_frame("f2")])
+    with store.snapshot() as snapshot:
+        store.add_frame(make_frame("f1", kriya="take"))
+        store.compact()
+        assert store.frames == {}
+        assert snapshot.get_frame("f1").kriya == "give"
+        store.clear()
+        assert frame_ids(snapshot) == ["f1", "f2"]
+    assert len(store) == 0
+    store.close()
+
+
+def test_failed_batch_is_rolled_back(tmp_path):
+    path = str(tmp_path / "frames.json")
+    store = FrameStore(path)
+    store.add_frames([make_frame(f"f{i}") for i in range(4)])
+    store.compact()
+    store.add_frame(make_frame("f4"))
+    version, ids = store.version, frame_ids(store)
+
+    with pytest.raises(AttributeError):
+        store.add_frames([make_frame("f2", kriya="run"), make_frame("f4", kriya="run"),
+                          make_frame("new"), None])
+    assert store.version == version
+    assert frame_ids(store) == ids
+    assert store.get_frame("f2").kriya == "give" and store.get_frame("f4").kriya == "give"
+    assert store.find_by_kriya("run") == []
+
+    store.add_frame(make_frame("f5"))  # Reuses the failed batch's version
+    assert store.version == version + 1
+    store.close()
+
+    reopened = FrameStore(path)
+    assert frame_ids(reopened) == sorted(ids + ["f5"])
+    assert reopened.version == version + 1
+    assert reopened.find_by_kriya("run") == []
+
+
+def test_sqlite_snapshot_holds_its_version(tmp_path):
+    store = SQLiteFrameStore(str(tmp_path / "frames.db"))
+    store.add_frames([make_frame("f1"), make_frame("f2")])
+    with store.snapshot() as snapshot:
+        store.add_frame(make_frame("f3"))
+        store.delete_frame("f1")
+        assert frame_ids(snapshot) == ["f1", "f2"]
+        assert store.version == snapshot.version + 2
+    assert frame_ids(store) == ["f2", "f3"]
+    store.close()
@@ -0,0 +1,63 @@
+import asyncio
+import json
+
+import frame_validator
+from frame_extractor import Frame
+from frame_validator import audit_frame, check_invariants, drop_ungrounded, is_grounded, validate_frame
+
+SENTENCE = "The study was funded by the ERC in 2021."
+
+
+def codes(issues):
+    return [issue.code for issue in issues]
+
+
+def make_frame(**roles):
+    return Frame(frame_id="F_1", sentence_id=0, sentence_text=SENTENCE,
+                 kriya="fund", kriya_surface="was funded", **roles)
+
+
+def test_is_grounded_ignores_case_punctuation_and_articles():
+    assert is_grounded("ERC", SENTENCE)
+    assert is_grounded("a study", SENTENCE)
+    assert not is_grounded("Horizon Europe", SENTENCE)
+
+
+def test_well_formed_passive_frame_passes():
+    assert validate_frame(make_frame(karta="the ERC", karma="The study", locus_time="2021")) == []
+
+
+def test_frame_without_roles_is_not_missing_links():
+    assert check_invariants("It rained.", "rain", "rained", {"karta": None}) == []
+
+
+def test_only_ungrounded_roles_is_missing_links():
+    issues = check_invariants(SENTENCE, "fund", "was funded", {"karma": "the grant"})
+    assert codes(issues) == ["invented_entity", "missing_links"]
+
+
+def test_duplicate_and_passive_errors():
+    issues = check_invariants(SENTENCE, "fund", "was funded",
+                              {"karta": "The study", "karma": "the study"}, prayoga="active")
+    assert codes(issues) == ["duplicate_role", "passive_voice_error", "passive_voice_error"]
+    assert codes(check_invariants(SENTENCE, "UNKNOWN", "was paid", {})) == [
+        "empty_kriya", "kriya_surface_missing"]
+
+
+def test_drop_ungrounded_clears_invented_fillers():
+    frame = make_frame(karta="the ERC", karana="a grant")
+    assert drop_ungrounded(frame) == ["karana"]
+    assert frame.karana is None and frame.karta == "the ERC"
+
+
+def test_audit_applies_suggested_role_move(monkeypatch):
+    async def call_llm(prompt, user, **kwargs):
+        assert SENTENCE in prompt
+        return json.dumps({"score": 0, "needs_retry": True, "suggested_fix": {
+            "entity": "2021", "wrong_role": "Locus_Space", "correct_role": "Locus_Time"}})
+
+    monkeypatch.setattr(frame_validator, "call_llm", call_llm)
+    frame = make_frame(karta="the ERC", locus_space="2021")
+    verdict = asyncio.run(audit_frame(frame, []))
+    assert verdict["needs_retry"]
+    assert frame.locus_time == "2021" and frame.locus_space is None
@@ -0,0 +1,80 @@
+import os
+import time
+
+from columnar_snapshot import ColumnarSnapshot
+from frame_extractor import Frame
+from frame_store import FrameStore
+from frame_wal import FrameLog
+
+
+def frame(i):
+    return Frame(f"F{i}", i, f"Sentence {i}.", "fund", "funded", karta=f"Agency {i}")
+
+
+def test_torn_tail_is_discarded_on_replay(tmp_path):
+    path = tmp_path / "frames.json"
+    store = FrameStore(str(path))
+    store.add_frames([frame(1), frame(2)])
+    with open(str(path) + ".wal", "a", encoding="utf-8") as f:
+        f.write('{"op": "add", "frame": {"frame_id": "F3"')  # Crash mid-write
+
+    recovered = FrameStore(str(path))
+    assert sorted(recovered.frames) == ["F1", "F2"]
+    assert recovered.log.torn_bytes > 0
+    assert open(str(path) + ".wal", encoding="utf-8").read().endswith("\n")
+
+
+def test_single_writes_share_group_commits(tmp_path, monkeypatch):
+    fsyncs = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: (fsyncs.append(fd), real_fsync(fd)))
+
+    store = FrameStore(str(tmp_path / "frames.json"))
+    store.log.group_interval = 0.3
+    for i in range(50):
+        store.add_frame(frame(i))
+    assert store.log.commits == 0  # Still inside the group window
+    time.sleep(0.8)
+    assert store.log.commits == 1 and len(fsyncs) == 1
+    assert len(FrameStore(str(tmp_path / "frames.json")).frames) == 50
+
+    store.add_frame(frame(99), flush=True)
+    assert store.log.commits == 2
+    store.close()
+
+
+def test_full_group_commits_without_waiting(tmp_path):
+    log = FrameLog(tmp_path / "frames.json", group_size=3, group_interval=60)
+    for i in range(7):
+        log.append({"op": "add", "frame": frame(i).to_dict()})
+    assert log.commits == 2 and log.get_stats()["buffered"] == 1
+    log.close()
+    assert log.commits == 3
+
+
+def test_interrupted_compaction_is_recovered(tmp_path):
+    path = tmp_path / "frames.json"
+    store = FrameStore(str(path))
+    store.add_frames([frame(1), frame(2)])
+    store.log.rotate()  # Crash after rotating, before the snapshot was written
+    store.add_frames([frame(3)])
+    store.close()
+    assert store.log.rotated_path.exists()
+
+    recovered = FrameStore(str(path))
+    assert sorted(f.frame_id for f in recovered.get_all_frames()) == ["F1", "F2", "F3"]
+    assert not recovered.log.rotated_path.exists()
+    snapshot = ColumnarSnapshot(recovered.log.snapshot_path)
+    assert [snapshot.frame_id(row) for row in range(snapshot.count)] == ["F1", "F2", "F3"]
+
+
+def test_background_compaction_bounds_the_log(tmp_path):
+    path = tmp_path / "frames.json"
+    store = FrameStore(str(path))
+    store.log.compact_min_records = 10
+    for i in range(40):
+        store.add_frames([frame(i)])
+    store.close()
+    assert store.log.compactions >= 1
+    assert store.log.wal_records <= max(10, store.log.snapshot_frames) + 1
+    assert len(FrameStore(str(path))) == 40
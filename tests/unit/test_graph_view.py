@@ -0,0 +1,103 @@
+import pytest
+
+from frame_extractor import Frame
+from frame_store import FrameStore
+from graph_view import GraphView, entity_node_id
+from sqlite_frame_store import SQLiteFrameStore
+
+
+def make_frame(frame_id, kriya="give", **roles):
+    return Frame(frame_id, 0, f"{frame_id} text", kriya, kriya, **roles)
+
+
+def graph_ids(data):
+    return sorted(n["id"] for n in data["nodes"]), sorted(e["id"] for e in data["edges"])
+
+
+def test_entity_ids_are_stable():
+    assert entity_node_id("ram") == entity_node_id("ram")
+    assert entity_node_id("ram") != entity_node_id("sita")
+
+    first, second = GraphView(), GraphView()
+    first.build([make_frame("f1", karta="Ram"), make_frame("f2", karta="Sita")], 1)
+    second.build([make_frame("f2", karta=" SITA"), make_frame("f1", karta="ram")], 1)
+    assert graph_ids(first.to_graph_data(1)) == graph_ids(second.to_graph_data(1))
+
+
+def test_delta_reports_changes_since_a_version():
+    graph = GraphView()
+    graph.build([make_frame("f1", karta="Ram", karma="a book")], 1)
+    graph.add_frame(make_frame("f2", karta="Ram", sampradana="Sita"), 2)
+    graph.remove_frame(make_frame("f1", karta="Ram", karma="a book"), 3)
+
+    delta = graph.delta(1, 3)
+    assert not delta["full"]
+    assert sorted(n["id"] for n in delta["nodes_added"]) == sorted(["f2", entity_node_id("sita")])
+    assert sorted(delta["nodes_removed"]) == sorted(["f1", entity_node_id("a book")])
+    assert len(delta["edges_added"]) == 2 and len(delta["edges_removed"]) == 2
+    assert entity_node_id("ram") in graph.nodes   # Still referenced by f2
+
+    assert graph.delta(3, 3)["nodes_added"] == []
+
+
+def test_delta_older_than_the_log_is_the_full_graph():
+    graph = GraphView(max_log=4)
+    for version in range(1, 6):
+        graph.add_frame(make_frame(f"f{version}", karta=f"Person {version}"), version)
+    assert graph.floor > 0
+    assert graph.delta(0, 5)["full"]
+    assert not graph.delta(5, 5)["full"]
+
+    graph.reset(6)
+    assert graph.delta(5, 6) == graph.to_graph_data(6)
+
+
+def test_store_graph_follows_writes(tmp_path):
+    store = FrameStore(str(tmp_path / "frames.json"))
+    store.add_frames([make_frame("f1", karta="Ram"), make_frame("f2", karta="Sita")])
+    version = store.to_graph_data()["version"]
+
+    store.add_frame(make_frame("f1", kriya="take", karta="Hari"))
+    store.delete_frame("f2")
+    store.compact()
+    store.add_frame(make_frame("f3", karta="Ram"))
+
+    delta = store.graph_delta(version)
+    assert delta["version"] == store.version
+    assert sorted(delta["nodes_removed"]) == sorted([entity_node_id("sita"), "f2"])
+    assert {n["id"] for n in delta["nodes_added"]} >= {"f1", "f3", entity_node_id("hari")}
+    with store.snapshot() as snapshot:
+        assert graph_ids(store.to_graph_data()) == graph_ids(snapshot.to_graph_data())
+    assert store.get_stats()["graph"]["nodes"] == len(store.to_graph_data()["nodes"])
+    store.close()
+
+
+def test_sqlite_graph_matches_memory_store(tmp_path):
+    frames = [make_frame("f1", karta="Ram"), make_frame("f2", karta="Sita", karma="a book")]
+    memory, sqlite = FrameStore(), SQLiteFrameStore(str(tmp_path / "frames.db"))
+    for store in (memory, sqlite):
+        store.add_frames(frames)
+        store.to_graph_data()
+        store.add_frame(make_frame("f1", kriya="take", karta="Hari"))
+        store.delete_frame("f2")
+
+    assert graph_ids(sqlite.to_graph_data()) == graph_ids(memory.to_graph_data())
+    assert sqlite.version == memory.version == 3
+    sqlite_delta, memory_delta = sqlite.graph_delta(1), memory.graph_delta(1)
+    for key in ("nodes_removed", "edges_removed"):
+        assert sorted(sqlite_delta[key]) == sorted(memory_delta[key])
+    for key in ("nodes_added", "edges_added"):
+        assert sorted(i["id"] for i in sqlite_delta[key]) == sorted(i["id"] for i in memory_delta[key])
+    sqlite.close()
+
+
+def test_failed_batch_leaves_the_graph_unchanged(tmp_path):
+    store = FrameStore(str(tmp_path / "frames.json"))
+    store.add_frames([make_frame("f1", karta="Ram"), make_frame("f2", karta="Sita")])
+    store.compact()
+    before = graph_ids(store.to_graph_data())
+
+    with pytest.raises(AttributeError):
+        store.add_frames([make_frame("f1", karta="Hari"), make_frame("f3"), None])
+    assert graph_ids(store.to_graph_data()) == before
+    store.close()
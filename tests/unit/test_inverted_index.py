@@ -0,0 +1,120 @@
+import pytest
+
+from frame_collections import FrameCollections
+from frame_extractor import Frame
+from frame_store import FrameStore
+from inverted_index import InvertedIndex, lemma, tokenize
+from sqlite_frame_store import SQLiteFrameStore
+
+
+def make_frame(frame_id, kriya="give", text=None, **roles):
+    return Frame(frame_id, 0, text or f"{frame_id} text", kriya, kriya, **roles)
+
+
+def ids(results):
+    return [item[0] if isinstance(item[0], str) else item[0].frame_id for item in results]
+
+
+FRAMES = [
+    make_frame("f1", "gives", karta="Ram", karma="a bow", sampradana="Sita"),
+    make_frame("f2", "ruled", karta="Dasharatha", locus_space="Ayodhya"),
+    make_frame("f3", "giving", text="Sita was giving alms", karta="Sita"),
+    make_frame("f4", "walked", text="Ram walked to the forest", karta="Lakshmana"),
+]
+
+
+def test_tokens_are_lemmatized():
+    assert lemma("giving") == lemma("gives") == lemma("give")
+    assert tokenize("The bows of Ram") == ["bow", "ram"]
+
+
+def test_kriya_matches_rank_first():
+    index = InvertedIndex()
+    index.build(FRAMES)
+    assert sorted(ids(index.search(["give"], []))) == ["f1", "f3"]
+    assert ids(index.search([], ["ram"]))[0] == "f1"           # kartā beats sentence text
+    assert ids(index.search(["walk"], ["ram"]))[0] == "f4"
+    assert len(index.search([], ["sita", "ram", "ayodhya"], k=2)) == 2
+    assert index.search(["fly"], []) == []
+
+
+def test_versions_hide_later_changes_until_purged():
+    held = [1]
+    index = InvertedIndex(horizon=lambda: held[0], purge_after=1)
+    index.build(FRAMES)
+    index.add(make_frame("f1", "takes", karta="Ravana"), 2)
+    assert sorted(ids(index.search(["give"], [], version=1))) == ["f1", "f3"]
+    assert ids(index.search(["give"], [], version=2)) == ["f3"]
+    assert index.get_stats()["removed_docs"] == 1      # Held for the reader at version 1
+
+    held[0] = None
+    index.remove("f2", 3)
+    assert index.get_stats()["removed_docs"] == 0 and index.purged == 2
+    assert ids(index.search(["take"], [])) == ["f1"]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        store = FrameStore(str(tmp_path / "frames.json"))
+    else:
+        store = SQLiteFrameStore(str(tmp_path / "frames.db"))
+    yield store
+    store.close()
+
+
+def test_store_search_follows_writes(store):
+    store.add_frames(FRAMES)
+    assert ids(store.search(["give"], ["sita"]))[0] in ("f1", "f3")
+    assert store.get_stats()["search"]["frames"] == 4
+
+    store.add_frame(make_frame("f3", "sleeps", karta="Sita"))
+    store.delete_frame("f1")
+    store.compact()
+    assert store.search(["give"], []) == []
+    assert ids(store.search(["sleep"], [])) == ["f3"]
+    store.retract("f2")
+    assert store.search([], ["ayodhya"]) == []
+
+
+def test_snapshots_rank_what_they_see(store):
+    store.add_frames(FRAMES)
+    store.search([], [])                                # Build the index
+    with store.snapshot() as snapshot:
+        store.delete_frame("f1")
+        store.add_frame(make_frame("f5", "gives", karta="Bharata"))
+        assert sorted(ids(snapshot.search(["give"], []))) == ["f1", "f3"]
+        assert sorted(ids(store.search(["give"], []))) == ["f3", "f5"]
+        assert store.search_index.get_stats()["removed_docs"] == 1
+    store.search_index.purge()                          # Nothing holds them now
+    assert store.search_index.get_stats()["removed_docs"] == 0
+
+
+def test_snapshot_before_the_first_search(store):
+    store.add_frames(FRAMES)
+    with store.snapshot() as snapshot:
+        store.delete_frame("f4")
+        assert ids(snapshot.search(["walk"], [])) == ["f4"]
+    assert store.search(["walk"], []) == []
+
+
+def test_failed_batch_leaves_the_index_unchanged(tmp_path):
+    store = FrameStore(str(tmp_path / "frames.json"))
+    store.add_frames(FRAMES)
+    store.compact()
+    store.search([], [])
+    with pytest.raises(AttributeError):
+        store.add_frames([make_frame("f1", "sleeps"), None])
+    assert ids(store.search(["sleep"], [])) == []
+    assert "f1" in ids(store.search(["give"], []))
+    store.close()
+
+
+def test_collections_merge_top_k(tmp_path):
+    collections = FrameCollections(str(tmp_path / "collections"), default_store=FrameStore())
+    collections.get("a").add_frames(FRAMES[:2])
+    collections.get("b").add_frames(FRAMES[2:])
+    with collections.snapshot(["a", "b"]) as view:
+        assert sorted(ids(view.search(["give"], [], k=5))) == ["f1", "f3"]
+        assert len(view.search([], ["ram", "sita"], k=1)) == 1
+    collections.close()
@@ -0,0 +1,67 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+import frame_extractor
+import llm_client
+from frame_extractor import ExtractionStats, extract_frames
+from llm_client import get_routing_stats, record_tier_decision, resolve_model
+from sentence_index import SentenceIndex
+
+SENTENCE = "The ERC funded the study in 2021."
+FRAME = {"kriya": "fund", "kriya_surface": "funded", "prayoga": "active",
+         "karta": "The ERC", "karma": "the study", "locus_time": "2021"}
+
+
+def test_resolve_model_prefers_explicit_model_then_task_tier(monkeypatch):
+    monkeypatch.setitem(llm_client.TASK_TIERS, "planner", "small")
+    assert resolve_model("planner") == (llm_client.SMALL_MODEL, "small")
+    assert resolve_model("answer") == (llm_client.DEFAULT_MODEL, "large")
+    assert resolve_model("unknown-task") == (llm_client.DEFAULT_MODEL, "large")
+    assert resolve_model("planner", model="custom/model") == ("custom/model", "large")
+
+
+def test_small_tier_is_opt_in():
+    if os.getenv("LLM_SMALL_BASE_URL") or os.getenv("LLM_TASK_TIERS"):
+        pytest.skip("small tier configured in this environment")
+    assert set(llm_client.TASK_TIERS.values()) == {"large"}
+
+
+def test_escalation_rate_is_reported(monkeypatch):
+    monkeypatch.setattr(llm_client, "_routing", {})
+    record_tier_decision("extraction", escalated=False)
+    record_tier_decision("extraction", escalated=True)
+    report = get_routing_stats()["tasks"]["extraction"]
+    assert report["escalations"] == 1 and report["escalation_rate"] == 0.5
+
+
+def run_samples(monkeypatch, replies):
+    calls = []
+
+    async def call_llm(prompt, user, temperature=0.1, usage=None, task=None, **kwargs):
+        calls.append((task, temperature))
+        reply = replies[len(calls) - 1] if task == "extraction" else FRAME
+        return json.dumps(reply)
+
+    monkeypatch.setattr(frame_extractor, "call_llm", call_llm)
+    monkeypatch.setattr(frame_extractor, "EXTRACTION_MODE", "cascade")
+    monkeypatch.setattr(frame_extractor, "EXTRACTION_SAMPLES", 2)
+    monkeypatch.setattr(frame_extractor, "prefill_frame", lambda sentence: None)
+    stats = ExtractionStats()
+    items = [{"sentence_id": 0, "text": SENTENCE, "is_eventive": True}]
+    frames = asyncio.run(extract_frames(items, SentenceIndex(fingerprint="fp"), stats=stats))
+    return frames[0], calls, stats
+
+
+def test_agreeing_samples_keep_the_baseline_frame(monkeypatch):
+    frame, calls, stats = run_samples(monkeypatch, [FRAME, {**FRAME, "karta": "the ERC"}])
+    assert calls == [("extraction", 0.1), ("extraction", frame_extractor.SAMPLE_TEMPERATURE)]
+    assert frame.karta == "The ERC" and stats.escalations == 0
+
+
+def test_disagreeing_samples_escalate_to_reasoning_tier(monkeypatch):
+    frame, calls, stats = run_samples(monkeypatch, [FRAME, {**FRAME, "karta": None}])
+    assert [task for task, _ in calls] == ["extraction", "extraction", "extraction_reasoning"]
+    assert stats.escalations == 1
@@ -0,0 +1,73 @@
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+import eventive_filter
+from frame_extractor import Frame
+from near_duplicates import adapt_frame, choose_bands, cluster_sentences, shingles
+
+
+def test_shingles_collapse_numbers():
+    assert shingles("Revenue rose 12% in 2021.") == shingles("Revenue rose 15% in 2023.")
+    assert shingles("Ram ate") == {"ram ate"}
+
+
+def test_choose_bands_divides_permutations():
+    bands, rows = choose_bands(64, 0.8)
+    assert bands * rows == 64
+    assert abs((1 / bands) ** (1 / rows) - 0.8) < 0.1
+
+
+def test_cluster_points_duplicates_at_earlier_representative():
+    sentences = [
+        "The company hired 50 engineers in Berlin last year.",
+        "Ram ate the mango.",
+        "The company hired 70 engineers in Berlin last year.",
+        "",
+    ]
+    assert cluster_sentences(sentences, threshold=0.8) == [None, None, 0, None]
+
+
+def test_adapt_frame_carries_changed_fillers():
+    rep = Frame(
+        frame_id="F_rep", sentence_id=0,
+        sentence_text="The company hired 50 engineers in Berlin.",
+        kriya="hire", kriya_surface="hired",
+        karta="The company", karma="50 engineers", locus_space="Berlin",
+    )
+    adapted = adapt_frame(rep, 3, "The company hired 70 engineers in Munich.")
+    assert adapted.sentence_id == 3
+    assert adapted.karma == "70 engineers" and adapted.locus_space == "Munich"
+    assert adapted.kriya == "hire" and adapted.kriya_surface == "hired"
+
+    # A changed verb needs its own extraction
+    assert adapt_frame(rep, 4, "The company fired 50 engineers in Berlin.") is None
+
+
+def test_members_inherit_unless_keyword_check_contradicts(monkeypatch):
+    calls = []
+
+    async def fake_is_eventive(sentence):
+        calls.append(sentence)
+        return True, "action"
+
+    monkeypatch.setattr(eventive_filter, "is_eventive", fake_is_eventive)
+    sentences = [
+        "The company hired 50 engineers in Berlin last year.",
+        "The company hired 70 engineers in Berlin last year.",
+        "The company is a large employer of engineers in Berlin last year.",
+    ]
+    monkeypatch.setattr(eventive_filter, "cluster_sentences", lambda s, t: [None, 0, 0])
+    results = asyncio.run(eventive_filter.filter_eventive(sentences))
+
+    assert calls == [sentences[0], sentences[2]]
+    assert results[1]["duplicate_of"] == 0 and results[1]["is_eventive"]
+    assert "duplicate_of" not in results[2]
+
+
+def test_eventive_filter_does_not_import_frame_extractor():
+    code = "import sys, eventive_filter; sys.exit('frame_extractor' in sys.modules)"
+    env_path = [str(Path(eventive_filter.__file__).parent)] + sys.path
+    result = subprocess.run([sys.executable, "-c", code], env={"PYTHONPATH": ":".join(env_path)})
+    assert result.returncode == 0
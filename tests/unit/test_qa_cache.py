@@ -0,0 +1,115 @@
+import asyncio
+
+import numpy as np
+
+import qa_cache
+import qa_engine
+import query_planner
+from frame_collections import FrameCollections
+from frame_extractor import Frame
+from frame_store import FrameStore
+from qa_cache import AnswerCache, CachedAnswer, PlanCache, plan_signature
+
+
+def make_frame(frame_id, kriya, text, **roles):
+    return Frame(frame_id, 0, text, kriya, kriya, **roles)
+
+
+def unit(*values):
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def entry(question, signature=None, version=1):
+    return CachedAnswer(question=question, scope="s", plan={}, fingerprint="fp",
+                        result={"answer": question}, version=version, signature=signature)
+
+
+def test_plan_cache_is_exact_and_lru():
+    plans = PlanCache(max_entries=2)
+    plans.put("Who ate?", {"kriya_keywords": ["eat"]})
+    plans.put("Who ran?", {})
+    assert plans.get("who ate") == {"kriya_keywords": ["eat"]}
+    plans.put("Who slept?", {})                       # Evicts the least recently used
+    assert plans.get("Who ate?") is not None and plans.get("Who ran?") is None
+    assert plans.get_stats()["entries"] == 2
+
+
+def test_similar_questions_need_the_same_signature():
+    funded_2019 = plan_signature({"target_role": "karta", "kriya_keywords": ["Fund"],
+                                  "entity_keywords": ["ERC"], "constraints": {"locus_time": "2019"}})
+    funded_2021 = plan_signature({"target_role": "karta", "kriya_keywords": ["fund"],
+                                  "entity_keywords": ["erc"], "constraints": {"locus_time": "2021"}})
+    assert funded_2019 != funded_2021 and plan_signature(None) is None
+
+    answers = AnswerCache(threshold=0.9)
+    answers.put(unit(1, 0), entry("Who funded ERC in 2019?", funded_2019))
+    near = unit(1, 0.1)
+    assert answers.lookup(near, "s", "Who funded ERC in 2021?", funded_2021) is None
+    assert answers.lookup(near, "s", "Who was funding ERC in 2019?", funded_2019) is not None
+    assert answers.lookup(near, "s", "who funded erc in 2019", None) is not None   # Same question
+    assert answers.lookup(near, "other", "Who funded ERC in 2019?") is None
+    assert answers.get_stats()["rejected"] == 1
+
+    exact_only = AnswerCache(threshold=0.9, semantic=False)
+    exact_only.put(unit(1, 0), entry("Who funded ERC in 2019?", funded_2019))
+    assert exact_only.lookup(near, "s", "Who was funding ERC in 2019?", funded_2019) is None
+
+
+def test_answers_are_revalidated_against_newer_versions():
+    answers = AnswerCache(threshold=0.9)
+    answers.put(unit(0, 1), entry("Q", version=1))
+    assert answers.get(unit(0, 1), "s", 2, lambda plan: "fp", question="Q") is not None
+    assert answers.revalidated == 1
+    assert answers.get(unit(0, 1), "s", 3, lambda plan: "changed", question="Q") is None
+    assert answers.invalidated == 1 and len(answers) == 0
+
+
+def test_ask_reuses_answers_until_their_frames_change(monkeypatch):
+    calls = {"planner": 0, "answer": 0}
+
+    async def fake_llm(system, user, temperature=0.1, json_mode=False, task=None):
+        calls[task] += 1
+        if task == "planner":
+            return '{"kriya_keywords": ["fund"], "entity_keywords": ["ERC"]}'
+        return '{"answer": "The ERC funded the project.", "matched_frame_ids": ["f1"]}'
+
+    monkeypatch.setattr(qa_engine, "call_llm", fake_llm)
+    monkeypatch.setattr(query_planner, "RULE_PLANNER", False)
+    monkeypatch.setattr(qa_cache, "_cache", None)
+    store = FrameStore()
+    store.add_frames([
+        make_frame("f1", "fund", "The ERC funded the project.", karta="ERC", karma="the project"),
+        make_frame("f2", "eat", "Ram ate.", karta="Ram"),
+    ])
+
+    def ask(question="What did the ERC fund?"):
+        return asyncio.run(qa_engine.ask(question, store))
+
+    assert ask()["cache"] is None
+    assert ask("what did the ERC fund")["cache"] == "answer"
+
+    # A write that does not touch the retrieved frames keeps the answer
+    store.add_frame(make_frame("f3", "eat", "Sita ate.", karta="Sita"))
+    assert ask()["cache"] == "answer"
+    assert calls == {"planner": 1, "answer": 1}
+
+    # A write that changes them recomputes it (the plan is still cached)
+    store.add_frame(make_frame("f4", "fund", "The ERC funded a lab.", karta="ERC", karma="a lab"))
+    assert ask()["cache"] == "plan"
+    assert calls == {"planner": 1, "answer": 2}
+
+
+def test_cache_keys_never_repeat(tmp_path, monkeypatch):
+    assert FrameStore().scope_id != FrameStore().scope_id
+    monkeypatch.setattr(FrameCollections, "_delete_later", staticmethod(lambda directory: None))
+    collections = FrameCollections(str(tmp_path / "collections"), default_store=FrameStore())
+    collections.get("a").add_frame(make_frame("f1", "eat", "Ram ate.", karta="Ram"))
+    with collections.snapshot(["a"]) as view:
+        before = view.cache_version
+
+    collections.drop("a")
+    collections.get("a").add_frame(make_frame("f1", "eat", "Sita ate.", karta="Sita"))
+    with collections.snapshot(["a"]) as view:
+        assert view.version == 1 and view.cache_version != before
+    collections.close()
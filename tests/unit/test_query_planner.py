@@ -0,0 +1,103 @@
+import asyncio
+
+import spacy
+from spacy.tokens import Doc
+
+import qa_engine
+import query_planner
+import sentence_splitter
+from query_planner import kriya_synonyms, plan_from_doc, plan_with_rules
+
+VOCAB = spacy.blank("en").vocab
+
+
+def parse(words, heads, deps, pos, tags, lemmas):
+    """Hand-built parse (heads are absolute token indices)."""
+    return Doc(VOCAB, words=words, heads=heads, deps=deps, pos=pos, tags=tags, lemmas=lemmas)
+
+
+def test_subject_question_asks_for_karta():
+    # Who funded the study ?
+    plan = plan_from_doc(parse(
+        ["Who", "funded", "the", "study", "?"],
+        [1, 1, 3, 1, 1],
+        ["nsubj", "ROOT", "det", "dobj", "punct"],
+        ["PRON", "VERB", "DET", "NOUN", "PUNCT"],
+        ["WP", "VBD", "DT", "NN", "."],
+        ["who", "fund", "the", "study", "?"],
+    ))
+    assert plan["target_role"] == "karta" and plan["confidence"] == 1.0
+    assert plan["constraints"] == {"karma": "study"} and plan["entity_keywords"] == ["study"]
+    assert plan["kriya_keywords"][:2] == ["fund", "funded"] and "finance" in plan["kriya_keywords"]
+
+
+def test_stranded_preposition_in_a_passive_question():
+    # Who was the grant given to ?
+    plan = plan_from_doc(parse(
+        ["Who", "was", "the", "grant", "given", "to", "?"],
+        [4, 4, 3, 4, 4, 4, 4],
+        ["dobj", "auxpass", "det", "nsubjpass", "ROOT", "prep", "punct"],
+        ["PRON", "AUX", "DET", "NOUN", "VERB", "ADP", "PUNCT"],
+        ["WP", "VBD", "DT", "NN", "VBN", "IN", "."],
+        ["who", "be", "the", "grant", "give", "to", "?"],
+    ))
+    assert plan["target_role"] == "sampradana"
+    assert plan["constraints"] == {"karma": "grant"}
+    assert "provide" in plan["kriya_keywords"]
+
+
+def test_non_karaka_questions_are_left_to_the_llm():
+    # Why did Ram leave ?
+    plan = plan_from_doc(parse(
+        ["Why", "did", "Ram", "leave", "?"],
+        [3, 3, 3, 3, 3],
+        ["advmod", "aux", "nsubj", "ROOT", "punct"],
+        ["SCONJ", "AUX", "PROPN", "VERB", "PUNCT"],
+        ["WRB", "VBD", "NNP", "VB", "."],
+        ["why", "do", "Ram", "leave", "?"],
+    ))
+    assert plan["target_role"] is None
+    assert plan["confidence"] < query_planner.PLANNER_MIN_CONFIDENCE
+    assert "'why' is not a kāraka question" in plan["reasoning"]
+
+
+def test_synonyms_exclude_the_lemma():
+    assert kriya_synonyms("fund")[:4] == ["finance", "grant", "sponsor", "support"]
+    assert "fund" not in kriya_synonyms("fund")
+
+
+def test_missing_model_falls_back_once_without_download(monkeypatch, capsys):
+    loads = []
+    monkeypatch.setattr(sentence_splitter, "_nlp", None)
+    monkeypatch.setattr(query_planner, "_parser_unavailable", False)
+    monkeypatch.setattr(query_planner, "RULE_PLANNER", True)
+
+    def fake_load(name):
+        loads.append(name)
+        raise OSError(f"[E050] Can't find model '{name}'")
+
+    monkeypatch.setattr(spacy, "load", fake_load)
+    assert plan_with_rules("Who funded the study?") is None
+    assert plan_with_rules("Who ate the mango?") is None
+    assert loads == ["en_core_web_sm"]
+    assert capsys.readouterr().out.count("Rule planner disabled") == 1
+    assert query_planner.get_planner_stats()["parser_available"] is False
+
+
+def test_plan_query_uses_confident_rule_plans(monkeypatch):
+    calls = []
+
+    async def fake_llm(system, user, temperature=0.1, json_mode=False, task=None):
+        calls.append(task)
+        return '{"kriya_keywords": ["leave"], "entity_keywords": ["Ram"]}'
+
+    monkeypatch.setattr(qa_engine, "call_llm", fake_llm)
+    confident = {"kriya_keywords": ["fund"], "entity_keywords": [], "target_role": "karta",
+                 "constraints": {}, "reasoning": "", "planner": "rules", "confidence": 1.0}
+    assert asyncio.run(qa_engine.plan_query("Who funded it?", confident)) is confident
+    assert calls == []
+
+    unsure = {**confident, "target_role": "locus_time", "confidence": 0.4}
+    plan = asyncio.run(qa_engine.plan_query("When did Ram leave, and why?", unsure))
+    assert calls == ["planner"]
+    assert plan["planner"] == "llm" and plan["target_role"] == "locus_time"
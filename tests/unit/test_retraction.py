@@ -0,0 +1,117 @@
+import pytest
+
+from frame_extractor import Frame
+from frame_store import FrameStore, RETRACT_SYMBOL, TRACE_SYMBOL
+from sqlite_frame_store import SQLiteFrameStore
+
+
+def make_frame(frame_id, kriya="eat", **roles):
+    return Frame(frame_id, 0, f"{frame_id} text", kriya, kriya, **roles)
+
+
+def frame_ids(reader):
+    return sorted(frame.frame_id for frame in reader.get_all_frames())
+
+
+CHAIN = [
+    make_frame("f1", "eat", karta="ram_p5"),
+    make_frame("f2", "king", karta="ram_p50"),
+    make_frame("id1", "≡", karta="ram_p5", karma="ram_p50"),
+    make_frame("p1", "king_eats", karta="ram_p5"),
+    make_frame("d1", "derive", karta="p1", karma="f1", karana="f2", sampradana="id1"),
+    make_frame("c2", "x", karta="a"),
+    make_frame("d2", "derive", karta="c2", karma="p1"),
+    make_frame("c3", "y", karta="b"),
+    make_frame("d3", "derive", karta="c3", karma="c2"),
+    # c4 keeps an independent derivation from f1
+    make_frame("c4", "z", karta="c"),
+    make_frame("d4", "derive", karta="c4", karma="c3"),
+    make_frame("d4b", "derive", karta="c4", karma="f1"),
+]
+RETRACTED = ["c2", "c3", "d1", "d2", "d3", "d4", "id1", "p1"]
+REMAINING = ["c4", "d4b", "f1", "f2"]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def open_store(request, tmp_path):
+    if request.param == "memory":
+        return lambda: FrameStore(str(tmp_path / "frames.json"))
+    return lambda: SQLiteFrameStore(str(tmp_path / "frames.db"))
+
+
+def test_retraction_cascades_through_derivations(open_store):
+    store = open_store()
+    store.add_frames(CHAIN)
+    version = store.version
+
+    assert sorted(store.retract("id1")) == RETRACTED
+    assert store.version == version + 1
+    assert frame_ids(store) == REMAINING
+    assert store.get_frame("d1") is None and store.find_by_kriya("derive")[0].frame_id == "d4b"
+    assert store.get_retracted("d1").kriya == "derive"
+    assert store.get_stats()["retracted_frames"] == len(RETRACTED)
+    assert store.retract("id1") == []
+    store.close()
+
+    reopened = open_store()
+    assert frame_ids(reopened) == REMAINING
+    assert reopened.get_retracted("p1") is not None
+    reopened.close()
+
+
+def test_retract_identity_adds_retraction_and_trace(open_store):
+    store = open_store()
+    store.add_frames(CHAIN)
+    with pytest.raises(ValueError):
+        store.retract_identity("f1")
+
+    retraction_id = store.retract_identity("id1", reason="different people")
+    retraction = store.get_frame(retraction_id)
+    assert retraction.kriya == RETRACT_SYMBOL and retraction.karta == "id1"
+    trace, = store.find_by_kriya(TRACE_SYMBOL)
+    assert (trace.karma, trace.karana) == ("id1", "different people")
+    assert frame_ids(store) == sorted(REMAINING + [retraction_id, trace.frame_id])
+    store.close()
+
+
+def test_retractions_survive_compaction_and_deletion(tmp_path):
+    path = str(tmp_path / "frames.json")
+    store = FrameStore(path)
+    store.add_frames(CHAIN)
+    store.compact()
+    assert store.retract("c3") == ["c3", "d3", "d4"]   # From the snapshot
+    store.compact()
+    assert frame_ids(store) == sorted(set(f.frame_id for f in CHAIN) - {"c3", "d3", "d4"})
+    assert store.delete_frame("d4") is True     # Retracted frames can be deleted
+    assert store.get_retracted("d4") is None
+    store.add_frame(make_frame("c3", "y", karta="b"))   # Re-asserted
+    store.close()
+
+    reopened = FrameStore(path)
+    assert sorted(reopened.retracted) == ["d3"]
+    assert reopened.get_frame("c3") is not None and reopened.get_frame("d4") is None
+
+
+def test_retraction_in_a_failed_batch_is_rolled_back(tmp_path):
+    store = FrameStore(str(tmp_path / "frames.json"))
+    store.add_frames(CHAIN)
+    with pytest.raises(RuntimeError):
+        with store._write_batch():
+            store.retract("id1")
+            raise RuntimeError("abort")
+    assert frame_ids(store) == sorted(f.frame_id for f in CHAIN)
+    assert store.retracted == {}
+    store.close()
+
+
+def test_retract_inside_a_batch_does_not_flush(tmp_path, monkeypatch):
+    store = FrameStore(str(tmp_path / "frames.json"))
+    store.add_frames(CHAIN)
+    flushes = []
+    monkeypatch.setattr(store, "flush", lambda: flushes.append(store._writing))
+    with store._write_batch():
+        store.retract("c3")
+        store.add_frame(make_frame("c5", "z", karta="e"))
+    assert flushes == []
+    store.retract("c2")
+    assert flushes == [None]
@@ -0,0 +1,59 @@
+import json
+
+from sentence_index import SentenceIndex, frame_id_for, normalize_sentence, sentence_key
+
+
+def occurrence(sentence_id, source="doc"):
+    return {"source": source, "sentence_id": sentence_id}
+
+
+def test_sentence_key_ignores_case_and_whitespace():
+    assert normalize_sentence("  The ERC\tfunded\n the study. ") == "the erc funded the study."
+    assert sentence_key("The ERC funded the study.") == sentence_key("the  ERC funded the study.")
+    assert frame_id_for("Ram ate.") == f"F_{sentence_key('Ram ate.')}"
+
+
+def test_repeats_reuse_the_frame_and_dedupe_occurrences(tmp_path):
+    index = SentenceIndex(tmp_path / "index.jsonl", fingerprint="fp1")
+    key = sentence_key("Ram ate.")
+    assert index.lookup(key) is None
+    index.add(key, {"kriya": "eat"}, occurrence(1))
+    index.add_occurrence(key, {"sentence_id": 1, "source": "doc"})
+    index.add_occurrence(key, occurrence(2))
+    assert index.lookup(key) == {"kriya": "eat"}
+    assert index.occurrences(key) == [occurrence(1), occurrence(2)]
+    assert index.get_stats()["hits"] == 1 and index.get_stats()["misses"] == 1
+
+    reloaded = SentenceIndex(tmp_path / "index.jsonl", fingerprint="fp1")
+    assert reloaded.lookup(key) == {"kriya": "eat"}
+    assert reloaded.occurrences(key) == [occurrence(1), occurrence(2)]
+
+
+def test_other_fingerprint_is_re_extracted(tmp_path):
+    path = tmp_path / "index.jsonl"
+    SentenceIndex(path, fingerprint="old").add("k", {"kriya": "eat"}, occurrence(1))
+
+    index = SentenceIndex(path, fingerprint="new")
+    assert index.lookup("k") is None
+    assert index.get_stats()["stale"] == 1
+    index.add("k", {"kriya": "consume"}, occurrence(2))
+    assert SentenceIndex(path, fingerprint="new").lookup("k") == {"kriya": "consume"}
+    assert SentenceIndex(path, fingerprint="old").lookup("k") == {"kriya": "eat"}
+
+
+def test_log_is_rewritten_once_mostly_dead(tmp_path):
+    path = tmp_path / "index.jsonl"
+    old = SentenceIndex(path, fingerprint="old")
+    for i in range(30):
+        old.add(f"k{i}", {"kriya": "eat"}, occurrence(i))
+    assert SentenceIndex(path, fingerprint="new").get_stats()["compactions"] == 0
+
+    current = SentenceIndex(path, fingerprint="new", compact_min_records=10)
+    assert current.get_stats()["compactions"] == 1
+    assert path.read_text() == ""
+    current.add("k0", {"kriya": "consume"}, occurrence(0))
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [record["op"] for record in records] == ["frame", "occurrence"]
+    assert records[0]["fp"] == "new"
+    assert SentenceIndex(path, fingerprint="new").lookup("k0") == {"kriya": "consume"}
+    assert SentenceIndex(path, fingerprint="new").get_stats()["compactions"] == 0
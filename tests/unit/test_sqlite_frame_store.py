@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from frame_extractor import Frame
+from frame_store import FrameStore
+from sqlite_frame_store import SQLiteFrameStore
+
+
+FRAMES = [
+    Frame("F1", 0, "The agency funded the project in 2024.", "fund", "funded",
+          karta="The agency", karma="the project", locus_time="2024"),
+    Frame("F2", 1, "The project hired 50% of the staff.", "hire", "hired",
+          karta="the project", karma="50% of the staff"),
+    Frame("F3", 2, "Ram gave Sita a book.", "give", "gave",
+          karta="Ram", karma="a book", sampradana="Sita",
+          causal_links=[{"type": "because", "target": "F1"}]),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteFrameStore(str(tmp_path / "frames.db"))
+    store.add_frames(FRAMES)
+    yield store
+    store.close()
+
+
+def test_frames_round_trip(store, tmp_path):
+    assert store.get_frame("F3").to_dict() == FRAMES[2].to_dict()
+    assert [f.frame_id for f in store.get_all_frames()] == ["F1", "F2", "F3"]
+
+    reopened = SQLiteFrameStore(str(tmp_path / "frames.db"))
+    assert reopened.get_stats()["total_frames"] == 3
+    reopened.close()
+
+
+def test_lookups_match_memory_store(store):
+    memory = FrameStore()
+    memory.add_frames(FRAMES)
+
+    for lookup, args in [
+        ("find_by_entity", ("THE PROJECT ",)),
+        ("find_by_kriya", ("Hire",)),
+        ("find_by_role", ("agent", "project")),
+        ("find_by_role", ("object", "50%")),  # LIKE wildcards are escaped
+        ("find_by_role", ("object", "_")),
+        ("find_by_role", ("unknown", "x")),
+    ]:
+        expected = sorted(f.frame_id for f in getattr(memory, lookup)(*args))
+        assert sorted(f.frame_id for f in getattr(store, lookup)(*args)) == expected, lookup
+
+    assert store.to_graph_data() == memory.to_graph_data()
+    assert json.loads(store.to_json()) == json.loads(memory.to_json())
+
+
+def test_failed_batch_rolls_back(store):
+    bad = Frame("F4", 3, "Broken.", None, None)  # symbol is NOT NULL
+    with pytest.raises(Exception):
+        store.add_frames([Frame("F5", 4, "Ok.", "run", "ran"), bad])
+    assert store.get_frame("F5") is None
+    assert not store._writer.in_transaction
+
+    store.add_frame(Frame("F6", 5, "Ram ran.", "run", "ran", karta="Ram"))
+    assert store.get_frame("F6") is not None
+
+
+def test_clear(store):
+    store.clear()
+    assert store.get_all_frames() == []
+    assert store.find_by_entity("ram") == []
+
+
+def test_import_from_snapshot_once(tmp_path):
+    snapshot = tmp_path / "frames.json"
+    snapshot.write_text(json.dumps([f.to_dict() for f in FRAMES]))
+
+    store = SQLiteFrameStore(str(tmp_path / "frames.db"), import_path=str(snapshot))
+    assert store.get_stats()["total_frames"] == 3
+    store.clear()
+    store.add_frame(FRAMES[0])
+    store.close()
+
+    store = SQLiteFrameStore(str(tmp_path / "frames.db"), import_path=str(snapshot))
+    assert [f.frame_id for f in store.get_all_frames()] == ["F1"]
+    store.close()
@@ -0,0 +1,76 @@
+import spacy
+from spacy.tokens import Doc
+
+import sentence_splitter
+import srl_prefill
+from srl_prefill import prefill_frame, prefill_from_doc
+
+VOCAB = spacy.blank("en").vocab
+
+
+def parse(words, heads, deps, pos, lemmas=None, ents=None):
+    """Hand-built parse (heads are absolute token indices)."""
+    return Doc(VOCAB, words=words, heads=heads, deps=deps, pos=pos,
+               lemmas=lemmas or [w.lower() for w in words], ents=ents)
+
+
+def test_active_sentence_prefills_cleanly():
+    # The ERC funded the study in Berlin .
+    doc = parse(
+        ["The", "ERC", "funded", "the", "study", "in", "Berlin", "."],
+        [1, 2, 2, 4, 2, 2, 5, 2],
+        ["det", "nsubj", "ROOT", "det", "dobj", "prep", "pobj", "punct"],
+        ["DET", "PROPN", "VERB", "DET", "NOUN", "ADP", "PROPN", "PUNCT"],
+        lemmas=["the", "ERC", "fund", "the", "study", "in", "Berlin", "."],
+        ents=["O", "B-ORG", "O", "O", "O", "O", "B-GPE", "O"],
+    )
+    prefill = prefill_from_doc(doc)
+    assert prefill.is_clean
+    assert prefill.data == {"kriya": "fund", "kriya_surface": "funded", "prayoga": "active",
+                            "karta": "The ERC", "karma": "the study", "locus_space": "Berlin"}
+
+
+def test_passive_agent_and_year():
+    # The study was funded by the ERC in 2021 .
+    doc = parse(
+        ["The", "study", "was", "funded", "by", "the", "ERC", "in", "2021", "."],
+        [1, 3, 3, 3, 3, 6, 4, 3, 7, 3],
+        ["det", "nsubjpass", "auxpass", "ROOT", "agent", "det", "pobj", "prep", "pobj", "punct"],
+        ["DET", "NOUN", "AUX", "VERB", "ADP", "DET", "PROPN", "ADP", "NUM", "PUNCT"],
+        lemmas=["the", "study", "be", "fund", "by", "the", "ERC", "in", "2021", "."],
+    )
+    prefill = prefill_from_doc(doc)
+    assert prefill.is_clean
+    assert prefill.data["prayoga"] == "passive" and prefill.data["kriya_surface"] == "was funded"
+    assert prefill.data["karta"] == "the ERC" and prefill.data["karma"] == "The study"
+    assert prefill.data["locus_time"] == "2021"
+
+
+def test_ambiguous_preposition_and_non_verbal_root():
+    # Ram worked in the field .
+    doc = parse(
+        ["Ram", "worked", "in", "the", "field", "."],
+        [1, 1, 1, 4, 2, 1],
+        ["nsubj", "ROOT", "prep", "det", "pobj", "punct"],
+        ["PROPN", "VERB", "ADP", "DET", "NOUN", "PUNCT"],
+        lemmas=["Ram", "work", "in", "the", "field", "."],
+    )
+    assert prefill_from_doc(doc).ambiguities == ["'in the field': place or topic"]
+    assert prefill_from_doc(parse(["Hello", "."], [0, 0], ["ROOT", "punct"], ["INTJ", "PUNCT"])) is None
+
+
+def test_missing_model_fails_closed_once_without_download(monkeypatch, capsys):
+    loads = []
+    monkeypatch.setattr(sentence_splitter, "_nlp", None)
+    monkeypatch.setattr(srl_prefill, "_parser_unavailable", False)
+    monkeypatch.setattr(srl_prefill, "SRL_PREFILL", True)
+
+    def fake_load(name):
+        loads.append(name)
+        raise OSError(f"[E050] Can't find model '{name}'")
+
+    monkeypatch.setattr(spacy, "load", fake_load)
+    assert prefill_frame("Ram ate the mango.") is None
+    assert prefill_frame("Ram ate the apple.") is None
+    assert loads == ["en_core_web_sm"]
+    assert capsys.readouterr().out.count("SRL prefill disabled") == 1
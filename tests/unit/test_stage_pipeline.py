@@ -0,0 +1,112 @@
+import asyncio
+import json
+
+import pytest
+
+import llm_client
+import stage_pipeline
+from stage_pipeline import Stage, StageCache, StagePipeline, parse_concurrency, parse_tagged_json, primary_event
+
+
+def render(template, sentence, inputs):
+    return f"{template}|{sentence}|{json.dumps(inputs, sort_keys=True)}"
+
+
+def make_stage(name, deps=(), prompt="prompt"):
+    stage = Stage(name, f"{name}.txt", deps, render, max_concurrency=2)
+    stage.__dict__["prompt"] = f"{prompt}-{name}"  # cached_property override
+    return stage
+
+
+def make_pipeline(cache=None, prompts=None):
+    prompts = prompts or {}
+    return StagePipeline([
+        make_stage("A", prompt=prompts.get("A", "p")),
+        make_stage("B", prompt=prompts.get("B", "p")),
+        make_stage("C", ("A", "B"), prompt=prompts.get("C", "p")),
+    ], cache=cache)
+
+
+def fake_llm(monkeypatch, gate=None):
+    calls = []
+
+    async def call_llm(prompt, user, usage=None, **kwargs):
+        calls.append(prompt.split("|")[0])
+        if gate is not None:
+            await gate.wait()
+        return f"<json>{json.dumps({'stage': prompt.split('|')[0].split('-')[1]})}</json>"
+
+    monkeypatch.setattr(stage_pipeline, "call_llm", call_llm)
+    return calls
+
+
+def test_parse_helpers():
+    assert parse_concurrency("D1=2, D2b=x") == {"D1": 2, "D2a": 8, "D2b": 4}
+    assert parse_tagged_json('<reasoning>{no}</reasoning><json>{"a": 1}</json>') == {"a": 1}
+    assert parse_tagged_json('noise {"a": 2} noise') == {"a": 2}
+
+
+def test_graph_runs_and_caches_per_stage(tmp_path, monkeypatch):
+    calls = fake_llm(monkeypatch)
+    cache_path = tmp_path / "stages.jsonl"
+    outputs = asyncio.run(make_pipeline(StageCache(cache_path)).run("Ram ate."))
+    assert outputs["C"] == {"stage": "C"}
+    assert sorted(calls) == ["p-A", "p-B", "p-C"]
+
+    # Editing B's prompt re-runs B only: its output, C's input, is unchanged
+    calls.clear()
+    pipeline = make_pipeline(StageCache(cache_path), prompts={"B": "q"})
+    asyncio.run(pipeline.run("Ram ate."))
+    assert calls == ["q-B"]
+    assert pipeline.timings["A"].cache_hits == 1
+
+
+def test_cache_key_includes_model(monkeypatch):
+    stage = make_stage("A")
+    key = stage.cache_key("Ram ate.", {})
+    monkeypatch.setitem(llm_client.TASK_TIERS, "extraction_reasoning", "small")
+    assert stage.cache_key("Ram ate.", {}) != key
+
+
+def test_concurrent_callers_share_one_call(monkeypatch):
+    calls = fake_llm(monkeypatch)
+    pipeline = make_pipeline()
+    results = asyncio.run(pipeline.run_many(["Ram ate."] * 3))
+    assert all(r["C"] == {"stage": "C"} for r in results)
+    assert len(calls) == 3
+
+
+def test_cancelled_owner_does_not_hang_waiters(monkeypatch):
+    async def scenario():
+        gate = asyncio.Event()
+        calls = fake_llm(monkeypatch, gate)
+        pipeline = make_pipeline()
+        stage = pipeline.stages["A"]
+        owner = asyncio.create_task(pipeline._run_stage(stage, "Ram ate.", {}, {}))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(pipeline._run_stage(stage, "Ram ate.", {}, {}))
+        await asyncio.sleep(0)
+        owner.cancel()
+        await asyncio.sleep(0)
+        gate.set()
+        result = await asyncio.wait_for(waiter, timeout=1)
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        return calls, result
+
+    calls, result = asyncio.run(scenario())
+    assert result == {"stage": "A"} and calls == ["p-A", "p-A"]
+
+
+def test_primary_event_skips_copula():
+    outputs = {
+        "D2a": {"kriyās": [{"surface_text": "is", "is_copula": True}]},
+        "D2b": {"event_instances": [
+            {"kriyā_concept": "be", "surface_text": "is", "kāraka_links": []},
+            {"kriyā_concept": "fund", "surface_text": "funded", "prayoga": "active",
+             "kāraka_links": [{"role": "Agent", "entity": "ERC"}, {"role": "Locus_Time", "entity": "2021"}]},
+        ]},
+    }
+    assert primary_event(outputs) == {"kriya": "fund", "kriya_surface": "funded", "prayoga": "active",
+                                      "karta": "ERC", "locus_time": "2021"}
+    assert primary_event({"D2b": {"event_instances": []}}) is None
@@ -0,0 +1,71 @@
+import random
+
+from frame_extractor import Frame
+from frame_store import FrameStore
+from sqlite_frame_store import SQLiteFrameStore
+from trigram_index import TrigramIndex
+
+
+def test_lookup_matches_substring_scan():
+    rng = random.Random(7)
+    words = ["the", "agency", "Ram", "project", "bank", "funds", "a", "ab", "Ministry"]
+    fillers = {f"F{i}": " ".join(rng.choice(words) for _ in range(rng.randint(1, 4))) for i in range(300)}
+
+    index = TrigramIndex()
+    for frame_id, value in fillers.items():
+        index.add("karta", value, frame_id)
+
+    for query in ["ag", "a", "AGENCY", "the bank", "ncy Ra", "ministry funds", "zzz", ""]:
+        expected = {fid for fid, value in fillers.items() if query.lower() in value.lower()}
+        assert index.lookup("karta", query) == expected, query
+    assert index.lookup("karma", "agency") == set()
+
+
+def test_remove_drops_unused_values_only():
+    index = TrigramIndex()
+    index.add("karma", "the project", "F1")
+    index.add("karma", "The Project", "F2")
+    index.remove("karma", "the project", "F1")
+    assert index.lookup("karma", "proj") == {"F2"}
+
+    index.remove("karma", "the project", "F2")
+    index.remove("karma", "the project", "F3")  # Not indexed: no-op
+    assert index.lookup("karma", "proj") == set()
+    assert index.get_stats()["karma"] == {"values": 0, "trigrams": 0}
+
+
+def test_replaced_frame_is_unindexed():
+    store = FrameStore()
+    store.add_frame(Frame("F1", 0, "Ram ate a mango.", "eat", "ate", karta="Ram", karma="a mango"))
+    store.add_frame(Frame("F1", 0, "Ram ate an apple.", "eat", "ate", karta="Ram", karma="an apple"))
+
+    assert store.find_by_role("object", "mango") == []
+    assert [f.frame_id for f in store.find_by_role("object", "apple")] == ["F1"]
+    assert "a mango" not in store.entities
+
+
+def test_delete_is_logged_and_replayed(tmp_path):
+    path = str(tmp_path / "frames.json")
+    store = FrameStore(path)
+    store.add_frames([
+        Frame("F1", 0, "Ram ate a mango.", "eat", "ate", karta="Ram", karma="a mango"),
+        Frame("F2", 1, "Sita ate rice.", "eat", "ate", karta="Sita", karma="rice"),
+    ])
+    assert store.delete_frame("F1") is True
+    assert store.delete_frame("F1") is False
+    store.close()
+
+    recovered = FrameStore(path)
+    assert sorted(recovered.frames) == ["F2"]
+    assert recovered.find_by_role("agent", "ram") == []
+    assert recovered.find_by_entity("a mango") == []
+    assert [f.frame_id for f in recovered.find_by_kriya("eat")] == ["F2"]
+
+
+def test_sqlite_delete_frame(tmp_path):
+    store = SQLiteFrameStore(str(tmp_path / "frames.db"))
+    store.add_frame(Frame("F1", 0, "Ram ate a mango.", "eat", "ate", karta="Ram", karma="a mango"))
+    assert store.delete_frame("F1") is True
+    assert store.delete_frame("F1") is False
+    assert store.find_by_entity("ram") == []
+    store.close()
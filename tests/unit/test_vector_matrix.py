@@ -0,0 +1,85 @@
+import asyncio
+
+import numpy as np
+
+from frame_extractor import Frame
+from frame_store import FrameStore
+from sqlite_frame_store import SQLiteFrameStore
+from vector_matrix import VectorMatrix
+
+
+def unit_vectors(n, dim=16, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_search_matches_exact_scan():
+    vectors = unit_vectors(3000)
+    matrix = VectorMatrix(16, initial_capacity=4)  # Grows by doubling
+    matrix.set_many([f"F{i}" for i in range(3000)], vectors)
+    matrix.remove("F7")
+
+    query = vectors[7]
+    scores = vectors.astype(np.float16).astype(np.float32) @ query
+    scores[7] = -np.inf
+    expected = [f"F{i}" for i in np.argsort(-scores)[:5]]
+    assert [fid for fid, _ in matrix.search(query, 5)] == expected
+    assert matrix.capacity == 4096 and len(matrix) == 2999
+
+
+def test_freed_rows_are_reused():
+    matrix = VectorMatrix(16, initial_capacity=8)
+    matrix.set_many(["A", "B", "C"], unit_vectors(3))
+    matrix.remove("B")
+    matrix.set("D", unit_vectors(1, seed=1)[0])
+    assert matrix.row_of["D"] == 1
+    assert matrix.get_stats()["rows"] == 3
+
+
+def test_persisted_matrix_reloads(tmp_path):
+    base = str(tmp_path / "frames.json.vec")
+    vectors = unit_vectors(50)
+    matrix = VectorMatrix(16, path=base, model="m1", initial_capacity=8)
+    matrix.set_many([f"F{i}" for i in range(50)], vectors)
+    matrix.remove("F3")
+    matrix.close()
+
+    reloaded = VectorMatrix(16, path=base, model="m1")
+    assert len(reloaded) == 49 and "F3" not in reloaded
+    assert np.allclose(reloaded.get("F10"), vectors[10], atol=1e-3)
+    reloaded.close()
+
+    assert len(VectorMatrix(16, path=base, model="m2")) == 0  # Model changed
+
+
+def test_store_embeds_in_batches_and_searches(tmp_path):
+    path = str(tmp_path / "frames.json")
+    store = FrameStore(path)
+    store.add_frames([
+        Frame("F1", 0, "Ram ate a mango.", "eat", "ate", karta="Ram", karma="a mango"),
+        Frame("F2", 1, "The agency funded the project.", "fund", "funded",
+              karta="The agency", karma="the project"),
+    ])
+    assert asyncio.run(store.embed_pending()) == 2
+    results = asyncio.run(store.semantic_search("agency fund project", k=1))
+    assert [frame.frame_id for frame, _ in results] == ["F2"]
+
+    store.delete_frame("F1")
+    store.close()
+    reopened = FrameStore(path)
+    assert asyncio.run(reopened.embed_pending()) == 0  # Nothing to re-embed
+    assert "F2" in reopened.embeddings and "F1" not in reopened.embeddings
+    reopened.close()
+
+
+def test_sqlite_store_shares_embeddings(tmp_path):
+    store = SQLiteFrameStore(str(tmp_path / "frames.db"))
+    store.add_frame(Frame("F1", 0, "Ram ate a mango.", "eat", "ate", karta="Ram", karma="a mango"))
+    assert asyncio.run(store.embed_pending()) == 1
+    results = asyncio.run(store.semantic_search("Ram eat mango", k=3))
+    assert [frame.frame_id for frame, _ in results] == ["F1"]
+    store.close()
+
+    reopened = SQLiteFrameStore(str(tmp_path / "frames.db"))
+    assert asyncio.run(reopened.embed_pending()) == 0
+    reopened.close()